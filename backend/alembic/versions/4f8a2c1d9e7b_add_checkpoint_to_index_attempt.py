@@ -0,0 +1,28 @@
+"""add checkpoint to index attempt
+
+Revision ID: 4f8a2c1d9e7b
+Revises: c0aab6edb6dd
+Create Date: 2024-12-20 10:12:45.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "4f8a2c1d9e7b"
+down_revision = "c0aab6edb6dd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "index_attempt",
+        sa.Column("checkpoint", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("index_attempt", "checkpoint")
@@ -2,8 +2,11 @@ from datetime import datetime
 from datetime import timezone
 
 from sqlalchemy import select
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
+from onyx.access.models import DocExternalAccess
 from onyx.access.models import ExternalAccess
 from onyx.access.utils import prefix_group_w_source
 from onyx.configs.constants import DocumentSource
@@ -101,3 +104,109 @@ def upsert_document_external_perms(
         db_session.commit()
 
     return False
+
+
+def upsert_document_external_perms_batch(
+    db_session: Session,
+    doc_external_accesses: list[DocExternalAccess],
+    source_type: DocumentSource,
+) -> tuple[list[str], list[str]]:
+    """
+    Sets the permissions for a batch of documents in postgres with one statement per kind
+    of change instead of one round trip per document.
+    Returns the ids of the documents that were created and the ids of the existing documents
+    whose permissions changed.
+    NOTE: this will replace any existing external access, it will not do a union
+    NOTE: this function is Postgres specific, it relies on the ON CONFLICT clause
+    """
+    # the last permissions win if a document is listed more than once
+    doc_id_to_external_access = {
+        doc_external_access.doc_id: doc_external_access.external_access
+        for doc_external_access in doc_external_accesses
+    }
+    if not doc_id_to_external_access:
+        return [], []
+
+    doc_id_to_prefixed_external_groups = {
+        doc_id: {
+            prefix_group_w_source(ext_group_name=group_id, source=source_type)
+            for group_id in external_access.external_user_group_ids
+        }
+        for doc_id, external_access in doc_id_to_external_access.items()
+    }
+
+    existing_docs = db_session.execute(
+        select(
+            DbDocument.id,
+            DbDocument.external_user_emails,
+            DbDocument.external_user_group_ids,
+            DbDocument.is_public,
+        ).where(DbDocument.id.in_(list(doc_id_to_external_access)))
+    ).all()
+    existing_doc_ids = {existing_doc.id for existing_doc in existing_docs}
+
+    now = datetime.now(timezone.utc)
+    changed_doc_values: list[dict] = []
+    for existing_doc in existing_docs:
+        external_access = doc_id_to_external_access[existing_doc.id]
+        prefixed_external_groups = doc_id_to_prefixed_external_groups[existing_doc.id]
+        if (
+            external_access.external_user_emails
+            != set(existing_doc.external_user_emails or [])
+            or prefixed_external_groups
+            != set(existing_doc.external_user_group_ids or [])
+            or external_access.is_public != existing_doc.is_public
+        ):
+            changed_doc_values.append(
+                {
+                    "id": existing_doc.id,
+                    "external_user_emails": list(external_access.external_user_emails),
+                    "external_user_group_ids": list(prefixed_external_groups),
+                    "is_public": external_access.is_public,
+                    "last_modified": now,
+                }
+            )
+
+    if changed_doc_values:
+        # bulk UPDATE by primary key, executed as a single executemany
+        db_session.execute(update(DbDocument), changed_doc_values)
+
+    new_doc_ids = [
+        doc_id for doc_id in doc_id_to_external_access if doc_id not in existing_doc_ids
+    ]
+    if new_doc_ids:
+        # If the document does not exist, still store the external access
+        # So that if the document is added later, the external access is already stored
+        # The upsert function in the indexing pipeline does not overwrite the permissions fields
+        insert_stmt = insert(DbDocument).values(
+            [
+                {
+                    "id": doc_id,
+                    "semantic_id": "",
+                    "external_user_emails": list(
+                        doc_id_to_external_access[doc_id].external_user_emails
+                    ),
+                    "external_user_group_ids": list(
+                        doc_id_to_prefixed_external_groups[doc_id]
+                    ),
+                    "is_public": doc_id_to_external_access[doc_id].is_public,
+                }
+                for doc_id in new_doc_ids
+            ]
+        )
+        # a document created by indexing in the meantime still gets the permissions
+        db_session.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["id"],
+                set_={
+                    "external_user_emails": insert_stmt.excluded.external_user_emails,
+                    "external_user_group_ids": insert_stmt.excluded.external_user_group_ids,
+                    "is_public": insert_stmt.excluded.is_public,
+                    "last_modified": now,
+                },
+            )
+        )
+
+    db_session.commit()
+
+    return new_doc_ids, [doc_values["id"] for doc_values in changed_doc_values]
@@ -20,6 +20,7 @@ from onyx.chat.models import LlmDoc
 from onyx.chat.models import LLMRelevanceFilterResponse
 from onyx.chat.models import OnyxAnswerPiece
 from onyx.chat.models import QADocsResponse
+from onyx.chat.models import SearchTimingsResponse
 from onyx.chat.models import StreamingError
 from onyx.chat.process_message import ChatPacketStream
 from onyx.chat.process_message import stream_chat_message_objects
@@ -108,6 +109,8 @@ def _convert_packet_stream_to_response(
             response.llm_chunks_indices = packet.llm_selected_doc_indices
         elif isinstance(packet, FinalUsedContextDocsResponse):
             final_context_docs = packet.final_context_docs
+        elif isinstance(packet, SearchTimingsResponse):
+            response.search_timings = packet.search_timings
         elif isinstance(packet, AllCitations):
             response.cited_documents = {
                 citation.citation_num: citation.document_id
@@ -96,6 +96,8 @@ class ChatBasicResponse(BaseModel):
     final_context_doc_indices: list[int] | None = None
     # this is a map of the citation number to the document id
     cited_documents: dict[int, str] | None = None
+    # Milliseconds spent in each search stage, only set if RETURN_SEARCH_TIMINGS is set
+    search_timings: dict[str, float] | None = None
 
     # FOR BACKWARDS COMPATIBILITY
     # TODO: deprecate both of these
@@ -23,6 +23,7 @@ from onyx.chat.chat_utils import prepare_chat_message_request
 from onyx.chat.models import PersonaOverrideConfig
 from onyx.chat.process_message import ChatPacketStream
 from onyx.chat.process_message import stream_chat_message_objects
+from onyx.configs.chat_configs import RETURN_SEARCH_TIMINGS
 from onyx.configs.onyxbot_configs import MAX_THREAD_CONTEXT_PERCENTAGE
 from onyx.context.search.models import SavedSearchDocWithContent
 from onyx.context.search.models import SearchRequest
@@ -51,6 +52,8 @@ basic_router = APIRouter(prefix="/query")
 class DocumentSearchResponse(BaseModel):
     top_documents: list[SavedSearchDocWithContent]
     llm_indices: list[int]
+    # Milliseconds spent in each search stage, only set if RETURN_SEARCH_TIMINGS is set
+    search_timings: dict[str, float] | None = None
 
 
 @basic_router.post("/document-search")
@@ -131,7 +134,13 @@ def handle_search_request(
             dropped_indices=dropped_inds,
         )
 
-    return DocumentSearchResponse(top_documents=deduped_docs, llm_indices=llm_indices)
+    return DocumentSearchResponse(
+        top_documents=deduped_docs,
+        llm_indices=llm_indices,
+        search_timings=(
+            search_pipeline.timings.as_milliseconds() if RETURN_SEARCH_TIMINGS else None
+        ),
+    )
 
 
 def get_answer_stream(
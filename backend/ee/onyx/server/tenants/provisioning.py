@@ -32,8 +32,8 @@ from onyx.db.llm import upsert_llm_provider
 from onyx.db.models import IndexModelStatus
 from onyx.db.models import SearchSettings
 from onyx.db.models import UserTenantMapping
-from onyx.llm.llm_provider_options import ANTHROPIC_MODEL_NAMES
 from onyx.llm.llm_provider_options import ANTHROPIC_PROVIDER_NAME
+from onyx.llm.llm_provider_options import fetch_models_for_provider
 from onyx.llm.llm_provider_options import OPEN_AI_MODEL_NAMES
 from onyx.llm.llm_provider_options import OPENAI_PROVIDER_NAME
 from onyx.server.manage.embedding.models import CloudEmbeddingProviderCreationRequest
@@ -222,7 +222,7 @@ def configure_default_api_keys(db_session: Session) -> None:
             api_key=ANTHROPIC_DEFAULT_API_KEY,
             default_model_name="claude-3-5-sonnet-20241022",
             fast_default_model_name="claude-3-5-sonnet-20241022",
-            model_names=ANTHROPIC_MODEL_NAMES,
+            model_names=fetch_models_for_provider(ANTHROPIC_PROVIDER_NAME),
         )
         try:
             full_provider = upsert_llm_provider(anthropic_provider, db_session)
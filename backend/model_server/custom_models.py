@@ -7,6 +7,7 @@ from transformers import BatchEncoding  # type: ignore
 from transformers import PreTrainedTokenizer  # type: ignore
 
 from model_server.constants import MODEL_WARM_UP_STRING
+from model_server.onnx_models import use_onnx_for_distilbert_classifier
 from model_server.onyx_torch_model import ConnectorClassifier
 from model_server.onyx_torch_model import HybridClassifier
 from model_server.utils import simple_log_function_time
@@ -71,6 +72,11 @@ def get_local_connector_classifier(
                     f"Failed to load model even after attempted snapshot download: {e}"
                 )
                 raise
+        use_onnx_for_distilbert_classifier(
+            _CONNECTOR_CLASSIFIER_MODEL,
+            model_name_or_path,
+            get_connector_classifier_tokenizer(),
+        )
     return _CONNECTOR_CLASSIFIER_MODEL
 
 
@@ -109,6 +115,9 @@ def get_local_intent_model(
                     f"Failed to load model even after attempted snapshot download: {e}"
                 )
                 raise
+        use_onnx_for_distilbert_classifier(
+            _INTENT_MODEL, model_name_or_path, get_intent_model_tokenizer()
+        )
     return _INTENT_MODEL
 
 
@@ -3,22 +3,12 @@ import json
 from types import TracebackType
 from typing import cast
 from typing import Optional
+from typing import TYPE_CHECKING
 
 import httpx
-import openai
-import vertexai  # type: ignore
-import voyageai  # type: ignore
-from cohere import AsyncClient as CohereAsyncClient
 from fastapi import APIRouter
 from fastapi import HTTPException
-from google.oauth2 import service_account  # type: ignore
-from litellm import aembedding
-from litellm.exceptions import RateLimitError
 from retry import retry
-from sentence_transformers import CrossEncoder  # type: ignore
-from sentence_transformers import SentenceTransformer  # type: ignore
-from vertexai.language_models import TextEmbeddingInput  # type: ignore
-from vertexai.language_models import TextEmbeddingModel  # type: ignore
 
 from model_server.constants import DEFAULT_COHERE_MODEL
 from model_server.constants import DEFAULT_OPENAI_MODEL
@@ -26,6 +16,8 @@ from model_server.constants import DEFAULT_VERTEX_MODEL
 from model_server.constants import DEFAULT_VOYAGE_MODEL
 from model_server.constants import EmbeddingModelTextType
 from model_server.constants import EmbeddingProvider
+from model_server.onnx_models import use_onnx_for_embedding_model
+from model_server.onnx_models import use_onnx_for_reranking_model
 from model_server.utils import simple_log_function_time
 from onyx.utils.logger import setup_logger
 from shared_configs.configs import API_BASED_EMBEDDING_TIMEOUT
@@ -40,6 +32,10 @@ from shared_configs.model_server_models import RerankRequest
 from shared_configs.model_server_models import RerankResponse
 from shared_configs.utils import batch_list
 
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder  # type: ignore
+    from sentence_transformers import SentenceTransformer  # type: ignore
+
 
 logger = setup_logger()
 
@@ -81,6 +77,8 @@ class CloudEmbedding:
         if not model:
             model = DEFAULT_OPENAI_MODEL
 
+        import openai
+
         # Use the OpenAI specific timeout for this one
         client = openai.AsyncOpenAI(
             api_key=self.api_key, timeout=OPENAI_EMBEDDING_TIMEOUT
@@ -110,6 +108,8 @@ class CloudEmbedding:
         if not model:
             model = DEFAULT_COHERE_MODEL
 
+        from cohere import AsyncClient as CohereAsyncClient
+
         client = CohereAsyncClient(api_key=self.api_key)
 
         final_embeddings: list[Embedding] = []
@@ -131,6 +131,8 @@ class CloudEmbedding:
         if not model:
             model = DEFAULT_VOYAGE_MODEL
 
+        import voyageai  # type: ignore
+
         client = voyageai.AsyncClient(
             api_key=self.api_key, timeout=API_BASED_EMBEDDING_TIMEOUT
         )
@@ -147,6 +149,8 @@ class CloudEmbedding:
     async def _embed_azure(
         self, texts: list[str], model: str | None
     ) -> list[Embedding]:
+        from litellm import aembedding
+
         response = await aembedding(
             model=model,
             input=texts,
@@ -164,6 +168,11 @@ class CloudEmbedding:
         if not model:
             model = DEFAULT_VERTEX_MODEL
 
+        import vertexai  # type: ignore
+        from google.oauth2 import service_account  # type: ignore
+        from vertexai.language_models import TextEmbeddingInput  # type: ignore
+        from vertexai.language_models import TextEmbeddingModel  # type: ignore
+
         credentials = service_account.Credentials.from_service_account_info(
             json.loads(self.api_key)
         )
@@ -288,6 +297,7 @@ def get_embedding_model(
             trust_remote_code=True,
         )
         model.max_seq_length = max_context_length
+        use_onnx_for_embedding_model(model, model_name)
         _GLOBAL_MODELS_DICT[model_name] = model
     elif max_context_length != _GLOBAL_MODELS_DICT[model_name].max_seq_length:
         _GLOBAL_MODELS_DICT[model_name].max_seq_length = max_context_length
@@ -297,11 +307,14 @@ def get_embedding_model(
 
 def get_local_reranking_model(
     model_name: str,
-) -> CrossEncoder:
+) -> "CrossEncoder":
+    from sentence_transformers import CrossEncoder  # type: ignore
+
     global _RERANK_MODEL
     if _RERANK_MODEL is None:
         logger.notice(f"Loading {model_name}")
         model = CrossEncoder(model_name)
+        use_onnx_for_reranking_model(model, model_name)
         _RERANK_MODEL = model
     return _RERANK_MODEL
 
@@ -405,6 +418,8 @@ async def local_rerank(query: str, docs: list[str], model_name: str) -> list[flo
 async def cohere_rerank(
     query: str, docs: list[str], model_name: str, api_key: str
 ) -> list[float]:
+    from cohere import AsyncClient as CohereAsyncClient
+
     cohere_client = CohereAsyncClient(api_key=api_key)
     response = await cohere_client.rerank(query=query, documents=docs, model=model_name)
     results = response.results
@@ -443,6 +458,8 @@ async def process_embed_request(
     elif not all(embed_request.texts):
         raise ValueError("Empty strings are not allowed for embedding.")
 
+    from litellm.exceptions import RateLimitError
+
     try:
         if embed_request.text_type == EmbedTextType.QUERY:
             prefix = embed_request.manual_query_prefix
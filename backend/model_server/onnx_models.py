@@ -0,0 +1,249 @@
+"""Optional ONNX Runtime backend for the local models, selected per model via ONNX_MODELS.
+
+Only the transformer of each model is exported (for cross-encoders the full sequence
+classification model), tokenization, pooling and the classifier heads keep running in
+PyTorch. The ONNX module replaces the PyTorch one in place so the callers don't change."""
+import os
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+import torch
+from sentence_transformers import CrossEncoder  # type: ignore
+from sentence_transformers import SentenceTransformer  # type: ignore
+from sentence_transformers.models import Transformer  # type: ignore
+from torch import nn
+from transformers import PreTrainedTokenizerBase  # type: ignore
+from transformers.modeling_outputs import BaseModelOutput  # type: ignore
+from transformers.modeling_outputs import ModelOutput
+from transformers.modeling_outputs import SequenceClassifierOutput
+
+from model_server.constants import MODEL_WARM_UP_STRING
+from onyx.utils.logger import setup_logger
+from shared_configs.configs import ONNX_MODEL_CACHE_DIR
+from shared_configs.configs import ONNX_MODELS
+
+logger = setup_logger()
+
+# Relative L2 error allowed between the PyTorch and ONNX outputs of the warm up batch
+_MAX_RELATIVE_ERROR = 1e-3
+_INT8_MAX_RELATIVE_ERROR = 0.1
+
+_SAMPLE_BATCH_SIZE = 8
+_BENCHMARK_RUNS = 3
+_ONNX_OPSET_VERSION = 14
+
+
+class _ExportWrapper(nn.Module):
+    """torch.onnx.export passes inputs positionally, only the first output is exported."""
+
+    def __init__(self, model: nn.Module, input_names: list[str]) -> None:
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs: torch.Tensor) -> torch.Tensor:
+        return self.model(**dict(zip(self.input_names, inputs)))[0]
+
+
+class OnnxModule(nn.Module):
+    def __init__(
+        self,
+        session: Any,
+        config: Any,
+        wrap_output: Callable[[torch.Tensor], ModelOutput],
+    ) -> None:
+        super().__init__()
+        self.session = session
+        self.config = config
+        self.wrap_output = wrap_output
+        self.input_names = [model_input.name for model_input in session.get_inputs()]
+        # SentenceTransformer.device fails if none of its modules hold any tensor
+        self.device_anchor = nn.Parameter(torch.zeros(0), requires_grad=False)
+
+    def forward(self, **inputs: Any) -> ModelOutput:
+        (output,) = self.session.run(
+            None, {name: inputs[name].cpu().numpy() for name in self.input_names}
+        )
+        return self.wrap_output(torch.from_numpy(output))
+
+
+def _model_path(model_name: str, component: str, quantize: bool) -> str:
+    model_dir = re.sub(r"[^A-Za-z0-9_.-]", "_", model_name)
+    file_name = f"{component}.int8.onnx" if quantize else f"{component}.onnx"
+    return os.path.join(ONNX_MODEL_CACHE_DIR, model_dir, file_name)
+
+
+def _build_session(
+    model: nn.Module,
+    model_name: str,
+    component: str,
+    sample_inputs: dict[str, torch.Tensor],
+    quantize: bool,
+) -> Any:
+    import onnxruntime  # type: ignore
+
+    fp32_path = _model_path(model_name, component, quantize=False)
+    if not os.path.exists(fp32_path):
+        logger.notice(f"Exporting {model_name} {component} to ONNX")
+        os.makedirs(os.path.dirname(fp32_path), exist_ok=True)
+        input_names = list(sample_inputs)
+        # The export restores the wrapper's train/eval mode (recursively) when done
+        torch.onnx.export(
+            _ExportWrapper(model, input_names).eval(),
+            tuple(sample_inputs[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["output"],
+            dynamic_axes={
+                **{name: {0: "batch", 1: "sequence"} for name in input_names},
+                "output": {0: "batch"},
+            },
+            opset_version=_ONNX_OPSET_VERSION,
+        )
+
+    model_path = fp32_path
+    if quantize:
+        model_path = _model_path(model_name, component, quantize=True)
+        if not os.path.exists(model_path):
+            from onnxruntime.quantization import quantize_dynamic  # type: ignore
+            from onnxruntime.quantization import QuantType
+
+            logger.notice(f"Quantizing {model_name} {component} to int8")
+            quantize_dynamic(fp32_path, model_path, weight_type=QuantType.QInt8)
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = torch.get_num_threads()
+    return onnxruntime.InferenceSession(
+        model_path, session_options, providers=["CPUExecutionProvider"]
+    )
+
+
+def _time_model(model: nn.Module, sample_inputs: dict[str, torch.Tensor]) -> float:
+    start = time.monotonic()
+    with torch.no_grad():
+        for _ in range(_BENCHMARK_RUNS):
+            model(**sample_inputs)
+    return (time.monotonic() - start) / _BENCHMARK_RUNS
+
+
+def to_onnx_module(
+    model: nn.Module,
+    model_name: str,
+    component: str,
+    sample_inputs: dict[str, torch.Tensor],
+    wrap_output: Callable[[torch.Tensor], ModelOutput],
+) -> nn.Module:
+    """Returns the ONNX Runtime replacement of `model` if `model_name` is in ONNX_MODELS.
+    The original model is returned if it is not, if the export fails or if the outputs
+    for the sample inputs are further from PyTorch than the tolerance."""
+    if model_name not in ONNX_MODELS:
+        return model
+
+    if torch.cuda.is_available() or torch.backends.mps.is_available():
+        logger.notice(f"GPU available, not using ONNX Runtime for {model_name}")
+        return model
+
+    quantize = ONNX_MODELS[model_name]
+    try:
+        onnx_module = OnnxModule(
+            session=_build_session(
+                model, model_name, component, sample_inputs, quantize
+            ),
+            config=getattr(model, "config", None),
+            wrap_output=wrap_output,
+        )
+        with torch.no_grad():
+            expected = model(**sample_inputs)[0]
+        actual = onnx_module(**sample_inputs)[0]
+        relative_error = (
+            torch.linalg.norm(expected - actual)
+            / torch.linalg.norm(expected).clamp(min=1e-12)
+        ).item()
+    except Exception:
+        logger.exception(f"Failed to load {model_name} {component} with ONNX Runtime")
+        return model
+
+    max_relative_error = _INT8_MAX_RELATIVE_ERROR if quantize else _MAX_RELATIVE_ERROR
+    if relative_error > max_relative_error:
+        logger.warning(
+            f"ONNX output of {model_name} {component} differs from PyTorch by "
+            f"{relative_error:.2e} (max {max_relative_error:.0e}), using PyTorch"
+        )
+        return model
+
+    torch_seconds = _time_model(model, sample_inputs)
+    onnx_seconds = _time_model(onnx_module, sample_inputs)
+    logger.notice(
+        f"Using ONNX Runtime{' int8' if quantize else ''} for {model_name} "
+        f"{component}: relative error {relative_error:.2e}, warm up batch "
+        f"{onnx_seconds * 1000:.0f}ms vs {torch_seconds * 1000:.0f}ms with PyTorch"
+    )
+    return onnx_module
+
+
+def use_onnx_for_embedding_model(model: SentenceTransformer, model_name: str) -> None:
+    transformer = model[0]
+    if model_name not in ONNX_MODELS or not isinstance(transformer, Transformer):
+        return
+
+    features = transformer.tokenize([MODEL_WARM_UP_STRING] * _SAMPLE_BATCH_SIZE)
+    transformer.auto_model = to_onnx_module(
+        transformer.auto_model,
+        model_name=model_name,
+        component="transformer",
+        # Same inputs as sentence_transformers.models.Transformer.forward passes
+        sample_inputs={
+            name: features[name]
+            for name in ["input_ids", "attention_mask", "token_type_ids"]
+            if name in features
+        },
+        wrap_output=lambda output: BaseModelOutput(last_hidden_state=output),
+    )
+
+
+def use_onnx_for_reranking_model(model: CrossEncoder, model_name: str) -> None:
+    if model_name not in ONNX_MODELS:
+        return
+
+    features = model.tokenizer(
+        [MODEL_WARM_UP_STRING] * _SAMPLE_BATCH_SIZE,
+        [MODEL_WARM_UP_STRING] * _SAMPLE_BATCH_SIZE,
+        padding=True,
+        truncation="longest_first",
+        return_tensors="pt",
+        max_length=model.max_length,
+    )
+    model.model = to_onnx_module(
+        model.model,
+        model_name=model_name,
+        component="cross_encoder",
+        sample_inputs=dict(features),
+        wrap_output=lambda output: SequenceClassifierOutput(logits=output),
+    )
+
+
+def use_onnx_for_distilbert_classifier(
+    model: nn.Module, model_name: str, tokenizer: PreTrainedTokenizerBase
+) -> None:
+    """For the Onyx custom models which run their heads on top of `model.distilbert`."""
+    if model_name not in ONNX_MODELS:
+        return
+
+    features = tokenizer(
+        [MODEL_WARM_UP_STRING] * _SAMPLE_BATCH_SIZE,
+        return_tensors="pt",
+        truncation=True,
+        padding=True,
+    )
+    model.distilbert = to_onnx_module(
+        model.distilbert,
+        model_name=model_name,
+        component="distilbert",
+        sample_inputs={
+            "input_ids": features["input_ids"],
+            "attention_mask": features["attention_mask"],
+        },
+        wrap_output=lambda output: BaseModelOutput(last_hidden_state=output),
+    )
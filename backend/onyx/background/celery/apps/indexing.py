@@ -11,6 +11,7 @@ from celery.signals import worker_ready
 from celery.signals import worker_shutdown
 
 import onyx.background.celery.apps.app_base as app_base
+from onyx.background.celery.tasks.indexing.tasks import start_warm_indexing_processes
 from onyx.configs.constants import POSTGRES_CELERY_WORKER_INDEXING_APP_NAME
 from onyx.db.engine import SqlEngine
 from onyx.utils.logger import setup_logger
@@ -66,6 +67,8 @@ def on_worker_init(sender: Any, **kwargs: Any) -> None:
     app_base.wait_for_db(sender, **kwargs)
     app_base.wait_for_vespa(sender, **kwargs)
 
+    start_warm_indexing_processes()
+
     # Less startup checks in multi-tenant case
     if MULTI_TENANT:
         return
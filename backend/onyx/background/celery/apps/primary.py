@@ -34,6 +34,8 @@ from onyx.redis.redis_connector_index import RedisConnectorIndex
 from onyx.redis.redis_connector_prune import RedisConnectorPrune
 from onyx.redis.redis_connector_stop import RedisConnectorStop
 from onyx.redis.redis_document_set import RedisDocumentSet
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+from onyx.redis.redis_indexing_schedule import RedisIndexingSchedule
 from onyx.redis.redis_pool import get_redis_client
 from onyx.redis.redis_usergroup import RedisUserGroup
 from onyx.utils.logger import setup_logger
@@ -154,12 +156,16 @@ def on_worker_init(sender: Any, **kwargs: Any) -> None:
 
     RedisConnectorIndex.reset_all(r)
 
+    RedisIndexingSchedule.reset_all(r)
+
     RedisConnectorStop.reset_all(r)
 
     RedisConnectorPermissionSync.reset_all(r)
 
     RedisConnectorExternalGroupSync.reset_all(r)
 
+    RedisFenceRegistry.reset_all(r)
+
     # mark orphaned index attempts as failed
     with get_session_with_default_tenant() as db_session:
         unfenced_attempt_ids = get_unfenced_index_attempt_ids(db_session, r)
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from datetime import datetime
 from datetime import timezone
 from typing import Any
@@ -76,51 +77,56 @@ def document_batch_to_ids(
     return {doc.id for doc in doc_batch}
 
 
-def extract_ids_from_runnable_connector(
+def iterate_ids_from_runnable_connector(
     runnable_connector: BaseConnector,
     callback: IndexingHeartbeatInterface | None = None,
-) -> set[str]:
+) -> Iterator[list[str]]:
     """
-    If the SlimConnector hasnt been implemented for the given connector, just pull
-    all docs using the load_from_state and grab out the IDs.
+    Yields the IDs of all documents in the source, one batch at a time. Only the slim
+    retrieval is used if the connector implements it, otherwise all docs are pulled
+    using load_from_state / poll_source and the IDs are grabbed out.
 
     Optionally, a callback can be passed to handle the length of each document batch.
     """
-    all_connector_doc_ids: set[str] = set()
-
+    doc_id_batch_generator: Iterator[list[str]]
     if isinstance(runnable_connector, SlimConnector):
-        for metadata_batch in runnable_connector.retrieve_all_slim_documents():
-            all_connector_doc_ids.update({doc.id for doc in metadata_batch})
-
-    doc_batch_generator = None
-
-    if isinstance(runnable_connector, LoadConnector):
-        doc_batch_generator = runnable_connector.load_from_state()
-    elif isinstance(runnable_connector, PollConnector):
-        start = datetime(1970, 1, 1, tzinfo=timezone.utc).timestamp()
-        end = datetime.now(timezone.utc).timestamp()
-        doc_batch_generator = runnable_connector.poll_source(start=start, end=end)
+        doc_id_batch_generator = (
+            [doc.id for doc in metadata_batch]
+            for metadata_batch in runnable_connector.retrieve_all_slim_documents()
+        )
     else:
-        raise RuntimeError("Pruning job could not find a valid runnable_connector.")
-
-    doc_batch_processing_func = document_batch_to_ids
-    if MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE:
-        doc_batch_processing_func = rate_limit_builder(
-            max_calls=MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE, period=60
-        )(document_batch_to_ids)
-    for doc_batch in doc_batch_generator:
+        doc_batch_generator = None
+
+        if isinstance(runnable_connector, LoadConnector):
+            doc_batch_generator = runnable_connector.load_from_state()
+        elif isinstance(runnable_connector, PollConnector):
+            start = datetime(1970, 1, 1, tzinfo=timezone.utc).timestamp()
+            end = datetime.now(timezone.utc).timestamp()
+            doc_batch_generator = runnable_connector.poll_source(start=start, end=end)
+        else:
+            raise RuntimeError("Pruning job could not find a valid runnable_connector.")
+
+        doc_batch_processing_func = document_batch_to_ids
+        if MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE:
+            doc_batch_processing_func = rate_limit_builder(
+                max_calls=MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE, period=60
+            )(document_batch_to_ids)
+        doc_id_batch_generator = (
+            list(doc_batch_processing_func(doc_batch))
+            for doc_batch in doc_batch_generator
+        )
+
+    for doc_id_batch in doc_id_batch_generator:
         if callback:
             if callback.should_stop():
                 raise RuntimeError(
-                    "extract_ids_from_runnable_connector: Stop signal detected"
+                    "iterate_ids_from_runnable_connector: Stop signal detected"
                 )
 
-        all_connector_doc_ids.update(doc_batch_processing_func(doc_batch))
+        yield doc_id_batch
 
         if callback:
-            callback.progress("extract_ids_from_runnable_connector", len(doc_batch))
-
-    return all_connector_doc_ids
+            callback.progress("iterate_ids_from_runnable_connector", len(doc_id_batch))
 
 
 def celery_is_listening_to_queue(worker: Any, name: str) -> bool:
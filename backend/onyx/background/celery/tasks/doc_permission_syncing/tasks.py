@@ -9,13 +9,17 @@ from celery import Task
 from celery.exceptions import SoftTimeLimitExceeded
 from redis import Redis
 from redis.lock import Lock as RedisLock
+from sqlalchemy.orm import Session
 
 from ee.onyx.db.connector_credential_pair import get_all_auto_sync_cc_pairs
 from ee.onyx.db.document import upsert_document_external_perms
+from ee.onyx.db.document import upsert_document_external_perms_batch
 from ee.onyx.external_permissions.sync_params import DOC_PERMISSION_SYNC_PERIODS
 from ee.onyx.external_permissions.sync_params import DOC_PERMISSIONS_FUNC_MAP
+from onyx.access.access import get_access_for_documents
 from onyx.access.models import DocExternalAccess
 from onyx.background.celery.apps.app_base import task_logger
+from onyx.background.celery.tasks.shared.RetryDocumentIndex import RetryDocumentIndex
 from onyx.configs.app_configs import JOB_TIMEOUT
 from onyx.configs.constants import CELERY_PERMISSIONS_SYNC_LOCK_TIMEOUT
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
@@ -25,13 +29,20 @@ from onyx.configs.constants import OnyxCeleryPriority
 from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisLocks
+from onyx.context.search.retrieval_cache import bump_index_generation
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
+from onyx.db.document import get_documents_by_ids
+from onyx.db.document import mark_documents_as_synced
 from onyx.db.document import upsert_document_by_connector_credential_pair
+from onyx.db.document_set import fetch_document_sets_for_documents
 from onyx.db.engine import get_session_with_tenant
 from onyx.db.enums import AccessType
 from onyx.db.enums import ConnectorCredentialPairStatus
 from onyx.db.models import ConnectorCredentialPair
 from onyx.db.users import batch_add_ext_perm_user_if_not_exists
+from onyx.document_index.document_index_utils import get_both_index_names
+from onyx.document_index.factory import get_default_document_index
+from onyx.document_index.interfaces import UpdateRequest
 from onyx.redis.redis_connector import RedisConnector
 from onyx.redis.redis_connector_doc_perm_sync import (
     RedisConnectorPermissionSyncPayload,
@@ -50,6 +61,10 @@ DOCUMENT_PERMISSIONS_UPDATE_MAX_RETRIES = 3
 LIGHT_SOFT_TIME_LIMIT = 105
 LIGHT_TIME_LIMIT = LIGHT_SOFT_TIME_LIMIT + 15
 
+# a batch task does the work of many light tasks, with a vespa update per group of docs
+BATCH_SOFT_TIME_LIMIT = LIGHT_SOFT_TIME_LIMIT * 3
+BATCH_TIME_LIMIT = BATCH_SOFT_TIME_LIMIT + 15
+
 
 def _is_external_doc_permissions_sync_due(cc_pair: ConnectorCredentialPair) -> bool:
     """Returns boolean indicating if external doc permissions sync is due."""
@@ -343,3 +358,160 @@ def update_external_document_permissions_task(
     except Exception:
         logger.exception("Error Syncing Document Permissions")
         return False
+
+
+@shared_task(
+    name=OnyxCeleryTask.UPDATE_EXTERNAL_DOCUMENT_PERMISSIONS_BATCH_TASK,
+    soft_time_limit=BATCH_SOFT_TIME_LIMIT,
+    time_limit=BATCH_TIME_LIMIT,
+    max_retries=DOCUMENT_PERMISSIONS_UPDATE_MAX_RETRIES,
+    bind=True,
+)
+def update_external_document_permissions_batch_task(
+    self: Task,
+    tenant_id: str | None,
+    serialized_doc_external_accesses: list[dict],
+    source_string: str,
+    connector_id: int,
+    credential_id: int,
+) -> bool:
+    """Applies the external permissions of a batch of documents with set based upserts
+    and then syncs the documents whose permissions changed to vespa in bulk"""
+    document_external_accesses = [
+        DocExternalAccess.from_dict(serialized_doc_external_access)
+        for serialized_doc_external_access in serialized_doc_external_accesses
+    ]
+    try:
+        with get_session_with_tenant(tenant_id) as db_session:
+            # Add the users to the DB if they don't exist
+            batch_add_ext_perm_user_if_not_exists(
+                db_session=db_session,
+                emails=list(
+                    set().union(
+                        *(
+                            doc_external_access.external_access.external_user_emails
+                            for doc_external_access in document_external_accesses
+                        )
+                    )
+                ),
+            )
+            # Then we upsert the documents' external permissions in postgres
+            created_doc_ids, changed_doc_ids = upsert_document_external_perms_batch(
+                db_session=db_session,
+                doc_external_accesses=document_external_accesses,
+                source_type=DocumentSource(source_string),
+            )
+
+            if created_doc_ids:
+                # If new documents were created, we associate them with the cc_pair
+                upsert_document_by_connector_credential_pair(
+                    db_session=db_session,
+                    connector_id=connector_id,
+                    credential_id=credential_id,
+                    document_ids=created_doc_ids,
+                )
+
+            logger.debug(
+                f"Successfully synced postgres document permissions: "
+                f"docs={len(document_external_accesses)} "
+                f"created={len(created_doc_ids)} changed={len(changed_doc_ids)}"
+            )
+
+            # The created documents are not in vespa yet, they get their permissions
+            # when they are indexed
+            if changed_doc_ids:
+                _sync_documents_to_vespa(changed_doc_ids, tenant_id, db_session)
+        return True
+    except SoftTimeLimitExceeded:
+        task_logger.info(
+            f"SoftTimeLimitExceeded exception. docs={len(document_external_accesses)}"
+        )
+        return False
+    except Exception:
+        logger.exception("Error Syncing Document Permissions")
+        return False
+
+
+def _sync_documents_to_vespa(
+    document_ids: list[str], tenant_id: str | None, db_session: Session
+) -> None:
+    """Does what vespa_metadata_sync_task does for each document, but with one update per
+    group of documents that share the same fields. A failure only logs, the documents
+    are still out of sync and are picked up by the regular vespa sync."""
+    # taken before anything is read, so that a change made during the sync
+    # still leaves the document marked as needing a sync
+    synced_at = datetime.now(timezone.utc)
+
+    try:
+        curr_ind_name, sec_ind_name = get_both_index_names(db_session)
+        doc_index = get_default_document_index(
+            primary_index_name=curr_ind_name, secondary_index_name=sec_ind_name
+        )
+        retry_index = RetryDocumentIndex(doc_index)
+
+        documents = get_documents_by_ids(
+            db_session=db_session, document_ids=document_ids
+        )
+        document_id_to_access = get_access_for_documents(
+            document_ids=document_ids, db_session=db_session
+        )
+        document_id_to_document_sets = {
+            document_id: set(document_sets)
+            for document_id, document_sets in fetch_document_sets_for_documents(
+                document_ids=document_ids, db_session=db_session
+            )
+        }
+
+        # documents with the same fields are updated by a single request
+        grouped_requests: dict[tuple, UpdateRequest] = {}
+        for document in documents:
+            access = document_id_to_access.get(document.id)
+            if access is None:
+                continue
+
+            document_sets = document_id_to_document_sets.get(document.id, set())
+            group_key = (
+                frozenset(access.to_acl()),
+                frozenset(document_sets),
+                document.boost,
+                document.hidden,
+            )
+            if group_key in grouped_requests:
+                grouped_requests[group_key].document_ids.append(document.id)
+                continue
+
+            grouped_requests[group_key] = UpdateRequest(
+                document_ids=[document.id],
+                access=access,
+                document_sets=document_sets,
+                boost=document.boost,
+                hidden=document.hidden,
+            )
+
+        if not grouped_requests:
+            return
+
+        # update Vespa. OK if a doc doesn't exist. Raises exception otherwise.
+        retry_index.update(list(grouped_requests.values()))
+        bump_index_generation(tenant_id)
+
+        # update db last. Worst case = we crash right before this and
+        # the sync might repeat again later
+        synced_doc_ids = [
+            document_id
+            for update_request in grouped_requests.values()
+            for document_id in update_request.document_ids
+        ]
+        mark_documents_as_synced(synced_doc_ids, synced_at, db_session)
+
+        task_logger.info(
+            f"Synced document permissions to vespa: "
+            f"docs={len(synced_doc_ids)} requests={len(grouped_requests)}"
+        )
+    except SoftTimeLimitExceeded:
+        raise
+    except Exception:
+        task_logger.exception(
+            f"Failed to sync document permissions to vespa, "
+            f"leaving them to the vespa sync: docs={len(document_ids)}"
+        )
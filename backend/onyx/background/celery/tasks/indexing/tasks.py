@@ -19,8 +19,14 @@ from sqlalchemy.orm import Session
 from onyx.background.celery.apps.app_base import task_logger
 from onyx.background.celery.celery_redis import celery_find_task
 from onyx.background.indexing.job_client import SimpleJobClient
+from onyx.background.indexing.job_client import WarmJobClient
 from onyx.background.indexing.run_indexing import run_indexing_entrypoint
+from onyx.background.indexing.run_indexing import run_indexing_shards_entrypoint
+from onyx.configs.app_configs import CELERY_WORKER_INDEXING_CONCURRENCY
 from onyx.configs.app_configs import DISABLE_INDEX_UPDATE_ON_SWAP
+from onyx.configs.app_configs import INDEXING_SCHEDULE_REBUILD_INTERVAL
+from onyx.configs.app_configs import INDEXING_WORKER_MAX_JOBS
+from onyx.configs.app_configs import INDEXING_WORKER_MAX_RSS_MB
 from onyx.configs.constants import CELERY_INDEXING_LOCK_TIMEOUT
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import DANSWER_REDIS_FUNCTION_LOCK_PREFIX
@@ -30,7 +36,7 @@ from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisLocks
 from onyx.db.connector import mark_ccpair_with_indexing_trigger
-from onyx.db.connector_credential_pair import fetch_connector_credential_pairs
+from onyx.db.connector_credential_pair import fetch_connector_credential_pair_ids
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
 from onyx.db.engine import get_db_current_time
 from onyx.db.engine import get_session_with_tenant
@@ -57,6 +63,8 @@ from onyx.natural_language_processing.search_nlp_models import warm_up_bi_encode
 from onyx.redis.redis_connector import RedisConnector
 from onyx.redis.redis_connector_index import RedisConnectorIndex
 from onyx.redis.redis_connector_index import RedisConnectorIndexPayload
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+from onyx.redis.redis_indexing_schedule import RedisIndexingSchedule
 from onyx.redis.redis_pool import get_redis_client
 from onyx.utils.logger import setup_logger
 from onyx.utils.variable_functionality import global_version
@@ -68,6 +76,38 @@ from shared_configs.configs import SENTRY_DSN
 logger = setup_logger()
 
 
+_warm_job_client: WarmJobClient | None = None
+
+
+def _warm_up_indexing_process() -> None:
+    """Runs first in every warm indexing process. Unpickling it imports this module, and
+    with it the connectors, the indexing pipeline and the NLP libraries."""
+    logger.info("Warm indexing process ready.")
+
+
+def get_indexing_job_client() -> SimpleJobClient | WarmJobClient:
+    """The warm process pool is shared by all the tasks of this celery worker"""
+    global _warm_job_client
+
+    if not INDEXING_WORKER_MAX_JOBS:
+        return SimpleJobClient()
+
+    if _warm_job_client is None:
+        _warm_job_client = WarmJobClient(
+            n_workers=CELERY_WORKER_INDEXING_CONCURRENCY,
+            max_jobs_per_worker=INDEXING_WORKER_MAX_JOBS,
+            max_rss_mb=INDEXING_WORKER_MAX_RSS_MB,
+            warm_up=_warm_up_indexing_process,
+        )
+    return _warm_job_client
+
+
+def start_warm_indexing_processes() -> None:
+    client = get_indexing_job_client()
+    if isinstance(client, WarmJobClient):
+        client.start()
+
+
 class IndexingCallback(IndexingHeartbeatInterface):
     def __init__(
         self,
@@ -111,6 +151,30 @@ class IndexingCallback(IndexingHeartbeatInterface):
         self.redis_client.incrby(self.generator_progress_key, amount)
 
 
+class IndexingShardCallback(IndexingHeartbeatInterface):
+    """For the helpers indexing the shards of a poll window. They do not hold the
+    indexing lock, the indexing task keeps it alive while it waits for them."""
+
+    def __init__(
+        self,
+        stop_key: str,
+        generator_progress_key: str,
+        redis_client: Redis,
+    ):
+        super().__init__()
+        self.stop_key: str = stop_key
+        self.generator_progress_key: str = generator_progress_key
+        self.redis_client = redis_client
+
+    def should_stop(self) -> bool:
+        if self.redis_client.exists(self.stop_key):
+            return True
+        return False
+
+    def progress(self, tag: str, amount: int) -> None:
+        self.redis_client.incrby(self.generator_progress_key, amount)
+
+
 def get_unfenced_index_attempt_ids(db_session: Session, r: redis.Redis) -> list[int]:
     """Gets a list of unfenced index attempts. Should not be possible, so we'd typically
     want to clean them up.
@@ -208,91 +272,110 @@ def check_for_indexing(self: Task, *, tenant_id: str | None) -> int | None:
                         embedding_model=embedding_model,
                     )
 
-        # gather cc_pair_ids
-        cc_pair_ids: list[int] = []
+        indexing_schedule = RedisIndexingSchedule(tenant_id, redis_client)
+
+        # gather the cc_pair / search settings combinations due for an indexing check
         with get_session_with_tenant(tenant_id) as db_session:
             lock_beat.reacquire()
-            cc_pairs = fetch_connector_credential_pairs(db_session)
-            for cc_pair_entry in cc_pairs:
-                cc_pair_ids.append(cc_pair_entry.id)
+            search_settings_list: list[SearchSettings] = get_active_search_settings(
+                db_session
+            )
+            due_checks = _get_due_indexing_checks(
+                indexing_schedule, search_settings_list, db_session
+            )
+
+        search_settings_by_id = {
+            search_settings_instance.id: search_settings_instance
+            for search_settings_instance in search_settings_list
+        }
 
         # kick off index attempts
-        for cc_pair_id in cc_pair_ids:
+        for cc_pair_id, search_settings_id in due_checks:
             lock_beat.reacquire()
 
-            redis_connector = RedisConnector(tenant_id, cc_pair_id)
-            with get_session_with_tenant(tenant_id) as db_session:
-                search_settings_list: list[SearchSettings] = get_active_search_settings(
-                    db_session
-                )
-                for search_settings_instance in search_settings_list:
-                    redis_connector_index = redis_connector.new_index(
-                        search_settings_instance.id
-                    )
-                    if redis_connector_index.fenced:
-                        continue
+            search_settings_instance = search_settings_by_id.get(search_settings_id)
+            if not search_settings_instance:
+                indexing_schedule.remove(cc_pair_id, search_settings_id)
+                continue
 
-                    cc_pair = get_connector_credential_pair_from_id(
-                        cc_pair_id, db_session
-                    )
-                    if not cc_pair:
-                        continue
+            redis_connector = RedisConnector(tenant_id, cc_pair_id)
+            redis_connector_index = redis_connector.new_index(search_settings_id)
+            if redis_connector_index.fenced:
+                # left due, so it is checked again right after the attempt ends
+                continue
 
-                    last_attempt = get_last_attempt_for_cc_pair(
-                        cc_pair.id, search_settings_instance.id, db_session
-                    )
+            with get_session_with_tenant(tenant_id) as db_session:
+                cc_pair = get_connector_credential_pair_from_id(cc_pair_id, db_session)
+                if not cc_pair:
+                    indexing_schedule.remove(cc_pair_id, search_settings_id)
+                    continue
 
-                    search_settings_primary = False
-                    if search_settings_instance.id == search_settings_list[0].id:
-                        search_settings_primary = True
+                last_attempt = get_last_attempt_for_cc_pair(
+                    cc_pair.id, search_settings_instance.id, db_session
+                )
 
-                    if not _should_index(
+                search_settings_primary = False
+                if search_settings_instance.id == search_settings_list[0].id:
+                    search_settings_primary = True
+
+                if not _should_index(
+                    cc_pair=cc_pair,
+                    last_index=last_attempt,
+                    search_settings_instance=search_settings_instance,
+                    search_settings_primary=search_settings_primary,
+                    secondary_index_building=len(search_settings_list) > 1,
+                    db_session=db_session,
+                ):
+                    next_check = _get_next_indexing_check_time(
                         cc_pair=cc_pair,
                         last_index=last_attempt,
                         search_settings_instance=search_settings_instance,
-                        search_settings_primary=search_settings_primary,
                         secondary_index_building=len(search_settings_list) > 1,
                         db_session=db_session,
-                    ):
-                        continue
-
-                    reindex = False
-                    if search_settings_instance.id == search_settings_list[0].id:
-                        # the indexing trigger is only checked and cleared with the primary search settings
-                        if cc_pair.indexing_trigger is not None:
-                            if cc_pair.indexing_trigger == IndexingMode.REINDEX:
-                                reindex = True
-
-                            task_logger.info(
-                                f"Connector indexing manual trigger detected: "
-                                f"cc_pair={cc_pair.id} "
-                                f"search_settings={search_settings_instance.id} "
-                                f"indexing_mode={cc_pair.indexing_trigger}"
-                            )
-
-                            mark_ccpair_with_indexing_trigger(
-                                cc_pair.id, None, db_session
-                            )
-
-                    # using a task queue and only allowing one task per cc_pair/search_setting
-                    # prevents us from starving out certain attempts
-                    attempt_id = try_creating_indexing_task(
-                        self.app,
-                        cc_pair,
-                        search_settings_instance,
-                        reindex,
-                        db_session,
-                        redis_client,
-                        tenant_id,
                     )
-                    if attempt_id:
+                    if next_check is None:
+                        indexing_schedule.remove(cc_pair_id, search_settings_id)
+                    else:
+                        indexing_schedule.set_next_check(
+                            cc_pair_id, search_settings_id, next_check
+                        )
+                    continue
+
+                reindex = False
+                if search_settings_instance.id == search_settings_list[0].id:
+                    # the indexing trigger is only checked and cleared with the primary search settings
+                    if cc_pair.indexing_trigger is not None:
+                        if cc_pair.indexing_trigger == IndexingMode.REINDEX:
+                            reindex = True
+
                         task_logger.info(
-                            f"Connector indexing queued: "
-                            f"index_attempt={attempt_id} "
+                            f"Connector indexing manual trigger detected: "
                             f"cc_pair={cc_pair.id} "
-                            f"search_settings={search_settings_instance.id}"
+                            f"search_settings={search_settings_instance.id} "
+                            f"indexing_mode={cc_pair.indexing_trigger}"
                         )
-                        tasks_created += 1
+
+                        mark_ccpair_with_indexing_trigger(cc_pair.id, None, db_session)
+
+                # using a task queue and only allowing one task per cc_pair/search_setting
+                # prevents us from starving out certain attempts
+                attempt_id = try_creating_indexing_task(
+                    self.app,
+                    cc_pair,
+                    search_settings_instance,
+                    reindex,
+                    db_session,
+                    redis_client,
+                    tenant_id,
+                )
+                if attempt_id:
+                    task_logger.info(
+                        f"Connector indexing queued: "
+                        f"index_attempt={attempt_id} "
+                        f"cc_pair={cc_pair.id} "
+                        f"search_settings={search_settings_instance.id}"
+                    )
+                    tasks_created += 1
 
         # Fail any index attempts in the DB that don't have fences
         # This shouldn't ever happen!
@@ -357,6 +440,79 @@ def check_for_indexing(self: Task, *, tenant_id: str | None) -> int | None:
     return tasks_created
 
 
+def _get_due_indexing_checks(
+    indexing_schedule: RedisIndexingSchedule,
+    search_settings_list: list[SearchSettings],
+    db_session: Session,
+) -> list[tuple[int, int]]:
+    """Brings the indexing schedule up to date with new and changed cc_pairs and
+    returns the (cc_pair_id, search_settings_id) combinations due for a check"""
+    search_settings_ids = [
+        search_settings_instance.id for search_settings_instance in search_settings_list
+    ]
+
+    if indexing_schedule.needs_rebuild(search_settings_ids):
+        cc_pair_ids = fetch_connector_credential_pair_ids(db_session)
+        indexing_schedule.rebuild(
+            cc_pair_ids, search_settings_ids, INDEXING_SCHEDULE_REBUILD_INTERVAL
+        )
+        task_logger.info(f"Indexing schedule rebuilt: cc_pairs={len(cc_pair_ids)}")
+    else:
+        new_cc_pair_ids = fetch_connector_credential_pair_ids(
+            db_session, min_id=indexing_schedule.get_last_cc_pair_id()
+        )
+        if new_cc_pair_ids:
+            indexing_schedule.mark_cc_pairs_due(new_cc_pair_ids, search_settings_ids)
+            indexing_schedule.set_last_cc_pair_id(new_cc_pair_ids[-1])
+
+        indexing_schedule.mark_cc_pairs_due(
+            indexing_schedule.pop_dirty_cc_pair_ids(), search_settings_ids
+        )
+
+    return indexing_schedule.get_due()
+
+
+def _get_next_indexing_check_time(
+    cc_pair: ConnectorCredentialPair,
+    last_index: IndexAttempt | None,
+    search_settings_instance: SearchSettings,
+    secondary_index_building: bool,
+    db_session: Session,
+) -> float | None:
+    """For a combination that _should_index just turned down, returns the unix time at
+    which that can change by time passing alone. None if it can only change because of
+    an attempt finishing or a config change, which put it back in the schedule anyway.
+    """
+    connector = cc_pair.connector
+
+    if (
+        connector.source == DocumentSource.NOT_APPLICABLE
+        or connector.source == DocumentSource.INGESTION_API
+        or connector.id == 0
+    ):
+        return None
+
+    # only an attempt finishing or the swap completing changes these
+    if search_settings_instance.status == IndexModelStatus.FUTURE:
+        return None
+
+    if DISABLE_INDEX_UPDATE_ON_SWAP and secondary_index_building:
+        return None
+
+    if (
+        not cc_pair.status.is_active()
+        or connector.refresh_freq is None
+        or last_index is None
+    ):
+        return None
+
+    # _should_index measures the refresh frequency with the db clock
+    time_since_index = get_db_current_time(db_session) - last_index.time_updated
+    return time.time() + max(
+        connector.refresh_freq - time_since_index.total_seconds(), 0
+    )
+
+
 def validate_indexing_fences(
     tenant_id: str | None,
     celery_app: Celery,
@@ -406,7 +562,9 @@ def validate_indexing_fences(
             active_indexing_tasks.add(task["id"])
 
     # validate all existing indexing jobs
-    for key_bytes in r.scan_iter(RedisConnectorIndex.FENCE_PREFIX + "*"):
+    for key_bytes in RedisFenceRegistry.get_active_fences(
+        r, RedisConnectorIndex.FENCE_PREFIX
+    ):
         lock_beat.reacquire()
         with get_session_with_tenant(tenant_id) as db_session:
             validate_indexing_fence(
@@ -762,7 +920,7 @@ def connector_indexing_proxy_task(
     if not self.request.id:
         task_logger.error("self.request.id is None!")
 
-    client = SimpleJobClient()
+    client = get_indexing_job_client()
 
     job = client.submit(
         connector_indexing_task_wrapper,
@@ -795,6 +953,20 @@ def connector_indexing_proxy_task(
     while True:
         sleep(5)
 
+        # The spawned task asks for helpers when it splits up a long poll window
+        for _ in range(redis_connector_index.pop_shard_helpers()):
+            self.app.send_task(
+                OnyxCeleryTask.CONNECTOR_INDEXING_SHARD_TASK,
+                kwargs=dict(
+                    index_attempt_id=index_attempt_id,
+                    cc_pair_id=cc_pair_id,
+                    search_settings_id=search_settings_id,
+                    tenant_id=tenant_id,
+                ),
+                queue=OnyxCeleryQueues.CONNECTOR_INDEXING,
+                priority=OnyxCeleryPriority.MEDIUM,
+            )
+
         if self.request.id and redis_connector_index.terminating(self.request.id):
             task_logger.warning(
                 "Indexing watchdog - termination signal detected: "
@@ -899,6 +1071,93 @@ def connector_indexing_proxy_task(
     return
 
 
+@shared_task(
+    name=OnyxCeleryTask.CONNECTOR_INDEXING_SHARD_TASK,
+    bind=True,
+    acks_late=False,
+    track_started=True,
+)
+def connector_indexing_shard_task(
+    self: Task,
+    index_attempt_id: int,
+    cc_pair_id: int,
+    search_settings_id: int,
+    tenant_id: str | None,
+) -> None:
+    """Helps the indexing task with the shards of a long poll window. Spawns the work
+    for the same reason as connector_indexing_proxy_task."""
+    client = get_indexing_job_client()
+
+    job = client.submit(
+        connector_indexing_shard_task_wrapper,
+        index_attempt_id,
+        cc_pair_id,
+        search_settings_id,
+        tenant_id,
+        global_version.is_ee_version(),
+        pure=False,
+    )
+
+    if not job:
+        task_logger.info(
+            f"Indexing shard helper - spawn failed: attempt={index_attempt_id} "
+            f"cc_pair={cc_pair_id} "
+            f"search_settings={search_settings_id}"
+        )
+        return
+
+    # Shards of a helper that stops are claimed again by the indexing task, there is
+    # nothing to clean up here
+    while not job.done():
+        sleep(5)
+
+    if job.status == "error":
+        task_logger.error(
+            "Indexing shard helper - spawned task exceptioned: "
+            f"attempt={index_attempt_id} "
+            f"tenant={tenant_id} "
+            f"cc_pair={cc_pair_id} "
+            f"search_settings={search_settings_id} "
+            f"error={job.exception()}"
+        )
+
+    job.release()
+
+
+def connector_indexing_shard_task_wrapper(
+    index_attempt_id: int,
+    cc_pair_id: int,
+    search_settings_id: int,
+    tenant_id: str | None,
+    is_ee: bool,
+) -> None:
+    redis_connector = RedisConnector(tenant_id, cc_pair_id)
+    redis_connector_index = redis_connector.new_index(search_settings_id)
+
+    try:
+        run_indexing_shards_entrypoint(
+            index_attempt_id,
+            tenant_id,
+            cc_pair_id,
+            search_settings_id,
+            is_ee,
+            callback=IndexingShardCallback(
+                redis_connector.stop.fence_key,
+                redis_connector_index.generator_progress_key,
+                get_redis_client(tenant_id=tenant_id),
+            ),
+        )
+    except:
+        logger.exception(
+            f"connector_indexing_shard_task exceptioned: "
+            f"tenant={tenant_id} "
+            f"index_attempt={index_attempt_id} "
+            f"cc_pair={cc_pair_id} "
+            f"search_settings={search_settings_id}"
+        )
+        raise
+
+
 def connector_indexing_task_wrapper(
     index_attempt_id: int,
     cc_pair_id: int,
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -12,10 +13,11 @@ from redis.lock import Lock as RedisLock
 from sqlalchemy.orm import Session
 
 from onyx.background.celery.apps.app_base import task_logger
-from onyx.background.celery.celery_utils import extract_ids_from_runnable_connector
+from onyx.background.celery.celery_utils import iterate_ids_from_runnable_connector
 from onyx.background.celery.tasks.indexing.tasks import IndexingCallback
 from onyx.configs.app_configs import ALLOW_SIMULTANEOUS_PRUNING
 from onyx.configs.app_configs import JOB_TIMEOUT
+from onyx.configs.app_configs import PRUNING_DOC_ID_BATCH_SIZE
 from onyx.configs.constants import CELERY_PRUNING_LOCK_TIMEOUT
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import DANSWER_REDIS_FUNCTION_LOCK_PREFIX
@@ -28,7 +30,7 @@ from onyx.connectors.models import InputType
 from onyx.db.connector_credential_pair import get_connector_credential_pair
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
 from onyx.db.connector_credential_pair import get_connector_credential_pairs
-from onyx.db.document import get_documents_for_connector_credential_pair
+from onyx.db.document import get_document_id_batches_for_connector_credential_pair
 from onyx.db.engine import get_session_with_tenant
 from onyx.db.enums import ConnectorCredentialPairStatus
 from onyx.db.models import ConnectorCredentialPair
@@ -76,6 +78,25 @@ def _is_pruning_due(cc_pair: ConnectorCredentialPair) -> bool:
     return True
 
 
+def _get_doc_ids_to_remove(
+    redis_connector: RedisConnector,
+    db_session: Session,
+    connector_id: int,
+    credential_id: int,
+) -> Iterator[str]:
+    """Yields the docs in our local index that are no longer in the source. Raises if
+    the source doc IDs disappear from redis while the index is being compared."""
+    for indexed_doc_id_batch in get_document_id_batches_for_connector_credential_pair(
+        db_session=db_session,
+        connector_id=connector_id,
+        credential_id=credential_id,
+        batch_size=PRUNING_DOC_ID_BATCH_SIZE,
+    ):
+        yield from redis_connector.prune.filter_missing_from_connector(
+            indexed_doc_id_batch
+        )
+
+
 @shared_task(
     name=OnyxCeleryTask.CHECK_FOR_PRUNING,
     soft_time_limit=JOB_TIMEOUT,
@@ -289,43 +310,33 @@ def connector_pruning_generator_task(
                 r,
             )
 
-            # a list of docs in the source
-            all_connector_doc_ids: set[str] = extract_ids_from_runnable_connector(
+            # the docs in the source are spilled to redis instead of being held in memory
+            redis_connector.prune.start_connector_doc_ids()
+            for doc_id_batch in iterate_ids_from_runnable_connector(
                 runnable_connector, callback
-            )
-
-            # a list of docs in our local index
-            all_indexed_document_ids = {
-                doc.id
-                for doc in get_documents_for_connector_credential_pair(
-                    db_session=db_session,
-                    connector_id=connector_id,
-                    credential_id=credential_id,
-                )
-            }
-
-            # generate list of docs to remove (no longer in the source)
-            doc_ids_to_remove = list(all_indexed_document_ids - all_connector_doc_ids)
-
-            task_logger.info(
-                "Pruning set collected: "
-                f"cc_pair={cc_pair_id} "
-                f"connector_source={cc_pair.connector.source} "
-                f"docs_to_remove={len(doc_ids_to_remove)}"
-            )
+            ):
+                redis_connector.prune.add_connector_doc_ids(doc_id_batch)
 
             task_logger.info(
                 f"RedisConnector.prune.generate_tasks starting. cc_pair={cc_pair_id}"
             )
             tasks_generated = redis_connector.prune.generate_tasks(
-                set(doc_ids_to_remove), self.app, db_session, None
+                _get_doc_ids_to_remove(
+                    redis_connector, db_session, connector_id, credential_id
+                ),
+                self.app,
+                db_session,
+                None,
             )
+            redis_connector.prune.connector_doc_ids_clear()
             if tasks_generated is None:
                 return None
 
             task_logger.info(
                 "RedisConnector.prune.generate_tasks finished. "
-                f"cc_pair={cc_pair_id} tasks_generated={tasks_generated}"
+                f"cc_pair={cc_pair_id} "
+                f"connector_source={cc_pair.connector.source} "
+                f"tasks_generated={tasks_generated}"
             )
 
             redis_connector.prune.generator_complete = tasks_generated
@@ -5,6 +5,7 @@ from tenacity import stop_after_delay
 from tenacity import wait_random_exponential
 
 from onyx.document_index.interfaces import DocumentIndex
+from onyx.document_index.interfaces import UpdateRequest
 from onyx.document_index.interfaces import VespaDocumentFields
 
 
@@ -38,3 +39,11 @@ class RetryDocumentIndex:
     )
     def update_single(self, doc_id: str, fields: VespaDocumentFields) -> int:
         return self.index.update_single(doc_id, fields)
+
+    @retry(
+        retry=retry_if_exception_type(httpx.ReadTimeout),
+        wait=wait_random_exponential(multiplier=1, max=MAX_WAIT),
+        stop=stop_after_delay(STOP_AFTER),
+    )
+    def update(self, update_requests: list[UpdateRequest]) -> None:
+        self.index.update(update_requests)
@@ -10,6 +10,7 @@ from onyx.access.access import get_access_for_document
 from onyx.background.celery.apps.app_base import task_logger
 from onyx.background.celery.tasks.shared.RetryDocumentIndex import RetryDocumentIndex
 from onyx.configs.constants import OnyxCeleryTask
+from onyx.context.search.retrieval_cache import bump_index_generation
 from onyx.db.document import delete_document_by_connector_credential_pair__no_commit
 from onyx.db.document import delete_documents_complete__no_commit
 from onyx.db.document import get_document
@@ -128,6 +129,9 @@ def document_by_cc_pair_cleanup_task(
 
             db_session.commit()
 
+            if action != "skip":
+                bump_index_generation(tenant_id)
+
             task_logger.info(
                 f"doc={document_id} "
                 f"action={action} "
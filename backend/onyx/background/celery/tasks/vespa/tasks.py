@@ -28,6 +28,7 @@ from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.configs.constants import OnyxRedisLocks
+from onyx.context.search.retrieval_cache import bump_index_generation
 from onyx.db.connector import fetch_connector_by_id
 from onyx.db.connector import mark_cc_pair_as_permissions_synced
 from onyx.db.connector import mark_ccpair_as_pruned
@@ -66,6 +67,7 @@ from onyx.redis.redis_connector_doc_perm_sync import (
 from onyx.redis.redis_connector_index import RedisConnectorIndex
 from onyx.redis.redis_connector_prune import RedisConnectorPrune
 from onyx.redis.redis_document_set import RedisDocumentSet
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
 from onyx.redis.redis_pool import get_redis_client
 from onyx.redis.redis_usergroup import RedisUserGroup
 from onyx.utils.logger import setup_logger
@@ -337,7 +339,11 @@ def try_generate_user_group_sync_tasks(
 
 
 def monitor_connector_taskset(r: Redis) -> None:
-    fence_value = r.get(RedisConnectorCredentialPair.get_fence_key())
+    with r.pipeline(transaction=False) as pipe:
+        pipe.get(RedisConnectorCredentialPair.get_fence_key())
+        pipe.scard(RedisConnectorCredentialPair.get_taskset_key())
+        fence_value, count = pipe.execute()
+
     if fence_value is None:
         return
 
@@ -347,7 +353,6 @@ def monitor_connector_taskset(r: Redis) -> None:
         task_logger.error("The value is not an integer.")
         return
 
-    count = r.scard(RedisConnectorCredentialPair.get_taskset_key())
     task_logger.info(
         f"Stale document sync progress: remaining={count} initial={initial_count}"
     )
@@ -725,6 +730,36 @@ def monitor_ccpair_indexing_taskset(
     redis_connector_index.reset()
 
 
+def get_fences_with_empty_tasksets(
+    r: Redis, fence_prefix: str, taskset_prefix: str
+) -> list[bytes]:
+    """Counts the remaining tasks of every fence with the prefix in a single round
+    trip. Fences with tasks remaining only need their progress logged, so just the
+    ones with an empty taskset are returned for the monitor functions to finish."""
+    fence_keys = RedisFenceRegistry.get_active_fences(r, fence_prefix)
+    if not fence_keys:
+        return []
+
+    with r.pipeline(transaction=False) as pipe:
+        for fence_key in fence_keys:
+            # fence keys are "{fence_prefix}_{id}" and tasksets "{taskset_prefix}_{id}"
+            object_id = fence_key.decode("utf-8")[len(fence_prefix) + 1 :]
+            pipe.scard(f"{taskset_prefix}_{object_id}")
+        remaining_counts = pipe.execute()
+
+    empty_fence_keys: list[bytes] = []
+    for fence_key, remaining in zip(fence_keys, remaining_counts):
+        if remaining > 0:
+            task_logger.info(
+                f"Taskset progress: fence={fence_key.decode('utf-8')} "
+                f"remaining={remaining}"
+            )
+            continue
+
+        empty_fence_keys.append(fence_key)
+    return empty_fence_keys
+
+
 @shared_task(name=OnyxCeleryTask.MONITOR_VESPA_SYNC, soft_time_limit=300, bind=True)
 def monitor_vespa_sync(self: Task, tenant_id: str | None) -> bool:
     """This is a celery beat task that monitors and finalizes metadata sync tasksets.
@@ -776,22 +811,29 @@ def monitor_vespa_sync(self: Task, tenant_id: str | None) -> bool:
         )
 
         lock_beat.reacquire()
-        if r.exists(RedisConnectorCredentialPair.get_fence_key()):
-            monitor_connector_taskset(r)
+        monitor_connector_taskset(r)
 
+        # the monitors below only have work to do once a taskset is empty, so the
+        # taskset counts are fetched in bulk and only those fences are monitored
         lock_beat.reacquire()
-        for key_bytes in r.scan_iter(RedisConnectorDelete.FENCE_PREFIX + "*"):
+        for key_bytes in get_fences_with_empty_tasksets(
+            r, RedisConnectorDelete.FENCE_PREFIX, RedisConnectorDelete.TASKSET_PREFIX
+        ):
             lock_beat.reacquire()
             monitor_connector_deletion_taskset(tenant_id, key_bytes, r)
 
         lock_beat.reacquire()
-        for key_bytes in r.scan_iter(RedisDocumentSet.FENCE_PREFIX + "*"):
+        for key_bytes in get_fences_with_empty_tasksets(
+            r, RedisDocumentSet.FENCE_PREFIX, RedisDocumentSet.TASKSET_PREFIX
+        ):
             lock_beat.reacquire()
             with get_session_with_tenant(tenant_id) as db_session:
                 monitor_document_set_taskset(tenant_id, key_bytes, r, db_session)
 
         lock_beat.reacquire()
-        for key_bytes in r.scan_iter(RedisUserGroup.FENCE_PREFIX + "*"):
+        for key_bytes in get_fences_with_empty_tasksets(
+            r, RedisUserGroup.FENCE_PREFIX, RedisUserGroup.TASKSET_PREFIX
+        ):
             lock_beat.reacquire()
             monitor_usergroup_taskset = fetch_versioned_implementation_with_fallback(
                 "onyx.background.celery.tasks.vespa.tasks",
@@ -802,19 +844,27 @@ def monitor_vespa_sync(self: Task, tenant_id: str | None) -> bool:
                 monitor_usergroup_taskset(tenant_id, key_bytes, r, db_session)
 
         lock_beat.reacquire()
-        for key_bytes in r.scan_iter(RedisConnectorPrune.FENCE_PREFIX + "*"):
+        for key_bytes in get_fences_with_empty_tasksets(
+            r, RedisConnectorPrune.FENCE_PREFIX, RedisConnectorPrune.TASKSET_PREFIX
+        ):
             lock_beat.reacquire()
             with get_session_with_tenant(tenant_id) as db_session:
                 monitor_ccpair_pruning_taskset(tenant_id, key_bytes, r, db_session)
 
         lock_beat.reacquire()
-        for key_bytes in r.scan_iter(RedisConnectorIndex.FENCE_PREFIX + "*"):
+        for key_bytes in RedisFenceRegistry.get_active_fences(
+            r, RedisConnectorIndex.FENCE_PREFIX
+        ):
             lock_beat.reacquire()
             with get_session_with_tenant(tenant_id) as db_session:
                 monitor_ccpair_indexing_taskset(tenant_id, key_bytes, r, db_session)
 
         lock_beat.reacquire()
-        for key_bytes in r.scan_iter(RedisConnectorPermissionSync.FENCE_PREFIX + "*"):
+        for key_bytes in get_fences_with_empty_tasksets(
+            r,
+            RedisConnectorPermissionSync.FENCE_PREFIX,
+            RedisConnectorPermissionSync.TASKSET_PREFIX,
+        ):
             lock_beat.reacquire()
             with get_session_with_tenant(tenant_id) as db_session:
                 monitor_ccpair_permissions_taskset(tenant_id, key_bytes, r, db_session)
@@ -877,6 +927,7 @@ def vespa_metadata_sync_task(
 
             # update Vespa. OK if doc doesn't exist. Raises exception otherwise.
             chunks_affected = retry_index.update_single(document_id, fields)
+            bump_index_generation(tenant_id)
 
             # update db last. Worst case = we crash right before this and
             # the sync might repeat again later
@@ -6,6 +6,7 @@ import datetime
 from onyx.configs.app_configs import EXPERIMENTAL_CHECKPOINTING_ENABLED
 from onyx.configs.constants import DocumentSource
 from onyx.connectors.cross_connector_utils.miscellaneous_utils import datetime_to_utc
+from onyx.connectors.models import IndexingCheckpoint
 
 
 def _2010_dt() -> datetime.datetime:
@@ -78,3 +79,41 @@ def get_time_windows_for_index_attempt(
         start_of_window = end_of_window
 
     return time_windows
+
+
+def get_time_windows_to_resume(
+    time_windows: list[tuple[datetime.datetime, datetime.datetime]],
+    checkpoint: IndexingCheckpoint,
+) -> list[tuple[datetime.datetime, datetime.datetime]] | None:
+    """Returns the windows left to index when resuming from the checkpoint, or None if the
+    checkpoint does not belong to any of the windows. The checkpointed window keeps its
+    original end since the connector checkpoint is only valid for that exact range, the
+    rest of the planned window is indexed right after it."""
+    for ind, (window_start, window_end) in enumerate(time_windows):
+        if window_start != checkpoint.window_start:
+            continue
+
+        resumed_windows = [(checkpoint.window_start, checkpoint.window_end)]
+        if checkpoint.window_end < window_end:
+            resumed_windows.append((checkpoint.window_end, window_end))
+        return resumed_windows + time_windows[ind + 1 :]
+
+    return None
+
+
+def split_time_window(
+    window_start: datetime.datetime,
+    window_end: datetime.datetime,
+    num_shards: int,
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """Splits the window into equally long, adjacent sub-windows"""
+    shard_length = (window_end - window_start) / num_shards
+    return [
+        (
+            window_start + shard_length * ind,
+            window_start + shard_length * (ind + 1)
+            if ind < num_shards - 1
+            else window_end,
+        )
+        for ind in range(num_shards)
+    ]
@@ -4,13 +4,19 @@ not follow the expected behavior, etc.
 
 NOTE: cannot use Celery directly due to
 https://github.com/celery/celery/issues/7007#issuecomment-1740139367"""
+import threading
+import traceback
 from collections.abc import Callable
 from dataclasses import dataclass
+from multiprocessing import Pipe
 from multiprocessing import Process
+from multiprocessing.connection import Connection
 from typing import Any
 from typing import Literal
 from typing import Optional
 
+import psutil
+
 from onyx.configs.constants import POSTGRES_CELERY_WORKER_INDEXING_CHILD_APP_NAME
 from onyx.db.engine import SqlEngine
 from onyx.utils.logger import setup_logger
@@ -26,17 +32,12 @@ JobStatusType = (
 )
 
 
-def _initializer(
-    func: Callable, args: list | tuple, kwargs: dict[str, Any] | None = None
-) -> Any:
+def _initialize_child_process() -> None:
     """Initialize the child process with a fresh SQLAlchemy Engine.
 
     Based on SQLAlchemy's recommendations to handle multiprocessing:
     https://docs.sqlalchemy.org/en/20/core/pooling.html#using-connection-pools-with-multiprocessing-or-os-fork
     """
-    if kwargs is None:
-        kwargs = {}
-
     logger.info("Initializing spawned worker child process.")
 
     # Reset the engine in the child process
@@ -48,6 +49,15 @@ def _initializer(
     # Initialize a new engine with desired parameters
     SqlEngine.init_engine(pool_size=4, max_overflow=12, pool_recycle=60)
 
+
+def _initializer(
+    func: Callable, args: list | tuple, kwargs: dict[str, Any] | None = None
+) -> Any:
+    if kwargs is None:
+        kwargs = {}
+
+    _initialize_child_process()
+
     # Proceed with executing the target function
     return func(*args, **kwargs)
 
@@ -138,3 +148,204 @@ class SimpleJobClient:
         self.jobs[job_id] = job
 
         return job
+
+
+def _run_warm_worker(conn: Connection, warm_up: Callable | None) -> None:
+    """Entrypoint of a WarmWorker process. Initializes once, then runs the jobs it
+    receives one at a time until the pipe is closed."""
+    _initialize_child_process()
+    if warm_up:
+        warm_up()
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+
+        func, args = message
+        try:
+            func(*args)
+            error: str | None = None
+        except Exception:
+            error = traceback.format_exc()
+
+        try:
+            conn.send(error)
+        except (BrokenPipeError, OSError):
+            # the client gave up on this worker while the job was running
+            return
+
+
+class WarmWorker:
+    """A spawned process that runs jobs one after the other, so that the imports and
+    connections it sets up are reused instead of redone for every job"""
+
+    def __init__(self, warm_up: Callable | None = None) -> None:
+        self.conn, child_conn = Pipe()
+        self.process = Process(
+            target=_run_warm_worker, args=(child_conn, warm_up), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.num_jobs = 0
+
+    def run(self, func: Callable, args: tuple) -> None:
+        self.conn.send((func, args))
+        self.num_jobs += 1
+
+    def rss_mb(self) -> float:
+        try:
+            return psutil.Process(self.process.pid).memory_info().rss / 2**20
+        except psutil.Error:
+            return 0
+
+    def stop(self) -> None:
+        """Closing the pipe makes an idle worker exit, a busy one exits after its job"""
+        self.conn.close()
+
+    def terminate(self) -> None:
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+@dataclass
+class WarmJob:
+    """Same interface as SimpleJob, for a job running on a WarmWorker"""
+
+    id: int
+    worker: WarmWorker
+    client: "WarmJobClient"
+    finished: bool = False
+    error: str | None = None
+
+    @property
+    def process(self) -> Process:
+        return self.worker.process
+
+    def cancel(self) -> bool:
+        return self.release()
+
+    def release(self) -> bool:
+        """Terminates the worker if the job is still running, otherwise hands it back
+        to the client to be reused"""
+        terminated = False
+        if not self.done():
+            self.worker.terminate()
+            terminated = True
+        self.client.release_worker(self.worker)
+        return terminated
+
+    def _poll(self) -> None:
+        if self.finished or self.worker.conn.closed:
+            return
+        try:
+            if self.worker.conn.poll():
+                self.error = self.worker.conn.recv()
+                self.finished = True
+        except (EOFError, OSError):
+            # the worker died, the process exit code tells how
+            pass
+
+    @property
+    def status(self) -> JobStatusType:
+        self._poll()
+        if self.finished:
+            return "error" if self.error else "finished"
+        elif self.process.is_alive():
+            return "running"
+        elif self.process.exitcode is None:
+            return "cancelled"
+        else:
+            # the process exiting without reporting back is always an error
+            return "error"
+
+    def done(self) -> bool:
+        return self.status != "running"
+
+    def exception(self) -> str:
+        if self.error:
+            return self.error
+        return (
+            f"Job with ID '{self.id}' was killed or encountered an unhandled exception."
+        )
+
+
+class WarmJobClient:
+    """Drop in replacement for SimpleJobClient that runs jobs on a pool of warm worker
+    processes instead of a new process per job. Thread safe, so it can be shared by
+    the threads of a celery worker.
+
+    A worker is recycled after max_jobs_per_worker jobs or once its RSS passes
+    max_rss_mb (0 for no limit) and replaced right away, so that the replacement is
+    warmed up before the next job arrives. The RSS is only checked between jobs, a
+    running job is not stopped however much memory it uses. A job that is never released keeps its
+    worker until it finishes, after which the worker exits, as a SimpleJob would."""
+
+    def __init__(
+        self,
+        n_workers: int,
+        max_jobs_per_worker: int,
+        max_rss_mb: int = 0,
+        warm_up: Callable | None = None,
+    ) -> None:
+        self.n_workers = n_workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.warm_up = warm_up
+        self.job_id_counter = 0
+        self.idle_workers: list[WarmWorker] = []
+        self._lock = threading.Lock()
+
+    def _is_reusable(self, worker: WarmWorker) -> bool:
+        if not worker.process.is_alive() or worker.conn.closed:
+            return False
+        if worker.num_jobs >= self.max_jobs_per_worker:
+            return False
+        return not self.max_rss_mb or worker.rss_mb() <= self.max_rss_mb
+
+    def start(self) -> None:
+        """Starts idle workers up to n_workers"""
+        with self._lock:
+            while len(self.idle_workers) < self.n_workers:
+                self.idle_workers.append(WarmWorker(self.warm_up))
+
+    def release_worker(self, worker: WarmWorker) -> None:
+        with self._lock:
+            if worker in self.idle_workers:
+                return
+
+            if not self._is_reusable(worker):
+                logger.info(
+                    f"Recycling warm worker: pid={worker.process.pid} "
+                    f"jobs={worker.num_jobs}"
+                )
+                worker.stop()
+                worker = WarmWorker(self.warm_up)
+
+            if len(self.idle_workers) < self.n_workers:
+                self.idle_workers.append(worker)
+            else:
+                worker.stop()
+
+    def submit(self, func: Callable, *args: Any, pure: bool = True) -> WarmJob | None:
+        """NOTE: `pure` arg is needed so this can be a drop in replacement for Dask"""
+        with self._lock:
+            worker: WarmWorker | None = None
+            while self.idle_workers:
+                idle_worker = self.idle_workers.pop(0)
+                if idle_worker.process.is_alive():
+                    worker = idle_worker
+                    break
+                idle_worker.stop()
+
+            if worker is None:
+                logger.debug("No idle warm worker, starting a new one.")
+                worker = WarmWorker(self.warm_up)
+
+            job_id = self.job_id_counter
+            self.job_id_counter += 1
+
+        worker.run(func, args)
+        return WarmJob(id=job_id, worker=worker, client=self)
@@ -3,36 +3,67 @@ import traceback
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
+from uuid import uuid4
 
 from sqlalchemy.orm import Session
 
 from onyx.background.indexing.checkpointing import get_time_windows_for_index_attempt
+from onyx.background.indexing.checkpointing import get_time_windows_to_resume
+from onyx.background.indexing.checkpointing import split_time_window
 from onyx.background.indexing.tracer import OnyxTracer
+from onyx.configs.app_configs import INDEX_BATCH_SIZE
+from onyx.configs.app_configs import INDEXING_POLL_SHARD_MIN_WINDOW_DAYS
+from onyx.configs.app_configs import INDEXING_POLL_SHARD_SOURCES
+from onyx.configs.app_configs import INDEXING_POLL_SHARDS
 from onyx.configs.app_configs import INDEXING_SIZE_WARNING_THRESHOLD
 from onyx.configs.app_configs import INDEXING_TRACER_INTERVAL
 from onyx.configs.app_configs import POLL_CONNECTOR_OFFSET
+from onyx.configs.app_configs import REEMBED_FROM_CURRENT_INDEX
+from onyx.configs.constants import DocumentSource
 from onyx.configs.constants import MilestoneRecordType
 from onyx.connectors.connector_runner import ConnectorRunner
 from onyx.connectors.factory import instantiate_connector
+from onyx.connectors.interfaces import BaseConnector
+from onyx.connectors.interfaces import CheckpointConnector
+from onyx.connectors.interfaces import ConnectorCheckpoint
+from onyx.connectors.interfaces import PollConnector
 from onyx.connectors.models import IndexAttemptMetadata
+from onyx.connectors.models import IndexingCheckpoint
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
 from onyx.db.connector_credential_pair import get_last_successful_attempt_time
 from onyx.db.connector_credential_pair import update_connector_credential_pair
+from onyx.db.document import get_document_id_batches_for_connector_credential_pair
 from onyx.db.engine import get_session_with_tenant
 from onyx.db.enums import ConnectorCredentialPairStatus
+from onyx.db.index_attempt import get_index_attempt
+from onyx.db.index_attempt import get_resumable_checkpoint
+from onyx.db.index_attempt import has_failed_index_attempt
 from onyx.db.index_attempt import mark_attempt_canceled
 from onyx.db.index_attempt import mark_attempt_failed
 from onyx.db.index_attempt import mark_attempt_partially_succeeded
 from onyx.db.index_attempt import mark_attempt_succeeded
+from onyx.db.index_attempt import mark_attempt_succeeded_up_to
 from onyx.db.index_attempt import transition_attempt_to_in_progress
 from onyx.db.index_attempt import update_docs_indexed
+from onyx.db.index_attempt import update_index_attempt_checkpoint
 from onyx.db.models import IndexAttempt
 from onyx.db.models import IndexingStatus
 from onyx.db.models import IndexModelStatus
+from onyx.db.models import SearchSettings
+from onyx.db.search_settings import get_current_search_settings
 from onyx.document_index.factory import get_default_document_index
+from onyx.document_index.interfaces import StoredChunkRetrievalCapable
 from onyx.indexing.embedder import DefaultIndexingEmbedder
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
+from onyx.indexing.indexing_pipeline import build_chunker
 from onyx.indexing.indexing_pipeline import build_indexing_pipeline
+from onyx.indexing.indexing_pipeline import IndexingPipelineProtocol
+from onyx.indexing.reembedding import chunks_are_reusable
+from onyx.indexing.reembedding import reembed_doc_batch
+from onyx.redis.redis_connector import RedisConnector
+from onyx.redis.redis_connector_index import IndexingShard
+from onyx.redis.redis_connector_index import IndexingShardResult
+from onyx.redis.redis_connector_index import RedisConnectorIndex
 from onyx.utils.logger import setup_logger
 from onyx.utils.logger import TaskAttemptSingleton
 from onyx.utils.telemetry import create_milestone_and_report
@@ -41,6 +72,8 @@ from onyx.utils.variable_functionality import global_version
 logger = setup_logger()
 
 INDEXING_TRACER_NUM_PRINT_ENTRIES = 5
+# How often the indexing task checks whether the helpers finished their shards
+SHARD_WAIT_INTERVAL = 5
 
 
 def _get_connector_runner(
@@ -49,9 +82,10 @@ def _get_connector_runner(
     start_time: datetime,
     end_time: datetime,
     tenant_id: str | None,
+    checkpoint: ConnectorCheckpoint | None = None,
 ) -> ConnectorRunner:
     """
-    NOTE: `start_time` and `end_time` are only used for poll connectors
+    NOTE: `start_time` and `end_time` are only used for poll and checkpoint connectors
 
     Returns an iterator of document batches and whether the returned documents
     are the complete list of existing documents of the connector. If the task
@@ -86,7 +120,9 @@ def _get_connector_runner(
         raise e
 
     return ConnectorRunner(
-        connector=runnable_connector, time_range=(start_time, end_time)
+        connector=runnable_connector,
+        time_range=(start_time, end_time),
+        checkpoint=checkpoint,
     )
 
 
@@ -94,6 +130,347 @@ class ConnectorStopSignal(Exception):
     """A custom exception used to signal a stop in processing."""
 
 
+def _build_attempt_indexing_pipeline(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    search_settings: SearchSettings,
+    tenant_id: str | None,
+    callback: IndexingHeartbeatInterface | None,
+) -> IndexingPipelineProtocol:
+    # Indexing is only done into one index at a time
+    document_index = get_default_document_index(
+        primary_index_name=search_settings.index_name, secondary_index_name=None
+    )
+
+    embedding_model = DefaultIndexingEmbedder.from_db_search_settings(
+        search_settings=search_settings,
+        callback=callback,
+    )
+
+    return build_indexing_pipeline(
+        attempt_id=index_attempt.id,
+        embedder=embedding_model,
+        document_index=document_index,
+        ignore_time_skip=(
+            index_attempt.from_beginning
+            or (search_settings.status == IndexModelStatus.FUTURE)
+        ),
+        db_session=db_session,
+        tenant_id=tenant_id,
+        callback=callback,
+    )
+
+
+def _check_indexing_can_continue(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    search_settings: SearchSettings,
+    callback: IndexingHeartbeatInterface | None,
+) -> None:
+    """Raises if the run has to stop, checked before every batch"""
+    # Check if connector is disabled mid run and stop if so unless it's the secondary
+    # index being built. We want to populate it even for paused connectors
+    # Often paused connectors are sources that aren't updated frequently but the
+    # contents still need to be initially pulled.
+    if callback:
+        if callback.should_stop():
+            raise ConnectorStopSignal("Connector stop signal detected")
+
+    # TODO: should we move this into the above callback instead?
+    db_cc_pair = index_attempt.connector_credential_pair
+    db_session.refresh(db_cc_pair)
+    if (
+        (
+            db_cc_pair.status == ConnectorCredentialPairStatus.PAUSED
+            and search_settings.status != IndexModelStatus.FUTURE
+        )
+        # if it's deleting, we don't care if this is a secondary index
+        or db_cc_pair.status == ConnectorCredentialPairStatus.DELETING
+    ):
+        # let the `except` block handle this
+        raise RuntimeError("Connector was disabled mid run")
+
+    db_session.refresh(index_attempt)
+    if index_attempt.status != IndexingStatus.IN_PROGRESS:
+        # Likely due to user manually disabling it or model swap
+        raise RuntimeError(
+            f"Index Attempt was canceled, status is {index_attempt.status}"
+        )
+
+
+def _should_shard_window(
+    connector: BaseConnector,
+    source: DocumentSource,
+    window_start: datetime,
+    window_end: datetime,
+) -> bool:
+    return (
+        INDEXING_POLL_SHARDS > 1
+        and source.value in INDEXING_POLL_SHARD_SOURCES
+        and isinstance(connector, PollConnector)
+        # Checkpoints are kept per window, not per shard
+        and not isinstance(connector, CheckpointConnector)
+        and window_end - window_start
+        >= timedelta(days=INDEXING_POLL_SHARD_MIN_WINDOW_DAYS)
+    )
+
+
+def _index_shard(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    search_settings: SearchSettings,
+    indexing_pipeline: IndexingPipelineProtocol,
+    shard: IndexingShard,
+    redis_connector_index: RedisConnectorIndex,
+    tenant_id: str | None,
+    callback: IndexingHeartbeatInterface | None,
+) -> IndexingShardResult:
+    """Indexes one shard of a poll window. Failures are returned in the result rather
+    than raised so that the other shards are still indexed, except for stop signals."""
+    result = IndexingShardResult(shard_id=shard.shard_id, generation=shard.generation)
+    index_attempt_md = IndexAttemptMetadata(
+        connector_id=index_attempt.connector_credential_pair.connector_id,
+        credential_id=index_attempt.connector_credential_pair.credential_id,
+    )
+
+    try:
+        connector_runner = _get_connector_runner(
+            db_session=db_session,
+            attempt=index_attempt,
+            start_time=shard.start,
+            end_time=shard.end,
+            tenant_id=tenant_id,
+        )
+
+        for doc_batch in connector_runner.run():
+            _check_indexing_can_continue(
+                db_session, index_attempt, search_settings, callback
+            )
+
+            index_attempt_md.batch_num = result.num_batches + 1
+            new_docs, total_batch_chunks = indexing_pipeline(
+                document_batch=doc_batch,
+                index_attempt_metadata=index_attempt_md,
+            )
+
+            result.num_batches += 1
+            result.net_doc_change += new_docs
+            result.chunk_count += total_batch_chunks
+            result.document_count += len(doc_batch)
+
+            db_session.commit()
+            redis_connector_index.refresh_shard_claim(shard)
+            if callback:
+                callback.progress("_index_shard", len(doc_batch))
+    except ConnectorStopSignal:
+        raise
+    except Exception as e:
+        logger.exception(
+            f"Indexing shard failed: shard={shard.shard_id} "
+            f"start={shard.start} end={shard.end}"
+        )
+        result.error = str(e)
+
+    result.num_exceptions = index_attempt_md.num_exceptions
+    return result
+
+
+def _run_sharded_window(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    search_settings: SearchSettings,
+    indexing_pipeline: IndexingPipelineProtocol,
+    window_start: datetime,
+    window_end: datetime,
+    tenant_id: str | None,
+    callback: IndexingHeartbeatInterface | None,
+) -> list[IndexingShardResult]:
+    """Splits the window into shards that are indexed in parallel by this process and
+    by helper tasks on the other indexing workers. This process claims shards just like
+    the helpers, so the window is indexed even if no worker is free to help."""
+    redis_connector_index = RedisConnector(
+        tenant_id, index_attempt.connector_credential_pair_id
+    ).new_index(search_settings.id)
+
+    generation = str(uuid4())
+    shards = [
+        IndexingShard(
+            shard_id=ind, generation=generation, start=shard_start, end=shard_end
+        )
+        for ind, (shard_start, shard_end) in enumerate(
+            split_time_window(window_start, window_end, INDEXING_POLL_SHARDS)
+        )
+    ]
+    logger.info(
+        f"Indexing window in shards: shards={len(shards)} "
+        f"window_start={window_start} window_end={window_end}"
+    )
+    redis_connector_index.set_shards(shards, num_helpers=len(shards) - 1)
+
+    try:
+        while True:
+            shard = redis_connector_index.claim_shard()
+            if shard:
+                redis_connector_index.set_shard_result(
+                    _index_shard(
+                        db_session=db_session,
+                        index_attempt=index_attempt,
+                        search_settings=search_settings,
+                        indexing_pipeline=indexing_pipeline,
+                        shard=shard,
+                        redis_connector_index=redis_connector_index,
+                        tenant_id=tenant_id,
+                        callback=callback,
+                    )
+                )
+                continue
+
+            shard_results = redis_connector_index.get_shard_results()
+            if len(shard_results) == len(shards):
+                return list(shard_results.values())
+
+            # The rest is claimed by helpers. If a helper dies, its claim expires and
+            # the shard is claimed again by whoever is still running
+            _check_indexing_can_continue(
+                db_session, index_attempt, search_settings, callback
+            )
+            if callback:
+                callback.progress("_run_sharded_window", 0)
+            time.sleep(SHARD_WAIT_INTERVAL)
+    finally:
+        redis_connector_index.shards_clear()
+
+
+def _should_reembed_from_current_index(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    search_settings: SearchSettings,
+) -> bool:
+    if (
+        not REEMBED_FROM_CURRENT_INDEX
+        or search_settings.status != IndexModelStatus.FUTURE
+    ):
+        return False
+
+    # the current index only has the documents once the connector has run for it
+    if index_attempt.connector_credential_pair.last_successful_index_time is None:
+        return False
+
+    # go to the source if re-embedding failed before, so that a problem with the
+    # current index can't keep the model switch from finishing
+    if has_failed_index_attempt(
+        cc_pair_id=index_attempt.connector_credential_pair_id,
+        search_settings_id=search_settings.id,
+        db_session=db_session,
+    ):
+        return False
+
+    current_search_settings = get_current_search_settings(db_session)
+    current_document_index = get_default_document_index(
+        primary_index_name=current_search_settings.index_name,
+        secondary_index_name=None,
+    )
+    return isinstance(
+        current_document_index, StoredChunkRetrievalCapable
+    ) and chunks_are_reusable(current_search_settings, search_settings)
+
+
+def _run_reembedding(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    search_settings: SearchSettings,
+    tenant_id: str | None,
+    callback: IndexingHeartbeatInterface | None = None,
+) -> None:
+    """Builds the index of the new search settings for the documents of the cc pair by
+    embedding the chunks of the current index again, the source is not contacted"""
+    start_time = time.time()
+
+    current_search_settings = get_current_search_settings(db_session)
+    current_document_index = get_default_document_index(
+        primary_index_name=current_search_settings.index_name,
+        secondary_index_name=None,
+    )
+    if not isinstance(current_document_index, StoredChunkRetrievalCapable):
+        raise RuntimeError("The current document index can't return stored chunks")
+
+    document_index = get_default_document_index(
+        primary_index_name=search_settings.index_name, secondary_index_name=None
+    )
+    embedder = DefaultIndexingEmbedder.from_db_search_settings(
+        search_settings=search_settings,
+        callback=callback,
+    )
+    chunker = build_chunker(embedder=embedder, db_session=db_session, callback=callback)
+
+    db_cc_pair = index_attempt.connector_credential_pair
+    # captured before anything is read, the current index has the changes of the source
+    # up to here and no further. The source is polled from here once this succeeds.
+    indexed_up_to = db_cc_pair.last_successful_index_time
+    if indexed_up_to is None:
+        raise RuntimeError("The current index has not been built for the cc pair")
+
+    document_count = 0
+    net_doc_change = 0
+    chunk_count = 0
+    try:
+        for document_ids in get_document_id_batches_for_connector_credential_pair(
+            db_session=db_session,
+            connector_id=db_cc_pair.connector_id,
+            credential_id=db_cc_pair.credential_id,
+            batch_size=INDEX_BATCH_SIZE,
+        ):
+            _check_indexing_can_continue(
+                db_session, index_attempt, search_settings, callback
+            )
+
+            new_docs, total_batch_chunks = reembed_doc_batch(
+                document_ids=document_ids,
+                chunker=chunker,
+                embedder=embedder,
+                source_index=current_document_index,
+                target_index=document_index,
+                db_session=db_session,
+                tenant_id=tenant_id,
+            )
+
+            document_count += len(document_ids)
+            net_doc_change += new_docs
+            chunk_count += total_batch_chunks
+
+            if callback:
+                callback.progress("_run_reembedding", len(document_ids))
+
+            update_docs_indexed(
+                db_session=db_session,
+                index_attempt=index_attempt,
+                total_docs_indexed=document_count,
+                new_docs_indexed=net_doc_change,
+                docs_removed_from_index=0,
+            )
+    except Exception as e:
+        logger.exception(
+            f"Re-embedding exceptioned after elapsed time: {time.time() - start_time} seconds"
+        )
+        if isinstance(e, ConnectorStopSignal):
+            mark_attempt_canceled(index_attempt.id, db_session, reason=str(e))
+        else:
+            mark_attempt_failed(
+                index_attempt.id,
+                db_session,
+                failure_reason=str(e),
+                full_exception_trace=traceback.format_exc(),
+            )
+        raise e
+
+    mark_attempt_succeeded_up_to(index_attempt, indexed_up_to, db_session)
+    logger.info(
+        f"Re-embedding succeeded: "
+        f"docs={document_count} chunks={chunk_count} "
+        f"elapsed={time.time() - start_time:.2f}s"
+    )
+
+
 def _run_indexing(
     db_session: Session,
     index_attempt: IndexAttempt,
@@ -117,31 +494,28 @@ def _run_indexing(
 
     search_settings = index_attempt.search_settings
 
-    index_name = search_settings.index_name
+    if _should_reembed_from_current_index(db_session, index_attempt, search_settings):
+        logger.info(
+            "Building the index for the new search settings from the current index: "
+            f"search_settings={search_settings.id}"
+        )
+        _run_reembedding(
+            db_session=db_session,
+            index_attempt=index_attempt,
+            search_settings=search_settings,
+            tenant_id=tenant_id,
+            callback=callback,
+        )
+        return
 
     # Only update cc-pair status for primary index jobs
     # Secondary index syncs at the end when swapping
     is_primary = search_settings.status == IndexModelStatus.PRESENT
 
-    # Indexing is only done into one index at a time
-    document_index = get_default_document_index(
-        primary_index_name=index_name, secondary_index_name=None
-    )
-
-    embedding_model = DefaultIndexingEmbedder.from_db_search_settings(
-        search_settings=search_settings,
-        callback=callback,
-    )
-
-    indexing_pipeline = build_indexing_pipeline(
-        attempt_id=index_attempt.id,
-        embedder=embedding_model,
-        document_index=document_index,
-        ignore_time_skip=(
-            index_attempt.from_beginning
-            or (search_settings.status == IndexModelStatus.FUTURE)
-        ),
+    indexing_pipeline = _build_attempt_indexing_pipeline(
         db_session=db_session,
+        index_attempt=index_attempt,
+        search_settings=search_settings,
         tenant_id=tenant_id,
         callback=callback,
     )
@@ -176,19 +550,42 @@ def _run_indexing(
         credential_id=db_credential.id,
     )
 
+    time_windows = get_time_windows_for_index_attempt(
+        last_successful_run=datetime.fromtimestamp(
+            last_successful_index_time, tz=timezone.utc
+        ),
+        source_type=db_connector.source,
+    )
+
+    # Pick up where the previous attempt was interrupted, only CheckpointConnectors
+    # leave a checkpoint behind
+    resume_checkpoint = get_resumable_checkpoint(index_attempt, db_session)
+    if resume_checkpoint:
+        resumed_time_windows = get_time_windows_to_resume(
+            time_windows, resume_checkpoint
+        )
+        if resumed_time_windows is None:
+            logger.info(
+                "Not resuming from the previous attempt's checkpoint, its time window "
+                f"is no longer being indexed: window_start={resume_checkpoint.window_start}"
+            )
+            resume_checkpoint = None
+        else:
+            logger.info(
+                f"Resuming from the previous attempt's checkpoint: "
+                f"window_start={resume_checkpoint.window_start} "
+                f"window_end={resume_checkpoint.window_end}"
+            )
+            time_windows = resumed_time_windows
+
     batch_num = 0
     net_doc_change = 0
     document_count = 0
     chunk_count = 0
     run_end_dt = None
-    for ind, (window_start, window_end) in enumerate(
-        get_time_windows_for_index_attempt(
-            last_successful_run=datetime.fromtimestamp(
-                last_successful_index_time, tz=timezone.utc
-            ),
-            source_type=db_connector.source,
-        )
-    ):
+    for ind, (window_start, window_end) in enumerate(time_windows):
+        # Checkpoints refer to the window as planned, before the poll offset is applied
+        planned_window_start = window_start
         try:
             window_start = max(
                 window_start - timedelta(minutes=POLL_CONNECTOR_OFFSET),
@@ -201,104 +598,143 @@ def _run_indexing(
                 start_time=window_start,
                 end_time=window_end,
                 tenant_id=tenant_id,
+                checkpoint=(
+                    resume_checkpoint.connector_checkpoint
+                    if resume_checkpoint and ind == 0
+                    else None
+                ),
             )
 
-            all_connector_doc_ids: set[str] = set()
-
             tracer_counter = 0
-            if INDEXING_TRACER_INTERVAL > 0:
-                tracer.snap()
-            for doc_batch in connector_runner.run():
-                # Check if connector is disabled mid run and stop if so unless it's the secondary
-                # index being built. We want to populate it even for paused connectors
-                # Often paused connectors are sources that aren't updated frequently but the
-                # contents still need to be initially pulled.
-                if callback:
-                    if callback.should_stop():
-                        raise ConnectorStopSignal("Connector stop signal detected")
-
-                # TODO: should we move this into the above callback instead?
-                db_session.refresh(db_cc_pair)
-                if (
-                    (
-                        db_cc_pair.status == ConnectorCredentialPairStatus.PAUSED
-                        and search_settings.status != IndexModelStatus.FUTURE
-                    )
-                    # if it's deleting, we don't care if this is a secondary index
-                    or db_cc_pair.status == ConnectorCredentialPairStatus.DELETING
-                ):
-                    # let the `except` block handle this
-                    raise RuntimeError("Connector was disabled mid run")
+            if _should_shard_window(
+                connector_runner.connector,
+                db_connector.source,
+                window_start,
+                window_end,
+            ):
+                shard_results = _run_sharded_window(
+                    db_session=db_session,
+                    index_attempt=index_attempt,
+                    search_settings=search_settings,
+                    indexing_pipeline=indexing_pipeline,
+                    window_start=window_start,
+                    window_end=window_end,
+                    tenant_id=tenant_id,
+                    callback=callback,
+                )
+                for shard_result in shard_results:
+                    batch_num += shard_result.num_batches
+                    net_doc_change += shard_result.net_doc_change
+                    chunk_count += shard_result.chunk_count
+                    document_count += shard_result.document_count
+                    index_attempt_md.num_exceptions += shard_result.num_exceptions
+
+                update_docs_indexed(
+                    db_session=db_session,
+                    index_attempt=index_attempt,
+                    total_docs_indexed=document_count,
+                    new_docs_indexed=net_doc_change,
+                    docs_removed_from_index=0,
+                )
 
-                db_session.refresh(index_attempt)
-                if index_attempt.status != IndexingStatus.IN_PROGRESS:
-                    # Likely due to user manually disabling it or model swap
+                # The window is only done if every shard is, otherwise it is redone
+                # by the next attempt
+                failed_shard_results = [
+                    shard_result for shard_result in shard_results if shard_result.error
+                ]
+                if failed_shard_results:
                     raise RuntimeError(
-                        f"Index Attempt was canceled, status is {index_attempt.status}"
+                        f"{len(failed_shard_results)} of {len(shard_results)} shards "
+                        f"failed, first error: {failed_shard_results[0].error}"
                     )
+            else:
+                all_connector_doc_ids: set[str] = set()
 
-                batch_description = []
-                for doc in doc_batch:
-                    batch_description.append(doc.to_short_descriptor())
+                if INDEXING_TRACER_INTERVAL > 0:
+                    tracer.snap()
+                for doc_batch in connector_runner.run():
+                    _check_indexing_can_continue(
+                        db_session, index_attempt, search_settings, callback
+                    )
 
-                    doc_size = 0
-                    for section in doc.sections:
-                        doc_size += len(section.text)
+                    batch_description = []
+                    for doc in doc_batch:
+                        batch_description.append(doc.to_short_descriptor())
 
-                    if doc_size > INDEXING_SIZE_WARNING_THRESHOLD:
-                        logger.warning(
-                            f"Document size: doc='{doc.to_short_descriptor()}' "
-                            f"size={doc_size} "
-                            f"threshold={INDEXING_SIZE_WARNING_THRESHOLD}"
-                        )
+                        doc_size = 0
+                        for section in doc.sections:
+                            doc_size += len(section.text)
 
-                logger.debug(f"Indexing batch of documents: {batch_description}")
+                        if doc_size > INDEXING_SIZE_WARNING_THRESHOLD:
+                            logger.warning(
+                                f"Document size: doc='{doc.to_short_descriptor()}' "
+                                f"size={doc_size} "
+                                f"threshold={INDEXING_SIZE_WARNING_THRESHOLD}"
+                            )
 
-                index_attempt_md.batch_num = batch_num + 1  # use 1-index for this
+                    logger.debug(f"Indexing batch of documents: {batch_description}")
 
-                # real work happens here!
-                new_docs, total_batch_chunks = indexing_pipeline(
-                    document_batch=doc_batch,
-                    index_attempt_metadata=index_attempt_md,
-                )
+                    index_attempt_md.batch_num = batch_num + 1  # use 1-index for this
 
-                batch_num += 1
-                net_doc_change += new_docs
-                chunk_count += total_batch_chunks
-                document_count += len(doc_batch)
-                all_connector_doc_ids.update(doc.id for doc in doc_batch)
+                    # real work happens here!
+                    new_docs, total_batch_chunks = indexing_pipeline(
+                        document_batch=doc_batch,
+                        index_attempt_metadata=index_attempt_md,
+                    )
 
-                # commit transaction so that the `update` below begins
-                # with a brand new transaction. Postgres uses the start
-                # of the transactions when computing `NOW()`, so if we have
-                # a long running transaction, the `time_updated` field will
-                # be inaccurate
-                db_session.commit()
+                    batch_num += 1
+                    net_doc_change += new_docs
+                    chunk_count += total_batch_chunks
+                    document_count += len(doc_batch)
+                    all_connector_doc_ids.update(doc.id for doc in doc_batch)
 
-                if callback:
-                    callback.progress("_run_indexing", len(doc_batch))
+                    # commit transaction so that the `update` below begins
+                    # with a brand new transaction. Postgres uses the start
+                    # of the transactions when computing `NOW()`, so if we have
+                    # a long running transaction, the `time_updated` field will
+                    # be inaccurate
+                    db_session.commit()
 
-                # This new value is updated every batch, so UI can refresh per batch update
-                update_docs_indexed(
-                    db_session=db_session,
-                    index_attempt=index_attempt,
-                    total_docs_indexed=document_count,
-                    new_docs_indexed=net_doc_change,
-                    docs_removed_from_index=0,
-                )
+                    if callback:
+                        callback.progress("_run_indexing", len(doc_batch))
 
-                tracer_counter += 1
-                if (
-                    INDEXING_TRACER_INTERVAL > 0
-                    and tracer_counter % INDEXING_TRACER_INTERVAL == 0
-                ):
-                    logger.debug(
-                        f"Running trace comparison for batch {tracer_counter}. interval={INDEXING_TRACER_INTERVAL}"
+                    # This new value is updated every batch, so UI can refresh per batch update
+                    update_docs_indexed(
+                        db_session=db_session,
+                        index_attempt=index_attempt,
+                        total_docs_indexed=document_count,
+                        new_docs_indexed=net_doc_change,
+                        docs_removed_from_index=0,
                     )
-                    tracer.snap()
-                    tracer.log_previous_diff(INDEXING_TRACER_NUM_PRINT_ENTRIES)
+
+                    # Everything up to here is indexed, a restart can continue after it
+                    if connector_runner.checkpoint is not None:
+                        update_index_attempt_checkpoint(
+                            db_session=db_session,
+                            index_attempt=index_attempt,
+                            checkpoint=IndexingCheckpoint(
+                                window_start=planned_window_start,
+                                window_end=window_end,
+                                connector_checkpoint=connector_runner.checkpoint,
+                            ),
+                        )
+
+                    tracer_counter += 1
+                    if (
+                        INDEXING_TRACER_INTERVAL > 0
+                        and tracer_counter % INDEXING_TRACER_INTERVAL == 0
+                    ):
+                        logger.debug(
+                            f"Running trace comparison for batch {tracer_counter}. interval={INDEXING_TRACER_INTERVAL}"
+                        )
+                        tracer.snap()
+                        tracer.log_previous_diff(INDEXING_TRACER_NUM_PRINT_ENTRIES)
 
             run_end_dt = window_end
+            if index_attempt.checkpoint is not None:
+                update_index_attempt_checkpoint(
+                    db_session=db_session, index_attempt=index_attempt, checkpoint=None
+                )
             if is_primary:
                 update_connector_credential_pair(
                     db_session=db_session,
@@ -473,3 +909,60 @@ def run_indexing_entrypoint(
         logger.exception(
             f"Indexing job with ID '{index_attempt_id}' for tenant {tenant_id} failed due to {e}"
         )
+
+
+def run_indexing_shards_entrypoint(
+    index_attempt_id: int,
+    tenant_id: str | None,
+    connector_credential_pair_id: int,
+    search_settings_id: int,
+    is_ee: bool = False,
+    callback: IndexingHeartbeatInterface | None = None,
+) -> None:
+    """Entrypoint of the helper tasks of a sharded poll window, indexes shards until
+    there are none left to claim. The indexing task merges the results."""
+    if is_ee:
+        global_version.set_ee()
+
+    TaskAttemptSingleton.set_cc_and_index_id(
+        index_attempt_id, connector_credential_pair_id
+    )
+    redis_connector_index = RedisConnector(
+        tenant_id, connector_credential_pair_id
+    ).new_index(search_settings_id)
+
+    with get_session_with_tenant(tenant_id) as db_session:
+        index_attempt = get_index_attempt(db_session, index_attempt_id)
+        if (
+            not index_attempt
+            or not index_attempt.search_settings
+            or index_attempt.status != IndexingStatus.IN_PROGRESS
+        ):
+            logger.info("Index attempt is no longer running, no shards to index")
+            return
+
+        indexing_pipeline = _build_attempt_indexing_pipeline(
+            db_session=db_session,
+            index_attempt=index_attempt,
+            search_settings=index_attempt.search_settings,
+            tenant_id=tenant_id,
+            callback=callback,
+        )
+
+        num_shards = 0
+        while shard := redis_connector_index.claim_shard():
+            redis_connector_index.set_shard_result(
+                _index_shard(
+                    db_session=db_session,
+                    index_attempt=index_attempt,
+                    search_settings=index_attempt.search_settings,
+                    indexing_pipeline=indexing_pipeline,
+                    shard=shard,
+                    redis_connector_index=redis_connector_index,
+                    tenant_id=tenant_id,
+                    callback=callback,
+                )
+            )
+            num_shards += 1
+
+        logger.info(f"Indexing shards finished: shards={num_shards}")
@@ -81,6 +81,11 @@ class FinalUsedContextDocsResponse(BaseModel):
     final_context_docs: list[LlmDoc]
 
 
+class SearchTimingsResponse(BaseModel):
+    # Milliseconds spent in each search stage, only sent if RETURN_SEARCH_TIMINGS is set
+    search_timings: dict[str, float]
+
+
 class RelevanceAnalysis(BaseModel):
     relevant: bool
     content: str | None = None
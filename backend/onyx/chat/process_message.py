@@ -25,8 +25,10 @@ from onyx.chat.models import OnyxAnswerPiece
 from onyx.chat.models import OnyxContexts
 from onyx.chat.models import PromptConfig
 from onyx.chat.models import QADocsResponse
+from onyx.chat.models import SearchTimingsResponse
 from onyx.chat.models import StreamingError
 from onyx.chat.models import StreamStopInfo
+from onyx.chat.stream_processing.packet_framing import frame_packets
 from onyx.configs.chat_configs import CHAT_TARGET_CHUNK_PERCENTAGE
 from onyx.configs.chat_configs import DISABLE_LLM_CHOOSE_SEARCH
 from onyx.configs.chat_configs import MAX_CHUNKS_FED_TO_CHAT
@@ -76,7 +78,6 @@ from onyx.llm.utils import litellm_exception_to_error_msg
 from onyx.natural_language_processing.utils import get_tokenizer
 from onyx.server.query_and_chat.models import ChatMessageDetail
 from onyx.server.query_and_chat.models import CreateChatMessageRequest
-from onyx.server.utils import get_json_line
 from onyx.tools.force import ForceUseTool
 from onyx.tools.models import ToolResponse
 from onyx.tools.tool import Tool
@@ -115,6 +116,7 @@ from onyx.tools.tool_implementations.search.search_tool import (
     SEARCH_RESPONSE_SUMMARY_ID,
 )
 from onyx.tools.tool_implementations.search.search_tool import SearchResponseSummary
+from onyx.tools.tool_implementations.search.search_tool import SEARCH_TIMINGS_ID
 from onyx.tools.tool_implementations.search.search_tool import SearchTool
 from onyx.tools.tool_implementations.search.search_tool import (
     SECTION_RELEVANCE_LIST_ID,
@@ -272,6 +274,7 @@ ChatPacket = (
     | OnyxContexts
     | LLMRelevanceFilterResponse
     | FinalUsedContextDocsResponse
+    | SearchTimingsResponse
     | ChatMessageDetail
     | OnyxAnswerPiece
     | AllCitations
@@ -761,6 +764,8 @@ def stream_chat_message_objects(
                     yield FinalUsedContextDocsResponse(
                         final_context_docs=packet.response
                     )
+                elif packet.id == SEARCH_TIMINGS_ID:
+                    yield SearchTimingsResponse(search_timings=packet.response)
 
                 elif packet.id == IMAGE_GENERATION_RESPONSE_ID:
                     img_generation_response = cast(
@@ -930,8 +935,7 @@ def stream_chat_message(
             custom_tool_additional_headers=custom_tool_additional_headers,
             is_connected=is_connected,
         )
-        for obj in objects:
-            yield get_json_line(obj.model_dump())
+        yield from frame_packets(objects)
 
 
 @log_function_time()
@@ -8,12 +8,16 @@ from pydantic.v1 import BaseModel as BaseModel__v1
 
 from onyx.chat.models import PromptConfig
 from onyx.chat.prompt_builder.citations_prompt import compute_max_llm_input_tokens
+from onyx.chat.prompt_builder.utils import build_cacheable_system_prompt
+from onyx.chat.prompt_builder.utils import build_cacheable_turn_info
 from onyx.chat.prompt_builder.utils import translate_history_to_basemessages
+from onyx.configs.chat_configs import ENABLE_PROMPT_CACHE_LAYOUT
 from onyx.file_store.models import InMemoryChatFile
 from onyx.llm.interfaces import LLMConfig
 from onyx.llm.models import PreviousMessage
 from onyx.llm.utils import build_content_with_imgs
 from onyx.llm.utils import check_message_tokens
+from onyx.llm.utils import mark_prompt_cache_breakpoint
 from onyx.llm.utils import message_to_prompt_and_imgs
 from onyx.natural_language_processing.utils import get_tokenizer
 from onyx.prompts.chat_prompts import CHAT_USER_CONTEXT_FREE_PROMPT
@@ -29,9 +33,16 @@ from onyx.tools.tool import Tool
 def default_build_system_message(
     prompt_config: PromptConfig,
 ) -> SystemMessage | None:
-    system_prompt = prompt_config.system_prompt.strip()
-    if prompt_config.datetime_aware:
-        system_prompt = add_date_time_to_prompt(prompt_str=system_prompt)
+    if ENABLE_PROMPT_CACHE_LAYOUT:
+        system_prompt = build_cacheable_system_prompt(
+            system_prompt=prompt_config.system_prompt,
+            task_prompt=prompt_config.task_prompt,
+            datetime_aware=prompt_config.datetime_aware,
+        )
+    else:
+        system_prompt = prompt_config.system_prompt.strip()
+        if prompt_config.datetime_aware:
+            system_prompt = add_date_time_to_prompt(prompt_str=system_prompt)
 
     if not system_prompt:
         return None
@@ -44,11 +55,17 @@ def default_build_system_message(
 def default_build_user_message(
     user_query: str, prompt_config: PromptConfig, files: list[InMemoryChatFile] = []
 ) -> HumanMessage:
+    # With the prompt cache layout, the task prompt is part of the system message instead
+    task_prompt = (
+        build_cacheable_turn_info(prompt_config)
+        if ENABLE_PROMPT_CACHE_LAYOUT
+        else prompt_config.task_prompt
+    )
     user_prompt = (
         CHAT_USER_CONTEXT_FREE_PROMPT.format(
-            task_prompt=prompt_config.task_prompt, user_query=user_query
+            task_prompt=task_prompt, user_query=user_query
         )
-        if prompt_config.task_prompt
+        if task_prompt
         else user_query
     )
     user_prompt = user_prompt.strip()
@@ -137,6 +154,21 @@ class AnswerPromptBuilder:
             ]
         )
 
+        if ENABLE_PROMPT_CACHE_LAYOUT:
+            # The system prompt (and the tools before it) are the same every turn and the
+            # history up to here is the prefix of the next follow-up's prompt
+            breakpoint_inds = set()
+            if self.system_message_and_token_cnt:
+                breakpoint_inds.add(0)
+            if self.message_history:
+                breakpoint_inds.add(len(final_messages_with_tokens) - 1)
+            final_messages_with_tokens = [
+                (mark_prompt_cache_breakpoint(message), token_cnt)
+                if ind in breakpoint_inds
+                else (message, token_cnt)
+                for ind, (message, token_cnt) in enumerate(final_messages_with_tokens)
+            ]
+
         final_messages_with_tokens.append(self.user_message_and_token_cnt)
 
         if self.new_messages_and_token_cnts:
@@ -3,6 +3,9 @@ from langchain.schema.messages import SystemMessage
 
 from onyx.chat.models import LlmDoc
 from onyx.chat.models import PromptConfig
+from onyx.chat.prompt_builder.utils import build_cacheable_system_prompt
+from onyx.chat.prompt_builder.utils import build_cacheable_turn_info
+from onyx.configs.chat_configs import ENABLE_PROMPT_CACHE_LAYOUT
 from onyx.configs.model_configs import GEN_AI_SINGLE_USER_MESSAGE_EXPECTED_MAX_TOKENS
 from onyx.context.search.models import InferenceChunk
 from onyx.db.models import Persona
@@ -125,7 +128,16 @@ def build_citations_system_message(
     system_prompt = prompt_config.system_prompt.strip()
     if prompt_config.include_citations:
         system_prompt += REQUIRE_CITATION_STATEMENT
-    if prompt_config.datetime_aware:
+    if ENABLE_PROMPT_CACHE_LAYOUT:
+        system_prompt = build_cacheable_system_prompt(
+            system_prompt=system_prompt,
+            task_prompt=build_task_prompt_reminders(
+                prompt=prompt_config,
+                use_language_hint=bool(get_multilingual_expansion()),
+            ),
+            datetime_aware=prompt_config.datetime_aware,
+        )
+    elif prompt_config.datetime_aware:
         system_prompt = add_date_time_to_prompt(prompt_str=system_prompt)
 
     return SystemMessage(content=system_prompt)
@@ -138,10 +150,14 @@ def build_citations_user_message(
     all_doc_useful: bool,
     history_message: str = "",
 ) -> HumanMessage:
-    multilingual_expansion = get_multilingual_expansion()
-    task_prompt_with_reminder = build_task_prompt_reminders(
-        prompt=prompt_config, use_language_hint=bool(multilingual_expansion)
-    )
+    if ENABLE_PROMPT_CACHE_LAYOUT:
+        # The task prompt is part of the system message instead
+        task_prompt_with_reminder = build_cacheable_turn_info(prompt_config)
+    else:
+        multilingual_expansion = get_multilingual_expansion()
+        task_prompt_with_reminder = build_task_prompt_reminders(
+            prompt=prompt_config, use_language_hint=bool(multilingual_expansion)
+        )
 
     history_block = (
         HISTORY_BLOCK.format(history_str=history_message) + "\n"
@@ -2,6 +2,7 @@ from langchain.schema.messages import AIMessage
 from langchain.schema.messages import BaseMessage
 from langchain.schema.messages import HumanMessage
 
+from onyx.chat.models import PromptConfig
 from onyx.configs.constants import MessageType
 from onyx.db.models import ChatMessage
 from onyx.file_store.models import InMemoryChatFile
@@ -9,6 +10,9 @@ from onyx.llm.models import PreviousMessage
 from onyx.llm.utils import build_content_with_imgs
 from onyx.prompts.direct_qa_prompts import PARAMATERIZED_PROMPT
 from onyx.prompts.direct_qa_prompts import PARAMATERIZED_PROMPT_WITHOUT_CONTEXT
+from onyx.prompts.prompt_utils import add_date_time_to_prompt
+from onyx.prompts.prompt_utils import DANSWER_DATETIME_REPLACEMENT
+from onyx.prompts.prompt_utils import get_current_llm_day_time
 
 
 def build_dummy_prompt(
@@ -58,3 +62,28 @@ def translate_history_to_basemessages(
     ]
     history_token_counts = [msg.token_count for msg in history if msg.token_count != 0]
     return history_basemessages, history_token_counts
+
+
+def build_cacheable_system_prompt(
+    system_prompt: str, task_prompt: str, datetime_aware: bool
+) -> str:
+    """For the prompt cache layout, the persona instructions are moved from the user message
+    into the system prompt so everything before the chat history stays the same"""
+    system_prompt = "\n\n".join(
+        part for part in [system_prompt.strip(), task_prompt.strip()] if part
+    )
+    # An explicitly placed datetime is kept, even though it changes the prefix every minute
+    if datetime_aware and DANSWER_DATETIME_REPLACEMENT in system_prompt:
+        system_prompt = add_date_time_to_prompt(prompt_str=system_prompt)
+    return system_prompt
+
+
+def build_cacheable_turn_info(prompt_config: PromptConfig) -> str:
+    """Per turn information that goes in the latest user message for the prompt cache layout"""
+    if (
+        not prompt_config.datetime_aware
+        or DANSWER_DATETIME_REPLACEMENT in prompt_config.system_prompt
+        or DANSWER_DATETIME_REPLACEMENT in prompt_config.task_prompt
+    ):
+        return ""
+    return get_current_llm_day_time() + "."
@@ -1,6 +1,7 @@
 import json
 from collections import defaultdict
 from copy import deepcopy
+from typing import cast
 from typing import TypeVar
 
 from pydantic import BaseModel
@@ -16,6 +17,7 @@ from onyx.configs.model_configs import DOC_EMBEDDING_CONTEXT_SIZE
 from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceSection
 from onyx.llm.interfaces import LLMConfig
+from onyx.natural_language_processing.utils import BaseTokenizer
 from onyx.natural_language_processing.utils import get_tokenizer
 from onyx.natural_language_processing.utils import tokenizer_trim_content
 from onyx.prompts.prompt_utils import build_doc_context_str
@@ -131,6 +133,46 @@ def _remove_sections_to_ignore(
     ]
 
 
+def _build_section_str(
+    section: InferenceSection, ind: int, using_tool_message: bool
+) -> str:
+    # If using tool message, it will be a bit of an overestimate as the extra json text around the section
+    # will be counted towards the token count. However, once the Sections are merged, the extra json parts
+    # that overlap will not be counted multiple times like it is in the pruning step.
+    if using_tool_message:
+        return json.dumps(section_to_dict(section, ind))
+    return build_doc_context_str(
+        semantic_identifier=section.center_chunk.semantic_identifier,
+        source_type=section.center_chunk.source_type,
+        content=section.combined_content,
+        metadata_dict=section.center_chunk.metadata,
+        updated_at=section.center_chunk.updated_at,
+        ind=ind,
+    )
+
+
+def _precomputed_content_token_count(
+    section: InferenceSection, llm_tokenizer: BaseTokenizer
+) -> int | None:
+    """Token count of the section content from the counts stored at indexing time. Returns
+    None if any chunk is missing a count for this tokenizer or if the content is no longer
+    just the chunks joined together (e.g. it has been trimmed)."""
+    if not section.chunks:
+        return None
+
+    chunk_token_counts = [
+        chunk.llm_token_counts.get(llm_tokenizer.family) for chunk in section.chunks
+    ]
+    if any(count is None for count in chunk_token_counts):
+        return None
+
+    if section.combined_content != "\n".join(chunk.content for chunk in section.chunks):
+        return None
+
+    # Joining newlines are counted as a token each which may be a slight overcount
+    return sum(cast(list[int], chunk_token_counts)) + len(section.chunks) - 1
+
+
 def _apply_pruning(
     sections: list[InferenceSection],
     section_relevance_list: list[bool] | None,
@@ -156,23 +198,26 @@ def _apply_pruning(
     final_section_ind = None
     total_tokens = 0
     for ind, section in enumerate(sections):
-        section_str = (
-            # If using tool message, it will be a bit of an overestimate as the extra json text around the section
-            # will be counted towards the token count. However, once the Sections are merged, the extra json parts
-            # that overlap will not be counted multiple times like it is in the pruning step.
-            json.dumps(section_to_dict(section, ind))
-            if using_tool_message
-            else build_doc_context_str(
-                semantic_identifier=section.center_chunk.semantic_identifier,
-                source_type=section.center_chunk.source_type,
-                content=section.combined_content,
-                metadata_dict=section.center_chunk.metadata,
-                updated_at=section.center_chunk.updated_at,
-                ind=ind,
+        content_token_count = _precomputed_content_token_count(section, llm_tokenizer)
+        if content_token_count is None:
+            section_token_count = len(
+                llm_tokenizer.encode(
+                    _build_section_str(section, ind, using_tool_message)
+                )
+            )
+        else:
+            # Only the title / metadata wrapper needs to be tokenized, this is slightly off
+            # for tool messages since the content would be json escaped
+            section_token_count = content_token_count + len(
+                llm_tokenizer.encode(
+                    _build_section_str(
+                        section.model_copy(update={"combined_content": ""}),
+                        ind,
+                        using_tool_message,
+                    )
+                )
             )
-        )
 
-        section_token_count = len(llm_tokenizer.encode(section_str))
         # if not using sections (specifically, using Sections where each section maps exactly to the one center chunk),
         # truncate chunks that are way too long. This can happen if the embedding model tokenizer is different
         # than the LLM tokenizer
@@ -224,9 +269,14 @@ def _apply_pruning(
             amount_to_truncate = total_tokens - token_limit
             # NOTE: need to recalculate the length here, since the previous calculation included
             # overhead from JSON-fying the doc / the metadata
-            final_doc_content_length = len(
-                llm_tokenizer.encode(sections[final_section_ind].combined_content)
-            ) - (amount_to_truncate)
+            final_content_token_count = _precomputed_content_token_count(
+                sections[final_section_ind], llm_tokenizer
+            )
+            if final_content_token_count is None:
+                final_content_token_count = len(
+                    llm_tokenizer.encode(sections[final_section_ind].combined_content)
+                )
+            final_doc_content_length = final_content_token_count - amount_to_truncate
             # this could occur if we only have space for the title / metadata
             # not ideal, but it's the most reasonable thing to do
             # NOTE: the frontend prevents documents from being selected if
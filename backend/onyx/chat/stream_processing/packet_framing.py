@@ -0,0 +1,66 @@
+import time
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+from pydantic import BaseModel
+
+from onyx.chat.models import OnyxAnswerPiece
+from onyx.configs.chat_configs import STREAMING_FRAME_MAX_CHARS
+from onyx.configs.chat_configs import STREAMING_FRAME_MAX_DELAY_MS
+from onyx.server.utils import get_json_line
+
+
+def frame_packets(
+    packets: Iterable[BaseModel],
+    max_delay_ms: int = STREAMING_FRAME_MAX_DELAY_MS,
+    max_frame_chars: int = STREAMING_FRAME_MAX_CHARS,
+) -> Iterator[str]:
+    """Serializes packets into newline delimited json frames. Consecutive answer pieces are
+    merged into one answer piece packet, so the packets the consumer sees are unchanged apart
+    from there being fewer answer pieces. A frame is sent once the first buffered piece is
+    `max_delay_ms` old or the frame holds `max_frame_chars`, and whenever any other packet
+    comes through so that those are never delayed.
+
+    NOTE: the delay is only checked when the next packet arrives, a stall in the LLM output
+    holds back the pieces buffered before it."""
+    answer_pieces: list[str] = []
+    answer_chars = 0
+    frame_lines: list[str] = []
+    frame_started_at: float | None = None
+
+    def _flush_answer_pieces() -> None:
+        nonlocal answer_chars
+        if answer_pieces:
+            frame_lines.append(get_json_line({"answer_piece": "".join(answer_pieces)}))
+            answer_pieces.clear()
+            answer_chars = 0
+
+    def _build_frame() -> str:
+        nonlocal frame_started_at
+        _flush_answer_pieces()
+        frame = "".join(frame_lines)
+        frame_lines.clear()
+        frame_started_at = None
+        return frame
+
+    for packet in packets:
+        if isinstance(packet, OnyxAnswerPiece) and packet.answer_piece:
+            if frame_started_at is None:
+                frame_started_at = time.monotonic()
+            answer_pieces.append(packet.answer_piece)
+            answer_chars += len(packet.answer_piece)
+
+            if (
+                answer_chars >= max_frame_chars
+                or (time.monotonic() - frame_started_at) * 1000 >= max_delay_ms
+            ):
+                yield _build_frame()
+            continue
+
+        # Anything else (including the answer end marker) goes out with the buffered pieces
+        _flush_answer_pieces()
+        frame_lines.append(get_json_line(packet.model_dump()))
+        yield _build_frame()
+
+    if answer_pieces or frame_lines:
+        yield _build_frame()
@@ -5,6 +5,7 @@ from typing import cast
 
 from onyx.configs.constants import AuthType
 from onyx.configs.constants import DocumentIndexType
+from onyx.configs.constants import EmbeddingQuantization
 from onyx.file_processing.enums import HtmlBasedConnectorTransformLinksStrategy
 
 #####
@@ -129,6 +130,14 @@ VESPA_DEPLOYMENT_ZIP = (
 VESPA_CLOUD_CERT_PATH = os.environ.get("VESPA_CLOUD_CERT_PATH")
 VESPA_CLOUD_KEY_PATH = os.environ.get("VESPA_CLOUD_KEY_PATH")
 
+# Nearest neighbor search runs on an int8 or binary quantized copy of the embeddings, the
+# full precision embeddings are paged from disk and only used to rescore the hits. One of
+# "none", "int8" or "binary". Changing it for an existing index requires all documents to be
+# reindexed since the quantized embeddings are written at indexing time
+VESPA_EMBEDDING_QUANTIZATION = EmbeddingQuantization(
+    (os.environ.get("VESPA_EMBEDDING_QUANTIZATION") or "none").lower()
+)
+
 # Number of documents in a batch during indexing (further batching done by chunks before passing to bi-encoder)
 try:
     INDEX_BATCH_SIZE = int(os.environ.get("INDEX_BATCH_SIZE", 16))
@@ -360,6 +369,36 @@ EXPERIMENTAL_CHECKPOINTING_ENABLED = (
     os.environ.get("EXPERIMENTAL_CHECKPOINTING_ENABLED", "").lower() == "true"
 )
 
+# Opt-in, when set index attempts run in a warm, reused process per indexing worker,
+# which is replaced after this many attempts or once it uses more than
+# INDEXING_WORKER_MAX_RSS_MB (0 for no limit). The RSS is only checked between attempts,
+# an attempt is never stopped while it runs. Attempts of different tenants and cc pairs
+# then share process wide state, 0 (the default) spawns a new process for every attempt
+INDEXING_WORKER_MAX_JOBS = int(os.environ.get("INDEXING_WORKER_MAX_JOBS") or 0)
+INDEXING_WORKER_MAX_RSS_MB = int(os.environ.get("INDEXING_WORKER_MAX_RSS_MB") or 2048)
+
+# Every cc_pair is checked for indexing at least this often (in seconds), in between
+# only the ones that are due or had their config changed are checked
+INDEXING_SCHEDULE_REBUILD_INTERVAL = int(
+    os.environ.get("INDEXING_SCHEDULE_REBUILD_INTERVAL") or 60 * 60
+)
+
+# Splits long poll windows into this many sub-windows that are indexed in parallel by
+# the indexing workers, 1 disables it. Only for the sources below, whose APIs serve
+# parallel date range queries well
+INDEXING_POLL_SHARDS = int(os.environ.get("INDEXING_POLL_SHARDS") or 1)
+INDEXING_POLL_SHARD_SOURCES = [
+    source.strip().lower()
+    for source in (
+        os.environ.get("INDEXING_POLL_SHARD_SOURCES") or "zendesk,jira,gmail,slack"
+    ).split(",")
+    if source.strip()
+]
+# Only poll windows at least this long are split up
+INDEXING_POLL_SHARD_MIN_WINDOW_DAYS = float(
+    os.environ.get("INDEXING_POLL_SHARD_MIN_WINDOW_DAYS") or 30
+)
+
 PRUNING_DISABLED = -1
 DEFAULT_PRUNING_FREQ = 60 * 60 * 24  # Once a day
 
@@ -372,6 +411,15 @@ MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE = int(
     os.environ.get("MAX_PRUNING_DOCUMENT_RETRIEVAL_PER_MINUTE", 0)
 )
 
+# Number of indexed document IDs compared against the source per round trip while pruning
+PRUNING_DOC_ID_BATCH_SIZE = int(os.environ.get("PRUNING_DOC_ID_BATCH_SIZE") or 1000)
+
+# Number of documents whose external permissions are applied by a single task during a
+# doc permission sync
+DOC_PERMISSION_SYNC_BATCH_SIZE = int(
+    os.environ.get("DOC_PERMISSION_SYNC_BATCH_SIZE") or 200
+)
+
 # comma delimited list of zendesk article labels to skip indexing for
 ZENDESK_CONNECTOR_SKIP_ARTICLE_LABELS = os.environ.get(
     "ZENDESK_CONNECTOR_SKIP_ARTICLE_LABELS", ""
@@ -400,6 +448,13 @@ NUM_INDEXING_WORKERS = int(os.environ.get("NUM_INDEXING_WORKERS") or 1)
 NUM_SECONDARY_INDEXING_WORKERS = int(
     os.environ.get("NUM_SECONDARY_INDEXING_WORKERS") or NUM_INDEXING_WORKERS
 )
+# When switching embedding models, build the new index from the chunks in the current index
+# instead of pulling every document from its source again. Only used for connectors whose
+# documents the new model would chunk the same way (same tokenizer), the others are indexed
+# through the connector as usual. Also falls back to the connector if a re-embed failed once.
+REEMBED_FROM_CURRENT_INDEX = (
+    os.environ.get("REEMBED_FROM_CURRENT_INDEX", "").lower() == "true"
+)
 # More accurate results at the expense of indexing speed and index size (stores additional 4 MINI_CHUNK vectors)
 ENABLE_MULTIPASS_INDEXING = (
     os.environ.get("ENABLE_MULTIPASS_INDEXING", "").lower() == "true"
@@ -415,6 +470,17 @@ LARGE_CHUNK_RATIO = 4
 # Include the document level metadata in each chunk. If the metadata is too long, then it is thrown out
 # We don't want the metadata to overwhelm the actual contents of the chunk
 SKIP_METADATA_IN_CHUNK = os.environ.get("SKIP_METADATA_IN_CHUNK", "").lower() == "true"
+
+# Chunk token counts are stored at indexing time for these tiktoken encodings (plus the
+# default tokenizer) so that prompt pruning does not need to re-tokenize retrieved chunks.
+# Set to an empty string to only store counts for the default tokenizer
+LLM_TOKEN_COUNT_TIKTOKEN_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.environ.get(
+        "LLM_TOKEN_COUNT_TIKTOKEN_ENCODINGS", "o200k_base,cl100k_base"
+    ).split(",")
+    if encoding.strip()
+]
 # Timeout to wait for job's last update before killing it, in hours
 CLEANUP_INDEXING_JOBS_TIMEOUT = int(
     os.environ.get("CLEANUP_INDEXING_JOBS_TIMEOUT") or 3
@@ -483,6 +549,16 @@ CUSTOM_ANSWER_VALIDITY_CONDITIONS = json.loads(
 )
 
 VESPA_REQUEST_TIMEOUT = int(os.environ.get("VESPA_REQUEST_TIMEOUT") or "15")
+# Connection pool of the process wide Vespa clients, HTTP/2 multiplexes requests over
+# each connection so few connections are needed
+VESPA_HTTP_MAX_CONNECTIONS = int(os.environ.get("VESPA_HTTP_MAX_CONNECTIONS") or "100")
+VESPA_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.environ.get("VESPA_HTTP_MAX_KEEPALIVE_CONNECTIONS") or "20"
+)
+# Seconds an idle connection is kept open
+VESPA_HTTP_KEEPALIVE_EXPIRY = float(
+    os.environ.get("VESPA_HTTP_KEEPALIVE_EXPIRY") or "60"
+)
 
 SYSTEM_RECURSION_LIMIT = int(os.environ.get("SYSTEM_RECURSION_LIMIT") or "1000")
 
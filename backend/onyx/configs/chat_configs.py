@@ -81,6 +81,12 @@ DISABLE_LLM_DOC_RELEVANCE = (
 # Stops streaming answers back to the UI if this pattern is seen:
 STOP_STREAM_PAT = os.environ.get("STOP_STREAM_PAT") or None
 
+# Consecutive answer pieces streamed back to the UI are combined into a single packet and
+# written together until either budget is hit. Packets other than answer pieces are always
+# sent right away. Set the delay to 0 to send every piece separately
+STREAMING_FRAME_MAX_DELAY_MS = int(os.environ.get("STREAMING_FRAME_MAX_DELAY_MS") or 50)
+STREAMING_FRAME_MAX_CHARS = int(os.environ.get("STREAMING_FRAME_MAX_CHARS") or 2048)
+
 # Set this to "true" to hard delete chats
 # This will make chats unviewable by admins after a user deletes them
 # As opposed to soft deleting them, which just hides them from non-admin users
@@ -93,3 +99,51 @@ BING_API_KEY = os.environ.get("BING_API_KEY") or None
 ENABLE_CONNECTOR_CLASSIFIER = os.environ.get("ENABLE_CONNECTOR_CLASSIFIER", False)
 
 VESPA_SEARCHER_THREADS = int(os.environ.get("VESPA_SEARCHER_THREADS") or 2)
+
+# Opt-in result cache for the deterministic secondary LLM flows (query rephrasing, source
+# filter extraction, multilingual expansion, section relevance). Comma separated list of flow
+# names to cache, e.g. "history_rephrase,source_filter,multilingual_expansion,
+# section_relevance". Empty (the default) disables the cache entirely. Time filter
+# extraction is never cached, its prompt includes the current time
+SECONDARY_LLM_FLOW_CACHE_FLOWS = [
+    flow.strip().lower()
+    for flow in (os.environ.get("SECONDARY_LLM_FLOW_CACHE_FLOWS") or "").split(",")
+    if flow.strip()
+]
+SECONDARY_LLM_FLOW_CACHE_TTL = int(
+    os.environ.get("SECONDARY_LLM_FLOW_CACHE_TTL") or 60 * 60 * 24  # 1 day
+)
+
+# Caches retrieval results (chunks and their expanded sections) in Redis for identical
+# searches by users with the same access. Any write to the document index invalidates the
+# cache for the tenant. 0 (the default) disables the cache
+RETRIEVAL_CACHE_TTL = int(os.environ.get("RETRIEVAL_CACHE_TTL") or 0)
+
+# Cross-encoder scores are cached per (rerank model, query, chunk content) so only chunks
+# not scored before for the query are sent to the reranker. Since the content is part of
+# the key, entries can't go stale. 0 (the default) disables the cache
+RERANK_SCORE_CACHE_TTL = int(os.environ.get("RERANK_SCORE_CACHE_TTL") or 0)
+
+# Returns the time spent in each search stage (milliseconds) with the search results, for
+# debugging latency. The stage timings are exported as Prometheus histograms regardless
+RETURN_SEARCH_TIMINGS = os.environ.get("RETURN_SEARCH_TIMINGS", "").lower() == "true"
+
+# For follow-up messages, start retrieval for the raw user message (and a cheap heuristic
+# rewrite of it) while the history based query rephrase is still running. If the rephrased
+# query ends up semantically equivalent to one of them, the speculative results are reused
+ENABLE_SPECULATIVE_RETRIEVAL = (
+    os.environ.get("ENABLE_SPECULATIVE_RETRIEVAL", "").lower() == "true"
+)
+# Minimum cosine similarity between the rephrased query and a speculative query embedding
+# for the speculative results to be reused
+SPECULATIVE_RETRIEVAL_SIMILARITY_THRESHOLD = float(
+    os.environ.get("SPECULATIVE_RETRIEVAL_SIMILARITY_THRESHOLD") or 0.95
+)
+
+# Lays out the answer prompt so that the system prompt, tools and persona instructions form a
+# prefix that stays the same across turns (the current date/time moves into the latest user
+# message) and marks prompt cache breakpoints for models that need them (Anthropic). Providers
+# like OpenAI cache matching prefixes automatically. Also records cached prompt token usage
+ENABLE_PROMPT_CACHE_LAYOUT = (
+    os.environ.get("ENABLE_PROMPT_CACHE_LAYOUT", "").lower() == "true"
+)
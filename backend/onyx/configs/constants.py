@@ -165,6 +165,12 @@ class DocumentIndexType(str, Enum):
     SPLIT = "split"  # Typesense + Qdrant
 
 
+class EmbeddingQuantization(str, Enum):
+    NONE = "none"
+    INT8 = "int8"
+    BINARY = "binary"
+
+
 class AuthType(str, Enum):
     DISABLED = "disabled"
     BASIC = "basic"
@@ -304,10 +310,14 @@ class OnyxCeleryTask:
     UPDATE_EXTERNAL_DOCUMENT_PERMISSIONS_TASK = (
         "update_external_document_permissions_task"
     )
+    UPDATE_EXTERNAL_DOCUMENT_PERMISSIONS_BATCH_TASK = (
+        "update_external_document_permissions_batch_task"
+    )
     CONNECTOR_EXTERNAL_GROUP_SYNC_GENERATOR_TASK = (
         "connector_external_group_sync_generator_task"
     )
     CONNECTOR_INDEXING_PROXY_TASK = "connector_indexing_proxy_task"
+    CONNECTOR_INDEXING_SHARD_TASK = "connector_indexing_shard_task"
     CONNECTOR_PRUNING_GENERATOR_TASK = "connector_pruning_generator_task"
     DOCUMENT_BY_CC_PAIR_CLEANUP_TASK = "document_by_cc_pair_cleanup_task"
     VESPA_METADATA_SYNC_TASK = "vespa_metadata_sync_task"
@@ -1,3 +1,4 @@
+from collections.abc import Iterator
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -16,6 +17,9 @@ from onyx.connectors.confluence.utils import build_confluence_document_id
 from onyx.connectors.confluence.utils import datetime_from_string
 from onyx.connectors.confluence.utils import extract_text_from_confluence_html
 from onyx.connectors.confluence.utils import validate_attachment_filetype
+from onyx.connectors.interfaces import CheckpointConnector
+from onyx.connectors.interfaces import ConnectorCheckpoint
+from onyx.connectors.interfaces import GenerateCheckpointedDocumentsOutput
 from onyx.connectors.interfaces import GenerateDocumentsOutput
 from onyx.connectors.interfaces import GenerateSlimDocumentOutput
 from onyx.connectors.interfaces import LoadConnector
@@ -57,7 +61,9 @@ _RESTRICTIONS_EXPANSION_FIELDS = [
 _SLIM_DOC_BATCH_SIZE = 5000
 
 
-class ConfluenceConnector(LoadConnector, PollConnector, SlimConnector):
+class ConfluenceConnector(
+    LoadConnector, PollConnector, SlimConnector, CheckpointConnector
+):
     def __init__(
         self,
         wiki_base: str,
@@ -228,16 +234,8 @@ class ConfluenceConnector(LoadConnector, PollConnector, SlimConnector):
 
         # Fetch attachments as Documents
         for confluence_page_id in confluence_page_ids:
-            attachment_cql = f"type=attachment and container='{confluence_page_id}'"
-            attachment_cql += self.cql_label_filter
-            # TODO: maybe should add time filter as well?
-            for attachment in self.confluence_client.paginated_cql_retrieval(
-                cql=attachment_cql,
-                expand=",".join(_ATTACHMENT_EXPANSION_FIELDS),
-            ):
-                doc = self._convert_object_to_document(attachment)
-                if doc is not None:
-                    doc_batch.append(doc)
+            for doc in self._fetch_attachment_documents(confluence_page_id):
+                doc_batch.append(doc)
                 if len(doc_batch) >= self.batch_size:
                     yield doc_batch
                     doc_batch = []
@@ -245,11 +243,24 @@ class ConfluenceConnector(LoadConnector, PollConnector, SlimConnector):
         if doc_batch:
             yield doc_batch
 
+    def _fetch_attachment_documents(
+        self, confluence_page_id: str
+    ) -> Iterator[Document]:
+        attachment_cql = f"type=attachment and container='{confluence_page_id}'"
+        attachment_cql += self.cql_label_filter
+        # TODO: maybe should add time filter as well?
+        for attachment in self.confluence_client.paginated_cql_retrieval(
+            cql=attachment_cql,
+            expand=",".join(_ATTACHMENT_EXPANSION_FIELDS),
+        ):
+            doc = self._convert_object_to_document(attachment)
+            if doc is not None:
+                yield doc
+
     def load_from_state(self) -> GenerateDocumentsOutput:
         return self._fetch_document_batches()
 
-    def poll_source(self, start: float, end: float) -> GenerateDocumentsOutput:
-        # Add time filters
+    def _set_cql_time_filter(self, start: float, end: float) -> None:
         formatted_start_time = datetime.fromtimestamp(start, tz=self.timezone).strftime(
             "%Y-%m-%d %H:%M"
         )
@@ -258,8 +269,61 @@ class ConfluenceConnector(LoadConnector, PollConnector, SlimConnector):
         )
         self.cql_time_filter = f" and lastmodified >= '{formatted_start_time}'"
         self.cql_time_filter += f" and lastmodified <= '{formatted_end_time}'"
+
+    def poll_source(self, start: float, end: float) -> GenerateDocumentsOutput:
+        # Add time filters
+        self._set_cql_time_filter(start, end)
         return self._fetch_document_batches()
 
+    def load_from_checkpoint(
+        self,
+        start: SecondsSinceUnixEpoch,
+        end: SecondsSinceUnixEpoch,
+        checkpoint: ConnectorCheckpoint | None,
+    ) -> GenerateCheckpointedDocumentsOutput:
+        """
+        Unlike poll_source, each page is indexed together with its attachments, so the
+        checkpoint only has to point into the page query: the url of the results being
+        processed and the ids of the pages in them that are done. Ids rather than a
+        count, since pages modified after the window end drop out of a re-fetch.
+        """
+        self._set_cql_time_filter(start, end)
+        page_query = self.cql_page_query + self.cql_label_filter + self.cql_time_filter
+        logger.debug(f"page_query: {page_query}")
+
+        doc_batch: list[Document] = []
+        next_checkpoint: ConnectorCheckpoint = checkpoint or {}
+        for results_url, pages in self.confluence_client.paginated_cql_result_pages(
+            cql=page_query,
+            expand=",".join(_PAGE_EXPANSION_FIELDS),
+            limit=self.batch_size,
+            start_url=checkpoint["results_url"] if checkpoint else None,
+        ):
+            done_page_ids: list[str] = []
+            if checkpoint and results_url == checkpoint["results_url"]:
+                done_page_ids = list(checkpoint["done_page_ids"])
+
+            for page in pages:
+                if page["id"] in done_page_ids:
+                    continue
+
+                doc = self._convert_object_to_document(page)
+                if doc is not None:
+                    doc_batch.append(doc)
+                doc_batch.extend(self._fetch_attachment_documents(page["id"]))
+
+                done_page_ids.append(page["id"])
+                next_checkpoint = {
+                    "results_url": results_url,
+                    "done_page_ids": done_page_ids.copy(),
+                }
+                if len(doc_batch) >= self.batch_size:
+                    yield doc_batch, next_checkpoint
+                    doc_batch = []
+
+        if doc_batch:
+            yield doc_batch, next_checkpoint
+
     def retrieve_all_slim_documents(
         self,
         start: SecondsSinceUnixEpoch | None = None,
@@ -123,6 +123,14 @@ def handle_confluence_rate_limit(confluence_call: F) -> F:
 _DEFAULT_PAGINATION_LIMIT = 1000
 
 
+def _add_limit_to_url(url_suffix: str, limit: int | None) -> str:
+    if not limit:
+        limit = _DEFAULT_PAGINATION_LIMIT
+
+    connection_char = "&" if "?" in url_suffix else "?"
+    return url_suffix + f"{connection_char}limit={limit}"
+
+
 class OnyxConfluence(Confluence):
     """
     This is a custom Confluence class that overrides the default Confluence class to add a custom CQL method.
@@ -179,12 +187,19 @@ class OnyxConfluence(Confluence):
         """
         This will paginate through the top level query.
         """
-        if not limit:
-            limit = _DEFAULT_PAGINATION_LIMIT
-
-        connection_char = "&" if "?" in url_suffix else "?"
-        url_suffix += f"{connection_char}limit={limit}"
+        for _, results in self._paginate_url_by_page(
+            _add_limit_to_url(url_suffix, limit)
+        ):
+            # yield the results individually
+            yield from results
 
+    def _paginate_url_by_page(
+        self, url_suffix: str
+    ) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """
+        Yields the results of each response together with the url that returned them.
+        The url must already include the limit.
+        """
         while url_suffix:
             try:
                 logger.debug(f"Making confluence call to {url_suffix}")
@@ -208,8 +223,7 @@ class OnyxConfluence(Confluence):
                 )
                 continue
 
-            # yield the results individually
-            yield from next_response.get("results", [])
+            yield url_suffix, next_response.get("results", [])
 
             url_suffix = next_response.get("_links", {}).get("next")
 
@@ -227,6 +241,25 @@ class OnyxConfluence(Confluence):
             f"rest/api/content/search?cql={cql}{expand_string}", limit
         )
 
+    def paginated_cql_result_pages(
+        self,
+        cql: str,
+        expand: str | None = None,
+        limit: int | None = None,
+        start_url: str | None = None,
+    ) -> Iterator[tuple[str, list[dict[str, Any]]]]:
+        """
+        Same query as paginated_cql_retrieval, but yields each page of results together
+        with the url it was fetched from. Passing that url back as start_url continues
+        the query from that page.
+        """
+        if start_url is None:
+            expand_string = f"&expand={expand}" if expand else ""
+            start_url = _add_limit_to_url(
+                f"rest/api/content/search?cql={cql}{expand_string}", limit
+            )
+        yield from self._paginate_url_by_page(start_url)
+
     def cql_paginate_all_expansions(
         self,
         cql: str,
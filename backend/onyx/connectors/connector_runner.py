@@ -2,6 +2,8 @@ import sys
 from datetime import datetime
 
 from onyx.connectors.interfaces import BaseConnector
+from onyx.connectors.interfaces import CheckpointConnector
+from onyx.connectors.interfaces import ConnectorCheckpoint
 from onyx.connectors.interfaces import GenerateDocumentsOutput
 from onyx.connectors.interfaces import LoadConnector
 from onyx.connectors.interfaces import PollConnector
@@ -20,10 +22,21 @@ class ConnectorRunner:
         connector: BaseConnector,
         time_range: TimeRange | None = None,
         fail_loudly: bool = False,
+        checkpoint: ConnectorCheckpoint | None = None,
     ):
         self.connector = connector
+        # For CheckpointConnectors, where to resume from after the last yielded batch
+        self.checkpoint = checkpoint
 
-        if isinstance(self.connector, PollConnector):
+        if isinstance(self.connector, CheckpointConnector):
+            if time_range is None:
+                raise ValueError("time_range is required for CheckpointConnector")
+
+            self.doc_batch_generator = self._run_from_checkpoint(
+                self.connector, time_range
+            )
+
+        elif isinstance(self.connector, PollConnector):
             if time_range is None:
                 raise ValueError("time_range is required for PollConnector")
 
@@ -42,6 +55,15 @@ class ConnectorRunner:
         else:
             raise ValueError(f"Invalid connector. type: {type(self.connector)}")
 
+    def _run_from_checkpoint(
+        self, connector: CheckpointConnector, time_range: TimeRange
+    ) -> GenerateDocumentsOutput:
+        for doc_batch, next_checkpoint in connector.load_from_checkpoint(
+            time_range[0].timestamp(), time_range[1].timestamp(), self.checkpoint
+        ):
+            self.checkpoint = next_checkpoint
+            yield doc_batch
+
     def run(self) -> GenerateDocumentsOutput:
         """Adds additional exception logging to the connector."""
         try:
@@ -11,6 +11,11 @@ SecondsSinceUnixEpoch = float
 
 GenerateDocumentsOutput = Iterator[list[Document]]
 GenerateSlimDocumentOutput = Iterator[list[SlimDocument]]
+# Opaque to everything but the connector that produced it, must be JSON serializable
+ConnectorCheckpoint = dict[str, Any]
+GenerateCheckpointedDocumentsOutput = Iterator[
+    tuple[list[Document], ConnectorCheckpoint]
+]
 
 
 class BaseConnector(abc.ABC):
@@ -55,6 +60,21 @@ class PollConnector(BaseConnector):
         raise NotImplementedError
 
 
+# Opt-in for long running syncs, an interrupted run can resume after the last indexed batch
+class CheckpointConnector(BaseConnector):
+    @abc.abstractmethod
+    def load_from_checkpoint(
+        self,
+        start: SecondsSinceUnixEpoch,
+        end: SecondsSinceUnixEpoch,
+        checkpoint: ConnectorCheckpoint | None,
+    ) -> GenerateCheckpointedDocumentsOutput:
+        """Yields every batch of documents together with the checkpoint to continue from
+        after it. A checkpoint is only ever passed back with the same start and end,
+        None means the run starts from the beginning of the time range."""
+        raise NotImplementedError
+
+
 class SlimConnector(BaseConnector):
     @abc.abstractmethod
     def retrieve_all_slim_documents(
@@ -202,6 +202,15 @@ class DocumentErrorSummary(BaseModel):
         }
 
 
+class IndexingCheckpoint(BaseModel):
+    """Progress of a CheckpointConnector run, stored with the index attempt after every
+    indexed batch so that the next attempt can pick up from there"""
+
+    window_start: datetime
+    window_end: datetime
+    connector_checkpoint: dict[str, Any]
+
+
 class IndexAttemptMetadata(BaseModel):
     batch_num: int | None = None
     num_exceptions: int = 0
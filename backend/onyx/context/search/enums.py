@@ -34,3 +34,15 @@ class LLMEvaluationType(str, Enum):
 class QueryFlow(str, Enum):
     SEARCH = "search"
     QUESTION_ANSWER = "question-answer"
+
+
+class SearchStage(str, Enum):
+    PREPROCESSING = "preprocessing"
+    QUERY_ANALYSIS = "query_analysis"
+    EMBEDDING = "embedding"
+    DOCUMENT_INDEX_QUERY = "document_index_query"
+    LARGE_CHUNK_RESOLUTION = "large_chunk_resolution"
+    SECTION_EXPANSION = "section_expansion"
+    RERANK = "rerank"
+    LLM_RELEVANCE_FILTER = "llm_relevance_filter"
+    PRUNING = "pruning"
@@ -16,6 +16,7 @@ from onyx.db.models import SearchSettings
 from onyx.indexing.models import BaseChunk
 from onyx.indexing.models import IndexingSetting
 from shared_configs.enums import RerankerProvider
+from shared_configs.model_server_models import Embedding
 
 
 MAX_METRICS_CONTENT = (
@@ -145,6 +146,9 @@ class SearchRequest(ChunkContext):
     hybrid_alpha: float | None = None
     rerank_settings: RerankingDetails | None = None
     evaluation_type: LLMEvaluationType = LLMEvaluationType.UNSPECIFIED
+
+    # If the query has already been embedded (e.g. by speculative retrieval), skip re-encoding
+    precomputed_query_embedding: Embedding | None = None
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
@@ -169,6 +173,9 @@ class SearchQuery(ChunkContext):
 
     num_hits: int = NUM_RETURNED_HITS
     offset: int = 0
+
+    # Must correspond to `query`, clear it when copying the query with different text
+    precomputed_query_embedding: Embedding | None = None
     model_config = ConfigDict(frozen=True)
 
 
@@ -288,6 +295,17 @@ class InferenceSection(BaseModel):
     combined_content: str
 
 
+class SectionContextPrefetch(BaseModel):
+    """Surrounding chunks fetched in the same document index request as the large chunk
+    references during retrieval, so section expansion doesn't need another request."""
+
+    chunks_above: int
+    chunks_below: int
+    chunks: dict[tuple[str, int], InferenceChunk] = Field(default_factory=dict)
+    # (document_id, chunk_id) of the chunks whose surroundings are all fetched
+    expanded_chunk_ids: set[tuple[str, int]] = Field(default_factory=set)
+
+
 class SearchDoc(BaseModel):
     document_id: str
     chunk_ind: int
@@ -13,6 +13,7 @@ from onyx.chat.prune_and_merge import merge_chunk_intervals
 from onyx.configs.chat_configs import DISABLE_LLM_DOC_RELEVANCE
 from onyx.context.search.enums import LLMEvaluationType
 from onyx.context.search.enums import QueryFlow
+from onyx.context.search.enums import SearchStage
 from onyx.context.search.enums import SearchType
 from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunk
@@ -21,10 +22,16 @@ from onyx.context.search.models import RerankMetricsContainer
 from onyx.context.search.models import RetrievalMetricsContainer
 from onyx.context.search.models import SearchQuery
 from onyx.context.search.models import SearchRequest
+from onyx.context.search.models import SectionContextPrefetch
 from onyx.context.search.postprocessing.postprocessing import cleanup_chunks
 from onyx.context.search.postprocessing.postprocessing import search_postprocessing
 from onyx.context.search.preprocessing.preprocessing import retrieval_preprocessing
 from onyx.context.search.retrieval.search_runner import retrieve_chunks
+from onyx.context.search.retrieval_cache import build_retrieval_cache_key
+from onyx.context.search.retrieval_cache import CachedRetrieval
+from onyx.context.search.retrieval_cache import get_cached_retrieval
+from onyx.context.search.retrieval_cache import set_cached_retrieval
+from onyx.context.search.timing import SearchTimings
 from onyx.context.search.utils import inference_section_from_chunks
 from onyx.context.search.utils import relevant_sections_to_indices
 from onyx.db.models import User
@@ -37,6 +44,7 @@ from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import FunctionCall
 from onyx.utils.threadpool_concurrency import run_functions_in_parallel
 from onyx.utils.timing import log_function_time
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
 
 logger = setup_logger()
 
@@ -55,6 +63,10 @@ class SearchPipeline:
         ) = None,
         rerank_metrics_callback: Callable[[RerankMetricsContainer], None] | None = None,
         prompt_config: PromptConfig | None = None,
+        # Results of an earlier preprocessing / retrieval pass for an equivalent query
+        # (e.g. from speculative retrieval), skips straight to section expansion
+        precomputed_search_query: SearchQuery | None = None,
+        precomputed_retrieved_chunks: list[InferenceChunk] | None = None,
     ):
         self.search_request = search_request
         self.user = user
@@ -64,6 +76,8 @@ class SearchPipeline:
         self.bypass_acl = bypass_acl
         self.retrieval_metrics_callback = retrieval_metrics_callback
         self.rerank_metrics_callback = rerank_metrics_callback
+        # Time spent in each stage, filled in as the stages are run
+        self.timings = SearchTimings()
 
         self.search_settings = get_current_search_settings(db_session)
         self.document_index = get_default_document_index(
@@ -73,13 +87,21 @@ class SearchPipeline:
         self.prompt_config: PromptConfig | None = prompt_config
 
         # Preprocessing steps generate this
-        self._search_query: SearchQuery | None = None
-        self._predicted_search_type: SearchType | None = None
+        self._search_query: SearchQuery | None = precomputed_search_query
+        self._predicted_search_type: SearchType | None = (
+            precomputed_search_query.search_type if precomputed_search_query else None
+        )
 
         # Initial document index retrieval chunks
-        self._retrieved_chunks: list[InferenceChunk] | None = None
+        self._retrieved_chunks: list[InferenceChunk] | None = (
+            precomputed_retrieved_chunks
+        )
         # Another call made to the document index to get surrounding sections
         self._retrieved_sections: list[InferenceSection] | None = None
+        # Surrounding chunks already fetched during retrieval
+        self._section_context: SectionContextPrefetch | None = None
+        # Set if the retrieval was not served from the cache and should be stored in it
+        self._retrieval_cache_key: str | None = None
         # Reranking and LLM section selection can be run together
         # If only LLM selection is on, the reranked chunks are yielded immediatly
         self._reranked_sections: list[InferenceSection] | None = None
@@ -98,13 +120,15 @@ class SearchPipeline:
     """Pre-processing"""
 
     def _run_preprocessing(self) -> None:
-        final_search_query = retrieval_preprocessing(
-            search_request=self.search_request,
-            user=self.user,
-            llm=self.llm,
-            db_session=self.db_session,
-            bypass_acl=self.bypass_acl,
-        )
+        with self.timings.stage(SearchStage.PREPROCESSING):
+            final_search_query = retrieval_preprocessing(
+                search_request=self.search_request,
+                user=self.user,
+                llm=self.llm,
+                db_session=self.db_session,
+                bypass_acl=self.bypass_acl,
+                timings=self.timings,
+            )
         self._search_query = final_search_query
         self._predicted_search_type = final_search_query.search_type
 
@@ -139,30 +163,76 @@ class SearchPipeline:
         if self._retrieved_chunks is not None:
             return self._retrieved_chunks
 
+        # Skipped when collecting retrieval metrics since a cache hit would not report any
+        retrieval_cache_key = (
+            build_retrieval_cache_key(
+                search_query=self.search_query,
+                index_name=self.search_settings.index_name,
+                multilingual_expansion=self.search_settings.multilingual_expansion,
+                persona_id=(
+                    self.search_request.persona.id
+                    if self.search_request.persona
+                    else None
+                ),
+                tenant_id=CURRENT_TENANT_ID_CONTEXTVAR.get(),
+            )
+            if self.retrieval_metrics_callback is None
+            else None
+        )
+        if retrieval_cache_key:
+            cached_retrieval = get_cached_retrieval(
+                retrieval_cache_key, tenant_id=CURRENT_TENANT_ID_CONTEXTVAR.get()
+            )
+            if cached_retrieval:
+                self._retrieved_chunks = cached_retrieval.retrieved_chunks
+                self._retrieved_sections = cached_retrieval.retrieved_sections
+                return self._retrieved_chunks
+            self._retrieval_cache_key = retrieval_cache_key
+
+        # Full docs are fetched separately, otherwise the surrounding chunks are fetched
+        # together with the large chunk references
+        if not self.search_query.full_doc:
+            self._section_context = SectionContextPrefetch(
+                chunks_above=self.search_query.chunks_above,
+                chunks_below=self.search_query.chunks_below,
+            )
+
         # These chunks do not include large chunks and have been deduped
         self._retrieved_chunks = retrieve_chunks(
             query=self.search_query,
             document_index=self.document_index,
             db_session=self.db_session,
             retrieval_metrics_callback=self.retrieval_metrics_callback,
+            section_context=self._section_context,
+            timings=self.timings,
         )
 
         return cast(list[InferenceChunk], self._retrieved_chunks)
 
-    @log_function_time(print_only=True)
-    def _get_sections(self) -> list[InferenceSection]:
-        """Returns an expanded section from each of the chunks.
-        If whole docs (instead of above/below context) is specified then it will give back all of the whole docs
-        that have a corresponding chunk.
+    @property
+    def retrieved_chunks(self) -> list[InferenceChunk]:
+        return self._get_chunks()
 
-        This step should be fast for any document index implementation.
-        """
+    def _get_sections(self) -> list[InferenceSection]:
         if self._retrieved_sections is not None:
             return self._retrieved_sections
 
         # These chunks are ordered, deduped, and contain no large chunks
         retrieved_chunks = self._get_chunks()
 
+        with self.timings.stage(SearchStage.SECTION_EXPANSION):
+            return self._expand_sections(retrieved_chunks)
+
+    @log_function_time(print_only=True)
+    def _expand_sections(
+        self, retrieved_chunks: list[InferenceChunk]
+    ) -> list[InferenceSection]:
+        """Returns an expanded section from each of the chunks.
+        If whole docs (instead of above/below context) is specified then it will give back all of the whole docs
+        that have a corresponding chunk.
+
+        This step should be fast for any document index implementation.
+        """
         above = self.search_query.chunks_above
         below = self.search_query.chunks_below
 
@@ -214,6 +284,7 @@ class SearchPipeline:
                     )
 
             self._retrieved_sections = expanded_inference_sections
+            self._cache_retrieval()
             return expanded_inference_sections
 
         # General flow:
@@ -243,11 +314,23 @@ class SearchPipeline:
 
         flat_ranges: list[ChunkRange] = [r for ranges in merged_ranges for r in ranges]
 
+        section_context = self._section_context
+        if section_context is not None:
+            inference_chunks.extend(section_context.chunks.values())
+
         for chunk_range in flat_ranges:
             # Don't need to fetch chunks within range for merging if chunk_above / below are 0.
             if above == below == 0:
                 inference_chunks.extend(chunk_range.chunks)
 
+            elif section_context is not None and all(
+                (chunk.document_id, chunk.chunk_id)
+                in section_context.expanded_chunk_ids
+                for chunk in chunk_range.chunks
+            ):
+                # Surroundings were already fetched during retrieval
+                continue
+
             else:
                 chunk_requests.append(
                     VespaChunkRequest(
@@ -303,8 +386,27 @@ class SearchPipeline:
                 logger.warning("Skipped creation of section, no chunks found")
 
         self._retrieved_sections = expanded_inference_sections
+        self._cache_retrieval()
         return expanded_inference_sections
 
+    def _cache_retrieval(self) -> None:
+        if (
+            self._retrieval_cache_key is None
+            or self._retrieved_chunks is None
+            or self._retrieved_sections is None
+        ):
+            return
+
+        set_cached_retrieval(
+            self._retrieval_cache_key,
+            CachedRetrieval(
+                retrieved_chunks=self._retrieved_chunks,
+                retrieved_sections=self._retrieved_sections,
+            ),
+            tenant_id=CURRENT_TENANT_ID_CONTEXTVAR.get(),
+        )
+        self._retrieval_cache_key = None
+
     @property
     def reranked_sections(self) -> list[InferenceSection]:
         """Reranking is always done at the chunk level since section merging could create arbitrarily
@@ -322,6 +424,7 @@ class SearchPipeline:
             retrieved_sections=self._get_sections(),
             llm=self.fast_llm,
             rerank_metrics_callback=self.rerank_metrics_callback,
+            timings=self.timings,
         )
 
         self._reranked_sections = cast(
@@ -359,7 +462,9 @@ class SearchPipeline:
             sections = self.final_context_sections
             functions = [
                 FunctionCall(
-                    evaluate_inference_section,
+                    self.timings.timed(
+                        SearchStage.LLM_RELEVANCE_FILTER, evaluate_inference_section
+                    ),
                     (section, self.search_query.query, self.llm),
                 )
                 for section in sections
@@ -10,6 +10,7 @@ from onyx.configs.constants import RETURN_SEPARATOR
 from onyx.configs.model_configs import CROSS_ENCODER_RANGE_MAX
 from onyx.configs.model_configs import CROSS_ENCODER_RANGE_MIN
 from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchStage
 from onyx.context.search.models import ChunkMetric
 from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceChunkUncleaned
@@ -17,6 +18,12 @@ from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import MAX_METRICS_CONTENT
 from onyx.context.search.models import RerankMetricsContainer
 from onyx.context.search.models import SearchQuery
+from onyx.context.search.postprocessing.rerank_cache import (
+    build_rerank_score_cache_key,
+)
+from onyx.context.search.postprocessing.rerank_cache import get_cached_rerank_scores
+from onyx.context.search.postprocessing.rerank_cache import set_cached_rerank_scores
+from onyx.context.search.timing import SearchTimings
 from onyx.document_index.document_index_utils import (
     translate_boost_count_to_multiplier,
 )
@@ -27,6 +34,7 @@ from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import FunctionCall
 from onyx.utils.threadpool_concurrency import run_functions_in_parallel
 from onyx.utils.timing import log_function_time
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
 
 
 logger = setup_logger()
@@ -96,18 +104,42 @@ def semantic_reranking(
 
     chunks_to_rerank = chunks[: rerank_settings.num_rerank]
 
-    cross_encoder = RerankingModel(
-        model_name=rerank_settings.rerank_model_name,
-        provider_type=rerank_settings.rerank_provider_type,
-        api_key=rerank_settings.rerank_api_key,
-        api_url=rerank_settings.rerank_api_url,
-    )
-
     passages = [
         f"{chunk.semantic_identifier or chunk.title or ''}\n{chunk.content}"
         for chunk in chunks_to_rerank
     ]
-    sim_scores_floats = cross_encoder.predict(query=query.query, passages=passages)
+
+    tenant_id = CURRENT_TENANT_ID_CONTEXTVAR.get()
+    cache_key = build_rerank_score_cache_key(rerank_settings, query.query)
+    cached_scores: list[float | None] = (
+        get_cached_rerank_scores(cache_key, chunks_to_rerank, passages, tenant_id)
+        if cache_key
+        else [None] * len(chunks_to_rerank)
+    )
+
+    # Only the passages not scored before for this query go to the cross-encoder
+    uncached_indices = [i for i, score in enumerate(cached_scores) if score is None]
+    if uncached_indices:
+        cross_encoder = RerankingModel(
+            model_name=rerank_settings.rerank_model_name,
+            provider_type=rerank_settings.rerank_provider_type,
+            api_key=rerank_settings.rerank_api_key,
+            api_url=rerank_settings.rerank_api_url,
+        )
+        uncached_chunks = [chunks_to_rerank[i] for i in uncached_indices]
+        uncached_passages = [passages[i] for i in uncached_indices]
+        new_scores = cross_encoder.predict(
+            query=query.query, passages=uncached_passages
+        )
+        for i, score in zip(uncached_indices, new_scores):
+            cached_scores[i] = score
+
+        if cache_key:
+            set_cached_rerank_scores(
+                cache_key, uncached_chunks, uncached_passages, new_scores, tenant_id
+            )
+
+    sim_scores_floats = cast(list[float], cached_scores)
 
     # Old logic to handle multiple cross-encoders preserved but not used
     sim_scores = [numpy.array(sim_scores_floats)]
@@ -249,6 +281,7 @@ def search_postprocessing(
     retrieved_sections: list[InferenceSection],
     llm: LLM,
     rerank_metrics_callback: Callable[[RerankMetricsContainer], None] | None = None,
+    timings: SearchTimings | None = None,
 ) -> Iterator[list[InferenceSection] | list[SectionRelevancePiece]]:
     post_processing_tasks: list[FunctionCall] = []
 
@@ -267,7 +300,9 @@ def search_postprocessing(
     ):
         post_processing_tasks.append(
             FunctionCall(
-                rerank_sections,
+                timings.timed(SearchStage.RERANK, rerank_sections)
+                if timings
+                else rerank_sections,
                 (
                     search_query,
                     retrieved_sections,
@@ -291,7 +326,9 @@ def search_postprocessing(
     ]:
         post_processing_tasks.append(
             FunctionCall(
-                filter_sections,
+                timings.timed(SearchStage.LLM_RELEVANCE_FILTER, filter_sections)
+                if timings
+                else filter_sections,
                 (
                     search_query,
                     retrieved_sections[: search_query.max_llm_filter_sections],
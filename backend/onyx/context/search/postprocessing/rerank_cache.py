@@ -0,0 +1,107 @@
+"""Redis cache of cross-encoder scores.
+
+Scores for a (rerank model, query) pair live in one Redis hash with a field per
+(document_id, chunk_id, content hash), so repeated queries and overlapping result sets
+only send the chunks that were never scored for the query to the reranker."""
+import hashlib
+import json
+from typing import cast
+
+from prometheus_client import Counter
+
+from onyx.configs.chat_configs import RERANK_SCORE_CACHE_TTL
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.models import RerankingDetails
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+RERANK_SCORE_CACHE_KEY_PREFIX = "rerank_scores"
+
+_RERANK_SCORE_CACHE_PASSAGES = Counter(
+    "onyx_rerank_score_cache_passages_total",
+    "Passages looked up in the rerank score cache, labeled by hit/miss",
+    ["result"],
+)
+
+
+def build_rerank_score_cache_key(
+    rerank_settings: RerankingDetails, query: str
+) -> str | None:
+    """Returns None if the cache is disabled."""
+    if RERANK_SCORE_CACHE_TTL <= 0:
+        return None
+
+    key_hash = hashlib.sha256(
+        json.dumps(
+            [
+                rerank_settings.rerank_model_name,
+                rerank_settings.rerank_provider_type,
+                rerank_settings.rerank_api_url,
+                query,
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return f"{RERANK_SCORE_CACHE_KEY_PREFIX}:{key_hash}"
+
+
+def _chunk_field(chunk: InferenceChunk, passage: str) -> str:
+    content_hash = hashlib.sha256(passage.encode("utf-8")).hexdigest()
+    return f"{chunk.document_id}:{chunk.chunk_id}:{content_hash}"
+
+
+def get_cached_rerank_scores(
+    cache_key: str,
+    chunks: list[InferenceChunk],
+    passages: list[str],
+    tenant_id: str | None,
+) -> list[float | None]:
+    """Returns the cached score for each passage, None where it was not scored yet."""
+    try:
+        cached = cast(
+            list[bytes | None],
+            get_redis_client(tenant_id=tenant_id).hmget(
+                cache_key,
+                [
+                    _chunk_field(chunk, passage)
+                    for chunk, passage in zip(chunks, passages)
+                ],
+            ),
+        )
+    except Exception as e:
+        # The cache is purely an optimization, never fail the search because of it
+        logger.error(f"Failed to read rerank score cache: {e}")
+        return [None] * len(chunks)
+
+    scores = [float(score) if score is not None else None for score in cached]
+    num_hits = sum(score is not None for score in scores)
+    _RERANK_SCORE_CACHE_PASSAGES.labels(result="hit").inc(num_hits)
+    _RERANK_SCORE_CACHE_PASSAGES.labels(result="miss").inc(len(scores) - num_hits)
+    return scores
+
+
+def set_cached_rerank_scores(
+    cache_key: str,
+    chunks: list[InferenceChunk],
+    passages: list[str],
+    scores: list[float],
+    tenant_id: str | None,
+) -> None:
+    if not chunks:
+        return
+
+    try:
+        redis_client = get_redis_client(tenant_id=tenant_id)
+        redis_client.hset(
+            cache_key,
+            mapping={
+                _chunk_field(chunk, passage): score
+                for chunk, passage, score in zip(chunks, passages, scores)
+            },
+        )
+        # The TTL restarts on every write so queries that keep being asked stay cached
+        redis_client.expire(cache_key, RERANK_SCORE_CACHE_TTL)
+    except Exception as e:
+        logger.error(f"Failed to write rerank score cache: {e}")
@@ -11,6 +11,7 @@ from onyx.configs.chat_configs import NUM_POSTPROCESSED_RESULTS
 from onyx.configs.chat_configs import NUM_RETURNED_HITS
 from onyx.context.search.enums import LLMEvaluationType
 from onyx.context.search.enums import RecencyBiasSetting
+from onyx.context.search.enums import SearchStage
 from onyx.context.search.enums import SearchType
 from onyx.context.search.models import BaseFilters
 from onyx.context.search.models import IndexFilters
@@ -23,6 +24,7 @@ from onyx.context.search.preprocessing.access_filters import (
 from onyx.context.search.retrieval.search_runner import (
     remove_stop_words_and_punctuation,
 )
+from onyx.context.search.timing import SearchTimings
 from onyx.db.engine import CURRENT_TENANT_ID_CONTEXTVAR
 from onyx.db.models import User
 from onyx.db.search_settings import get_current_search_settings
@@ -55,6 +57,7 @@ def retrieval_preprocessing(
     skip_query_analysis: bool = False,
     base_recency_decay: float = BASE_RECENCY_DECAY,
     favor_recent_decay_multiplier: float = FAVOR_RECENT_DECAY_MULTIPLIER,
+    timings: SearchTimings | None = None,
 ) -> SearchQuery:
     """Logic is as follows:
     Any global disables apply first
@@ -111,14 +114,27 @@ def retrieval_preprocessing(
     )
 
     # Based on the query, figure out if we should apply any source filters
+    # The tenant context var does not carry over to the worker threads
     run_source_filters = (
-        FunctionCall(extract_source_filter, (query, llm, db_session), {})
+        FunctionCall(
+            extract_source_filter,
+            (query, llm, db_session, CURRENT_TENANT_ID_CONTEXTVAR.get()),
+            {},
+        )
         if auto_detect_source_filter
         else None
     )
 
     run_query_analysis = (
-        None if skip_query_analysis else FunctionCall(query_analysis, (query,), {})
+        None
+        if skip_query_analysis
+        else FunctionCall(
+            timings.timed(SearchStage.QUERY_ANALYSIS, query_analysis)
+            if timings
+            else query_analysis,
+            (query,),
+            {},
+        )
     )
 
     functions_to_run = [
@@ -247,4 +263,5 @@ def retrieval_preprocessing(
         chunks_above=chunks_above,
         chunks_below=chunks_below,
         full_doc=search_request.full_doc,
+        precomputed_query_embedding=search_request.precomputed_query_embedding,
     )
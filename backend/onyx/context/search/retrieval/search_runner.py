@@ -1,4 +1,5 @@
 import string
+from collections import defaultdict
 from collections.abc import Callable
 
 import nltk  # type:ignore
@@ -6,6 +7,9 @@ from nltk.corpus import stopwords  # type:ignore
 from nltk.tokenize import word_tokenize  # type:ignore
 from sqlalchemy.orm import Session
 
+from onyx.chat.prune_and_merge import ChunkRange
+from onyx.chat.prune_and_merge import merge_chunk_intervals
+from onyx.context.search.enums import SearchStage
 from onyx.context.search.models import ChunkMetric
 from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceChunk
@@ -14,7 +18,10 @@ from onyx.context.search.models import InferenceSection
 from onyx.context.search.models import MAX_METRICS_CONTENT
 from onyx.context.search.models import RetrievalMetricsContainer
 from onyx.context.search.models import SearchQuery
+from onyx.context.search.models import SectionContextPrefetch
 from onyx.context.search.postprocessing.postprocessing import cleanup_chunks
+from onyx.context.search.timing import search_stage
+from onyx.context.search.timing import SearchTimings
 from onyx.context.search.utils import inference_section_from_chunks
 from onyx.db.search_settings import get_current_search_settings
 from onyx.db.search_settings import get_multilingual_expansion
@@ -31,6 +38,7 @@ from onyx.utils.timing import log_function_time
 from shared_configs.configs import MODEL_SERVER_HOST
 from shared_configs.configs import MODEL_SERVER_PORT
 from shared_configs.enums import EmbedTextType
+from shared_configs.model_server_models import Embedding
 
 
 logger = setup_logger()
@@ -109,39 +117,77 @@ def combine_retrieval_results(
     return sorted_chunks
 
 
+def _embed_queries(queries: list[str], db_session: Session) -> list[Embedding]:
+    search_settings = get_current_search_settings(db_session)
+
+    model = EmbeddingModel.from_db_model(
+        search_settings=search_settings,
+        # The below are globally set, this flow always uses the indexing one
+        server_host=MODEL_SERVER_HOST,
+        server_port=MODEL_SERVER_PORT,
+    )
+
+    return model.encode(queries, text_type=EmbedTextType.QUERY)
+
+
+def _build_context_chunk_requests(
+    chunk_ids: set[tuple[str, int]], chunks_above: int, chunks_below: int
+) -> list[VespaChunkRequest]:
+    doc_chunk_ranges_map: dict[str, list[ChunkRange]] = defaultdict(list)
+    for document_id, chunk_id in chunk_ids:
+        doc_chunk_ranges_map[document_id].append(
+            ChunkRange(
+                chunks=[],
+                start=max(0, chunk_id - chunks_above),
+                # No max known ahead of time, filter will handle this anyway
+                end=chunk_id + chunks_below,
+            )
+        )
+
+    return [
+        VespaChunkRequest(
+            document_id=replace_invalid_doc_id_characters(document_id),
+            min_chunk_ind=chunk_range.start,
+            max_chunk_ind=chunk_range.end,
+        )
+        for document_id, ranges in doc_chunk_ranges_map.items()
+        for chunk_range in merge_chunk_intervals(ranges)
+    ]
+
+
 @log_function_time(print_only=True)
 def doc_index_retrieval(
     query: SearchQuery,
     document_index: DocumentIndex,
     db_session: Session,
+    section_context: SectionContextPrefetch | None = None,
+    timings: SearchTimings | None = None,
 ) -> list[InferenceChunk]:
     """
     This function performs the search to retrieve the chunks,
     extracts chunks from the large chunks, persists the scores
     from the large chunks to the referenced chunks,
     dedupes the chunks, and cleans the chunks.
-    """
-    search_settings = get_current_search_settings(db_session)
-
-    model = EmbeddingModel.from_db_model(
-        search_settings=search_settings,
-        # The below are globally set, this flow always uses the indexing one
-        server_host=MODEL_SERVER_HOST,
-        server_port=MODEL_SERVER_PORT,
-    )
 
-    query_embedding = model.encode([query.query], text_type=EmbedTextType.QUERY)[0]
-
-    top_chunks = document_index.hybrid_retrieval(
-        query=query.query,
-        query_embedding=query_embedding,
-        final_keywords=query.processed_keywords,
-        filters=query.filters,
-        hybrid_alpha=query.hybrid_alpha,
-        time_decay_multiplier=query.recency_bias_multiplier,
-        num_to_retrieve=query.num_hits,
-        offset=query.offset,
-    )
+    If `section_context` is passed, the surrounding chunks of the results are fetched in
+    the same request as the large chunk references and added to it.
+    """
+    query_embedding = query.precomputed_query_embedding
+    if query_embedding is None:
+        with search_stage(timings, SearchStage.EMBEDDING):
+            query_embedding = _embed_queries([query.query], db_session)[0]
+
+    with search_stage(timings, SearchStage.DOCUMENT_INDEX_QUERY):
+        top_chunks = document_index.hybrid_retrieval(
+            query=query.query,
+            query_embedding=query_embedding,
+            final_keywords=query.processed_keywords,
+            filters=query.filters,
+            hybrid_alpha=query.hybrid_alpha,
+            time_decay_multiplier=query.recency_bias_multiplier,
+            num_to_retrieve=query.num_hits,
+            offset=query.offset,
+        )
 
     retrieval_requests: list[VespaChunkRequest] = []
     normal_chunks: list[InferenceChunkUncleaned] = []
@@ -165,16 +211,51 @@ def doc_index_retrieval(
         else:
             normal_chunks.append(chunk)
 
+    expand_context = section_context is not None and bool(
+        section_context.chunks_above or section_context.chunks_below
+    )
+    if section_context is not None and expand_context:
+        # The large chunk references are inside these ranges so one request gets both
+        result_chunk_ids = {
+            (chunk.document_id, chunk.chunk_id) for chunk in normal_chunks
+        } | set(referenced_chunk_scores)
+        retrieval_requests = _build_context_chunk_requests(
+            result_chunk_ids,
+            section_context.chunks_above,
+            section_context.chunks_below,
+        )
+
     # If there are no large chunks, just return the normal chunks
     if not retrieval_requests:
         return cleanup_chunks(normal_chunks)
 
     # Retrieve and return the referenced normal chunks from the large chunks
-    retrieved_inference_chunks = document_index.id_based_retrieval(
-        chunk_requests=retrieval_requests,
-        filters=query.filters,
-        batch_retrieval=True,
-    )
+    with search_stage(timings, SearchStage.LARGE_CHUNK_RESOLUTION):
+        retrieved_inference_chunks = document_index.id_based_retrieval(
+            chunk_requests=retrieval_requests,
+            filters=query.filters,
+            batch_retrieval=True,
+        )
+
+    if section_context is not None and expand_context:
+        context_chunks = [
+            chunk
+            for chunk in retrieved_inference_chunks
+            if (chunk.document_id, chunk.chunk_id) not in referenced_chunk_scores
+        ]
+        retrieved_inference_chunks = [
+            chunk
+            for chunk in retrieved_inference_chunks
+            if (chunk.document_id, chunk.chunk_id) in referenced_chunk_scores
+        ]
+        # Single dict updates so concurrent multilingual queries can share the prefetch
+        section_context.chunks.update(
+            {
+                (chunk.document_id, chunk.chunk_id): chunk
+                for chunk in cleanup_chunks(context_chunks)
+            }
+        )
+        section_context.expanded_chunk_ids.update(result_chunk_ids)
 
     # Apply the scores from the large chunks to the chunks referenced
     # by each large chunk
@@ -222,6 +303,8 @@ def retrieve_chunks(
     db_session: Session,
     retrieval_metrics_callback: Callable[[RetrievalMetricsContainer], None]
     | None = None,
+    section_context: SectionContextPrefetch | None = None,
+    timings: SearchTimings | None = None,
 ) -> list[InferenceChunk]:
     """Returns a list of the best chunks from an initial keyword/semantic/ hybrid search."""
 
@@ -229,31 +312,62 @@ def retrieve_chunks(
     # Don't do query expansion on complex queries, rephrasings likely would not work well
     if not multilingual_expansion or "\n" in query.query or "\r" in query.query:
         top_chunks = doc_index_retrieval(
-            query=query, document_index=document_index, db_session=db_session
+            query=query,
+            document_index=document_index,
+            db_session=db_session,
+            section_context=section_context,
+            timings=timings,
         )
     else:
         simplified_queries = set()
+        unique_rephrases: list[str] = []
         run_queries: list[tuple[Callable, tuple]] = []
 
         # Currently only uses query expansion on multilingual use cases
         query_rephrases = multilingual_query_expansion(
             query.query, multilingual_expansion
         )
-        # Just to be extra sure, add the original query.
-        query_rephrases.append(query.query)
-        for rephrase in set(query_rephrases):
+        # Just to be extra sure, add the original query. It goes first so that it is
+        # kept over near duplicate rephrases and its precomputed embedding is reused
+        for rephrase in dict.fromkeys([query.query] + query_rephrases):
             # Sometimes the model rephrases the query in the same language with minor changes
             # Avoid doing an extra search with the minor changes as this biases the results
             simplified_rephrase = _simplify_text(rephrase)
             if simplified_rephrase in simplified_queries:
                 continue
             simplified_queries.add(simplified_rephrase)
+            unique_rephrases.append(rephrase)
+
+        # All rephrases are embedded in one model server call instead of one per search
+        rephrase_embeddings: dict[str, Embedding] = {}
+        if query.precomputed_query_embedding is not None:
+            rephrase_embeddings[query.query] = query.precomputed_query_embedding
+        rephrases_to_embed = [
+            rephrase
+            for rephrase in unique_rephrases
+            if rephrase not in rephrase_embeddings
+        ]
+        if rephrases_to_embed:
+            with search_stage(timings, SearchStage.EMBEDDING):
+                rephrase_embeddings.update(
+                    zip(
+                        rephrases_to_embed,
+                        _embed_queries(rephrases_to_embed, db_session),
+                    )
+                )
 
-            q_copy = query.copy(update={"query": rephrase}, deep=True)
+        for rephrase in unique_rephrases:
+            q_copy = query.copy(
+                update={
+                    "query": rephrase,
+                    "precomputed_query_embedding": rephrase_embeddings[rephrase],
+                },
+                deep=True,
+            )
             run_queries.append(
                 (
                     doc_index_retrieval,
-                    (q_copy, document_index, db_session),
+                    (q_copy, document_index, db_session, section_context, timings),
                 )
             )
         parallel_search_results = run_functions_tuples_in_parallel(run_queries)
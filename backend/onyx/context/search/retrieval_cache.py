@@ -0,0 +1,150 @@
+"""Opt-in short-TTL Redis cache for search retrieval results.
+
+Embedding the query, hybrid retrieval, large chunk expansion and section expansion are
+re-run for identical searches (shared dashboards, many people asking the same thing in
+a Slack channel, regenerating an answer). The retrieved chunks and expanded sections are
+cached keyed by everything that affects them, including a hash of the user's ACL.
+
+Instead of tracking which entries a document change affects, every cache key contains a
+per-tenant index generation counter which is bumped whenever indexing, deletion or
+metadata sync write to the document index. Stale entries then simply stop being read
+and expire with their TTL."""
+import hashlib
+import json
+import re
+from typing import cast
+
+from prometheus_client import Counter
+from pydantic import BaseModel
+
+from onyx.configs.chat_configs import RETRIEVAL_CACHE_TTL
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.models import InferenceSection
+from onyx.context.search.models import SearchQuery
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+RETRIEVAL_CACHE_KEY_PREFIX = "retrieval_cache"
+INDEX_GENERATION_KEY = "index_generation"
+
+_RETRIEVAL_CACHE_REQUESTS = Counter(
+    "onyx_retrieval_cache_requests_total",
+    "Lookups against the retrieval cache, labeled by hit/miss",
+    ["result"],
+)
+
+
+class CachedRetrieval(BaseModel):
+    retrieved_chunks: list[InferenceChunk]
+    retrieved_sections: list[InferenceSection]
+
+
+def is_retrieval_cache_enabled() -> bool:
+    return RETRIEVAL_CACHE_TTL > 0
+
+
+def bump_index_generation(tenant_id: str | None) -> None:
+    """Invalidates all cached retrievals for the tenant. Called after every write to the
+    document index, never raises since the writes themselves already succeeded."""
+    try:
+        get_redis_client(tenant_id=tenant_id).incrby(INDEX_GENERATION_KEY, 1)
+    except Exception as e:
+        logger.error(f"Failed to bump index generation: {e}")
+
+
+def _get_index_generation(tenant_id: str | None) -> int:
+    generation = cast(
+        bytes | None, get_redis_client(tenant_id=tenant_id).get(INDEX_GENERATION_KEY)
+    )
+    return int(generation) if generation is not None else 0
+
+
+def _normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def build_retrieval_cache_key(
+    search_query: SearchQuery,
+    index_name: str,
+    multilingual_expansion: list[str],
+    persona_id: int | None,
+    tenant_id: str | None,
+) -> str | None:
+    """Returns None if the cache is disabled or Redis is unavailable."""
+    if not is_retrieval_cache_enabled():
+        return None
+
+    try:
+        generation = _get_index_generation(tenant_id)
+    except Exception as e:
+        logger.error(f"Failed to read index generation: {e}")
+        return None
+
+    access_control_list = search_query.filters.access_control_list
+    key_fields = {
+        "query": _normalize_query(search_query.query),
+        "search_query": search_query.model_dump(
+            mode="json",
+            include={
+                "search_type",
+                "chunks_above",
+                "chunks_below",
+                "full_doc",
+                "hybrid_alpha",
+                "recency_bias_multiplier",
+                "num_hits",
+                "offset",
+            },
+        ),
+        "filters": search_query.filters.model_dump(
+            mode="json", exclude={"access_control_list"}
+        ),
+        # None means the ACL is bypassed which is not the same as an empty ACL
+        "acl": (
+            hashlib.sha256(
+                json.dumps(sorted(access_control_list)).encode("utf-8")
+            ).hexdigest()
+            if access_control_list is not None
+            else None
+        ),
+        "index_name": index_name,
+        "multilingual_expansion": multilingual_expansion,
+        "persona_id": persona_id,
+    }
+    key_hash = hashlib.sha256(
+        json.dumps(key_fields, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return f"{RETRIEVAL_CACHE_KEY_PREFIX}:{generation}:{key_hash}"
+
+
+def get_cached_retrieval(
+    cache_key: str, tenant_id: str | None
+) -> CachedRetrieval | None:
+    try:
+        cached = get_redis_client(tenant_id=tenant_id).get(cache_key)
+    except Exception as e:
+        # The cache is purely an optimization, never fail the search because of it
+        logger.error(f"Failed to read retrieval cache: {e}")
+        return None
+
+    if cached is None:
+        _RETRIEVAL_CACHE_REQUESTS.labels(result="miss").inc()
+        return None
+
+    _RETRIEVAL_CACHE_REQUESTS.labels(result="hit").inc()
+    assert isinstance(cached, bytes)
+    return CachedRetrieval.model_validate_json(cached)
+
+
+def set_cached_retrieval(
+    cache_key: str, cached_retrieval: CachedRetrieval, tenant_id: str | None
+) -> None:
+    try:
+        get_redis_client(tenant_id=tenant_id).set(
+            cache_key, cached_retrieval.model_dump_json(), ex=RETRIEVAL_CACHE_TTL
+        )
+    except Exception as e:
+        logger.error(f"Failed to write retrieval cache: {e}")
@@ -0,0 +1,240 @@
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+import numpy
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from onyx.configs.chat_configs import SPECULATIVE_RETRIEVAL_SIMILARITY_THRESHOLD
+from onyx.configs.constants import MessageType
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.models import SearchQuery
+from onyx.context.search.models import SearchRequest
+from onyx.context.search.pipeline import SearchPipeline
+from onyx.db.engine import get_session_with_tenant
+from onyx.db.models import Persona
+from onyx.db.models import User
+from onyx.db.search_settings import get_current_search_settings
+from onyx.llm.interfaces import LLM
+from onyx.llm.models import PreviousMessage
+from onyx.natural_language_processing.search_nlp_models import EmbeddingModel
+from onyx.utils.logger import setup_logger
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+from shared_configs.configs import MODEL_SERVER_HOST
+from shared_configs.configs import MODEL_SERVER_PORT
+from shared_configs.enums import EmbedTextType
+from shared_configs.model_server_models import Embedding
+
+logger = setup_logger()
+
+
+# Past this, the combined follow-up is unlikely to be a useful search query
+_HEURISTIC_REWRITE_MAX_CHARS = 300
+
+
+class SpeculativeRetrievalResult(BaseModel):
+    query: str
+    query_embedding: Embedding
+    search_query: SearchQuery
+    retrieved_chunks: list[InferenceChunk]
+
+
+def heuristic_followup_rewrite(
+    query: str, history: list[PreviousMessage]
+) -> str | None:
+    """Cheap stand-in for the LLM rephrase: most follow-ups ("what about for EU customers?")
+    only make sense together with the previous user question, so search for both"""
+    previous_user_message = next(
+        (
+            message.message
+            for message in reversed(history)
+            if message.message_type == MessageType.USER
+        ),
+        None,
+    )
+    if not previous_user_message:
+        return None
+
+    rewrite = f"{previous_user_message.strip()} {query.strip()}"
+    if len(rewrite) > _HEURISTIC_REWRITE_MAX_CHARS:
+        return None
+    return rewrite
+
+
+def _get_query_embedding_model(db_session: Session) -> EmbeddingModel:
+    return EmbeddingModel.from_db_model(
+        search_settings=get_current_search_settings(db_session),
+        server_host=MODEL_SERVER_HOST,
+        server_port=MODEL_SERVER_PORT,
+    )
+
+
+def _speculative_search(
+    query: str,
+    query_embedding: Embedding,
+    search_request: SearchRequest,
+    user_id: UUID | None,
+    llm: LLM,
+    fast_llm: LLM,
+    bypass_acl: bool,
+    tenant_id: str | None,
+) -> SpeculativeRetrievalResult:
+    # Runs in its own thread, so it needs its own session and its own copies of the
+    # ORM objects rather than the ones bound to the request session
+    with get_session_with_tenant(tenant_id) as db_session:
+        user = db_session.get(User, user_id) if user_id else None
+        persona = (
+            db_session.get(Persona, search_request.persona.id)
+            if search_request.persona
+            else None
+        )
+        speculative_request = search_request.model_copy(
+            update={
+                "query": query,
+                "persona": persona,
+                "human_selected_filters": (
+                    search_request.human_selected_filters.model_copy(deep=True)
+                    if search_request.human_selected_filters
+                    else None
+                ),
+                "precomputed_query_embedding": query_embedding,
+            }
+        )
+
+        search_pipeline = SearchPipeline(
+            search_request=speculative_request,
+            user=user,
+            llm=llm,
+            fast_llm=fast_llm,
+            db_session=db_session,
+            bypass_acl=bypass_acl,
+        )
+
+        return SpeculativeRetrievalResult(
+            query=query,
+            query_embedding=query_embedding,
+            search_query=search_pipeline.search_query,
+            retrieved_chunks=search_pipeline.retrieved_chunks,
+        )
+
+
+def run_speculative_retrieval(
+    queries: list[str],
+    search_request: SearchRequest,
+    user_id: UUID | None,
+    llm: LLM,
+    fast_llm: LLM,
+    bypass_acl: bool,
+    tenant_id: str | None,
+) -> list[SpeculativeRetrievalResult]:
+    """Runs preprocessing and retrieval for each candidate query. Never raises, a failed
+    speculation just means the normal search flow runs afterwards."""
+    try:
+        with get_session_with_tenant(tenant_id) as db_session:
+            embedding_model = _get_query_embedding_model(db_session)
+
+        # All of the candidates are embedded in a single call
+        query_embeddings = embedding_model.encode(
+            queries, text_type=EmbedTextType.QUERY
+        )
+
+        functions_with_args: list[tuple[Callable[..., Any], tuple[Any, ...]]] = [
+            (
+                _speculative_search,
+                (
+                    query,
+                    query_embedding,
+                    search_request,
+                    user_id,
+                    llm,
+                    fast_llm,
+                    bypass_acl,
+                    tenant_id,
+                ),
+            )
+            for query, query_embedding in zip(queries, query_embeddings)
+        ]
+        results = run_functions_tuples_in_parallel(
+            functions_with_args, allow_failures=True
+        )
+    except Exception:
+        logger.exception("Speculative retrieval failed")
+        return []
+
+    return [result for result in results if result is not None]
+
+
+def _cosine_similarity(a: Embedding, b: Embedding) -> float:
+    vec_a = numpy.array(a)
+    vec_b = numpy.array(b)
+    denominator = numpy.linalg.norm(vec_a) * numpy.linalg.norm(vec_b)
+    if denominator == 0:
+        return 0.0
+    return float(numpy.dot(vec_a, vec_b) / denominator)
+
+
+def resolve_speculative_retrieval(
+    rephrased_query: str,
+    speculative_results: list[SpeculativeRetrievalResult],
+    tenant_id: str | None,
+    similarity_threshold: float = SPECULATIVE_RETRIEVAL_SIMILARITY_THRESHOLD,
+) -> tuple[SpeculativeRetrievalResult | None, Embedding | None]:
+    """Returns the speculative result to reuse for the rephrased query if one is equivalent
+    enough. Otherwise returns the rephrased query's embedding so that the regular search
+    does not need to encode it again."""
+    if not speculative_results:
+        return None, None
+
+    matched_result: SpeculativeRetrievalResult | None = next(
+        (
+            result
+            for result in speculative_results
+            if result.query.strip().lower() == rephrased_query.strip().lower()
+        ),
+        None,
+    )
+
+    rephrased_embedding: Embedding | None = None
+    if matched_result is None:
+        with get_session_with_tenant(tenant_id) as db_session:
+            embedding_model = _get_query_embedding_model(db_session)
+        rephrased_embedding = embedding_model.encode(
+            [rephrased_query], text_type=EmbedTextType.QUERY
+        )[0]
+
+        similarity, best_result = max(
+            (
+                (
+                    _cosine_similarity(rephrased_embedding, result.query_embedding),
+                    result,
+                )
+                for result in speculative_results
+            ),
+            key=lambda pair: pair[0],
+        )
+        logger.debug(
+            f"Best speculative query '{best_result.query}' has similarity "
+            f"{similarity:.3f} to rephrased query '{rephrased_query}'"
+        )
+        if similarity >= similarity_threshold:
+            matched_result = best_result
+
+    if matched_result is None:
+        return None, rephrased_embedding
+
+    logger.info(f"Reusing speculative retrieval for query '{matched_result.query}'")
+    # Downstream reranking and relevance evaluation should see the rephrased query
+    return (
+        matched_result.model_copy(
+            update={
+                "search_query": matched_result.search_query.model_copy(
+                    update={
+                        "query": rephrased_query,
+                        "precomputed_query_embedding": None,
+                    }
+                )
+            }
+        ),
+        None,
+    )
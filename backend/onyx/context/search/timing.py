@@ -0,0 +1,73 @@
+import threading
+import time
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any
+from typing import cast
+from typing import TypeVar
+
+from prometheus_client import Histogram
+
+from onyx.context.search.enums import SearchStage
+
+F = TypeVar("F", bound=Callable)
+
+_SEARCH_STAGE_SECONDS = Histogram(
+    "onyx_search_stage_duration_seconds",
+    "Time spent in each stage of a search, labeled by stage",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+class SearchTimings:
+    """Collects the time spent in each stage of one search. Stages can be timed from
+    multiple threads, the time of a stage that runs more than once (e.g. one document
+    index query per multilingual rephrase) is summed."""
+
+    def __init__(self) -> None:
+        self._seconds: dict[SearchStage, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: SearchStage, seconds: float) -> None:
+        with self._lock:
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+        _SEARCH_STAGE_SECONDS.labels(stage=stage.value).observe(seconds)
+
+    @contextmanager
+    def stage(self, stage: SearchStage) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(stage, time.monotonic() - start)
+
+    def timed(self, stage: SearchStage, func: F) -> F:
+        """Wraps `func` so that its calls are timed as `stage`, for functions that
+        are handed off to be run in parallel."""
+
+        @wraps(func)
+        def wrapped_func(*args: Any, **kwargs: Any) -> Any:
+            with self.stage(stage):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapped_func)
+
+    def as_milliseconds(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                stage.value: round(seconds * 1000, 1)
+                for stage, seconds in self._seconds.items()
+            }
+
+
+@contextmanager
+def search_stage(timings: SearchTimings | None, stage: SearchStage) -> Iterator[None]:
+    if timings is None:
+        yield
+        return
+
+    with timings.stage(stage):
+        yield
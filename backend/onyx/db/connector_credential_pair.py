@@ -478,6 +478,16 @@ def fetch_connector_credential_pairs(
     return db_session.query(ConnectorCredentialPair).all()
 
 
+def fetch_connector_credential_pair_ids(
+    db_session: Session, min_id: int | None = None
+) -> list[int]:
+    """min_id is exclusive, used to only fetch the cc_pairs created since then"""
+    stmt = select(ConnectorCredentialPair.id).order_by(ConnectorCredentialPair.id)
+    if min_id is not None:
+        stmt = stmt.where(ConnectorCredentialPair.id > min_id)
+    return list(db_session.scalars(stmt).all())
+
+
 def resync_cc_pair(
     cc_pair: ConnectorCredentialPair,
     db_session: Session,
@@ -13,6 +13,7 @@ from sqlalchemy import or_
 from sqlalchemy import Select
 from sqlalchemy import select
 from sqlalchemy import tuple_
+from sqlalchemy import update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.engine.util import TransactionalContext
 from sqlalchemy.exc import OperationalError
@@ -157,6 +158,36 @@ def get_document_ids_for_connector_credential_pair(
     return list(db_session.execute(doc_ids_stmt).scalars().all())
 
 
+def get_document_id_batches_for_connector_credential_pair(
+    db_session: Session, connector_id: int, credential_id: int, batch_size: int
+) -> Generator[list[str], None, None]:
+    """Yields the document IDs of the cc pair in ascending order, one batch at a time.
+    Uses a keyset scan so that only a single batch is ever held in memory."""
+    last_doc_id: str | None = None
+    while True:
+        stmt = (
+            select(DocumentByConnectorCredentialPair.id)
+            .where(
+                DocumentByConnectorCredentialPair.connector_id == connector_id,
+                DocumentByConnectorCredentialPair.credential_id == credential_id,
+            )
+            .order_by(DocumentByConnectorCredentialPair.id)
+            .limit(batch_size)
+        )
+        if last_doc_id is not None:
+            stmt = stmt.where(DocumentByConnectorCredentialPair.id > last_doc_id)
+
+        doc_ids = list(db_session.scalars(stmt).all())
+        if not doc_ids:
+            return
+
+        yield doc_ids
+
+        if len(doc_ids) < batch_size:
+            return
+        last_doc_id = doc_ids[-1]
+
+
 def get_documents_for_connector_credential_pair(
     db_session: Session, connector_id: int, credential_id: int, limit: int | None = None
 ) -> Sequence[DbDocument]:
@@ -441,6 +472,19 @@ def mark_document_as_synced(document_id: str, db_session: Session) -> None:
     db_session.commit()
 
 
+def mark_documents_as_synced(
+    document_ids: list[str], synced_at: datetime, db_session: Session
+) -> None:
+    """synced_at should be taken before the document state that was synced was read, so that
+    a change made during the sync still leaves the document marked as needing a sync"""
+    db_session.execute(
+        update(DbDocument)
+        .where(DbDocument.id.in_(document_ids))
+        .values(last_synced=synced_at)
+    )
+    db_session.commit()
+
+
 def delete_document_by_connector_credential_pair__no_commit(
     db_session: Session,
     document_id: str,
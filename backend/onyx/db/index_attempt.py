@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 
 from onyx.connectors.models import Document
 from onyx.connectors.models import DocumentErrorSummary
+from onyx.connectors.models import IndexingCheckpoint
 from onyx.db.models import IndexAttempt
 from onyx.db.models import IndexAttemptError
 from onyx.db.models import IndexingStatus
@@ -42,6 +43,23 @@ def get_last_attempt_for_cc_pair(
     )
 
 
+def has_failed_index_attempt(
+    cc_pair_id: int,
+    search_settings_id: int,
+    db_session: Session,
+) -> bool:
+    stmt = (
+        select(IndexAttempt.id)
+        .where(
+            IndexAttempt.connector_credential_pair_id == cc_pair_id,
+            IndexAttempt.search_settings_id == search_settings_id,
+            IndexAttempt.status == IndexingStatus.FAILED,
+        )
+        .limit(1)
+    )
+    return db_session.scalar(stmt) is not None
+
+
 def get_index_attempt(
     db_session: Session, index_attempt_id: int
 ) -> IndexAttempt | None:
@@ -207,6 +225,30 @@ def mark_attempt_succeeded(
         raise
 
 
+def mark_attempt_succeeded_up_to(
+    index_attempt: IndexAttempt,
+    indexed_up_to: datetime,
+    db_session: Session,
+) -> None:
+    """For attempts that did not poll the source, e.g. re-embedding the current index.
+    The next poll and the index swap take the time_started of the last successful
+    attempt as the time the index is up to date with the source, so it is moved back to
+    the time the copied documents are up to date with."""
+    try:
+        attempt = db_session.execute(
+            select(IndexAttempt)
+            .where(IndexAttempt.id == index_attempt.id)
+            .with_for_update()
+        ).scalar_one()
+
+        attempt.status = IndexingStatus.SUCCESS
+        attempt.time_started = indexed_up_to
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
+
+
 def mark_attempt_partially_succeeded(
     index_attempt: IndexAttempt,
     db_session: Session,
@@ -286,6 +328,45 @@ def update_docs_indexed(
     db_session.commit()
 
 
+def update_index_attempt_checkpoint(
+    db_session: Session,
+    index_attempt: IndexAttempt,
+    checkpoint: IndexingCheckpoint | None,
+) -> None:
+    index_attempt.checkpoint = (
+        checkpoint.model_dump(mode="json") if checkpoint else None
+    )
+
+    db_session.add(index_attempt)
+    db_session.commit()
+
+
+def get_resumable_checkpoint(
+    index_attempt: IndexAttempt,
+    db_session: Session,
+) -> IndexingCheckpoint | None:
+    """Returns the checkpoint of the previous attempt for the same cc pair and search
+    settings if that attempt was interrupted in the middle of a time window. Checkpoints
+    are cleared whenever a window completes, so any checkpoint left is unfinished work.
+    """
+    previous_attempt = db_session.execute(
+        select(IndexAttempt)
+        .where(
+            IndexAttempt.connector_credential_pair_id
+            == index_attempt.connector_credential_pair_id,
+            IndexAttempt.search_settings_id == index_attempt.search_settings_id,
+            IndexAttempt.id != index_attempt.id,
+        )
+        .order_by(desc(IndexAttempt.time_created))
+        .limit(1)
+    ).scalar_one_or_none()
+
+    if previous_attempt is None or previous_attempt.checkpoint is None:
+        return None
+
+    return IndexingCheckpoint.model_validate(previous_attempt.checkpoint)
+
+
 def get_last_attempt(
     connector_id: int,
     credential_id: int,
@@ -751,6 +751,10 @@ class IndexAttempt(Base):
         ForeignKey("search_settings.id", ondelete="SET NULL"),
         nullable=True,
     )
+    # Only for CheckpointConnectors, an IndexingCheckpoint as of the last indexed batch
+    checkpoint: Mapped[dict[str, Any] | None] = mapped_column(
+        postgresql.JSONB(), nullable=True, default=None
+    )
 
     time_created: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
@@ -5,6 +5,7 @@ from typing import Any
 
 from onyx.access.models import DocumentAccess
 from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.indexing.models import DocMetadataAwareIndexChunk
 from shared_configs.model_server_models import Embedding
@@ -286,6 +287,31 @@ class IdRetrievalCapable(abc.ABC):
         raise NotImplementedError
 
 
+class StoredChunkRetrievalCapable(abc.ABC):
+    """
+    Class must implement the ability to give back the chunks of documents as they were
+    indexed, so that they can be embedded again into another index without fetching the
+    documents from their source
+    """
+
+    @abc.abstractmethod
+    def stored_chunk_retrieval(self, document_ids: list[str]) -> list[InferenceChunk]:
+        """
+        Fetch the chunks of the documents, without the large chunks as those can be rebuilt
+        from the others
+
+        NOTE: the content of the returned chunks is the text of the chunk as produced by the
+        chunker, without the title prefix and metadata suffix.
+
+        Parameters:
+        - document_ids: the documents to retrieve the chunks of
+
+        Returns:
+            list of the chunks of the documents, in no particular order
+        """
+        raise NotImplementedError
+
+
 class HybridCapable(abc.ABC):
     """
     Class must implement hybrid (keyword + vector) search functionality
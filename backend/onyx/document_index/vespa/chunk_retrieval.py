@@ -12,9 +12,12 @@ from retry import retry
 
 from onyx.configs.app_configs import LOG_VESPA_TIMING_INFORMATION
 from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.document_index.interfaces import VespaChunkRequest
-from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
+from onyx.document_index.vespa.shared_utils.utils import (
+    get_shared_vespa_http_client,
+)
 from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
     build_vespa_filters,
 )
@@ -32,6 +35,7 @@ from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
 from onyx.document_index.vespa_constants import HIDDEN
 from onyx.document_index.vespa_constants import LARGE_CHUNK_REFERENCE_IDS
+from onyx.document_index.vespa_constants import LLM_TOKEN_COUNTS
 from onyx.document_index.vespa_constants import MAX_ID_SEARCH_QUERY_SIZE
 from onyx.document_index.vespa_constants import MAX_OR_CONDITIONS
 from onyx.document_index.vespa_constants import METADATA
@@ -89,6 +93,18 @@ def _process_dynamic_summary(
     return processed_summary
 
 
+def _process_llm_token_counts(
+    llm_token_counts: dict[str, int] | list[dict[str, Any]] | None,
+) -> dict[str, int]:
+    # Depending on the renderer settings, maps come back either as an object or as
+    # a list of key/value entries. Chunks indexed before this field existed have none
+    if not llm_token_counts:
+        return {}
+    if isinstance(llm_token_counts, dict):
+        return llm_token_counts
+    return {entry["key"]: entry["value"] for entry in llm_token_counts}
+
+
 def _vespa_hit_to_inference_chunk(
     hit: dict[str, Any], null_score: bool = False
 ) -> InferenceChunkUncleaned:
@@ -139,6 +155,7 @@ def _vespa_hit_to_inference_chunk(
         primary_owners=fields.get(PRIMARY_OWNERS),
         secondary_owners=fields.get(SECONDARY_OWNERS),
         large_chunk_reference_ids=fields.get(LARGE_CHUNK_REFERENCE_IDS, []),
+        llm_token_counts=_process_llm_token_counts(fields.get(LLM_TOKEN_COUNTS)),
         metadata=metadata,
         metadata_suffix=fields.get(METADATA_SUFFIX),
         match_highlights=match_highlights,
@@ -195,9 +212,8 @@ def _get_chunks_via_visit_api(
     while True:
         try:
             filtered_params = {k: v for k, v in params.items() if v is not None}
-            with get_vespa_http_client() as http_client:
-                response = http_client.get(url, params=filtered_params)
-                response.raise_for_status()
+            response = get_shared_vespa_http_client().get(url, params=filtered_params)
+            response.raise_for_status()
         except httpx.HTTPError as e:
             error_base = "Failed to query Vespa"
             logger.error(
@@ -281,6 +297,70 @@ def parallel_visit_api_retrieval(
     return inference_chunks
 
 
+# everything needed to rebuild a chunk for indexing, leaves out the embeddings
+STORED_CHUNK_FIELDS = [
+    DOCUMENT_ID,
+    CHUNK_ID,
+    BLURB,
+    CONTENT,
+    CONTENT_SUMMARY,
+    SOURCE_TYPE,
+    SOURCE_LINKS,
+    SEMANTIC_IDENTIFIER,
+    TITLE,
+    SECTION_CONTINUATION,
+    LLM_TOKEN_COUNTS,
+    METADATA,
+    METADATA_SUFFIX,
+    DOC_UPDATED_AT,
+    PRIMARY_OWNERS,
+    SECONDARY_OWNERS,
+    BOOST,
+    HIDDEN,
+]
+
+
+def _vespa_hit_to_stored_chunk(hit: dict[str, Any]) -> InferenceChunk:
+    inference_chunk = _vespa_hit_to_inference_chunk(
+        hit, null_score=True
+    ).to_inference_chunk()
+    # content has the title prefix and metadata suffix added, the summary is the
+    # text of the chunk as it came out of the chunker
+    inference_chunk.content = hit["fields"][CONTENT_SUMMARY]
+    inference_chunk.match_highlights = []
+    return inference_chunk
+
+
+def parallel_stored_chunk_retrieval(
+    index_name: str,
+    document_ids: list[str],
+) -> list[InferenceChunk]:
+    functions_with_args: list[tuple[Callable, tuple]] = [
+        (
+            _get_chunks_via_visit_api,
+            (
+                VespaChunkRequest(document_id=document_id),
+                index_name,
+                IndexFilters(access_control_list=None),
+                STORED_CHUNK_FIELDS,
+            ),
+        )
+        for document_id in document_ids
+    ]
+
+    # unlike the retrieval for search, a missing document would silently be left out
+    # of the index the chunks are copied into, so failures are raised
+    parallel_results = run_functions_tuples_in_parallel(
+        functions_with_args, allow_failures=False
+    )
+
+    return [
+        _vespa_hit_to_stored_chunk(chunk)
+        for chunk_set in parallel_results
+        for chunk in chunk_set
+    ]
+
+
 @retry(tries=3, delay=1, backoff=2)
 def query_vespa(
     query_params: Mapping[str, str | int | float]
@@ -298,9 +378,8 @@ def query_vespa(
     )
 
     try:
-        with get_vespa_http_client() as http_client:
-            response = http_client.post(SEARCH_ENDPOINT, json=params)
-            response.raise_for_status()
+        response = get_shared_vespa_http_client().post(SEARCH_ENDPOINT, json=params)
+        response.raise_for_status()
     except httpx.HTTPError as e:
         error_base = "Failed to query Vespa"
         logger.error(
@@ -349,7 +428,10 @@ def _get_chunks_via_batch_search(
     if not chunk_requests:
         return []
 
-    filters_str = build_vespa_filters(filters=filters, include_hidden=True)
+    filter_params: dict[str, str] = {}
+    filters_str = build_vespa_filters(
+        filters=filters, include_hidden=True, filter_params=filter_params
+    )
 
     yql = (
         YQL_BASE.format(index_name=index_name)
@@ -363,6 +445,7 @@ def _get_chunks_via_batch_search(
     params: dict[str, str | int | float] = {
         "yql": yql,
         "hits": MAX_ID_SEARCH_QUERY_SIZE,
+        **filter_params,
     }
 
     inference_chunks = query_vespa(params)
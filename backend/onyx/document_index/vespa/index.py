@@ -7,7 +7,6 @@ import re
 import time
 import urllib
 import zipfile
-from dataclasses import dataclass
 from datetime import datetime
 from datetime import timedelta
 from typing import BinaryIO
@@ -18,21 +17,25 @@ import httpx  # type: ignore
 import requests  # type: ignore
 
 from onyx.configs.app_configs import DOCUMENT_INDEX_NAME
+from onyx.configs.app_configs import VESPA_EMBEDDING_QUANTIZATION
 from onyx.configs.chat_configs import DOC_TIME_DECAY
 from onyx.configs.chat_configs import NUM_RETURNED_HITS
 from onyx.configs.chat_configs import TITLE_CONTENT_RATIO
 from onyx.configs.chat_configs import VESPA_SEARCHER_THREADS
+from onyx.configs.constants import EmbeddingQuantization
 from onyx.configs.constants import KV_REINDEX_KEY
 from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceChunkUncleaned
 from onyx.document_index.interfaces import DocumentIndex
 from onyx.document_index.interfaces import DocumentInsertionRecord
+from onyx.document_index.interfaces import StoredChunkRetrievalCapable
 from onyx.document_index.interfaces import UpdateRequest
 from onyx.document_index.interfaces import VespaChunkRequest
 from onyx.document_index.interfaces import VespaDocumentFields
 from onyx.document_index.vespa.chunk_retrieval import batch_search_api_retrieval
 from onyx.document_index.vespa.chunk_retrieval import (
-    get_all_vespa_ids_for_document_id,
+    parallel_stored_chunk_retrieval,
 )
 from onyx.document_index.vespa.chunk_retrieval import (
     parallel_visit_api_retrieval,
@@ -44,7 +47,13 @@ from onyx.document_index.vespa.indexing_utils import clean_chunk_id_copy
 from onyx.document_index.vespa.indexing_utils import (
     get_existing_documents_from_chunks,
 )
-from onyx.document_index.vespa.shared_utils.utils import get_vespa_http_client
+from onyx.document_index.vespa.quantization import (
+    add_embedding_quantization_to_schema,
+)
+from onyx.document_index.vespa.quantization import quantize_embedding
+from onyx.document_index.vespa.shared_utils.utils import (
+    get_shared_vespa_http_client,
+)
 from onyx.document_index.vespa.shared_utils.utils import (
     replace_invalid_doc_id_characters,
 )
@@ -60,11 +69,16 @@ from onyx.document_index.vespa_constants import DATE_REPLACEMENT
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
 from onyx.document_index.vespa_constants import DOCUMENT_REPLACEMENT_PAT
 from onyx.document_index.vespa_constants import DOCUMENT_SETS
+from onyx.document_index.vespa_constants import EMBEDDINGS
+from onyx.document_index.vespa_constants import EMBEDDINGS_QUANTIZED
 from onyx.document_index.vespa_constants import HIDDEN
+from onyx.document_index.vespa_constants import MAX_DOCUMENTS_PER_UPDATE_SELECTION
 from onyx.document_index.vespa_constants import NUM_THREADS
 from onyx.document_index.vespa_constants import SEARCH_THREAD_NUMBER_PAT
 from onyx.document_index.vespa_constants import TENANT_ID_PAT
 from onyx.document_index.vespa_constants import TENANT_ID_REPLACEMENT
+from onyx.document_index.vespa_constants import TITLE_EMBEDDING
+from onyx.document_index.vespa_constants import TITLE_EMBEDDING_QUANTIZED
 from onyx.document_index.vespa_constants import VESPA_APPLICATION_ENDPOINT
 from onyx.document_index.vespa_constants import VESPA_DIM_REPLACEMENT_PAT
 from onyx.document_index.vespa_constants import VESPA_TIMEOUT
@@ -84,13 +98,6 @@ httpx_logger = logging.getLogger("httpx")
 httpx_logger.setLevel(logging.WARNING)
 
 
-@dataclass
-class _VespaUpdateRequest:
-    document_id: str
-    url: str
-    update_request: dict[str, dict]
-
-
 def in_memory_zip_from_file_bytes(file_contents: dict[str, bytes]) -> BinaryIO:
     zip_buffer = io.BytesIO()
     with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zipf:
@@ -124,7 +131,7 @@ def add_ngrams_to_schema(schema_content: str) -> str:
     return schema_content
 
 
-class VespaIndex(DocumentIndex):
+class VespaIndex(DocumentIndex, StoredChunkRetrievalCapable):
     def __init__(
         self,
         index_name: str,
@@ -134,7 +141,6 @@ class VespaIndex(DocumentIndex):
         self.index_name = index_name
         self.secondary_index_name = secondary_index_name
         self.multitenant = multitenant
-        self.http_client = get_vespa_http_client()
 
     def ensure_indices_exist(
         self,
@@ -201,6 +207,9 @@ class VespaIndex(DocumentIndex):
         ).replace(VESPA_DIM_REPLACEMENT_PAT, str(index_embedding_dim))
 
         schema = add_ngrams_to_schema(schema) if needs_reindexing else schema
+        schema = add_embedding_quantization_to_schema(
+            schema, index_embedding_dim, VESPA_EMBEDDING_QUANTIZATION
+        )
         schema = schema.replace(TENANT_ID_PAT, "")
         zip_dict[f"schemas/{schema_names[0]}.sd"] = schema.encode("utf-8")
 
@@ -208,6 +217,12 @@ class VespaIndex(DocumentIndex):
             upcoming_schema = schema_template.replace(
                 DANSWER_CHUNK_REPLACEMENT_PAT, self.secondary_index_name
             ).replace(VESPA_DIM_REPLACEMENT_PAT, str(secondary_index_embedding_dim))
+            if secondary_index_embedding_dim is not None:
+                upcoming_schema = add_embedding_quantization_to_schema(
+                    upcoming_schema,
+                    secondary_index_embedding_dim,
+                    VESPA_EMBEDDING_QUANTIZATION,
+                )
             zip_dict[f"schemas/{schema_names[1]}.sd"] = upcoming_schema.encode("utf-8")
 
         zip_file = in_memory_zip_from_file_bytes(zip_dict)
@@ -292,6 +307,9 @@ class VespaIndex(DocumentIndex):
                 TENANT_ID_PAT, TENANT_ID_REPLACEMENT if MULTI_TENANT else ""
             )
             schema = add_ngrams_to_schema(schema) if needs_reindexing else schema
+            schema = add_embedding_quantization_to_schema(
+                schema, embedding_dim, VESPA_EMBEDDING_QUANTIZATION
+            )
             zip_dict[f"schemas/{index_name}.sd"] = schema.encode("utf-8")
 
         zip_file = in_memory_zip_from_file_bytes(zip_dict)
@@ -320,10 +338,8 @@ class VespaIndex(DocumentIndex):
 
         # NOTE: using `httpx` here since `requests` doesn't support HTTP2. This is beneficial for
         # indexing / updates / deletes since we have to make a large volume of requests.
-        with (
-            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
-            get_vespa_http_client() as http_client,
-        ):
+        http_client = get_shared_vespa_http_client()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
             if not fresh_index:
                 # Check for existing documents, existing documents need to have all of their chunks deleted
                 # prior to indexing as the document size (num chunks) may have shrunk
@@ -368,133 +384,119 @@ class VespaIndex(DocumentIndex):
         }
 
     @staticmethod
-    def _apply_updates_batched(
-        updates: list[_VespaUpdateRequest],
-        batch_size: int = BATCH_SIZE,
-    ) -> None:
-        """Runs a batch of updates in parallel via the ThreadPoolExecutor."""
+    def _build_update_dict(
+        fields: VespaDocumentFields | UpdateRequest,
+    ) -> dict[str, dict]:
+        update_dict: dict[str, dict] = {"fields": {}}
+        if fields.boost is not None:
+            update_dict["fields"][BOOST] = {"assign": fields.boost}
+        if fields.document_sets is not None:
+            update_dict["fields"][DOCUMENT_SETS] = {
+                "assign": {document_set: 1 for document_set in fields.document_sets}
+            }
+        if fields.access is not None:
+            update_dict["fields"][ACCESS_CONTROL_LIST] = {
+                "assign": {acl_entry: 1 for acl_entry in fields.access.to_acl()}
+            }
+        if fields.hidden is not None:
+            update_dict["fields"][HIDDEN] = {"assign": fields.hidden}
+        return update_dict
 
-        def _update_chunk(
-            update: _VespaUpdateRequest, http_client: httpx.Client
-        ) -> httpx.Response:
-            logger.debug(
-                f"Updating with request to {update.url} with body {update.update_request}"
-            )
-            return http_client.put(
-                update.url,
-                headers={"Content-Type": "application/json"},
-                json=update.update_request,
-            )
+    @staticmethod
+    def _update_by_selection(
+        http_client: httpx.Client,
+        index_name: str,
+        selection: str,
+        update_dict: dict[str, dict],
+    ) -> int:
+        """Applies the update to every chunk in the index that matches the selection.
+        Vespa visits the whole index to find the chunks, so a selection covering many
+        documents costs about the same as one covering a single document.
+
+        Returns the number of chunks updated"""
+        total_chunks_updated = 0
 
-        # NOTE: using `httpx` here since `requests` doesn't support HTTP2. This is beneficient for
-        # indexing / updates / deletes since we have to make a large volume of requests.
+        params = httpx.QueryParams(
+            {
+                "selection": selection,
+                "cluster": DOCUMENT_INDEX_NAME,
+            }
+        )
 
-        with (
-            concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor,
-            get_vespa_http_client() as http_client,
-        ):
-            for update_batch in batch_generator(updates, batch_size):
-                future_to_document_id = {
-                    executor.submit(
-                        _update_chunk,
-                        update,
-                        http_client,
-                    ): update.document_id
-                    for update in update_batch
-                }
-                for future in concurrent.futures.as_completed(future_to_document_id):
-                    res = future.result()
-                    try:
-                        res.raise_for_status()
-                    except requests.HTTPError as e:
-                        failure_msg = f"Failed to update document: {future_to_document_id[future]}"
-                        raise requests.HTTPError(failure_msg) from e
+        while True:
+            try:
+                vespa_url = f"{DOCUMENT_ID_ENDPOINT.format(index_name=index_name)}"
+                logger.debug(f'update PUT on URL "{vespa_url}"')
+                resp = http_client.put(
+                    vespa_url,
+                    params=params,
+                    headers={"Content-Type": "application/json"},
+                    json=update_dict,
+                )
 
-    def update(self, update_requests: list[UpdateRequest]) -> None:
-        logger.debug(f"Updating {len(update_requests)} documents in Vespa")
+                resp.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                logger.error(f"Failed to update chunks, details: {e.response.text}")
+                raise
 
-        # Handle Vespa character limitations
-        # Mutating update_requests but it's not used later anyway
-        for update_request in update_requests:
-            update_request.document_ids = [
-                replace_invalid_doc_id_characters(doc_id)
-                for doc_id in update_request.document_ids
-            ]
+            resp_data = resp.json()
 
-        update_start = time.monotonic()
+            if "documentCount" in resp_data:
+                chunks_updated = resp_data["documentCount"]
+                total_chunks_updated += chunks_updated
+
+            # Check for continuation token to handle pagination
+            if "continuation" not in resp_data:
+                break  # Exit loop if no continuation token
 
-        processed_updates_requests: list[_VespaUpdateRequest] = []
-        all_doc_chunk_ids: dict[str, list[str]] = {}
+            if not resp_data["continuation"]:
+                break  # Exit loop if continuation token is empty
+
+            params = params.set("continuation", resp_data["continuation"])
+
+        return total_chunks_updated
+
+    def update(self, update_requests: list[UpdateRequest]) -> None:
+        """Each request is applied with one selection based update per index and batch of
+        its documents, rather than one update per chunk"""
+        logger.debug(f"Updating {len(update_requests)} groups of documents in Vespa")
+
+        update_start = time.monotonic()
 
-        # Fetch all chunks for each document ahead of time
         index_names = [self.index_name]
         if self.secondary_index_name:
             index_names.append(self.secondary_index_name)
 
-        chunk_id_start_time = time.monotonic()
-        with concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-            future_to_doc_chunk_ids = {
-                executor.submit(
-                    get_all_vespa_ids_for_document_id,
-                    document_id=document_id,
-                    index_name=index_name,
-                    filters=None,
-                    get_large_chunks=True,
-                ): (document_id, index_name)
-                for index_name in index_names
-                for update_request in update_requests
-                for document_id in update_request.document_ids
-            }
-            for future in concurrent.futures.as_completed(future_to_doc_chunk_ids):
-                document_id, index_name = future_to_doc_chunk_ids[future]
-                try:
-                    doc_chunk_ids = future.result()
-                    if document_id not in all_doc_chunk_ids:
-                        all_doc_chunk_ids[document_id] = []
-                    all_doc_chunk_ids[document_id].extend(doc_chunk_ids)
-                except Exception as e:
-                    logger.error(
-                        f"Error retrieving chunk IDs for document {document_id} in index {index_name}: {e}"
-                    )
-        logger.debug(
-            f"Took {time.monotonic() - chunk_id_start_time:.2f} seconds to fetch all Vespa chunk IDs"
-        )
-
-        # Build the _VespaUpdateRequest objects
+        http_client = get_shared_vespa_http_client(http2=False)
         for update_request in update_requests:
-            update_dict: dict[str, dict] = {"fields": {}}
-            if update_request.boost is not None:
-                update_dict["fields"][BOOST] = {"assign": update_request.boost}
-            if update_request.document_sets is not None:
-                update_dict["fields"][DOCUMENT_SETS] = {
-                    "assign": {
-                        document_set: 1 for document_set in update_request.document_sets
-                    }
-                }
-            if update_request.access is not None:
-                update_dict["fields"][ACCESS_CONTROL_LIST] = {
-                    "assign": {
-                        acl_entry: 1 for acl_entry in update_request.access.to_acl()
-                    }
-                }
-            if update_request.hidden is not None:
-                update_dict["fields"][HIDDEN] = {"assign": update_request.hidden}
-
+            update_dict = self._build_update_dict(update_request)
             if not update_dict["fields"]:
                 logger.error("Update request received but nothing to update")
                 continue
 
-            for document_id in update_request.document_ids:
-                for doc_chunk_id in all_doc_chunk_ids[document_id]:
-                    processed_updates_requests.append(
-                        _VespaUpdateRequest(
-                            document_id=document_id,
-                            url=f"{DOCUMENT_ID_ENDPOINT.format(index_name=self.index_name)}/{doc_chunk_id}",
-                            update_request=update_dict,
-                        )
+            # Handle Vespa character limitations
+            doc_ids = [
+                replace_invalid_doc_id_characters(doc_id)
+                for doc_id in update_request.document_ids
+            ]
+            for index_name in index_names:
+                for doc_id_batch in batch_generator(
+                    doc_ids, MAX_DOCUMENTS_PER_UPDATE_SELECTION
+                ):
+                    selection = " or ".join(
+                        f"{index_name}.document_id=='{doc_id}'"
+                        for doc_id in doc_id_batch
+                    )
+                    chunks_updated = self._update_by_selection(
+                        http_client, index_name, selection, update_dict
+                    )
+                    logger.debug(
+                        f"VespaIndex.update: "
+                        f"index={index_name} "
+                        f"docs={len(doc_id_batch)} "
+                        f"chunks_updated={chunks_updated}"
                     )
 
-        self._apply_updates_batched(processed_updates_requests)
         logger.debug(
             "Finished updating Vespa documents in %.2f seconds",
             time.monotonic() - update_start,
@@ -512,21 +514,7 @@ class VespaIndex(DocumentIndex):
         # Mutating update_request but it's not used later anyway
         normalized_doc_id = replace_invalid_doc_id_characters(doc_id)
 
-        # Build the _VespaUpdateRequest objects
-        update_dict: dict[str, dict] = {"fields": {}}
-        if fields.boost is not None:
-            update_dict["fields"][BOOST] = {"assign": fields.boost}
-        if fields.document_sets is not None:
-            update_dict["fields"][DOCUMENT_SETS] = {
-                "assign": {document_set: 1 for document_set in fields.document_sets}
-            }
-        if fields.access is not None:
-            update_dict["fields"][ACCESS_CONTROL_LIST] = {
-                "assign": {acl_entry: 1 for acl_entry in fields.access.to_acl()}
-            }
-        if fields.hidden is not None:
-            update_dict["fields"][HIDDEN] = {"assign": fields.hidden}
-
+        update_dict = self._build_update_dict(fields)
         if not update_dict["fields"]:
             logger.error("Update request received but nothing to update")
             return 0
@@ -535,56 +523,21 @@ class VespaIndex(DocumentIndex):
         if self.secondary_index_name:
             index_names.append(self.secondary_index_name)
 
-        with get_vespa_http_client(http2=False) as http_client:
-            for index_name in index_names:
-                params = httpx.QueryParams(
-                    {
-                        "selection": f"{index_name}.document_id=='{normalized_doc_id}'",
-                        "cluster": DOCUMENT_INDEX_NAME,
-                    }
-                )
-
-                while True:
-                    try:
-                        vespa_url = (
-                            f"{DOCUMENT_ID_ENDPOINT.format(index_name=self.index_name)}"
-                        )
-                        logger.debug(f'update_single PUT on URL "{vespa_url}"')
-                        resp = http_client.put(
-                            vespa_url,
-                            params=params,
-                            headers={"Content-Type": "application/json"},
-                            json=update_dict,
-                        )
-
-                        resp.raise_for_status()
-                    except httpx.HTTPStatusError as e:
-                        logger.error(
-                            f"Failed to update chunks, details: {e.response.text}"
-                        )
-                        raise
-
-                    resp_data = resp.json()
-
-                    if "documentCount" in resp_data:
-                        chunks_updated = resp_data["documentCount"]
-                        total_chunks_updated += chunks_updated
-
-                    # Check for continuation token to handle pagination
-                    if "continuation" not in resp_data:
-                        break  # Exit loop if no continuation token
-
-                    if not resp_data["continuation"]:
-                        break  # Exit loop if continuation token is empty
-
-                    params = params.set("continuation", resp_data["continuation"])
+        http_client = get_shared_vespa_http_client(http2=False)
+        for index_name in index_names:
+            total_chunks_updated += self._update_by_selection(
+                http_client,
+                index_name,
+                f"{index_name}.document_id=='{normalized_doc_id}'",
+                update_dict,
+            )
 
-                logger.debug(
-                    f"VespaIndex.update_single: "
-                    f"index={index_name} "
-                    f"doc={normalized_doc_id} "
-                    f"chunks_updated={total_chunks_updated}"
-                )
+            logger.debug(
+                f"VespaIndex.update_single: "
+                f"index={index_name} "
+                f"doc={normalized_doc_id} "
+                f"chunks_updated={total_chunks_updated}"
+            )
 
         return total_chunks_updated
 
@@ -595,15 +548,15 @@ class VespaIndex(DocumentIndex):
 
         # NOTE: using `httpx` here since `requests` doesn't support HTTP2. This is beneficial for
         # indexing / updates / deletes since we have to make a large volume of requests.
-        with get_vespa_http_client() as http_client:
-            index_names = [self.index_name]
-            if self.secondary_index_name:
-                index_names.append(self.secondary_index_name)
+        http_client = get_shared_vespa_http_client()
+        index_names = [self.index_name]
+        if self.secondary_index_name:
+            index_names.append(self.secondary_index_name)
 
-            for index_name in index_names:
-                delete_vespa_docs(
-                    document_ids=doc_ids, index_name=index_name, http_client=http_client
-                )
+        for index_name in index_names:
+            delete_vespa_docs(
+                document_ids=doc_ids, index_name=index_name, http_client=http_client
+            )
         return
 
     def delete_single(self, doc_id: str) -> int:
@@ -623,53 +576,49 @@ class VespaIndex(DocumentIndex):
         if self.secondary_index_name:
             index_names.append(self.secondary_index_name)
 
-        with get_vespa_http_client(http2=False) as http_client:
-            for index_name in index_names:
-                params = httpx.QueryParams(
-                    {
-                        "selection": f"{index_name}.document_id=='{doc_id}'",
-                        "cluster": DOCUMENT_INDEX_NAME,
-                    }
-                )
+        http_client = get_shared_vespa_http_client(http2=False)
+        for index_name in index_names:
+            params = httpx.QueryParams(
+                {
+                    "selection": f"{index_name}.document_id=='{doc_id}'",
+                    "cluster": DOCUMENT_INDEX_NAME,
+                }
+            )
 
-                while True:
-                    try:
-                        vespa_url = (
-                            f"{DOCUMENT_ID_ENDPOINT.format(index_name=index_name)}"
-                        )
-                        logger.debug(f'delete_single DELETE on URL "{vespa_url}"')
-                        resp = http_client.delete(
-                            vespa_url,
-                            params=params,
-                        )
-                        resp.raise_for_status()
-                    except httpx.HTTPStatusError as e:
-                        logger.error(
-                            f"Failed to delete chunk, details: {e.response.text}"
-                        )
-                        raise
+            while True:
+                try:
+                    vespa_url = f"{DOCUMENT_ID_ENDPOINT.format(index_name=index_name)}"
+                    logger.debug(f'delete_single DELETE on URL "{vespa_url}"')
+                    resp = http_client.delete(
+                        vespa_url,
+                        params=params,
+                    )
+                    resp.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    logger.error(f"Failed to delete chunk, details: {e.response.text}")
+                    raise
 
-                    resp_data = resp.json()
+                resp_data = resp.json()
 
-                    if "documentCount" in resp_data:
-                        chunks_deleted = resp_data["documentCount"]
-                        total_chunks_deleted += chunks_deleted
+                if "documentCount" in resp_data:
+                    chunks_deleted = resp_data["documentCount"]
+                    total_chunks_deleted += chunks_deleted
 
-                    # Check for continuation token to handle pagination
-                    if "continuation" not in resp_data:
-                        break  # Exit loop if no continuation token
+                # Check for continuation token to handle pagination
+                if "continuation" not in resp_data:
+                    break  # Exit loop if no continuation token
 
-                    if not resp_data["continuation"]:
-                        break  # Exit loop if continuation token is empty
+                if not resp_data["continuation"]:
+                    break  # Exit loop if continuation token is empty
 
-                    params = params.set("continuation", resp_data["continuation"])
+                params = params.set("continuation", resp_data["continuation"])
 
-                logger.debug(
-                    f"VespaIndex.delete_single: "
-                    f"index={index_name} "
-                    f"doc={doc_id} "
-                    f"chunks_deleted={total_chunks_deleted}"
-                )
+            logger.debug(
+                f"VespaIndex.delete_single: "
+                f"index={index_name} "
+                f"doc={doc_id} "
+                f"chunks_deleted={total_chunks_deleted}"
+            )
 
         return total_chunks_deleted
 
@@ -694,6 +643,12 @@ class VespaIndex(DocumentIndex):
             get_large_chunks=get_large_chunks,
         )
 
+    def stored_chunk_retrieval(self, document_ids: list[str]) -> list[InferenceChunk]:
+        return parallel_stored_chunk_retrieval(
+            index_name=self.index_name,
+            document_ids=document_ids,
+        )
+
     def hybrid_retrieval(
         self,
         query: str,
@@ -706,14 +661,23 @@ class VespaIndex(DocumentIndex):
         offset: int = 0,
         title_content_ratio: float | None = TITLE_CONTENT_RATIO,
     ) -> list[InferenceChunkUncleaned]:
-        vespa_where_clauses = build_vespa_filters(filters)
+        filter_params: dict[str, str] = {}
+        vespa_where_clauses = build_vespa_filters(filters, filter_params=filter_params)
         # Needs to be at least as much as the value set in Vespa schema config
         target_hits = max(10 * num_to_retrieve, 1000)
+        quantized = VESPA_EMBEDDING_QUANTIZATION != EmbeddingQuantization.NONE
+        embeddings_field = EMBEDDINGS_QUANTIZED if quantized else EMBEDDINGS
+        title_embedding_field = (
+            TITLE_EMBEDDING_QUANTIZED if quantized else TITLE_EMBEDDING
+        )
+        nn_query_embedding = (
+            "query_embedding_quantized" if quantized else "query_embedding"
+        )
         yql = (
             YQL_BASE.format(index_name=self.index_name)
             + vespa_where_clauses
-            + f"(({{targetHits: {target_hits}}}nearestNeighbor(embeddings, query_embedding)) "
-            + f"or ({{targetHits: {target_hits}}}nearestNeighbor(title_embedding, query_embedding)) "
+            + f"(({{targetHits: {target_hits}}}nearestNeighbor({embeddings_field}, {nn_query_embedding})) "
+            + f"or ({{targetHits: {target_hits}}}nearestNeighbor({title_embedding_field}, {nn_query_embedding})) "
             + 'or ({grammar: "weakAnd"}userInput(@query)) '
             + f'or ({{defaultIndex: "{CONTENT_SUMMARY}"}}userInput(@query)))'
         )
@@ -735,7 +699,12 @@ class VespaIndex(DocumentIndex):
             "offset": offset,
             "ranking.profile": f"hybrid_search{len(query_embedding)}",
             "timeout": VESPA_TIMEOUT,
+            **filter_params,
         }
+        if quantized:
+            params["input.query(query_embedding_quantized)"] = str(
+                quantize_embedding(query_embedding, VESPA_EMBEDDING_QUANTIZATION)
+            )
 
         return query_vespa(params)
 
@@ -746,7 +715,10 @@ class VespaIndex(DocumentIndex):
         num_to_retrieve: int = NUM_RETURNED_HITS,
         offset: int = 0,
     ) -> list[InferenceChunkUncleaned]:
-        vespa_where_clauses = build_vespa_filters(filters, include_hidden=True)
+        filter_params: dict[str, str] = {}
+        vespa_where_clauses = build_vespa_filters(
+            filters, include_hidden=True, filter_params=filter_params
+        )
         yql = (
             YQL_BASE.format(index_name=self.index_name)
             + vespa_where_clauses
@@ -764,6 +736,7 @@ class VespaIndex(DocumentIndex):
             "offset": 0,
             "ranking.profile": "admin_search",
             "timeout": VESPA_TIMEOUT,
+            **filter_params,
         }
 
         return query_vespa(params)
@@ -837,22 +810,22 @@ class VespaIndex(DocumentIndex):
                 f"Querying for document IDs with tenant_id: {tenant_id}, offset: {offset}"
             )
 
-            with get_vespa_http_client(no_timeout=True) as http_client:
-                response = http_client.get(url, params=query_params)
-                response.raise_for_status()
+            http_client = get_shared_vespa_http_client(no_timeout=True)
+            response = http_client.get(url, params=query_params)
+            response.raise_for_status()
 
-                search_result = response.json()
-                hits = search_result.get("root", {}).get("children", [])
+            search_result = response.json()
+            hits = search_result.get("root", {}).get("children", [])
 
-                if not hits:
-                    break
+            if not hits:
+                break
 
-                for hit in hits:
-                    doc_id = hit.get("id")
-                    if doc_id:
-                        document_ids.append(doc_id)
+            for hit in hits:
+                doc_id = hit.get("id")
+                if doc_id:
+                    document_ids.append(doc_id)
 
-                offset += limit  # Move to the next page
+            offset += limit  # Move to the next page
 
         logger.debug(
             f"Retrieved {len(document_ids)} document IDs for tenant_id: {tenant_id}"
@@ -886,29 +859,27 @@ class VespaIndex(DocumentIndex):
         logger.debug(f"Starting batch deletion for {len(delete_requests)} documents")
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
-            with get_vespa_http_client(no_timeout=True) as http_client:
-                for batch_start in range(0, len(delete_requests), batch_size):
-                    batch = delete_requests[batch_start : batch_start + batch_size]
-
-                    future_to_document_id = {
-                        executor.submit(
-                            _delete_document,
-                            delete_request,
-                            http_client,
-                        ): delete_request.document_id
-                        for delete_request in batch
-                    }
-
-                    for future in concurrent.futures.as_completed(
-                        future_to_document_id
-                    ):
-                        doc_id = future_to_document_id[future]
-                        try:
-                            future.result()
-                            logger.debug(f"Successfully deleted document: {doc_id}")
-                        except httpx.HTTPError as e:
-                            logger.error(f"Failed to delete document {doc_id}: {e}")
-                            # Optionally, implement retry logic or error handling here
+            http_client = get_shared_vespa_http_client(no_timeout=True)
+            for batch_start in range(0, len(delete_requests), batch_size):
+                batch = delete_requests[batch_start : batch_start + batch_size]
+
+                future_to_document_id = {
+                    executor.submit(
+                        _delete_document,
+                        delete_request,
+                        http_client,
+                    ): delete_request.document_id
+                    for delete_request in batch
+                }
+
+                for future in concurrent.futures.as_completed(future_to_document_id):
+                    doc_id = future_to_document_id[future]
+                    try:
+                        future.result()
+                        logger.debug(f"Successfully deleted document: {doc_id}")
+                    except httpx.HTTPError as e:
+                        logger.error(f"Failed to delete document {doc_id}: {e}")
+                        # Optionally, implement retry logic or error handling here
 
         logger.info("Batch deletion completed")
 
@@ -922,7 +893,10 @@ class VespaIndex(DocumentIndex):
         This method is currently used for random chunk retrieval in the context of
         assistant starter message creation (passed as sample context for usage by the assistant).
         """
-        vespa_where_clauses = build_vespa_filters(filters, remove_trailing_and=True)
+        filter_params: dict[str, str] = {}
+        vespa_where_clauses = build_vespa_filters(
+            filters, remove_trailing_and=True, filter_params=filter_params
+        )
 
         yql = YQL_BASE.format(index_name=self.index_name) + vespa_where_clauses
 
@@ -934,6 +908,7 @@ class VespaIndex(DocumentIndex):
             "timeout": VESPA_TIMEOUT,
             "ranking.profile": "random_",
             "ranking.properties.random.seed": random_seed,
+            **filter_params,
         }
 
         return query_vespa(params)
@@ -10,7 +10,10 @@ from retry import retry
 from onyx.connectors.cross_connector_utils.miscellaneous_utils import (
     get_experts_stores_representations,
 )
+from onyx.configs.app_configs import VESPA_EMBEDDING_QUANTIZATION
+from onyx.configs.constants import EmbeddingQuantization
 from onyx.document_index.document_index_utils import get_uuid_from_chunk
+from onyx.document_index.vespa.quantization import quantize_embedding
 from onyx.document_index.vespa.shared_utils.utils import remove_invalid_unicode_chars
 from onyx.document_index.vespa.shared_utils.utils import (
     replace_invalid_doc_id_characters,
@@ -26,7 +29,9 @@ from onyx.document_index.vespa_constants import DOCUMENT_ID
 from onyx.document_index.vespa_constants import DOCUMENT_ID_ENDPOINT
 from onyx.document_index.vespa_constants import DOCUMENT_SETS
 from onyx.document_index.vespa_constants import EMBEDDINGS
+from onyx.document_index.vespa_constants import EMBEDDINGS_QUANTIZED
 from onyx.document_index.vespa_constants import LARGE_CHUNK_REFERENCE_IDS
+from onyx.document_index.vespa_constants import LLM_TOKEN_COUNTS
 from onyx.document_index.vespa_constants import METADATA
 from onyx.document_index.vespa_constants import METADATA_LIST
 from onyx.document_index.vespa_constants import METADATA_SUFFIX
@@ -41,6 +46,7 @@ from onyx.document_index.vespa_constants import SOURCE_TYPE
 from onyx.document_index.vespa_constants import TENANT_ID
 from onyx.document_index.vespa_constants import TITLE
 from onyx.document_index.vespa_constants import TITLE_EMBEDDING
+from onyx.document_index.vespa_constants import TITLE_EMBEDDING_QUANTIZED
 from onyx.indexing.models import DocMetadataAwareIndexChunk
 from onyx.utils.logger import setup_logger
 
@@ -162,6 +168,7 @@ def _index_vespa_chunk(
         SEMANTIC_IDENTIFIER: remove_invalid_unicode_chars(document.semantic_identifier),
         SECTION_CONTINUATION: chunk.section_continuation,
         LARGE_CHUNK_REFERENCE_IDS: chunk.large_chunk_reference_ids,
+        LLM_TOKEN_COUNTS: chunk.llm_token_counts,
         METADATA: json.dumps(document.metadata),
         # Save as a list for efficient extraction as an Attribute
         METADATA_LIST: chunk.source_document.get_metadata_str_attributes(),
@@ -180,6 +187,17 @@ def _index_vespa_chunk(
         BOOST: chunk.boost,
     }
 
+    if VESPA_EMBEDDING_QUANTIZATION != EmbeddingQuantization.NONE:
+        vespa_document_fields[EMBEDDINGS_QUANTIZED] = {
+            name: quantize_embedding(vector, VESPA_EMBEDDING_QUANTIZATION)
+            for name, vector in embeddings_name_vector_map.items()
+        }
+        vespa_document_fields[TITLE_EMBEDDING_QUANTIZED] = (
+            quantize_embedding(chunk.title_embedding, VESPA_EMBEDDING_QUANTIZATION)
+            if chunk.title_embedding
+            else None
+        )
+
     if multitenant:
         if chunk.tenant_id:
             vespa_document_fields[TENANT_ID] = chunk.tenant_id
@@ -0,0 +1,156 @@
+import re
+
+import numpy
+
+from onyx.configs.constants import EmbeddingQuantization
+from onyx.document_index.vespa_constants import EMBEDDINGS
+from onyx.document_index.vespa_constants import EMBEDDINGS_QUANTIZED
+from onyx.document_index.vespa_constants import TITLE_EMBEDDING
+from onyx.document_index.vespa_constants import TITLE_EMBEDDING_QUANTIZED
+from shared_configs.model_server_models import Embedding
+
+
+def quantize_embedding(
+    embedding: Embedding, quantization: EmbeddingQuantization
+) -> list[int]:
+    vector = numpy.asarray(embedding, dtype=numpy.float32)
+
+    if quantization == EmbeddingQuantization.BINARY:
+        # One bit per dimension (its sign) packed into int8 cells, compared by hamming distance
+        return numpy.packbits(vector > 0).astype(numpy.int8).tolist()
+
+    if quantization == EmbeddingQuantization.INT8:
+        max_abs = float(numpy.abs(vector).max()) if vector.size else 0.0
+        if max_abs == 0:
+            return [0] * vector.size
+        # Scaled per vector, the angular distance does not depend on the vector length
+        return numpy.round(vector * (127 / max_abs)).astype(numpy.int8).tolist()
+
+    raise ValueError(f"Embeddings are not quantized with {quantization}")
+
+
+def _quantized_field(
+    name: str, tensor_type: str, distance_metric: str, comment: str
+) -> str:
+    return (
+        f"        # {comment}\n"
+        f"        field {name} type {tensor_type} {{\n"
+        "            indexing: attribute | index\n"
+        "            attribute {\n"
+        f"                distance-metric: {distance_metric}\n"
+        "            }\n"
+        "        }\n"
+    )
+
+
+# Same scale as closeness() with the angular distance metric, 0 for missing embeddings
+_FULL_PRECISION_RANK_FUNCTIONS = f"""
+        function inline query_embedding_norm() {{
+            expression: sqrt(reduce(query(query_embedding) * query(query_embedding), sum))
+        }}
+
+        function {TITLE_EMBEDDING}_similarity() {{
+            expression {{
+                if (
+                    reduce(attribute({TITLE_EMBEDDING}) * attribute({TITLE_EMBEDDING}), sum) == 0,
+                    0,
+                    1 / (1 + acos(max(min(
+                        reduce(query(query_embedding) * attribute({TITLE_EMBEDDING}), sum)
+                        / (query_embedding_norm * sqrt(reduce(attribute({TITLE_EMBEDDING}) * attribute({TITLE_EMBEDDING}), sum))),
+                    1), -1)))
+                )
+            }}
+        }}
+
+        # Best matching of the chunk and mini chunk embeddings
+        function {EMBEDDINGS}_similarity() {{
+            expression {{
+                1 / (1 + acos(max(min(reduce(
+                    reduce(query(query_embedding) * attribute({EMBEDDINGS}), sum, x)
+                    / (query_embedding_norm * sqrt(reduce(attribute({EMBEDDINGS}) * attribute({EMBEDDINGS}), sum, x))),
+                max, t), 1), -1)))
+            }}
+        }}
+
+        # Rescore the hits of the quantized nearest neighbor search at full precision
+        second-phase {{
+            expression: {EMBEDDINGS}_similarity
+            rerank-count: 1000
+        }}
+"""
+
+
+def add_embedding_quantization_to_schema(
+    schema_content: str, embedding_dim: int, quantization: EmbeddingQuantization
+) -> str:
+    """Expects the embedding dimension to already be filled into the schema."""
+    if quantization == EmbeddingQuantization.NONE:
+        return schema_content
+
+    if quantization == EmbeddingQuantization.BINARY:
+        if embedding_dim % 8:
+            raise ValueError(
+                f"Binary quantization needs a multiple of 8 dimensions, got {embedding_dim}"
+            )
+        quantized_type = f"tensor<int8>(x[{embedding_dim // 8}])"
+        distance_metric = "hamming"
+    else:
+        quantized_type = f"tensor<int8>(x[{embedding_dim}])"
+        distance_metric = "angular"
+
+    # The full precision embeddings are no longer HNSW indexed and are paged from disk
+    # instead of being held in memory
+    for field in [TITLE_EMBEDDING, EMBEDDINGS]:
+        schema_content = re.sub(
+            rf"(field {field} type tensor<float>\([^)]*\) \{{\s*indexing: attribute) \| index"
+            r"(\s*attribute \{)",
+            r"\1\2\n                paged",
+            schema_content,
+        )
+
+    quantized_fields = _quantized_field(
+        TITLE_EMBEDDING_QUANTIZED,
+        quantized_type,
+        distance_metric,
+        f"{quantization.value} quantized {TITLE_EMBEDDING} for nearest neighbor search",
+    ) + _quantized_field(
+        EMBEDDINGS_QUANTIZED,
+        quantized_type.replace("(x[", "(t{},x["),
+        distance_metric,
+        f"{quantization.value} quantized {EMBEDDINGS} for nearest neighbor search",
+    )
+    schema_content = re.sub(
+        rf"(\n        field {EMBEDDINGS} type tensor<float>.*?\n        \}}\n)",
+        lambda match: match.group(1) + quantized_fields,
+        schema_content,
+        count=1,
+        flags=re.DOTALL,
+    )
+
+    # Hybrid search rank profile: quantized first phase, full precision after that
+    schema_content = re.sub(
+        r"(query\(query_embedding\) tensor<float>\(x\[\d+\]\))",
+        rf"\1\n            query(query_embedding_quantized) {quantized_type}",
+        schema_content,
+    )
+    schema_content = re.sub(
+        rf"(first-phase \{{\s*expression: )closeness\(field, {EMBEDDINGS}\)",
+        rf"\1closeness(field, {EMBEDDINGS_QUANTIZED})",
+        schema_content,
+    )
+    schema_content = (
+        schema_content.replace(
+            f"closeness(field, {EMBEDDINGS})", f"{EMBEDDINGS}_similarity"
+        )
+        .replace(
+            f"closeness(field, {TITLE_EMBEDDING})", f"{TITLE_EMBEDDING}_similarity"
+        )
+        .replace(f"closest({EMBEDDINGS})", f"closest({EMBEDDINGS_QUANTIZED})")
+    )
+    schema_content = re.sub(
+        r"(rank-profile hybrid_search\d+ inherits default, default_rank \{\s*"
+        r"inputs \{[^}]*\}\n)",
+        lambda match: match.group(1) + _FULL_PRECISION_RANK_FUNCTIONS,
+        schema_content,
+    )
+    return schema_content
@@ -1,12 +1,23 @@
+import atexit
+import os
 import re
+import threading
 from typing import cast
 
 import httpx
+from prometheus_client import Counter
+from prometheus_client import Gauge
 
 from onyx.configs.app_configs import MANAGED_VESPA
 from onyx.configs.app_configs import VESPA_CLOUD_CERT_PATH
 from onyx.configs.app_configs import VESPA_CLOUD_KEY_PATH
+from onyx.configs.app_configs import VESPA_HTTP_KEEPALIVE_EXPIRY
+from onyx.configs.app_configs import VESPA_HTTP_MAX_CONNECTIONS
+from onyx.configs.app_configs import VESPA_HTTP_MAX_KEEPALIVE_CONNECTIONS
 from onyx.configs.app_configs import VESPA_REQUEST_TIMEOUT
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
 
 # NOTE: This does not seem to be used in reality despite the Vespa Docs pointing to this code
 # See here for reference: https://docs.vespa.ai/en/documents.html
@@ -55,17 +66,111 @@ def remove_invalid_unicode_chars(text: str) -> str:
     return _illegal_xml_chars_RE.sub("", text)
 
 
-def get_vespa_http_client(no_timeout: bool = False, http2: bool = True) -> httpx.Client:
+_VESPA_HTTP_REQUESTS = Counter(
+    "onyx_vespa_http_requests_total",
+    "Requests sent through the shared Vespa clients, labeled by HTTP version",
+    ["http_version"],
+)
+_VESPA_HTTP_CLIENTS_CREATED = Counter(
+    "onyx_vespa_http_clients_created_total",
+    "Shared Vespa clients created, once per process and client kind",
+)
+_VESPA_HTTP_POOL_CONNECTIONS = Gauge(
+    "onyx_vespa_http_pool_connections",
+    "Open connections of the shared Vespa clients, labeled by state",
+    ["state"],
+)
+
+# (pid, no_timeout, http2) -> client, the pid keeps forked workers from reusing the
+# parent's connections
+_shared_clients: dict[tuple[int, bool, bool], httpx.Client] = {}
+_shared_transports: dict[tuple[int, bool, bool], httpx.HTTPTransport] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _record_response(response: httpx.Response) -> None:
+    _VESPA_HTTP_REQUESTS.labels(http_version=response.http_version).inc()
+
+
+def _count_pool_connections(idle: bool) -> int:
+    pid = os.getpid()
+    count = 0
+    for (client_pid, _, _), transport in list(_shared_transports.items()):
+        if client_pid != pid:
+            continue
+        # httpcore.ConnectionPool, not part of the public httpx API
+        pool = getattr(transport, "_pool", None)
+        for connection in getattr(pool, "connections", []):
+            if connection.is_idle() == idle:
+                count += 1
+    return count
+
+
+_VESPA_HTTP_POOL_CONNECTIONS.labels(state="idle").set_function(
+    lambda: _count_pool_connections(idle=True)
+)
+_VESPA_HTTP_POOL_CONNECTIONS.labels(state="active").set_function(
+    lambda: _count_pool_connections(idle=False)
+)
+
+
+def get_shared_vespa_http_client(
+    no_timeout: bool = False, http2: bool = True
+) -> httpx.Client:
     """
-    Configure and return an HTTP client for communicating with Vespa,
-    including authentication if needed.
+    Process wide, thread safe client for communicating with Vespa. Connections are
+    kept alive and reused across calls so requests don't pay for connection (and mTLS)
+    setup each time. Callers must not close it, see close_shared_vespa_http_clients.
     """
+    key = (os.getpid(), no_timeout, http2)
+    client = _shared_clients.get(key)
+    if client is not None:
+        return client
 
-    return httpx.Client(
-        cert=cast(tuple[str, str], (VESPA_CLOUD_CERT_PATH, VESPA_CLOUD_KEY_PATH))
-        if MANAGED_VESPA
-        else None,
-        verify=False if not MANAGED_VESPA else True,
-        timeout=None if no_timeout else VESPA_REQUEST_TIMEOUT,
-        http2=http2,
-    )
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is not None:
+            return client
+
+        # Inherited from the parent process, the connections can't be shared
+        for stale_key in [k for k in _shared_clients if k[0] != key[0]]:
+            _shared_clients.pop(stale_key)
+            _shared_transports.pop(stale_key, None)
+
+        transport = httpx.HTTPTransport(
+            cert=cast(tuple[str, str], (VESPA_CLOUD_CERT_PATH, VESPA_CLOUD_KEY_PATH))
+            if MANAGED_VESPA
+            else None,
+            verify=False if not MANAGED_VESPA else True,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=VESPA_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=VESPA_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=VESPA_HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        client = httpx.Client(
+            transport=transport,
+            timeout=None if no_timeout else VESPA_REQUEST_TIMEOUT,
+            event_hooks={"response": [_record_response]},
+        )
+        _shared_transports[key] = transport
+        _shared_clients[key] = client
+        _VESPA_HTTP_CLIENTS_CREATED.inc()
+        return client
+
+
+def close_shared_vespa_http_clients() -> None:
+    """Closes the shared clients of this process, they are recreated on next use."""
+    pid = os.getpid()
+    with _shared_clients_lock:
+        for key in [k for k in _shared_clients if k[0] == pid]:
+            _shared_transports.pop(key, None)
+            client = _shared_clients.pop(key)
+            try:
+                client.close()
+            except Exception:
+                logger.exception("Failed to close shared Vespa client")
+
+
+atexit.register(close_shared_vespa_http_clients)
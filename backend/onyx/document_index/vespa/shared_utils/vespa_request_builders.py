@@ -19,12 +19,23 @@ from onyx.utils.logger import setup_logger
 logger = setup_logger()
 
 
+def _build_in_filter_param(vals: list[str]) -> str:
+    escaped_vals = [val.replace("\\", "\\\\").replace('"', '\\"') for val in vals]
+    return ",".join(f'"{val}"' for val in escaped_vals)
+
+
 def build_vespa_filters(
     filters: IndexFilters,
     *,
     include_hidden: bool = False,
     remove_trailing_and: bool = False,  # Set to True when using as a complete Vespa query
+    filter_params: dict[str, str] | None = None,
 ) -> str:
+    """If `filter_params` is given, the values of the list filters (ACL, sources, tags,
+    document sets) are added to it as query parameters and matched with the `in`
+    operator, which keeps the YQL small for users with thousands of ACL entries.
+    The caller has to send `filter_params` along with the YQL."""
+
     def _build_or_filters(key: str, vals: list[str] | None) -> str:
         if vals is None:
             return ""
@@ -33,6 +44,11 @@ def build_vespa_filters(
         if not key or not valid_vals:
             return ""
 
+        if filter_params is not None:
+            param_name = f"{key}_filter"
+            filter_params[param_name] = _build_in_filter_param(valid_vals)
+            return f"({key} in (@{param_name})) and "
+
         eq_elems = [f'{key} contains "{elem}"' for elem in valid_vals]
         or_clause = " or ".join(eq_elems)
         return f"({or_clause}) and "
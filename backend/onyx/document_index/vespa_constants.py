@@ -44,6 +44,9 @@ MAX_ID_SEARCH_QUERY_SIZE = 400
 # Suspect that adding too many "or" conditions will cause Vespa to timeout and return
 # an empty list of hits (with no error status and coverage: 0 and degraded)
 MAX_OR_CONDITIONS = 10
+# Documents per selection based update, every update visits the whole index no matter how
+# many documents it selects, this only keeps the selection expression reasonably short
+MAX_DOCUMENTS_PER_UPDATE_SELECTION = 200
 # up from 500ms for now, since we've seen quite a few timeouts
 # in the long term, we are looking to improve the performance of Vespa
 # so that we can bring this back to default
@@ -62,9 +65,12 @@ SKIP_TITLE_EMBEDDING = "skip_title"
 SECTION_CONTINUATION = "section_continuation"
 EMBEDDINGS = "embeddings"
 TITLE_EMBEDDING = "title_embedding"
+EMBEDDINGS_QUANTIZED = "embeddings_quantized"
+TITLE_EMBEDDING_QUANTIZED = "title_embedding_quantized"
 ACCESS_CONTROL_LIST = "access_control_list"
 DOCUMENT_SETS = "document_sets"
 LARGE_CHUNK_REFERENCE_IDS = "large_chunk_reference_ids"
+LLM_TOKEN_COUNTS = "llm_token_counts"
 METADATA = "metadata"
 METADATA_LIST = "metadata_list"
 METADATA_SUFFIX = "metadata_suffix"
@@ -97,6 +103,7 @@ YQL_BASE = (
     f"{PRIMARY_OWNERS}, "
     f"{SECONDARY_OWNERS}, "
     f"{LARGE_CHUNK_REFERENCE_IDS}, "
+    f"{LLM_TOKEN_COUNTS}, "
     f"{METADATA}, "
     f"{METADATA_SUFFIX}, "
     f"{CONTENT_SUMMARY} "
@@ -13,10 +13,6 @@ from typing import Dict
 from typing import IO
 
 import chardet
-import docx  # type: ignore
-import openpyxl  # type: ignore
-import pptx  # type: ignore
-from docx import Document
 from fastapi import UploadFile
 from pypdf import PdfReader
 from pypdf.errors import PdfStreamError
@@ -248,6 +244,9 @@ def read_pdf_file(
 
 
 def docx_to_text(file: IO[Any]) -> str:
+    # the office format libraries are only imported for the files that need them
+    import docx  # type: ignore
+
     def is_simple_table(table: docx.table.Table) -> bool:
         for row in table.rows:
             # No omitted cells
@@ -288,6 +287,8 @@ def docx_to_text(file: IO[Any]) -> str:
 
 
 def pptx_to_text(file: IO[Any]) -> str:
+    import pptx  # type: ignore
+
     presentation = pptx.Presentation(file)
     text_content = []
     for slide_number, slide in enumerate(presentation.slides, start=1):
@@ -300,6 +301,8 @@ def pptx_to_text(file: IO[Any]) -> str:
 
 
 def xlsx_to_text(file: IO[Any]) -> str:
+    import openpyxl  # type: ignore
+
     workbook = openpyxl.load_workbook(file, read_only=True)
     text_content = []
     for sheet in workbook.worksheets:
@@ -385,6 +388,8 @@ def extract_file_text(
 def convert_docx_to_txt(
     file: UploadFile, file_store: FileStore, file_path: str
 ) -> None:
+    from docx import Document  # type: ignore
+
     file.file.seek(0)
     docx_content = file.file.read()
     doc = Document(BytesIO(docx_content))
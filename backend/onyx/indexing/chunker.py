@@ -10,9 +10,11 @@ from onyx.connectors.cross_connector_utils.miscellaneous_utils import (
     get_metadata_keys_to_ignore,
 )
 from onyx.connectors.models import Document
+from onyx.context.search.models import InferenceChunk
 from onyx.indexing.indexing_heartbeat import IndexingHeartbeatInterface
 from onyx.indexing.models import DocAwareChunk
 from onyx.natural_language_processing.utils import BaseTokenizer
+from onyx.natural_language_processing.utils import count_tokens_by_family
 from onyx.utils.logger import setup_logger
 from onyx.utils.text_processing import clean_text
 from onyx.utils.text_processing import shared_precompare_cleanup
@@ -312,11 +314,13 @@ class Chunker:
         # If the chunk does not have any useable content, it will not be indexed
         return chunks
 
-    def _handle_single_document(self, document: Document) -> list[DocAwareChunk]:
-        # Specifically for reproducing an issue with gmail
-        if document.source == DocumentSource.GMAIL:
-            logger.debug(f"Chunking {document.semantic_identifier}")
-
+    def _get_title_prefix_and_metadata_suffixes(
+        self, document: Document
+    ) -> tuple[str, str, str, int]:
+        """
+        Returns the title prefix, the semantic and keyword metadata suffixes shared by all of
+        the chunks of the document and the number of tokens left for the content of a chunk.
+        """
         title = self._extract_blurb(document.get_title_for_document_index() or "")
         title_prefix = title + RETURN_SEPARATOR if title else ""
         title_tokens = len(self.tokenizer.tokenize(title_prefix))
@@ -346,6 +350,25 @@ class Chunker:
             title_prefix = ""
             metadata_suffix_semantic = ""
 
+        return (
+            title_prefix,
+            metadata_suffix_semantic,
+            metadata_suffix_keyword,
+            content_token_limit,
+        )
+
+    def _handle_single_document(self, document: Document) -> list[DocAwareChunk]:
+        # Specifically for reproducing an issue with gmail
+        if document.source == DocumentSource.GMAIL:
+            logger.debug(f"Chunking {document.semantic_identifier}")
+
+        (
+            title_prefix,
+            metadata_suffix_semantic,
+            metadata_suffix_keyword,
+            content_token_limit,
+        ) = self._get_title_prefix_and_metadata_suffixes(document)
+
         normal_chunks = self._chunk_document(
             document,
             title_prefix,
@@ -360,6 +383,51 @@ class Chunker:
 
         return normal_chunks
 
+    def rebuild_chunks(
+        self, document: Document, stored_chunks: list[InferenceChunk]
+    ) -> list[DocAwareChunk]:
+        """
+        Rebuilds the chunks of a document from its indexed (non large) chunks, without needing
+        the sections of the document. The text of the chunks is kept as is, so the result is
+        only the same as chunking the document again if the chunks were cut with the same
+        tokenizer as this chunker uses.
+        """
+        (
+            title_prefix,
+            metadata_suffix_semantic,
+            metadata_suffix_keyword,
+            _,
+        ) = self._get_title_prefix_and_metadata_suffixes(document)
+
+        normal_chunks = [
+            DocAwareChunk(
+                source_document=document,
+                chunk_id=stored_chunk.chunk_id,
+                blurb=stored_chunk.blurb,
+                content=stored_chunk.content,
+                source_links=stored_chunk.source_links,
+                section_continuation=stored_chunk.section_continuation,
+                title_prefix=title_prefix,
+                metadata_suffix_semantic=metadata_suffix_semantic,
+                metadata_suffix_keyword=metadata_suffix_keyword,
+                mini_chunk_texts=self._get_mini_chunk_texts(stored_chunk.content),
+                llm_token_counts=stored_chunk.llm_token_counts,
+            )
+            for stored_chunk in sorted(stored_chunks, key=lambda c: c.chunk_id)
+        ]
+
+        # large chunks are rebuilt rather than copied, whether the index had them depends
+        # on the model it was built for
+        large_chunks: list[DocAwareChunk] = []
+        if self.enable_multipass and self.enable_large_chunks:
+            large_chunks = generate_large_chunks(normal_chunks)
+
+        chunks = normal_chunks + large_chunks
+        for chunk in chunks:
+            if not chunk.llm_token_counts:
+                chunk.llm_token_counts = count_tokens_by_family(chunk.content)
+        return chunks
+
     def chunk(self, documents: list[Document]) -> list[DocAwareChunk]:
         """
         Takes in a list of documents and chunks them into smaller chunks for indexing
@@ -372,6 +440,8 @@ class Chunker:
                     raise RuntimeError("Chunker.chunk: Stop signal detected")
 
             chunks = self._handle_single_document(document)
+            for chunk in chunks:
+                chunk.llm_token_counts = count_tokens_by_family(chunk.content)
             final_chunks.extend(chunks)
 
             if self.callback:
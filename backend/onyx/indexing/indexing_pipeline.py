@@ -20,6 +20,7 @@ from onyx.connectors.cross_connector_utils.miscellaneous_utils import (
 )
 from onyx.connectors.models import Document
 from onyx.connectors.models import IndexAttemptMetadata
+from onyx.context.search.retrieval_cache import bump_index_generation
 from onyx.db.document import get_documents_by_ids
 from onyx.db.document import prepare_to_modify_documents
 from onyx.db.document import update_docs_last_modified__no_commit
@@ -396,6 +397,7 @@ def index_doc_batch(
         # documents with chunks in this set, are fully represented by the chunks
         # in this set
         insertion_records = document_index.index(chunks=access_aware_chunks)
+        bump_index_generation(tenant_id)
 
         successful_doc_ids = [record.document_id for record in insertion_records]
         successful_docs = [
@@ -430,18 +432,12 @@ def index_doc_batch(
     return result
 
 
-def build_indexing_pipeline(
+def build_chunker(
     *,
     embedder: IndexingEmbedder,
-    document_index: DocumentIndex,
     db_session: Session,
-    chunker: Chunker | None = None,
-    ignore_time_skip: bool = False,
-    attempt_id: int | None = None,
-    tenant_id: str | None = None,
     callback: IndexingHeartbeatInterface | None = None,
-) -> IndexingPipelineProtocol:
-    """Builds a pipeline which takes in a list (batch) of docs and indexes them."""
+) -> Chunker:
     search_settings = get_current_search_settings(db_session)
     multipass = (
         search_settings.multipass_indexing
@@ -462,7 +458,7 @@ def build_indexing_pipeline(
         embedder.provider_type != EmbeddingProvider.COHERE
     )
 
-    chunker = chunker or Chunker(
+    return Chunker(
         tokenizer=embedder.embedding_model.tokenizer,
         enable_multipass=multipass,
         enable_large_chunks=enable_large_chunks,
@@ -470,6 +466,23 @@ def build_indexing_pipeline(
         callback=callback,
     )
 
+
+def build_indexing_pipeline(
+    *,
+    embedder: IndexingEmbedder,
+    document_index: DocumentIndex,
+    db_session: Session,
+    chunker: Chunker | None = None,
+    ignore_time_skip: bool = False,
+    attempt_id: int | None = None,
+    tenant_id: str | None = None,
+    callback: IndexingHeartbeatInterface | None = None,
+) -> IndexingPipelineProtocol:
+    """Builds a pipeline which takes in a list (batch) of docs and indexes them."""
+    chunker = chunker or build_chunker(
+        embedder=embedder, db_session=db_session, callback=callback
+    )
+
     return partial(
         index_doc_batch_with_handler,
         chunker=chunker,
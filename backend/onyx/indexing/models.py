@@ -28,6 +28,8 @@ class BaseChunk(BaseModel):
     # Holds the link and the offsets into the raw Chunk text
     source_links: dict[int, str] | None
     section_continuation: bool  # True if this Chunk's start is not at the start of a Section
+    # Token count of the content keyed by LLM tokenizer family, computed during indexing
+    llm_token_counts: dict[str, int] = Field(default_factory=dict)
 
 
 class DocAwareChunk(BaseChunk):
@@ -0,0 +1,156 @@
+from collections import defaultdict
+
+from sqlalchemy.orm import Session
+
+from onyx.access.access import get_access_for_documents
+from onyx.access.models import DocumentAccess
+from onyx.configs.constants import DEFAULT_BOOST
+from onyx.connectors.models import BasicExpertInfo
+from onyx.connectors.models import Document
+from onyx.context.search.models import InferenceChunk
+from onyx.db.document import get_documents_by_ids
+from onyx.db.document import prepare_to_modify_documents
+from onyx.db.document_set import fetch_document_sets_for_documents
+from onyx.db.models import SearchSettings
+from onyx.document_index.interfaces import DocumentIndex
+from onyx.document_index.interfaces import StoredChunkRetrievalCapable
+from onyx.indexing.chunker import Chunker
+from onyx.indexing.embedder import IndexingEmbedder
+from onyx.indexing.models import DocAwareChunk
+from onyx.indexing.models import DocMetadataAwareIndexChunk
+from onyx.natural_language_processing.utils import get_tokenizer
+from onyx.utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+def chunks_are_reusable(
+    current_search_settings: SearchSettings, new_search_settings: SearchSettings
+) -> bool:
+    """The chunks of the current index can be embedded with the new model if it would cut
+    the documents into the same chunks, which is the case when both use the same tokenizer.
+    Large chunks and mini chunks are rebuilt for the new model either way."""
+    current_tokenizer = get_tokenizer(
+        current_search_settings.model_name, current_search_settings.provider_type
+    )
+    new_tokenizer = get_tokenizer(
+        new_search_settings.model_name, new_search_settings.provider_type
+    )
+    return current_tokenizer.family == new_tokenizer.family
+
+
+def _build_document(stored_chunk: InferenceChunk) -> Document:
+    """Rebuilds the document level fields from one of its chunks, the sections are left out
+    as the text is already split into the chunks"""
+    return Document(
+        id=stored_chunk.document_id,
+        sections=[],
+        source=stored_chunk.source_type,
+        semantic_identifier=stored_chunk.semantic_identifier,
+        metadata=stored_chunk.metadata,
+        doc_updated_at=stored_chunk.updated_at,
+        # only the display form of the owners is indexed
+        primary_owners=[
+            BasicExpertInfo(display_name=owner)
+            for owner in stored_chunk.primary_owners or []
+        ]
+        or None,
+        secondary_owners=[
+            BasicExpertInfo(display_name=owner)
+            for owner in stored_chunk.secondary_owners or []
+        ]
+        or None,
+        # the indexed title is the one used for the title prefix and embedding, an empty
+        # title keeps a document without one from getting its semantic identifier instead
+        title=stored_chunk.title or "",
+    )
+
+
+def reembed_doc_batch(
+    *,
+    document_ids: list[str],
+    chunker: Chunker,
+    embedder: IndexingEmbedder,
+    source_index: StoredChunkRetrievalCapable,
+    target_index: DocumentIndex,
+    db_session: Session,
+    tenant_id: str | None = None,
+) -> tuple[int, int]:
+    """Copies the chunks of a batch of documents from one index into another, embedding them
+    with the embedder of the target index. Documents without chunks in the source index are
+    skipped.
+
+    Returns a tuple where the first element is the number of docs that are new to the target
+    index and the second element is the number of chunks."""
+    document_id_to_stored_chunks: dict[str, list[InferenceChunk]] = defaultdict(list)
+    for stored_chunk in source_index.stored_chunk_retrieval(document_ids):
+        document_id_to_stored_chunks[stored_chunk.document_id].append(stored_chunk)
+
+    if len(document_id_to_stored_chunks) < len(document_ids):
+        logger.warning(
+            f"Skipping {len(document_ids) - len(document_id_to_stored_chunks)} of "
+            f"{len(document_ids)} documents that have no chunks in the source index"
+        )
+
+    chunks: list[DocAwareChunk] = []
+    for stored_chunks in document_id_to_stored_chunks.values():
+        chunks.extend(
+            chunker.rebuild_chunks(_build_document(stored_chunks[0]), stored_chunks)
+        )
+
+    if not chunks:
+        return 0, 0
+
+    chunks_with_embeddings = embedder.embed_chunks(chunks)
+
+    no_access = DocumentAccess.build(
+        user_emails=[],
+        user_groups=[],
+        external_user_emails=[],
+        external_user_group_ids=[],
+        is_public=False,
+    )
+
+    reembedded_ids = list(document_id_to_stored_chunks)
+    # the same lock as when indexing, so that a metadata sync can't write to the documents
+    # in between reading their access and writing the chunks
+    with prepare_to_modify_documents(
+        db_session=db_session, document_ids=reembedded_ids
+    ):
+        document_id_to_access_info = get_access_for_documents(
+            document_ids=reembedded_ids, db_session=db_session
+        )
+        document_id_to_document_set = {
+            document_id: document_sets
+            for document_id, document_sets in fetch_document_sets_for_documents(
+                document_ids=reembedded_ids, db_session=db_session
+            )
+        }
+        document_id_to_boost = {
+            db_doc.id: db_doc.boost
+            for db_doc in get_documents_by_ids(
+                db_session=db_session, document_ids=reembedded_ids
+            )
+        }
+
+        access_aware_chunks = [
+            DocMetadataAwareIndexChunk.from_index_chunk(
+                index_chunk=chunk,
+                access=document_id_to_access_info.get(
+                    chunk.source_document.id, no_access
+                ),
+                document_sets=set(
+                    document_id_to_document_set.get(chunk.source_document.id, [])
+                ),
+                boost=document_id_to_boost.get(chunk.source_document.id, DEFAULT_BOOST),
+                tenant_id=tenant_id,
+            )
+            for chunk in chunks_with_embeddings
+        ]
+
+        insertion_records = target_index.index(chunks=access_aware_chunks)
+
+    return (
+        len([r for r in insertion_records if r.already_existed is False]),
+        len(access_aware_chunks),
+    )
@@ -24,8 +24,10 @@ from langchain_core.messages import SystemMessageChunk
 from langchain_core.messages.tool import ToolCallChunk
 from langchain_core.messages.tool import ToolMessage
 from langchain_core.prompt_values import PromptValue
+from prometheus_client import Counter
 
 from onyx.configs.app_configs import LOG_DANSWER_MODEL_INTERACTIONS
+from onyx.configs.chat_configs import ENABLE_PROMPT_CACHE_LAYOUT
 from onyx.configs.model_configs import (
     DISABLE_LITELLM_STREAMING,
 )
@@ -34,6 +36,9 @@ from onyx.configs.model_configs import LITELLM_EXTRA_BODY
 from onyx.llm.interfaces import LLM
 from onyx.llm.interfaces import LLMConfig
 from onyx.llm.interfaces import ToolChoiceOptions
+from onyx.llm.utils import model_supports_prompt_cache_breakpoints
+from onyx.llm.utils import model_supports_stream_usage
+from onyx.llm.utils import PROMPT_CACHE_BREAKPOINT_KWARG
 from onyx.server.utils import mask_string
 from onyx.utils.logger import setup_logger
 from onyx.utils.long_term_log import LongTermLogger
@@ -48,6 +53,12 @@ litellm.telemetry = False
 
 _LLM_PROMPT_LONG_TERM_LOG_CATEGORY = "llm_prompt"
 
+_PROMPT_TOKENS = Counter(
+    "onyx_llm_prompt_tokens_total",
+    "Prompt tokens sent to the LLM, token_type is total, cache_read or cache_write",
+    ["model_provider", "model_name", "token_type"],
+)
+
 
 def _base_msg_to_role(msg: BaseMessage) -> str:
     if isinstance(msg, HumanMessage) or isinstance(msg, HumanMessageChunk):
@@ -101,7 +112,9 @@ def _convert_litellm_message_to_langchain_message(
         raise ValueError(f"Unknown role type received: {role}")
 
 
-def _convert_message_to_dict(message: BaseMessage) -> dict:
+def _convert_message_to_dict(
+    message: BaseMessage, use_cache_breakpoints: bool = False
+) -> dict:
     """Adapted from langchain_community.chat_models.litellm._convert_message_to_dict"""
     if isinstance(message, ChatMessage):
         message_dict = {"role": message.role, "content": message.content}
@@ -143,9 +156,33 @@ def _convert_message_to_dict(message: BaseMessage) -> dict:
         raise ValueError(f"Got unknown type {message}")
     if "name" in message.additional_kwargs:
         message_dict["name"] = message.additional_kwargs["name"]
+    if use_cache_breakpoints and message.additional_kwargs.get(
+        PROMPT_CACHE_BREAKPOINT_KWARG
+    ):
+        message_dict["content"] = _add_cache_control(message_dict["content"])
     return message_dict
 
 
+def _add_cache_control(content: str | list[str | dict]) -> str | list[str | dict]:
+    # litellm passes cache_control on the last content block through to the provider
+    content_blocks: list[dict] = (
+        [{"type": "text", "text": content}]
+        if isinstance(content, str)
+        else [
+            {"type": "text", "text": block} if isinstance(block, str) else block
+            for block in content
+        ]
+    )
+    if not content_blocks:
+        return content
+
+    content_blocks[-1] = {
+        **content_blocks[-1],
+        "cache_control": {"type": "ephemeral"},
+    }
+    return cast(list[str | dict], content_blocks)
+
+
 def _convert_delta_to_message_chunk(
     _dict: dict[str, Any],
     curr_msg: BaseMessage | None,
@@ -206,6 +243,7 @@ def _convert_delta_to_message_chunk(
 
 def _prompt_to_dict(
     prompt: LanguageModelInput,
+    use_cache_breakpoints: bool = False,
 ) -> Sequence[str | list[str] | dict[str, Any] | tuple[str, str]]:
     # NOTE: this must go first, since it is also a Sequence
     if isinstance(prompt, str):
@@ -213,12 +251,17 @@ def _prompt_to_dict(
 
     if isinstance(prompt, (list, Sequence)):
         return [
-            _convert_message_to_dict(msg) if isinstance(msg, BaseMessage) else msg
+            _convert_message_to_dict(msg, use_cache_breakpoints)
+            if isinstance(msg, BaseMessage)
+            else msg
             for msg in prompt
         ]
 
     if isinstance(prompt, PromptValue):
-        return [_convert_message_to_dict(message) for message in prompt.to_messages()]
+        return [
+            _convert_message_to_dict(message, use_cache_breakpoints)
+            for message in prompt.to_messages()
+        ]
 
 
 class DefaultMultiLLM(LLM):
@@ -334,6 +377,27 @@ class DefaultMultiLLM(LLM):
                 category=_LLM_PROMPT_LONG_TERM_LOG_CATEGORY,
             )
 
+    def _record_usage(self, usage: litellm.Usage | None) -> None:
+        if not usage or not usage.prompt_tokens:
+            return
+
+        prompt_tokens_details = getattr(usage, "prompt_tokens_details", None)
+        cache_read_tokens = (
+            getattr(prompt_tokens_details, "cached_tokens", None) or 0
+            if prompt_tokens_details
+            else 0
+        )
+        cache_write_tokens = getattr(usage, "cache_creation_input_tokens", None) or 0
+
+        labels = (self.config.model_provider, self.config.model_name)
+        _PROMPT_TOKENS.labels(*labels, "total").inc(usage.prompt_tokens)
+        _PROMPT_TOKENS.labels(*labels, "cache_read").inc(cache_read_tokens)
+        _PROMPT_TOKENS.labels(*labels, "cache_write").inc(cache_write_tokens)
+        logger.debug(
+            f"Prompt tokens: {usage.prompt_tokens}, read from cache: {cache_read_tokens}, "
+            f"written to cache: {cache_write_tokens}"
+        )
+
     # def _calculate_max_output_tokens(self, prompt: LanguageModelInput) -> int:
     #     # NOTE: This method can be used for calculating the maximum tokens for the stream,
     #     # but it isn't used in practice due to the computational cost of counting tokens
@@ -368,7 +432,14 @@ class DefaultMultiLLM(LLM):
     ) -> litellm.ModelResponse | litellm.CustomStreamWrapper:
         # litellm doesn't accept LangChain BaseMessage objects, so we need to convert them
         # to a dict representation
-        processed_prompt = _prompt_to_dict(prompt)
+        processed_prompt = _prompt_to_dict(
+            prompt,
+            use_cache_breakpoints=ENABLE_PROMPT_CACHE_LAYOUT
+            and model_supports_prompt_cache_breakpoints(
+                model_provider=self.config.model_provider,
+                model_name=self.config.model_name,
+            ),
+        )
         self._record_call(processed_prompt)
 
         try:
@@ -387,6 +458,17 @@ class DefaultMultiLLM(LLM):
                 tool_choice=tool_choice if tools else None,
                 # streaming choice
                 stream=stream,
+                # the final chunk then carries the usage, including cached prompt tokens
+                **(
+                    {"stream_options": {"include_usage": True}}
+                    if stream
+                    and ENABLE_PROMPT_CACHE_LAYOUT
+                    and not self._custom_llm_provider
+                    and model_supports_stream_usage(
+                        self.config.model_provider, self._api_base
+                    )
+                    else {}
+                ),
                 # model params
                 temperature=self._temperature,
                 timeout=self._timeout,
@@ -434,6 +516,7 @@ class DefaultMultiLLM(LLM):
                 prompt, tools, tool_choice, False, structured_response_format
             ),
         )
+        self._record_usage(getattr(response, "usage", None))
         choice = response.choices[0]
         if hasattr(choice, "message"):
             output = _convert_litellm_message_to_langchain_message(choice.message)
@@ -460,6 +543,7 @@ class DefaultMultiLLM(LLM):
             return
 
         output = None
+        usage: litellm.Usage | None = None
         response = cast(
             litellm.CustomStreamWrapper,
             self._completion(
@@ -468,6 +552,8 @@ class DefaultMultiLLM(LLM):
         )
         try:
             for part in response:
+                # only the final chunk should carry usage, but just keep the last one seen
+                usage = getattr(part, "usage", None) or usage
                 if not part["choices"]:
                     continue
 
@@ -490,6 +576,7 @@ class DefaultMultiLLM(LLM):
                 "The AI model failed partway through generation, please try again."
             )
 
+        self._record_usage(usage)
         if output:
             self._record_result(prompt, output)
 
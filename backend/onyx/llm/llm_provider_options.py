@@ -1,4 +1,5 @@
-import litellm  # type: ignore
+from collections.abc import Callable
+
 from pydantic import BaseModel
 
 
@@ -51,13 +52,20 @@ OPEN_AI_MODEL_NAMES = [
 ]
 
 BEDROCK_PROVIDER_NAME = "bedrock"
-# need to remove all the weird "bedrock/eu-central-1/anthropic.claude-v1" named
-# models
-BEDROCK_MODEL_NAMES = [
-    model
-    for model in litellm.bedrock_models
-    if "/" not in model and "embed" not in model
-][::-1]
+
+
+def _fetch_bedrock_model_names() -> list[str]:
+    # litellm takes seconds to import, so only load it when the list is needed
+    import litellm  # type: ignore
+
+    # need to remove all the weird "bedrock/eu-central-1/anthropic.claude-v1" named
+    # models
+    return [
+        model
+        for model in litellm.bedrock_models
+        if "/" not in model and "embed" not in model
+    ][::-1]
+
 
 IGNORABLE_ANTHROPIC_MODELS = [
     "claude-2",
@@ -65,19 +73,25 @@ IGNORABLE_ANTHROPIC_MODELS = [
     "anthropic/claude-3-5-sonnet-20241022",
 ]
 ANTHROPIC_PROVIDER_NAME = "anthropic"
-ANTHROPIC_MODEL_NAMES = [
-    model
-    for model in litellm.anthropic_models
-    if model not in IGNORABLE_ANTHROPIC_MODELS
-][::-1]
+
+
+def _fetch_anthropic_model_names() -> list[str]:
+    import litellm  # type: ignore
+
+    return [
+        model
+        for model in litellm.anthropic_models
+        if model not in IGNORABLE_ANTHROPIC_MODELS
+    ][::-1]
+
 
 AZURE_PROVIDER_NAME = "azure"
 
 
-_PROVIDER_TO_MODELS_MAP = {
-    OPENAI_PROVIDER_NAME: OPEN_AI_MODEL_NAMES,
-    BEDROCK_PROVIDER_NAME: BEDROCK_MODEL_NAMES,
-    ANTHROPIC_PROVIDER_NAME: ANTHROPIC_MODEL_NAMES,
+_PROVIDER_TO_MODELS_MAP: dict[str, Callable[[], list[str]]] = {
+    OPENAI_PROVIDER_NAME: lambda: OPEN_AI_MODEL_NAMES,
+    BEDROCK_PROVIDER_NAME: _fetch_bedrock_model_names,
+    ANTHROPIC_PROVIDER_NAME: _fetch_anthropic_model_names,
 }
 
 
@@ -144,4 +158,5 @@ def fetch_available_well_known_llms() -> list[WellKnownLLMProviderDescriptor]:
 
 
 def fetch_models_for_provider(provider_name: str) -> list[str]:
-    return _PROVIDER_TO_MODELS_MAP.get(provider_name, [])
+    fetch_models = _PROVIDER_TO_MODELS_MAP.get(provider_name)
+    return fetch_models() if fetch_models else []
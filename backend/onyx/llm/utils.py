@@ -5,7 +5,6 @@ from collections.abc import Iterator
 from typing import Any
 from typing import cast
 
-import litellm  # type: ignore
 import tiktoken
 from langchain.prompts.base import StringPromptValue
 from langchain.prompts.chat import ChatPromptValue
@@ -15,18 +14,6 @@ from langchain.schema.messages import AIMessage
 from langchain.schema.messages import BaseMessage
 from langchain.schema.messages import HumanMessage
 from langchain.schema.messages import SystemMessage
-from litellm.exceptions import APIConnectionError  # type: ignore
-from litellm.exceptions import APIError  # type: ignore
-from litellm.exceptions import AuthenticationError  # type: ignore
-from litellm.exceptions import BadRequestError  # type: ignore
-from litellm.exceptions import BudgetExceededError  # type: ignore
-from litellm.exceptions import ContentPolicyViolationError  # type: ignore
-from litellm.exceptions import ContextWindowExceededError  # type: ignore
-from litellm.exceptions import NotFoundError  # type: ignore
-from litellm.exceptions import PermissionDeniedError  # type: ignore
-from litellm.exceptions import RateLimitError  # type: ignore
-from litellm.exceptions import Timeout  # type: ignore
-from litellm.exceptions import UnprocessableEntityError  # type: ignore
 
 from onyx.configs.app_configs import LITELLM_CUSTOM_ERROR_MESSAGE_MAPPINGS
 from onyx.configs.constants import MessageType
@@ -52,6 +39,19 @@ def litellm_exception_to_error_msg(
     custom_error_msg_mappings: dict[str, str]
     | None = LITELLM_CUSTOM_ERROR_MESSAGE_MAPPINGS,
 ) -> str:
+    from litellm.exceptions import APIConnectionError  # type: ignore
+    from litellm.exceptions import APIError  # type: ignore
+    from litellm.exceptions import AuthenticationError  # type: ignore
+    from litellm.exceptions import BadRequestError  # type: ignore
+    from litellm.exceptions import BudgetExceededError  # type: ignore
+    from litellm.exceptions import ContentPolicyViolationError  # type: ignore
+    from litellm.exceptions import ContextWindowExceededError  # type: ignore
+    from litellm.exceptions import NotFoundError  # type: ignore
+    from litellm.exceptions import PermissionDeniedError  # type: ignore
+    from litellm.exceptions import RateLimitError  # type: ignore
+    from litellm.exceptions import Timeout  # type: ignore
+    from litellm.exceptions import UnprocessableEntityError  # type: ignore
+
     error_msg = str(e)
 
     if custom_error_msg_mappings:
@@ -288,6 +288,41 @@ def should_be_verbose() -> bool:
     return LOG_LEVEL == "debug"
 
 
+# Set in a message's additional_kwargs to mark the end of a cacheable prompt prefix
+PROMPT_CACHE_BREAKPOINT_KWARG = "prompt_cache_breakpoint"
+
+
+def mark_prompt_cache_breakpoint(message: BaseMessage) -> BaseMessage:
+    return message.copy(
+        update={
+            "additional_kwargs": {
+                **message.additional_kwargs,
+                PROMPT_CACHE_BREAKPOINT_KWARG: True,
+            }
+        }
+    )
+
+
+def model_supports_prompt_cache_breakpoints(
+    model_provider: str, model_name: str
+) -> bool:
+    # OpenAI style providers cache matching prefixes automatically, Anthropic models (including
+    # through Bedrock / Vertex) only cache up to explicitly marked breakpoints
+    return model_provider == "anthropic" or "claude" in model_name.lower()
+
+
+# Providers that accept stream_options and report token usage on the final streamed chunk
+_STREAM_USAGE_PROVIDERS = {"openai", "azure", "anthropic"}
+
+
+def model_supports_stream_usage(model_provider: str, api_base: str | None) -> bool:
+    # an "openai" provider pointed at a custom base url is usually an OpenAI compatible
+    # server, some of which reject the unknown stream option
+    if model_provider == "openai" and api_base:
+        return False
+    return model_provider in _STREAM_USAGE_PROVIDERS
+
+
 # estimate of the number of tokens in an image url
 # is correct when downsampling is used. Is very wrong when OpenAI does not downsample
 # TODO: improve this
@@ -350,6 +385,8 @@ def test_llm(llm: LLM) -> str | None:
 
 
 def get_model_map() -> dict:
+    import litellm  # type: ignore
+
     starting_map = copy.deepcopy(cast(dict, litellm.model_cost))
 
     # NOTE: we could add additional models here in the future,
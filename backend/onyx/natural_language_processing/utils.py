@@ -3,8 +3,7 @@ from abc import ABC
 from abc import abstractmethod
 from copy import copy
 
-from transformers import logging as transformer_logging  # type:ignore
-
+from onyx.configs.app_configs import LLM_TOKEN_COUNT_TIKTOKEN_ENCODINGS
 from onyx.configs.model_configs import DOC_EMBEDDING_CONTEXT_SIZE
 from onyx.configs.model_configs import DOCUMENT_ENCODER_MODEL
 from onyx.context.search.models import InferenceChunk
@@ -12,7 +11,8 @@ from onyx.utils.logger import setup_logger
 from shared_configs.enums import EmbeddingProvider
 
 logger = setup_logger()
-transformer_logging.set_verbosity_error()
+# same as transformers.logging.set_verbosity_error(), without importing transformers
+os.environ["TRANSFORMERS_VERBOSITY"] = "error"
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 os.environ["HF_HUB_DISABLE_TELEMETRY"] = "1"
 os.environ["TRANSFORMERS_NO_ADVISORY_WARNINGS"] = "1"
@@ -31,6 +31,11 @@ class BaseTokenizer(ABC):
     def decode(self, tokens: list[int]) -> str:
         pass
 
+    @property
+    @abstractmethod
+    def family(self) -> str:
+        """Identifies the vocabulary, tokenizers with the same family produce the same tokens"""
+
 
 class TiktokenTokenizer(BaseTokenizer):
     _instances: dict[str, "TiktokenTokenizer"] = {}
@@ -44,7 +49,11 @@ class TiktokenTokenizer(BaseTokenizer):
         if not hasattr(self, "encoder"):
             import tiktoken
 
-            self.encoder = tiktoken.encoding_for_model(model_name)
+            try:
+                self.encoder = tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                # Also accept encoding names directly e.g. "cl100k_base"
+                self.encoder = tiktoken.get_encoding(model_name)
 
     def encode(self, string: str) -> list[int]:
         # this ignores special tokens that the model is trained on, see encode_ordinary for details
@@ -64,11 +73,16 @@ class TiktokenTokenizer(BaseTokenizer):
     def decode(self, tokens: list[int]) -> str:
         return self.encoder.decode(tokens)
 
+    @property
+    def family(self) -> str:
+        return self.encoder.name
+
 
 class HuggingFaceTokenizer(BaseTokenizer):
     def __init__(self, model_name: str):
         from tokenizers import Tokenizer  # type: ignore
 
+        self.model_name = model_name
         self.encoder = Tokenizer.from_pretrained(model_name)
 
     def encode(self, string: str) -> list[int]:
@@ -81,6 +95,10 @@ class HuggingFaceTokenizer(BaseTokenizer):
     def decode(self, tokens: list[int]) -> str:
         return self.encoder.decode(tokens)
 
+    @property
+    def family(self) -> str:
+        return self.model_name
+
 
 _TOKENIZER_CACHE: dict[tuple[EmbeddingProvider | None, str | None], BaseTokenizer] = {}
 
@@ -155,6 +173,35 @@ def get_tokenizer(
     return _check_tokenizer_cache(provider_type, model_name)
 
 
+_INDEX_TIME_TOKENIZERS: list[BaseTokenizer] | None = None
+
+
+def get_index_time_tokenizers() -> list[BaseTokenizer]:
+    """Tokenizers that chunk token counts are precomputed for during indexing. The default
+    tokenizer is always included since it is the fallback for any non-OpenAI LLM."""
+    global _INDEX_TIME_TOKENIZERS
+
+    if _INDEX_TIME_TOKENIZERS is None:
+        tokenizers: list[BaseTokenizer] = [_DEFAULT_TOKENIZER]
+        for encoding_name in LLM_TOKEN_COUNT_TIKTOKEN_ENCODINGS:
+            try:
+                tokenizers.append(TiktokenTokenizer(encoding_name))
+            except Exception as e:
+                logger.warning(
+                    f"Skipping token counts for tiktoken encoding {encoding_name}: {e}"
+                )
+        _INDEX_TIME_TOKENIZERS = tokenizers
+
+    return _INDEX_TIME_TOKENIZERS
+
+
+def count_tokens_by_family(text: str) -> dict[str, int]:
+    return {
+        tokenizer.family: len(tokenizer.encode(text))
+        for tokenizer in get_index_time_tokenizers()
+    }
+
+
 def tokenizer_trim_content(
     content: str, desired_length: int, tokenizer: BaseTokenizer
 ) -> str:
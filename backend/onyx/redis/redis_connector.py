@@ -9,6 +9,7 @@ from onyx.redis.redis_connector_ext_group_sync import RedisConnectorExternalGrou
 from onyx.redis.redis_connector_index import RedisConnectorIndex
 from onyx.redis.redis_connector_prune import RedisConnectorPrune
 from onyx.redis.redis_connector_stop import RedisConnectorStop
+from onyx.redis.redis_indexing_schedule import RedisIndexingSchedule
 from onyx.redis.redis_pool import get_redis_client
 
 
@@ -34,6 +35,11 @@ class RedisConnector:
             self.tenant_id, self.id, search_settings_id, self.redis
         )
 
+    def mark_indexing_check_due(self) -> None:
+        """Call after changing anything that decides when the cc_pair gets indexed, so
+        that the next indexing check reconsiders it"""
+        RedisIndexingSchedule(self.tenant_id, self.redis).mark_cc_pair_dirty(self.id)
+
     def wait_for_indexing_termination(
         self,
         search_settings_list: list[SearchSettings],
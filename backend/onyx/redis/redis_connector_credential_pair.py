@@ -17,6 +17,7 @@ from onyx.db.document import (
 )
 from onyx.db.models import Document
 from onyx.redis.redis_object_helper import RedisObjectHelper
+from onyx.utils.batching import batch_generator
 
 
 class RedisConnectorCredentialPair(RedisObjectHelper):
@@ -77,43 +78,49 @@ class RedisConnectorCredentialPair(RedisObjectHelper):
 
         num_docs = 0
 
-        for doc in db_session.scalars(stmt).yield_per(1):
-            doc = cast(Document, doc)
-            current_time = time.monotonic()
-            if current_time - last_lock_time >= (
-                CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT / 4
-            ):
-                lock.reacquire()
-                last_lock_time = current_time
-
-            num_docs += 1
+        for batch in batch_generator(
+            db_session.scalars(stmt).yield_per(self.TASKSET_ADD_BATCH_SIZE),
+            self.TASKSET_ADD_BATCH_SIZE,
+        ):
+            num_docs += len(batch)
 
             # check if we should skip the document (typically because it's already syncing)
-            if doc.id in self.skip_docs:
+            docs = [
+                cast(Document, doc) for doc in batch if doc.id not in self.skip_docs
+            ]
+            if not docs:
                 continue
 
             # celery's default task id format is "dd32ded3-00aa-4884-8b21-42f8332e7fac"
             # the key for the result is "celery-task-meta-dd32ded3-00aa-4884-8b21-42f8332e7fac"
             # we prefix the task id so it's easier to keep track of who created the task
             # aka "documentset_1_6dd32ded3-00aa-4884-8b21-42f8332e7fac"
-            custom_task_id = f"{self.task_id_prefix}_{uuid4()}"
+            custom_task_ids = [f"{self.task_id_prefix}_{uuid4()}" for _ in docs]
 
-            # add to the tracking taskset in redis BEFORE creating the celery task.
+            # add to the tracking taskset in redis BEFORE creating the celery tasks.
             # note that for the moment we are using a single taskset key, not differentiated by cc_pair id
             redis_client.sadd(
-                RedisConnectorCredentialPair.get_taskset_key(), custom_task_id
-            )
-
-            # Priority on sync's triggered by new indexing should be medium
-            result = celery_app.send_task(
-                OnyxCeleryTask.VESPA_METADATA_SYNC_TASK,
-                kwargs=dict(document_id=doc.id, tenant_id=tenant_id),
-                queue=OnyxCeleryQueues.VESPA_METADATA_SYNC,
-                task_id=custom_task_id,
-                priority=OnyxCeleryPriority.MEDIUM,
+                RedisConnectorCredentialPair.get_taskset_key(), *custom_task_ids
             )
 
-            async_results.append(result)
-            self.skip_docs.add(doc.id)
+            for doc, custom_task_id in zip(docs, custom_task_ids):
+                current_time = time.monotonic()
+                if current_time - last_lock_time >= (
+                    CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT / 4
+                ):
+                    lock.reacquire()
+                    last_lock_time = current_time
+
+                # Priority on sync's triggered by new indexing should be medium
+                result = celery_app.send_task(
+                    OnyxCeleryTask.VESPA_METADATA_SYNC_TASK,
+                    kwargs=dict(document_id=doc.id, tenant_id=tenant_id),
+                    queue=OnyxCeleryQueues.VESPA_METADATA_SYNC,
+                    task_id=custom_task_id,
+                    priority=OnyxCeleryPriority.MEDIUM,
+                )
+
+                async_results.append(result)
+                self.skip_docs.add(doc.id)
 
         return len(async_results), num_docs
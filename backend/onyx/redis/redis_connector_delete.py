@@ -16,6 +16,7 @@ from onyx.configs.constants import OnyxCeleryTask
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
 from onyx.db.document import construct_document_select_for_connector_credential_pair
 from onyx.db.models import Document as DbDocument
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
 
 
 class RedisConnectorDeletePayload(BaseModel):
@@ -68,10 +69,12 @@ class RedisConnectorDelete:
 
     def set_fence(self, payload: RedisConnectorDeletePayload | None) -> None:
         if not payload:
-            self.redis.delete(self.fence_key)
+            RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
             return
 
-        self.redis.set(self.fence_key, payload.model_dump_json())
+        RedisFenceRegistry.set_fence(
+            self.redis, self.fence_key, payload.model_dump_json()
+        )
 
     def _generate_task_id(self) -> str:
         # celery's default task id format is "dd32ded3-00aa-4884-8b21-42f8332e7fac"
@@ -133,7 +136,7 @@ class RedisConnectorDelete:
 
     def reset(self) -> None:
         self.redis.delete(self.taskset_key)
-        self.redis.delete(self.fence_key)
+        RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
 
     @staticmethod
     def remove_from_taskset(id: int, task_id: str, r: redis.Redis) -> None:
@@ -9,10 +9,13 @@ from pydantic import BaseModel
 from redis.lock import Lock as RedisLock
 
 from onyx.access.models import DocExternalAccess
+from onyx.configs.app_configs import DOC_PERMISSION_SYNC_BATCH_SIZE
 from onyx.configs.constants import CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT
 from onyx.configs.constants import OnyxCeleryPriority
 from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+from onyx.utils.batching import batch_generator
 
 
 class RedisConnectorPermissionSyncPayload(BaseModel):
@@ -67,10 +70,11 @@ class RedisConnectorPermissionSync:
 
     def get_active_task_count(self) -> int:
         """Count of active permission sync tasks"""
-        count = 0
-        for _ in self.redis.scan_iter(RedisConnectorPermissionSync.FENCE_PREFIX + "*"):
-            count += 1
-        return count
+        return len(
+            RedisFenceRegistry.get_active_fences(
+                self.redis, RedisConnectorPermissionSync.FENCE_PREFIX
+            )
+        )
 
     @property
     def fenced(self) -> bool:
@@ -98,10 +102,12 @@ class RedisConnectorPermissionSync:
         payload: RedisConnectorPermissionSyncPayload | None,
     ) -> None:
         if not payload:
-            self.redis.delete(self.fence_key)
+            RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
             return
 
-        self.redis.set(self.fence_key, payload.model_dump_json())
+        RedisFenceRegistry.set_fence(
+            self.redis, self.fence_key, payload.model_dump_json()
+        )
 
     @property
     def generator_complete(self) -> int | None:
@@ -139,8 +145,11 @@ class RedisConnectorPermissionSync:
         last_lock_time = time.monotonic()
         async_results = []
 
-        # Create a task for each document permission sync
-        for doc_perm in new_permissions:
+        # Create a task for each batch of document permissions, so that the upserts
+        # and the vespa updates are done in bulk
+        for doc_perms in batch_generator(
+            new_permissions, DOC_PERMISSION_SYNC_BATCH_SIZE
+        ):
             current_time = time.monotonic()
             if lock and current_time - last_lock_time >= (
                 CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT / 4
@@ -152,10 +161,12 @@ class RedisConnectorPermissionSync:
             self.redis.sadd(self.taskset_key, custom_task_id)
 
             result = celery_app.send_task(
-                OnyxCeleryTask.UPDATE_EXTERNAL_DOCUMENT_PERMISSIONS_TASK,
+                OnyxCeleryTask.UPDATE_EXTERNAL_DOCUMENT_PERMISSIONS_BATCH_TASK,
                 kwargs=dict(
                     tenant_id=self.tenant_id,
-                    serialized_doc_external_access=doc_perm.to_dict(),
+                    serialized_doc_external_accesses=[
+                        doc_perm.to_dict() for doc_perm in doc_perms
+                    ],
                     source_string=source_string,
                     connector_id=connector_id,
                     credential_id=credential_id,
@@ -172,7 +183,7 @@ class RedisConnectorPermissionSync:
         self.redis.delete(self.generator_progress_key)
         self.redis.delete(self.generator_complete_key)
         self.redis.delete(self.taskset_key)
-        self.redis.delete(self.fence_key)
+        RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
 
     @staticmethod
     def remove_from_taskset(id: int, task_id: str, r: redis.Redis) -> None:
@@ -7,6 +7,8 @@ from pydantic import BaseModel
 from redis.lock import Lock as RedisLock
 from sqlalchemy.orm import Session
 
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+
 
 class RedisConnectorExternalGroupSyncPayload(BaseModel):
     started: datetime | None
@@ -61,12 +63,11 @@ class RedisConnectorExternalGroupSync:
 
     def get_active_task_count(self) -> int:
         """Count of active external group syncing tasks"""
-        count = 0
-        for _ in self.redis.scan_iter(
-            RedisConnectorExternalGroupSync.FENCE_PREFIX + "*"
-        ):
-            count += 1
-        return count
+        return len(
+            RedisFenceRegistry.get_active_fences(
+                self.redis, RedisConnectorExternalGroupSync.FENCE_PREFIX
+            )
+        )
 
     @property
     def fenced(self) -> bool:
@@ -94,10 +95,12 @@ class RedisConnectorExternalGroupSync:
         payload: RedisConnectorExternalGroupSyncPayload | None,
     ) -> None:
         if not payload:
-            self.redis.delete(self.fence_key)
+            RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
             return
 
-        self.redis.set(self.fence_key, payload.model_dump_json())
+        RedisFenceRegistry.set_fence(
+            self.redis, self.fence_key, payload.model_dump_json()
+        )
 
     @property
     def generator_complete(self) -> int | None:
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from typing import cast
 from uuid import uuid4
@@ -5,6 +6,9 @@ from uuid import uuid4
 import redis
 from pydantic import BaseModel
 
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+from onyx.redis.redis_indexing_schedule import RedisIndexingSchedule
+
 
 class RedisConnectorIndexPayload(BaseModel):
     index_attempt_id: int | None
@@ -13,6 +17,29 @@ class RedisConnectorIndexPayload(BaseModel):
     celery_task_id: str | None
 
 
+class IndexingShard(BaseModel):
+    """One sub-window of a poll window that is indexed in parallel"""
+
+    shard_id: int
+    # unique per window, so that a claim or result left over from an earlier window
+    # is never taken for one of this window
+    generation: str
+    start: datetime
+    end: datetime
+
+
+class IndexingShardResult(BaseModel):
+    shard_id: int
+    generation: str
+    document_count: int = 0
+    net_doc_change: int = 0
+    chunk_count: int = 0
+    num_batches: int = 0
+    num_exceptions: int = 0
+    # Set if the shard failed, the window then has to be indexed again
+    error: str | None = None
+
+
 class RedisConnectorIndex:
     """Manages interactions with redis for indexing tasks. Should only be accessed
     through RedisConnector."""
@@ -35,6 +62,15 @@ class RedisConnectorIndex:
     # it's difficult to prevent
     ACTIVE_PREFIX = PREFIX + "_active"
 
+    # the shards of a poll window being indexed in parallel, see run_indexing
+    SHARDS_PREFIX = PREFIX + "_shards"
+    SHARD_RESULTS_PREFIX = PREFIX + "_shard_results"
+    SHARD_CLAIM_PREFIX = PREFIX + "_shard_claim"
+    SHARD_HELPERS_PREFIX = PREFIX + "_shard_helpers"
+    # a claim is refreshed after every batch, if it expires the shard is given to
+    # another process
+    SHARD_CLAIM_TIMEOUT = 30 * 60
+
     def __init__(
         self,
         tenant_id: str | None,
@@ -59,6 +95,14 @@ class RedisConnectorIndex:
         )
         self.terminate_key = f"{self.TERMINATE_PREFIX}_{id}/{search_settings_id}"
         self.active_key = f"{self.ACTIVE_PREFIX}_{id}/{search_settings_id}"
+        self.shards_key = f"{self.SHARDS_PREFIX}_{id}/{search_settings_id}"
+        self.shard_results_key = (
+            f"{self.SHARD_RESULTS_PREFIX}_{id}/{search_settings_id}"
+        )
+        self.shard_claim_key = f"{self.SHARD_CLAIM_PREFIX}_{id}/{search_settings_id}"
+        self.shard_helpers_key = (
+            f"{self.SHARD_HELPERS_PREFIX}_{id}/{search_settings_id}"
+        )
 
     @classmethod
     def fence_key_with_ids(cls, cc_pair_id: int, search_settings_id: int) -> str:
@@ -95,10 +139,12 @@ class RedisConnectorIndex:
         payload: RedisConnectorIndexPayload | None,
     ) -> None:
         if not payload:
-            self.redis.delete(self.fence_key)
+            RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
             return
 
-        self.redis.set(self.fence_key, payload.model_dump_json())
+        RedisFenceRegistry.set_fence(
+            self.redis, self.fence_key, payload.model_dump_json()
+        )
 
     def terminating(self, celery_task_id: str) -> bool:
         if self.redis.exists(f"{self.terminate_key}_{celery_task_id}"):
@@ -162,12 +208,98 @@ class RedisConnectorIndex:
         status = int(cast(int, bytes))
         return status
 
+    def set_shards(self, shards: list[IndexingShard], num_helpers: int) -> None:
+        """Publishes the shards to be claimed and requests helper tasks to claim them
+        alongside the indexing task, the watchdog dispatches the helpers"""
+        self.shards_clear()
+        self.redis.set(
+            self.shards_key,
+            json.dumps([shard.model_dump(mode="json") for shard in shards]),
+        )
+        self.redis.set(self.shard_helpers_key, num_helpers)
+
+    def get_shards(self) -> list[IndexingShard]:
+        shards_bytes = cast(bytes | None, self.redis.get(self.shards_key))
+        if shards_bytes is None:
+            return []
+
+        return [
+            IndexingShard.model_validate(shard) for shard in json.loads(shards_bytes)
+        ]
+
+    def pop_shard_helpers(self) -> int:
+        """Returns the number of helper tasks requested since the last call"""
+        num_helpers_bytes = cast(
+            bytes | None, self.redis.getdel(self.shard_helpers_key)
+        )
+        return int(num_helpers_bytes) if num_helpers_bytes else 0
+
+    def claim_shard(self) -> IndexingShard | None:
+        """Returns a shard that is neither finished nor being indexed by another process,
+        None if there is no such shard left"""
+        finished_shard_ids = self.get_shard_results().keys()
+        for shard in self.get_shards():
+            if shard.shard_id in finished_shard_ids:
+                continue
+
+            if self.redis.set(
+                self._shard_claim_key(shard),
+                0,
+                nx=True,
+                ex=self.SHARD_CLAIM_TIMEOUT,
+            ):
+                return shard
+
+        return None
+
+    def _shard_claim_key(self, shard: IndexingShard) -> str:
+        return f"{self.shard_claim_key}_{shard.generation}_{shard.shard_id}"
+
+    def refresh_shard_claim(self, shard: IndexingShard) -> None:
+        self.redis.expire(self._shard_claim_key(shard), self.SHARD_CLAIM_TIMEOUT)
+
+    def set_shard_result(self, result: IndexingShardResult) -> None:
+        self.redis.hset(
+            self.shard_results_key,
+            f"{result.generation}_{result.shard_id}",
+            result.model_dump_json(),
+        )
+
+    def get_shard_results(self) -> dict[int, IndexingShardResult]:
+        """Returns the results of the shards currently published. A helper that lost its
+        claim can still write a result after its window is over, results of other
+        generations are ignored."""
+        shards = self.get_shards()
+        if not shards:
+            return {}
+
+        generation = shards[0].generation
+        results = cast(dict[bytes, bytes], self.redis.hgetall(self.shard_results_key))
+        shard_results: dict[int, IndexingShardResult] = {}
+        for result_bytes in results.values():
+            result = IndexingShardResult.model_validate_json(result_bytes)
+            if result.generation == generation:
+                shard_results[result.shard_id] = result
+        return shard_results
+
+    def shards_clear(self) -> None:
+        for shard in self.get_shards():
+            self.redis.delete(self._shard_claim_key(shard))
+        self.redis.delete(self.shards_key)
+        self.redis.delete(self.shard_results_key)
+        self.redis.delete(self.shard_helpers_key)
+
     def reset(self) -> None:
+        self.shards_clear()
         self.redis.delete(self.active_key)
         self.redis.delete(self.generator_lock_key)
         self.redis.delete(self.generator_progress_key)
         self.redis.delete(self.generator_complete_key)
-        self.redis.delete(self.fence_key)
+        RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
+        # whatever ended the attempt, the next indexing check decides what comes next
+        RedisIndexingSchedule(self.tenant_id, self.redis).set_next_check(
+            self.id, self.search_settings_id, 0
+        )
 
     @staticmethod
     def reset_all(r: redis.Redis) -> None:
@@ -183,3 +315,12 @@ class RedisConnectorIndex:
 
         for key in r.scan_iter(RedisConnectorIndex.FENCE_PREFIX + "*"):
             r.delete(key)
+
+        for prefix in [
+            RedisConnectorIndex.SHARDS_PREFIX,
+            RedisConnectorIndex.SHARD_RESULTS_PREFIX,
+            RedisConnectorIndex.SHARD_CLAIM_PREFIX,
+            RedisConnectorIndex.SHARD_HELPERS_PREFIX,
+        ]:
+            for key in r.scan_iter(prefix + "*"):
+                r.delete(key)
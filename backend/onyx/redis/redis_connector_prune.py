@@ -1,4 +1,5 @@
 import time
+from collections.abc import Iterable
 from typing import cast
 from uuid import uuid4
 
@@ -12,6 +13,7 @@ from onyx.configs.constants import OnyxCeleryPriority
 from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.db.connector_credential_pair import get_connector_credential_pair_from_id
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
 
 
 class RedisConnectorPrune:
@@ -34,6 +36,16 @@ class RedisConnectorPrune:
     TASKSET_PREFIX = f"{PREFIX}_taskset"  # connectorpruning_taskset
     SUBTASK_PREFIX = f"{PREFIX}+sub"  # connectorpruning+sub
 
+    # set of the document IDs in the source, filled while the generator runs
+    CONNECTOR_DOC_IDS_PREFIX = (
+        f"{PREFIX}_connector_doc_ids"  # connectorpruning_connector_doc_ids
+    )
+    # only a safety net in case the generator dies without cleaning up
+    CONNECTOR_DOC_IDS_TTL = 60 * 60 * 24
+    # added when the set is started, so that a set that expired or was never written
+    # is not mistaken for a source without any documents
+    CONNECTOR_DOC_IDS_SENTINEL = "__onyx_connector_doc_ids_sentinel__"
+
     def __init__(self, tenant_id: str | None, id: int, redis: redis.Redis) -> None:
         self.tenant_id: str | None = tenant_id
         self.id = id
@@ -48,6 +60,8 @@ class RedisConnectorPrune:
 
         self.subtask_prefix: str = f"{self.SUBTASK_PREFIX}_{id}"
 
+        self.connector_doc_ids_key = f"{self.CONNECTOR_DOC_IDS_PREFIX}_{id}"
+
     def taskset_clear(self) -> None:
         self.redis.delete(self.taskset_key)
 
@@ -55,6 +69,48 @@ class RedisConnectorPrune:
         self.redis.delete(self.generator_progress_key)
         self.redis.delete(self.generator_complete_key)
 
+    def start_connector_doc_ids(self) -> None:
+        """Starts an empty set of source doc_ids, must be called before adding to it"""
+        self.redis.delete(self.connector_doc_ids_key)
+        self.redis.sadd(self.connector_doc_ids_key, self.CONNECTOR_DOC_IDS_SENTINEL)
+        self.redis.expire(self.connector_doc_ids_key, self.CONNECTOR_DOC_IDS_TTL)
+
+    def add_connector_doc_ids(self, doc_ids: list[str]) -> None:
+        if not doc_ids:
+            return
+
+        self.redis.sadd(self.connector_doc_ids_key, *doc_ids)
+        self.redis.expire(self.connector_doc_ids_key, self.CONNECTOR_DOC_IDS_TTL)
+
+    def filter_missing_from_connector(self, doc_ids: list[str]) -> list[str]:
+        """Returns the doc_ids that were not added with add_connector_doc_ids. Raises
+        if the set is gone, otherwise keeps it from expiring while it is being used."""
+        if not doc_ids:
+            return []
+
+        has_sentinel, *is_member = cast(
+            list[int],
+            self.redis.smismember(
+                self.connector_doc_ids_key,
+                [self.CONNECTOR_DOC_IDS_SENTINEL, *doc_ids],
+            ),
+        )
+        if not has_sentinel:
+            raise RuntimeError(
+                "The source doc_ids expired or were never written, "
+                f"not treating every doc as missing: key={self.connector_doc_ids_key}"
+            )
+
+        self.redis.expire(self.connector_doc_ids_key, self.CONNECTOR_DOC_IDS_TTL)
+        return [
+            doc_id
+            for doc_id, member in zip(doc_ids, is_member, strict=True)
+            if not member
+        ]
+
+    def connector_doc_ids_clear(self) -> None:
+        self.redis.delete(self.connector_doc_ids_key)
+
     def get_remaining(self) -> int:
         # todo: move into fence
         remaining = cast(int, self.redis.scard(self.taskset_key))
@@ -62,10 +118,11 @@ class RedisConnectorPrune:
 
     def get_active_task_count(self) -> int:
         """Count of active pruning tasks"""
-        count = 0
-        for key in self.redis.scan_iter(RedisConnectorPrune.FENCE_PREFIX + "*"):
-            count += 1
-        return count
+        return len(
+            RedisFenceRegistry.get_active_fences(
+                self.redis, RedisConnectorPrune.FENCE_PREFIX
+            )
+        )
 
     @property
     def fenced(self) -> bool:
@@ -76,10 +133,10 @@ class RedisConnectorPrune:
 
     def set_fence(self, value: bool) -> None:
         if not value:
-            self.redis.delete(self.fence_key)
+            RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
             return
 
-        self.redis.set(self.fence_key, 0)
+        RedisFenceRegistry.set_fence(self.redis, self.fence_key, 0)
 
     @property
     def generator_complete(self) -> int | None:
@@ -104,14 +161,14 @@ class RedisConnectorPrune:
 
     def generate_tasks(
         self,
-        documents_to_prune: set[str],
+        documents_to_prune: Iterable[str],
         celery_app: Celery,
         db_session: Session,
         lock: RedisLock | None,
     ) -> int | None:
         last_lock_time = time.monotonic()
 
-        async_results = []
+        num_tasks_sent = 0
         cc_pair = get_connector_credential_pair_from_id(int(self.id), db_session)
         if not cc_pair:
             return None
@@ -134,7 +191,7 @@ class RedisConnectorPrune:
             self.redis.sadd(self.taskset_key, custom_task_id)
 
             # Priority on sync's triggered by new indexing should be medium
-            result = celery_app.send_task(
+            celery_app.send_task(
                 OnyxCeleryTask.DOCUMENT_BY_CC_PAIR_CLEANUP_TASK,
                 kwargs=dict(
                     document_id=doc_id,
@@ -147,15 +204,16 @@ class RedisConnectorPrune:
                 priority=OnyxCeleryPriority.MEDIUM,
             )
 
-            async_results.append(result)
+            num_tasks_sent += 1
 
-        return len(async_results)
+        return num_tasks_sent
 
     def reset(self) -> None:
         self.redis.delete(self.generator_progress_key)
         self.redis.delete(self.generator_complete_key)
         self.redis.delete(self.taskset_key)
-        self.redis.delete(self.fence_key)
+        self.redis.delete(self.connector_doc_ids_key)
+        RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
 
     @staticmethod
     def remove_from_taskset(id: int, task_id: str, r: redis.Redis) -> None:
@@ -175,5 +233,8 @@ class RedisConnectorPrune:
         for key in r.scan_iter(RedisConnectorPrune.GENERATOR_PROGRESS_PREFIX + "*"):
             r.delete(key)
 
+        for key in r.scan_iter(RedisConnectorPrune.CONNECTOR_DOC_IDS_PREFIX + "*"):
+            r.delete(key)
+
         for key in r.scan_iter(RedisConnectorPrune.FENCE_PREFIX + "*"):
             r.delete(key)
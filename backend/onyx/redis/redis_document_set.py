@@ -13,7 +13,9 @@ from onyx.configs.constants import OnyxCeleryPriority
 from onyx.configs.constants import OnyxCeleryQueues
 from onyx.configs.constants import OnyxCeleryTask
 from onyx.db.document_set import construct_document_select_by_docset
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
 from onyx.redis.redis_object_helper import RedisObjectHelper
+from onyx.utils.batching import batch_generator
 
 
 class RedisDocumentSet(RedisObjectHelper):
@@ -33,10 +35,10 @@ class RedisDocumentSet(RedisObjectHelper):
 
     def set_fence(self, payload: int | None) -> None:
         if payload is None:
-            self.redis.delete(self.fence_key)
+            RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
             return
 
-        self.redis.set(self.fence_key, payload)
+        RedisFenceRegistry.set_fence(self.redis, self.fence_key, payload)
 
     @property
     def payload(self) -> int | None:
@@ -59,38 +61,42 @@ class RedisDocumentSet(RedisObjectHelper):
 
         async_results = []
         stmt = construct_document_select_by_docset(int(self._id), current_only=False)
-        for doc in db_session.scalars(stmt).yield_per(1):
-            current_time = time.monotonic()
-            if current_time - last_lock_time >= (
-                CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT / 4
-            ):
-                lock.reacquire()
-                last_lock_time = current_time
-
+        for docs in batch_generator(
+            db_session.scalars(stmt).yield_per(self.TASKSET_ADD_BATCH_SIZE),
+            self.TASKSET_ADD_BATCH_SIZE,
+        ):
             # celery's default task id format is "dd32ded3-00aa-4884-8b21-42f8332e7fac"
             # the key for the result is "celery-task-meta-dd32ded3-00aa-4884-8b21-42f8332e7fac"
             # we prefix the task id so it's easier to keep track of who created the task
             # aka "documentset_1_6dd32ded3-00aa-4884-8b21-42f8332e7fac"
-            custom_task_id = f"{self.task_id_prefix}_{uuid4()}"
+            custom_task_ids = [f"{self.task_id_prefix}_{uuid4()}" for _ in docs]
+
+            # add to the set BEFORE creating the tasks.
+            redis_client.sadd(self.taskset_key, *custom_task_ids)
 
-            # add to the set BEFORE creating the task.
-            redis_client.sadd(self.taskset_key, custom_task_id)
+            for doc, custom_task_id in zip(docs, custom_task_ids):
+                current_time = time.monotonic()
+                if current_time - last_lock_time >= (
+                    CELERY_VESPA_SYNC_BEAT_LOCK_TIMEOUT / 4
+                ):
+                    lock.reacquire()
+                    last_lock_time = current_time
 
-            result = celery_app.send_task(
-                OnyxCeleryTask.VESPA_METADATA_SYNC_TASK,
-                kwargs=dict(document_id=doc.id, tenant_id=tenant_id),
-                queue=OnyxCeleryQueues.VESPA_METADATA_SYNC,
-                task_id=custom_task_id,
-                priority=OnyxCeleryPriority.LOW,
-            )
+                result = celery_app.send_task(
+                    OnyxCeleryTask.VESPA_METADATA_SYNC_TASK,
+                    kwargs=dict(document_id=doc.id, tenant_id=tenant_id),
+                    queue=OnyxCeleryQueues.VESPA_METADATA_SYNC,
+                    task_id=custom_task_id,
+                    priority=OnyxCeleryPriority.LOW,
+                )
 
-            async_results.append(result)
+                async_results.append(result)
 
         return len(async_results), len(async_results)
 
     def reset(self) -> None:
         self.redis.delete(self.taskset_key)
-        self.redis.delete(self.fence_key)
+        RedisFenceRegistry.clear_fence(self.redis, self.fence_key)
 
     @staticmethod
     def reset_all(r: redis.Redis) -> None:
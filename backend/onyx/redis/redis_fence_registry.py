@@ -0,0 +1,112 @@
+from typing import Any
+from typing import cast
+
+import redis
+
+
+class RedisFenceRegistry:
+    """Keeps a set of the fence keys that are currently set, so that the active fences
+    of a type can be found without scanning the whole keyspace. The cost of a scan
+    grows with every key in redis (celery's included), this only with the active
+    fences.
+
+    Fences must be set and cleared through this class to stay registered."""
+
+    ACTIVE_FENCES_KEY = "fenceregistry_active"
+    # set once the fences that existed before the registry have been registered
+    BUILT_KEY = "fenceregistry_built"
+
+    @staticmethod
+    def set_fence(r: redis.Redis, fence_key: str, payload: Any) -> None:
+        # in one transaction so that a fence is never set without being registered
+        with r.pipeline() as pipe:
+            pipe.set(fence_key, payload)
+            pipe.sadd(RedisFenceRegistry.ACTIVE_FENCES_KEY, fence_key)
+            pipe.execute()
+
+    @staticmethod
+    def clear_fence(r: redis.Redis, fence_key: str) -> None:
+        with r.pipeline() as pipe:
+            pipe.delete(fence_key)
+            pipe.srem(RedisFenceRegistry.ACTIVE_FENCES_KEY, fence_key)
+            pipe.execute()
+
+    @staticmethod
+    def get_active_fences(r: redis.Redis, fence_prefix: str) -> list[bytes]:
+        """Returns the keys of the fences that start with the prefix, in the same form
+        scan_iter would. Registered fences that were deleted some other way (e.g. by
+        reset_all) are dropped from the registry."""
+        with r.pipeline(transaction=False) as pipe:
+            pipe.exists(RedisFenceRegistry.BUILT_KEY)
+            pipe.smembers(RedisFenceRegistry.ACTIVE_FENCES_KEY)
+            built, registered_fence_keys = pipe.execute()
+
+        if not built:
+            registered_fence_keys = RedisFenceRegistry._build(r)
+
+        fence_prefix_bytes = fence_prefix.encode("utf-8")
+        fence_keys = sorted(
+            fence_key
+            for fence_key in cast(set[bytes], registered_fence_keys)
+            if fence_key.startswith(fence_prefix_bytes)
+        )
+        if not fence_keys:
+            return []
+
+        with r.pipeline(transaction=False) as pipe:
+            for fence_key in fence_keys:
+                pipe.exists(fence_key)
+            fences_exist = pipe.execute()
+
+        active_fence_keys: list[bytes] = []
+        stale_fence_keys: list[bytes] = []
+        for fence_key, fence_exists in zip(fence_keys, fences_exist):
+            if fence_exists:
+                active_fence_keys.append(fence_key)
+            else:
+                stale_fence_keys.append(fence_key)
+
+        if stale_fence_keys:
+            RedisFenceRegistry._unregister_stale_fences(r, stale_fence_keys)
+
+        return active_fence_keys
+
+    @staticmethod
+    def _unregister_stale_fences(r: redis.Redis, stale_fence_keys: list[bytes]) -> None:
+        """Removes the fences that no longer exist from the registry. A fence can be set
+        again after it was found missing, so the keys are watched and checked again, the
+        removal is aborted if one of them is set before it is executed."""
+        with r.pipeline() as pipe:
+            try:
+                pipe.watch(*stale_fence_keys)
+                # commands run immediately while watching
+                still_stale_fence_keys = [
+                    fence_key
+                    for fence_key in stale_fence_keys
+                    if not pipe.exists(fence_key)
+                ]
+                if not still_stale_fence_keys:
+                    return
+
+                pipe.multi()
+                pipe.srem(RedisFenceRegistry.ACTIVE_FENCES_KEY, *still_stale_fence_keys)
+                pipe.execute()
+            except redis.WatchError:
+                # left registered, it is checked again the next time
+                pass
+
+    @staticmethod
+    def _build(r: redis.Redis) -> set[bytes]:
+        """Registers the fences that were set before the registry existed. Scans the
+        keyspace, but only once per tenant."""
+        # fence keys are "{PREFIX}_fence_{id}"
+        fence_keys = set(r.scan_iter("*_fence_*"))
+        if fence_keys:
+            r.sadd(RedisFenceRegistry.ACTIVE_FENCES_KEY, *fence_keys)
+        r.set(RedisFenceRegistry.BUILT_KEY, 1)
+        return cast(set[bytes], r.smembers(RedisFenceRegistry.ACTIVE_FENCES_KEY))
+
+    @staticmethod
+    def reset_all(r: redis.Redis) -> None:
+        r.delete(RedisFenceRegistry.ACTIVE_FENCES_KEY)
+        r.delete(RedisFenceRegistry.BUILT_KEY)
@@ -0,0 +1,140 @@
+import time
+from typing import cast
+
+import redis
+
+
+class RedisIndexingSchedule:
+    """Keeps the next time each cc_pair / search settings combination has to be checked
+    for indexing, so that check_for_indexing only has to look at the due ones.
+
+    Entries are marked due whenever something that may change the answer of that check
+    happens (an attempt finishing, a config change, a new cc_pair) and are otherwise
+    scheduled for when the refresh frequency of the connector has passed. The whole
+    schedule is rebuilt periodically and whenever the active search settings change."""
+
+    PREFIX = "indexingschedule"
+
+    # sorted set of "{cc_pair_id}/{search_settings_id}" by the unix time it is due
+    SCHEDULE_KEY = f"{PREFIX}_schedule"
+    # set of cc_pair ids that changed and need to be checked for all search settings
+    DIRTY_CC_PAIRS_KEY = f"{PREFIX}_dirty_cc_pairs"
+    # highest cc_pair id in the schedule, new cc_pairs are found by going past it
+    LAST_CC_PAIR_ID_KEY = f"{PREFIX}_last_cc_pair_id"
+    # the active search settings the schedule was built for
+    SEARCH_SETTINGS_KEY = f"{PREFIX}_search_settings"
+    # expires when the schedule needs a full rebuild
+    REBUILD_FENCE_KEY = f"{PREFIX}_rebuild_fence"
+
+    def __init__(self, tenant_id: str | None, redis: redis.Redis) -> None:
+        self.tenant_id: str | None = tenant_id
+        self.redis = redis
+
+    @staticmethod
+    def _member(cc_pair_id: int, search_settings_id: int) -> str:
+        return f"{cc_pair_id}/{search_settings_id}"
+
+    def needs_rebuild(self, search_settings_ids: list[int]) -> bool:
+        if not self.redis.exists(self.REBUILD_FENCE_KEY):
+            return True
+
+        search_settings_bytes = cast(
+            bytes | None, self.redis.get(self.SEARCH_SETTINGS_KEY)
+        )
+        if search_settings_bytes is None:
+            return True
+
+        return search_settings_bytes.decode("utf-8") != ",".join(
+            str(search_settings_id) for search_settings_id in search_settings_ids
+        )
+
+    def rebuild(
+        self,
+        cc_pair_ids: list[int],
+        search_settings_ids: list[int],
+        rebuild_interval: int,
+    ) -> None:
+        """Replaces the schedule with every combination due now"""
+        self.redis.delete(self.SCHEDULE_KEY)
+        self.redis.delete(self.DIRTY_CC_PAIRS_KEY)
+        self.mark_cc_pairs_due(cc_pair_ids, search_settings_ids)
+        self.redis.set(self.LAST_CC_PAIR_ID_KEY, max(cc_pair_ids, default=0))
+        self.redis.set(
+            self.SEARCH_SETTINGS_KEY,
+            ",".join(
+                str(search_settings_id) for search_settings_id in search_settings_ids
+            ),
+        )
+        self.redis.set(self.REBUILD_FENCE_KEY, 1, ex=rebuild_interval)
+
+    def get_last_cc_pair_id(self) -> int:
+        last_cc_pair_id_bytes = cast(
+            bytes | None, self.redis.get(self.LAST_CC_PAIR_ID_KEY)
+        )
+        return int(last_cc_pair_id_bytes) if last_cc_pair_id_bytes else 0
+
+    def set_last_cc_pair_id(self, cc_pair_id: int) -> None:
+        self.redis.set(self.LAST_CC_PAIR_ID_KEY, cc_pair_id)
+
+    def mark_cc_pair_dirty(self, cc_pair_id: int) -> None:
+        """For callers that don't know the search settings, picked up on the next check"""
+        self.redis.sadd(self.DIRTY_CC_PAIRS_KEY, cc_pair_id)
+
+    def pop_dirty_cc_pair_ids(self) -> list[int]:
+        cc_pair_ids: list[int] = []
+        while True:
+            cc_pair_id_bytes = cast(
+                bytes | None, self.redis.spop(self.DIRTY_CC_PAIRS_KEY)
+            )
+            if cc_pair_id_bytes is None:
+                return cc_pair_ids
+
+            cc_pair_ids.append(int(cc_pair_id_bytes))
+
+    def mark_cc_pairs_due(
+        self, cc_pair_ids: list[int], search_settings_ids: list[int]
+    ) -> None:
+        if not cc_pair_ids or not search_settings_ids:
+            return
+
+        self.redis.zadd(
+            self.SCHEDULE_KEY,
+            {
+                self._member(cc_pair_id, search_settings_id): 0
+                for cc_pair_id in cc_pair_ids
+                for search_settings_id in search_settings_ids
+            },
+        )
+
+    def set_next_check(
+        self, cc_pair_id: int, search_settings_id: int, next_check: float
+    ) -> None:
+        """next_check is a unix timestamp, 0 to make it due right away"""
+        self.redis.zadd(
+            self.SCHEDULE_KEY,
+            {self._member(cc_pair_id, search_settings_id): next_check},
+        )
+
+    def remove(self, cc_pair_id: int, search_settings_id: int) -> None:
+        self.redis.zrem(self.SCHEDULE_KEY, self._member(cc_pair_id, search_settings_id))
+
+    def get_due(self) -> list[tuple[int, int]]:
+        """Returns the (cc_pair_id, search_settings_id) combinations that are due,
+        oldest first"""
+        members = cast(
+            list[bytes],
+            self.redis.zrangebyscore(self.SCHEDULE_KEY, "-inf", time.time()),
+        )
+        due: list[tuple[int, int]] = []
+        for member in members:
+            cc_pair_id, search_settings_id = member.decode("utf-8").split("/")
+            due.append((int(cc_pair_id), int(search_settings_id)))
+        return due
+
+    @staticmethod
+    def reset_all(r: redis.Redis) -> None:
+        r.delete(RedisIndexingSchedule.SCHEDULE_KEY)
+        r.delete(RedisIndexingSchedule.DIRTY_CC_PAIRS_KEY)
+        r.delete(RedisIndexingSchedule.LAST_CC_PAIR_ID_KEY)
+        r.delete(RedisIndexingSchedule.SEARCH_SETTINGS_KEY)
+        r.delete(RedisIndexingSchedule.REBUILD_FENCE_KEY)
@@ -14,6 +14,9 @@ class RedisObjectHelper(ABC):
     FENCE_PREFIX = PREFIX + "_fence"
     TASKSET_PREFIX = PREFIX + "_taskset"
 
+    # task ids are added to the taskset this many at a time, one round trip each
+    TASKSET_ADD_BATCH_SIZE = 100
+
     def __init__(self, tenant_id: str | None, id: str):
         self._tenant_id: str | None = tenant_id
         self._id: str = id
@@ -5,6 +5,7 @@ from typing import Any
 from typing import Optional
 
 import redis
+from redis.client import Pipeline
 from redis.client import Redis
 
 from onyx.configs.app_configs import REDIS_DB_NUMBER
@@ -22,10 +23,53 @@ from onyx.utils.logger import setup_logger
 logger = setup_logger()
 
 
-class TenantRedis(redis.Redis):
-    def __init__(self, tenant_id: str, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-        self.tenant_id: str = tenant_id
+class TenantPrefixMixin:
+    """Prefixes the keys of the wrapped redis commands with the tenant id. Shared by
+    the client and its pipelines so that keys are the same whichever is used."""
+
+    tenant_id: str
+
+    # Regular methods that need simple prefixing (the key is the first argument)
+    METHODS_TO_WRAP = frozenset(
+        [
+            "lock",
+            "unlock",
+            "get",
+            "set",
+            "incrby",
+            "hset",
+            "hget",
+            "hmget",
+            "hgetall",
+            "expire",
+            "getset",
+            "getdel",
+            "owned",
+            "reacquire",
+            "create_lock",
+            "startswith",
+            "sadd",
+            "srem",
+            "scard",
+            "smembers",
+            "sismember",
+            "smismember",
+            "spop",
+            "zadd",
+            "zrem",
+            "zrangebyscore",
+        ]
+    )
+    # Methods where every positional argument is a key or a list of keys
+    MULTI_KEY_METHODS_TO_WRAP = frozenset(
+        [
+            "delete",
+            "exists",
+            "mget",
+            "unlink",
+            "watch",
+        ]
+    )
 
     def _prefixed(self, key: str | bytes | memoryview) -> str | bytes | memoryview:
         prefix: str = f"{self.tenant_id}:"
@@ -61,6 +105,21 @@ class TenantRedis(redis.Redis):
 
         return wrapper
 
+    def _prefix_multi_key_method(self, method: Callable) -> Callable:
+        def prefix_keys(keys: Any) -> Any:
+            if isinstance(keys, (list, tuple)):
+                return [self._prefixed(key) for key in keys]
+            return self._prefixed(keys)
+
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if "keys" in kwargs:
+                kwargs["keys"] = prefix_keys(kwargs["keys"])
+            args = tuple(prefix_keys(arg) for arg in args)
+            return method(*args, **kwargs)
+
+        return wrapper
+
     def _prefix_scan_iter(self, method: Callable) -> Callable:
         @functools.wraps(method)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -85,33 +144,51 @@ class TenantRedis(redis.Redis):
 
         return wrapper
 
-    def __getattribute__(self, item: str) -> Any:
-        original_attr = super().__getattribute__(item)
-        methods_to_wrap = [
-            "lock",
-            "unlock",
-            "get",
-            "set",
-            "delete",
-            "exists",
-            "incrby",
-            "hset",
-            "hget",
-            "getset",
-            "owned",
-            "reacquire",
-            "create_lock",
-            "startswith",
-            "sadd",
-            "srem",
-            "scard",
-        ]  # Regular methods that need simple prefixing
+    def _wrap_methods(self) -> None:
+        """Binds the prefixing wrappers once per instance, they shadow the class
+        methods so that the commands themselves don't allocate a wrapper per call."""
+        wrappers: list[tuple[frozenset[str], Callable[[Callable], Callable]]] = [
+            (frozenset(["scan_iter"]), self._prefix_scan_iter),
+            (TenantPrefixMixin.METHODS_TO_WRAP, self._prefix_method),
+            (
+                TenantPrefixMixin.MULTI_KEY_METHODS_TO_WRAP,
+                self._prefix_multi_key_method,
+            ),
+        ]
+        for method_names, wrap in wrappers:
+            for method_name in method_names:
+                method = getattr(self, method_name, None)
+                if callable(method):
+                    setattr(self, method_name, wrap(method))
+
 
-        if item == "scan_iter":
-            return self._prefix_scan_iter(original_attr)
-        elif item in methods_to_wrap and callable(original_attr):
-            return self._prefix_method(original_attr)
-        return original_attr
+class TenantPipeline(TenantPrefixMixin, Pipeline):
+    """A pipeline that queues its commands with tenant prefixed keys. Results come
+    back in one round trip when execute() is called."""
+
+    def __init__(self, tenant_id: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.tenant_id = tenant_id
+        self._wrap_methods()
+
+
+class TenantRedis(TenantPrefixMixin, redis.Redis):
+    def __init__(self, tenant_id: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.tenant_id = tenant_id
+        self._wrap_methods()
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> Pipeline:
+        """Also used by transaction(), so watched keys are prefixed too"""
+        return TenantPipeline(
+            self.tenant_id,
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
 
 
 class RedisPool:
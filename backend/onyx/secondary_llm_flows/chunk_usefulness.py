@@ -2,12 +2,13 @@ from collections.abc import Callable
 
 from onyx.configs.chat_configs import DISABLE_LLM_DOC_RELEVANCE
 from onyx.llm.interfaces import LLM
-from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
-from onyx.llm.utils import message_to_string
 from onyx.prompts.llm_chunk_filter import NONUSEFUL_PAT
 from onyx.prompts.llm_chunk_filter import SECTION_FILTER_PROMPT
+from onyx.secondary_llm_flows.flow_cache import invoke_llm_with_flow_cache
+from onyx.secondary_llm_flows.flow_cache import SecondaryLLMFlow
 from onyx.utils.logger import setup_logger
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
 
 logger = setup_logger()
 
@@ -18,6 +19,7 @@ def llm_eval_section(
     llm: LLM,
     title: str,
     metadata: dict[str, str | list[str]],
+    tenant_id: str | None = None,
 ) -> bool:
     def _get_metadata_str(metadata: dict[str, str | list[str]]) -> str:
         metadata_str = "\nMetadata:\n"
@@ -49,8 +51,12 @@ def llm_eval_section(
         return True
 
     messages = _get_usefulness_messages()
-    filled_llm_prompt = dict_based_prompt_to_langchain_prompt(messages)
-    model_output = message_to_string(llm.invoke(filled_llm_prompt))
+    model_output = invoke_llm_with_flow_cache(
+        flow=SecondaryLLMFlow.SECTION_RELEVANCE,
+        llm=llm,
+        messages=messages,
+        tenant_id=tenant_id,
+    )
     logger.debug(model_output)
 
     return _extract_usefulness(model_output)
@@ -71,8 +77,13 @@ def llm_batch_eval_sections(
         )
 
     if use_threads:
+        # The tenant context var does not carry over to the worker threads
+        tenant_id = CURRENT_TENANT_ID_CONTEXTVAR.get()
         functions_with_args: list[tuple[Callable, tuple]] = [
-            (llm_eval_section, (query, section_content, llm, title, metadata))
+            (
+                llm_eval_section,
+                (query, section_content, llm, title, metadata, tenant_id),
+            )
             for section_content, title, metadata in zip(
                 section_contents, titles, metadata_list
             )
@@ -0,0 +1,106 @@
+"""Opt-in Redis backed result cache for the secondary LLM flows.
+
+The secondary flows (query rephrasing, source filter extraction, multilingual expansion
+and section relevance evaluation) are effectively deterministic for a given model and
+prompt, yet each of them costs a full LLM round-trip before the main answer can start
+streaming. Flows listed in SECONDARY_LLM_FLOW_CACHE_FLOWS have their raw model output
+cached keyed by (flow, model, prompt hash)."""
+import hashlib
+import json
+from enum import Enum
+
+from prometheus_client import Counter
+
+from onyx.configs.chat_configs import SECONDARY_LLM_FLOW_CACHE_FLOWS
+from onyx.configs.chat_configs import SECONDARY_LLM_FLOW_CACHE_TTL
+from onyx.llm.interfaces import LLM
+from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
+from onyx.llm.utils import message_to_string
+from onyx.redis.redis_pool import get_redis_client
+from onyx.utils.logger import setup_logger
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
+
+logger = setup_logger()
+
+
+FLOW_CACHE_KEY_PREFIX = "secondary_llm_flow_cache"
+
+_FLOW_CACHE_REQUESTS = Counter(
+    "onyx_secondary_llm_flow_cache_requests_total",
+    "Lookups against the secondary LLM flow cache, labeled by flow and hit/miss",
+    ["flow", "result"],
+)
+
+
+class SecondaryLLMFlow(str, Enum):
+    HISTORY_REPHRASE = "history_rephrase"
+    SOURCE_FILTER = "source_filter"
+    MULTILINGUAL_EXPANSION = "multilingual_expansion"
+    SECTION_RELEVANCE = "section_relevance"
+
+
+def is_flow_cache_enabled(flow: SecondaryLLMFlow) -> bool:
+    return flow.value in SECONDARY_LLM_FLOW_CACHE_FLOWS
+
+
+def build_flow_cache_key(
+    flow: SecondaryLLMFlow,
+    llm: LLM,
+    messages: list[dict[str, str]],
+) -> str:
+    """The key covers everything that affects the model output: the flow, the exact model
+    (provider, name and temperature) and the full prompt. The prompt is hashed so that
+    arbitrarily long section contents still produce a short, fixed size key."""
+    config = llm.config
+    prompt_hash = hashlib.sha256(
+        json.dumps(messages, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    return (
+        f"{FLOW_CACHE_KEY_PREFIX}:{flow.value}:{config.model_provider}:"
+        f"{config.model_name}:{config.temperature}:{prompt_hash}"
+    )
+
+
+def invoke_llm_with_flow_cache(
+    flow: SecondaryLLMFlow,
+    llm: LLM,
+    messages: list[dict[str, str]],
+    tenant_id: str | None = None,
+) -> str:
+    """Drop-in replacement for invoking the LLM on a dict based prompt and returning the
+    string output. If caching is not enabled for the flow, this just calls the LLM.
+
+    tenant_id should be passed explicitly when called from a worker thread, the tenant
+    context var is not propagated to threads."""
+    filled_llm_prompt = dict_based_prompt_to_langchain_prompt(messages)
+
+    if not is_flow_cache_enabled(flow):
+        return message_to_string(llm.invoke(filled_llm_prompt))
+
+    cache_key = build_flow_cache_key(flow=flow, llm=llm, messages=messages)
+    redis_client = get_redis_client(
+        tenant_id=tenant_id or CURRENT_TENANT_ID_CONTEXTVAR.get()
+    )
+
+    try:
+        cached_output = redis_client.get(cache_key)
+    except Exception as e:
+        # The cache is purely an optimization, never fail the flow because of it
+        logger.error(f"Failed to read secondary LLM flow cache for {flow.value}: {e}")
+        cached_output = None
+
+    if cached_output is not None:
+        _FLOW_CACHE_REQUESTS.labels(flow=flow.value, result="hit").inc()
+        logger.debug(f"Secondary LLM flow cache hit for {flow.value}")
+        assert isinstance(cached_output, bytes)
+        return cached_output.decode("utf-8")
+
+    _FLOW_CACHE_REQUESTS.labels(flow=flow.value, result="miss").inc()
+    model_output = message_to_string(llm.invoke(filled_llm_prompt))
+
+    try:
+        redis_client.set(cache_key, model_output, ex=SECONDARY_LLM_FLOW_CACHE_TTL)
+    except Exception as e:
+        logger.error(f"Failed to write secondary LLM flow cache for {flow.value}: {e}")
+
+    return model_output
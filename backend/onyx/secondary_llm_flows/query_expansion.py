@@ -12,14 +12,19 @@ from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
 from onyx.llm.utils import message_to_string
 from onyx.prompts.chat_prompts import HISTORY_QUERY_REPHRASE
 from onyx.prompts.miscellaneous_prompts import LANGUAGE_REPHRASE_PROMPT
+from onyx.secondary_llm_flows.flow_cache import invoke_llm_with_flow_cache
+from onyx.secondary_llm_flows.flow_cache import SecondaryLLMFlow
 from onyx.utils.logger import setup_logger
 from onyx.utils.text_processing import count_punctuation
 from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
 
 logger = setup_logger()
 
 
-def llm_multilingual_query_expansion(query: str, language: str) -> str:
+def llm_multilingual_query_expansion(
+    query: str, language: str, tenant_id: str | None = None
+) -> str:
     def _get_rephrase_messages() -> list[dict[str, str]]:
         messages = [
             {
@@ -41,8 +46,12 @@ def llm_multilingual_query_expansion(query: str, language: str) -> str:
         return query
 
     messages = _get_rephrase_messages()
-    filled_llm_prompt = dict_based_prompt_to_langchain_prompt(messages)
-    model_output = message_to_string(fast_llm.invoke(filled_llm_prompt))
+    model_output = invoke_llm_with_flow_cache(
+        flow=SecondaryLLMFlow.MULTILINGUAL_EXPANSION,
+        llm=fast_llm,
+        messages=messages,
+        tenant_id=tenant_id,
+    )
     logger.debug(model_output)
 
     return model_output
@@ -55,8 +64,10 @@ def multilingual_query_expansion(
 ) -> list[str]:
     languages = [language.strip() for language in expansion_languages]
     if use_threads:
+        # The tenant context var does not carry over to the worker threads
+        tenant_id = CURRENT_TENANT_ID_CONTEXTVAR.get()
         functions_with_args: list[tuple[Callable, tuple]] = [
-            (llm_multilingual_query_expansion, (query, language))
+            (llm_multilingual_query_expansion, (query, language, tenant_id))
             for language in languages
         ]
 
@@ -95,6 +106,7 @@ def history_based_query_rephrase(
     punctuation_heuristic: int = 10,
     skip_first_rephrase: bool = True,
     prompt_template: str = HISTORY_QUERY_REPHRASE,
+    tenant_id: str | None = None,
 ) -> str:
     # Globally disabled, just use the exact user query
     if DISABLE_LLM_QUERY_REPHRASE:
@@ -123,8 +135,12 @@ def history_based_query_rephrase(
         question=query, history_str=history_str, prompt_template=prompt_template
     )
 
-    filled_llm_prompt = dict_based_prompt_to_langchain_prompt(prompt_msgs)
-    rephrased_query = message_to_string(llm.invoke(filled_llm_prompt))
+    rephrased_query = invoke_llm_with_flow_cache(
+        flow=SecondaryLLMFlow.HISTORY_REPHRASE,
+        llm=llm,
+        messages=prompt_msgs,
+        tenant_id=tenant_id,
+    )
 
     logger.debug(f"Rephrased combined query: {rephrased_query}")
 
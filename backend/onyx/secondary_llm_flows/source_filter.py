@@ -8,8 +8,6 @@ from onyx.configs.constants import DocumentSource
 from onyx.db.connector import fetch_unique_document_sources
 from onyx.db.engine import get_sqlalchemy_engine
 from onyx.llm.interfaces import LLM
-from onyx.llm.utils import dict_based_prompt_to_langchain_prompt
-from onyx.llm.utils import message_to_string
 from onyx.natural_language_processing.search_nlp_models import (
     ConnectorClassificationModel,
 )
@@ -17,6 +15,8 @@ from onyx.prompts.constants import SOURCES_KEY
 from onyx.prompts.filter_extration import FILE_SOURCE_WARNING
 from onyx.prompts.filter_extration import SOURCE_FILTER_PROMPT
 from onyx.prompts.filter_extration import WEB_SOURCE_WARNING
+from onyx.secondary_llm_flows.flow_cache import invoke_llm_with_flow_cache
+from onyx.secondary_llm_flows.flow_cache import SecondaryLLMFlow
 from onyx.utils.logger import setup_logger
 from onyx.utils.text_processing import extract_embedded_json
 
@@ -37,13 +37,15 @@ def _sample_document_sources(
     valid_sources: list[DocumentSource],
     num_sample: int,
     allow_less: bool = True,
+    rng: random.Random | None = None,
 ) -> list[DocumentSource]:
+    sampler = rng or random.Random()
     if len(valid_sources) < num_sample:
         if not allow_less:
             raise RuntimeError("Not enough sample Document Sources")
-        return random.sample(valid_sources, len(valid_sources))
+        return sampler.sample(valid_sources, len(valid_sources))
     else:
-        return random.sample(valid_sources, num_sample)
+        return sampler.sample(valid_sources, num_sample)
 
 
 def _sample_documents_using_custom_connector_classifier(
@@ -67,7 +69,7 @@ def _sample_documents_using_custom_connector_classifier(
 
 
 def extract_source_filter(
-    query: str, llm: LLM, db_session: Session
+    query: str, llm: LLM, db_session: Session, tenant_id: str | None = None
 ) -> list[DocumentSource] | None:
     """Returns a list of valid sources for search or None if no specific sources were detected"""
 
@@ -84,11 +86,14 @@ def extract_source_filter(
         # Seems the LLM performs similarly without examples
         show_samples: bool = False,
     ) -> list[dict[str, str]]:
+        # Seeded by the query so the same question always produces the same prompt,
+        # otherwise the sampled examples would defeat the secondary flow cache
+        rng = random.Random(query)
         sample_json = {
             SOURCES_KEY: [
                 s.value
                 for s in _sample_document_sources(
-                    valid_sources=valid_sources, num_sample=2
+                    valid_sources=valid_sources, num_sample=2, rng=rng
                 )
             ]
         }
@@ -99,12 +104,12 @@ def extract_source_filter(
         )
 
         msg_1_sources = _sample_document_sources(
-            valid_sources=valid_sources, num_sample=2
+            valid_sources=valid_sources, num_sample=2, rng=rng
         )
         msg_1_source_str = " and ".join([s.capitalize() for s in msg_1_sources])
 
         msg_2_sources = _sample_document_sources(
-            valid_sources=valid_sources, num_sample=2
+            valid_sources=valid_sources, num_sample=2, rng=rng
         )
 
         msg_2_real_source = msg_2_sources[0]
@@ -178,8 +183,12 @@ def extract_source_filter(
             return None
 
     messages = _get_source_filter_messages(query=query, valid_sources=valid_sources)
-    filled_llm_prompt = dict_based_prompt_to_langchain_prompt(messages)
-    model_output = message_to_string(llm.invoke(filled_llm_prompt))
+    model_output = invoke_llm_with_flow_cache(
+        flow=SecondaryLLMFlow.SOURCE_FILTER,
+        llm=llm,
+        messages=messages,
+        tenant_id=tenant_id,
+    )
     logger.debug(model_output)
 
     return _extract_source_filters_from_llm_out(model_output)
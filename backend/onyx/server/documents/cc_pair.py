@@ -262,6 +262,8 @@ def update_cc_pair_status(
 
     db_session.commit()
 
+    RedisConnector(tenant_id, cc_pair_id).mark_indexing_check_due()
+
     if still_terminating:
         return JSONResponse(
             status_code=HTTPStatus.ACCEPTED,
@@ -310,6 +312,7 @@ def update_cc_pair_property(
     update_request: CCPropertyUpdateRequest,  # in seconds
     user: User | None = Depends(current_curator_or_admin_user),
     db_session: Session = Depends(get_session),
+    tenant_id: str | None = Depends(get_current_tenant_id),
 ) -> StatusResponse[int]:
     cc_pair = get_connector_credential_pair_from_id(
         cc_pair_id=cc_pair_id,
@@ -329,6 +332,8 @@ def update_cc_pair_property(
         cc_pair.connector.validate_refresh_freq()
         db_session.commit()
 
+        RedisConnector(tenant_id, cc_pair_id).mark_indexing_check_due()
+
         msg = "Refresh frequency updated successfully"
     elif update_request.name == "pruning_frequency":
         cc_pair.connector.prune_freq = int(update_request.value)
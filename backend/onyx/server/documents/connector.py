@@ -772,6 +772,7 @@ def update_connector_from_model(
     connector_data: ConnectorUpdateRequest,
     user: User = Depends(current_curator_or_admin_user),
     db_session: Session = Depends(get_session),
+    tenant_id: str | None = Depends(get_current_tenant_id),
 ) -> ConnectorSnapshot | StatusResponse[int]:
     try:
         _validate_connector_allowed(connector_data.source)
@@ -794,6 +795,9 @@ def update_connector_from_model(
             status_code=404, detail=f"Connector {connector_id} does not exist"
         )
 
+    for cc_pair in updated_connector.credentials:
+        RedisConnector(tenant_id, cc_pair.id).mark_indexing_check_due()
+
     return ConnectorSnapshot(
         id=updated_connector.id,
         name=updated_connector.name,
@@ -896,6 +900,7 @@ def connector_run_once(
                 indexing_mode = IndexingMode.REINDEX
 
             mark_ccpair_with_indexing_trigger(cc_pair.id, indexing_mode, db_session)
+            RedisConnector(tenant_id, cc_pair.id).mark_indexing_check_due()
             num_triggers += 1
 
             logger.info(
@@ -22,9 +22,12 @@ from onyx.chat.prune_and_merge import prune_and_merge_sections
 from onyx.chat.prune_and_merge import prune_sections
 from onyx.configs.chat_configs import CONTEXT_CHUNKS_ABOVE
 from onyx.configs.chat_configs import CONTEXT_CHUNKS_BELOW
+from onyx.configs.chat_configs import ENABLE_SPECULATIVE_RETRIEVAL
+from onyx.configs.chat_configs import RETURN_SEARCH_TIMINGS
 from onyx.configs.model_configs import GEN_AI_MODEL_FALLBACK_MAX_TOKENS
 from onyx.context.search.enums import LLMEvaluationType
 from onyx.context.search.enums import QueryFlow
+from onyx.context.search.enums import SearchStage
 from onyx.context.search.enums import SearchType
 from onyx.context.search.models import IndexFilters
 from onyx.context.search.models import InferenceSection
@@ -32,6 +35,10 @@ from onyx.context.search.models import RerankingDetails
 from onyx.context.search.models import RetrievalDetails
 from onyx.context.search.models import SearchRequest
 from onyx.context.search.pipeline import SearchPipeline
+from onyx.context.search.speculative_retrieval import heuristic_followup_rewrite
+from onyx.context.search.speculative_retrieval import resolve_speculative_retrieval
+from onyx.context.search.speculative_retrieval import run_speculative_retrieval
+from onyx.context.search.speculative_retrieval import SpeculativeRetrievalResult
 from onyx.db.models import Persona
 from onyx.db.models import User
 from onyx.llm.interfaces import LLM
@@ -53,6 +60,10 @@ from onyx.tools.tool_implementations.search_like_tool_utils import (
 )
 from onyx.utils.logger import setup_logger
 from onyx.utils.special_types import JSON_ro
+from onyx.utils.threadpool_concurrency import FunctionCall
+from onyx.utils.threadpool_concurrency import run_functions_in_parallel
+from shared_configs.contextvars import CURRENT_TENANT_ID_CONTEXTVAR
+from shared_configs.model_server_models import Embedding
 
 logger = setup_logger()
 
@@ -60,6 +71,7 @@ SEARCH_RESPONSE_SUMMARY_ID = "search_response_summary"
 SEARCH_DOC_CONTENT_ID = "search_doc_content"
 SECTION_RELEVANCE_LIST_ID = "section_relevance_list"
 SEARCH_EVALUATION_ID = "llm_doc_eval"
+SEARCH_TIMINGS_ID = "search_timings"
 
 
 class SearchResponseSummary(BaseModel):
@@ -122,6 +134,13 @@ class SearchTool(Tool):
         self.full_doc = full_doc
         self.bypass_acl = bypass_acl
         self.db_session = db_session
+        # Captured here as the tool args may be generated in a worker thread
+        self.tenant_id = CURRENT_TENANT_ID_CONTEXTVAR.get()
+
+        # (rephrased query, reusable speculative result, rephrased query embedding)
+        self._speculative_retrieval: (
+            tuple[str, SpeculativeRetrievalResult | None, Embedding | None] | None
+        ) = None
 
         # Only used via API
         self.rerank_settings = rerank_settings
@@ -225,13 +244,87 @@ class SearchTool(Tool):
         ):
             return None
 
-        rephrased_query = history_based_query_rephrase(
-            query=query, history=history, llm=llm
-        )
+        if ENABLE_SPECULATIVE_RETRIEVAL and history and not self.selected_sections:
+            rephrased_query = self._rephrase_with_speculative_retrieval(
+                query=query, history=history, llm=llm
+            )
+        else:
+            rephrased_query = history_based_query_rephrase(
+                query=query, history=history, llm=llm
+            )
         return {"query": rephrased_query}
 
+    def _rephrase_with_speculative_retrieval(
+        self, query: str, history: list[PreviousMessage], llm: LLM
+    ) -> str:
+        """Retrieval for the raw message (and a heuristic rewrite of it) runs while the
+        LLM rephrase is in flight. If the rephrase turns out to be equivalent, `run` reuses
+        those results instead of searching again."""
+        candidate_queries = [query]
+        heuristic_rewrite = heuristic_followup_rewrite(query, history)
+        if heuristic_rewrite:
+            candidate_queries.append(heuristic_rewrite)
+
+        # The tenant context var does not carry over to the worker threads
+        rephrase_call = FunctionCall(
+            history_based_query_rephrase,
+            (query, history, llm),
+            {"tenant_id": self.tenant_id},
+        )
+        speculation_call = FunctionCall(
+            run_speculative_retrieval,
+            (
+                candidate_queries,
+                self._build_search_request(query),
+                self.user.id if self.user else None,
+                self.llm,
+                self.fast_llm,
+                self.bypass_acl,
+                self.tenant_id,
+            ),
+            {},
+        )
+        results = run_functions_in_parallel([rephrase_call, speculation_call])
+        rephrased_query = cast(str, results[rephrase_call.result_id])
+
+        speculative_result, rephrased_embedding = resolve_speculative_retrieval(
+            rephrased_query=rephrased_query,
+            speculative_results=results[speculation_call.result_id],
+            tenant_id=self.tenant_id,
+        )
+        self._speculative_retrieval = (
+            rephrased_query,
+            speculative_result,
+            rephrased_embedding,
+        )
+        return rephrased_query
+
     """Actual tool execution"""
 
+    def _build_search_request(
+        self, query: str, precomputed_query_embedding: Embedding | None = None
+    ) -> SearchRequest:
+        return SearchRequest(
+            query=query,
+            evaluation_type=self.evaluation_type,
+            human_selected_filters=(
+                self.retrieval_options.filters if self.retrieval_options else None
+            ),
+            persona=self.persona,
+            offset=(self.retrieval_options.offset if self.retrieval_options else None),
+            limit=self.retrieval_options.limit if self.retrieval_options else None,
+            rerank_settings=self.rerank_settings,
+            chunks_above=self.chunks_above,
+            chunks_below=self.chunks_below,
+            full_doc=self.full_doc,
+            enable_auto_detect_filters=(
+                self.retrieval_options.enable_auto_detect_filters
+                if self.retrieval_options
+                else None
+            ),
+            precomputed_query_embedding=precomputed_query_embedding,
+        )
+
     def _build_response_for_specified_sections(
         self, query: str
     ) -> Generator[ToolResponse, None, None]:
@@ -288,27 +381,19 @@ class SearchTool(Tool):
             yield from self._build_response_for_specified_sections(query)
             return
 
+        speculative_result: SpeculativeRetrievalResult | None = None
+        precomputed_query_embedding: Embedding | None = None
+        if self._speculative_retrieval is not None:
+            rephrased_query, result, embedding = self._speculative_retrieval
+            # Only valid if the search is run for the query it was resolved against
+            if rephrased_query == query:
+                speculative_result = result
+                precomputed_query_embedding = embedding
+            self._speculative_retrieval = None
+
         search_pipeline = SearchPipeline(
-            search_request=SearchRequest(
-                query=query,
-                evaluation_type=self.evaluation_type,
-                human_selected_filters=(
-                    self.retrieval_options.filters if self.retrieval_options else None
-                ),
-                persona=self.persona,
-                offset=(
-                    self.retrieval_options.offset if self.retrieval_options else None
-                ),
-                limit=self.retrieval_options.limit if self.retrieval_options else None,
-                rerank_settings=self.rerank_settings,
-                chunks_above=self.chunks_above,
-                chunks_below=self.chunks_below,
-                full_doc=self.full_doc,
-                enable_auto_detect_filters=(
-                    self.retrieval_options.enable_auto_detect_filters
-                    if self.retrieval_options
-                    else None
-                ),
+            search_request=self._build_search_request(
+                query, precomputed_query_embedding=precomputed_query_embedding
             ),
             user=self.user,
             llm=self.llm,
@@ -316,6 +401,12 @@ class SearchTool(Tool):
             bypass_acl=self.bypass_acl,
             db_session=self.db_session,
             prompt_config=self.prompt_config,
+            precomputed_search_query=(
+                speculative_result.search_query if speculative_result else None
+            ),
+            precomputed_retrieved_chunks=(
+                speculative_result.retrieved_chunks if speculative_result else None
+            ),
         )
 
         yield ToolResponse(
@@ -350,14 +441,17 @@ class SearchTool(Tool):
             response=search_pipeline.section_relevance,
         )
 
-        pruned_sections = prune_sections(
-            sections=search_pipeline.final_context_sections,
-            section_relevance_list=search_pipeline.section_relevance_list,
-            prompt_config=self.prompt_config,
-            llm_config=self.llm.config,
-            question=query,
-            contextual_pruning_config=self.contextual_pruning_config,
-        )
+        final_context_sections = search_pipeline.final_context_sections
+        section_relevance_list = search_pipeline.section_relevance_list
+        with search_pipeline.timings.stage(SearchStage.PRUNING):
+            pruned_sections = prune_sections(
+                sections=final_context_sections,
+                section_relevance_list=section_relevance_list,
+                prompt_config=self.prompt_config,
+                llm_config=self.llm.config,
+                question=query,
+                contextual_pruning_config=self.contextual_pruning_config,
+            )
 
         llm_docs = [
             llm_doc_from_inference_section(section) for section in pruned_sections
@@ -365,6 +459,12 @@ class SearchTool(Tool):
 
         yield ToolResponse(id=FINAL_CONTEXT_DOCUMENTS_ID, response=llm_docs)
 
+        if RETURN_SEARCH_TIMINGS:
+            yield ToolResponse(
+                id=SEARCH_TIMINGS_ID,
+                response=search_pipeline.timings.as_milliseconds(),
+            )
+
     def final_result(self, *args: ToolResponse) -> JSON_ro:
         final_docs = cast(
             list[LlmDoc],
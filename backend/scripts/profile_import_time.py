@@ -0,0 +1,155 @@
+"""Reports the import time of each entry point and the modules that cost the most.
+
+Every entry point is imported in a fresh interpreter with `python -X importtime`, so the
+numbers are for a cold start (apart from the OS file cache). Run from the backend
+directory:
+python scripts/profile_import_time.py --top 20
+python scripts/profile_import_time.py --entry-points api --budget-seconds 10
+
+With --budget-seconds, exits with a non-zero code if any entry point takes longer.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict
+from dataclasses import dataclass
+
+ENTRY_POINTS = {
+    "api": "onyx.main",
+    "celery_primary": "onyx.background.celery.versioned_apps.primary",
+    "celery_light": "onyx.background.celery.versioned_apps.light",
+    "celery_heavy": "onyx.background.celery.versioned_apps.heavy",
+    "celery_indexing": "onyx.background.celery.versioned_apps.indexing",
+    "celery_beat": "onyx.background.celery.versioned_apps.beat",
+    "model_server": "model_server.main",
+}
+
+
+@dataclass
+class ModuleImportTime:
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+
+
+def _parse_importtime(stderr: str) -> list[ModuleImportTime]:
+    """Parses lines like 'import time:   self [us] | cumulative | imported package'"""
+    module_times = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # the header line
+            continue
+        module_times.append(
+            ModuleImportTime(
+                module=fields[2].strip(),
+                self_seconds=int(fields[0]) / 1e6,
+                cumulative_seconds=int(fields[1]) / 1e6,
+            )
+        )
+    return module_times
+
+
+def profile_entry_point(module: str) -> list[ModuleImportTime]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return _parse_importtime(result.stderr)
+
+
+def _top_level_package(module: str) -> str:
+    return module.split(".")[0]
+
+
+def summarize(module: str, module_times: list[ModuleImportTime], top: int) -> dict:
+    total_seconds = next(
+        (
+            module_time.cumulative_seconds
+            for module_time in module_times
+            if module_time.module == module
+        ),
+        0.0,
+    )
+    # self time summed per third party / first party package
+    package_seconds: dict[str, float] = {}
+    for module_time in module_times:
+        package = _top_level_package(module_time.module)
+        package_seconds[package] = (
+            package_seconds.get(package, 0.0) + module_time.self_seconds
+        )
+
+    return {
+        "entry_point": module,
+        "total_seconds": round(total_seconds, 3),
+        "num_modules": len(module_times),
+        "top_packages": [
+            {"package": package, "self_seconds": round(seconds, 3)}
+            for package, seconds in sorted(
+                package_seconds.items(), key=lambda item: item[1], reverse=True
+            )[:top]
+        ],
+        "top_modules": [
+            asdict(module_time)
+            for module_time in sorted(
+                module_times, key=lambda m: m.cumulative_seconds, reverse=True
+            )[1 : top + 1]
+        ],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--entry-points",
+        nargs="+",
+        choices=list(ENTRY_POINTS),
+        default=list(ENTRY_POINTS),
+    )
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-seconds", type=float)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    summaries = []
+    for entry_point in args.entry_points:
+        module = ENTRY_POINTS[entry_point]
+        summary = summarize(module, profile_entry_point(module), args.top)
+        summaries.append({"name": entry_point, **summary})
+
+        print(
+            f"{entry_point} ({module}): {summary['total_seconds']}s, "
+            f"{summary['num_modules']} modules"
+        )
+        for package in summary["top_packages"]:
+            print(f"  {package['self_seconds']:>8.3f}s  {package['package']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summaries, f, indent=2)
+
+    if args.budget_seconds is None:
+        return 0
+
+    over_budget = [
+        summary
+        for summary in summaries
+        if summary["total_seconds"] > args.budget_seconds
+    ]
+    for summary in over_budget:
+        print(
+            f"Over budget: {summary['name']} {summary['total_seconds']}s "
+            f"> {args.budget_seconds}s",
+            file=sys.stderr,
+        )
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Deterministic synthetic corpora for the retrieval benchmark.
+
+Documents are made of sentences drawn from a fixed vocabulary with a per document topic,
+so that the queries (built from topic words) have a meaningful set of matching documents.
+The same seed always gives the same corpus and queries."""
+import random
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from onyx.access.models import DocumentAccess
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import Document
+from onyx.connectors.models import Section
+
+_VOCABULARY_SIZE = 5_000
+_NUM_TOPICS = 200
+_TOPIC_WORDS = 12
+_NUM_GROUPS = 50
+_NUM_DOCUMENT_SETS = 10
+_SOURCES = [
+    DocumentSource.GOOGLE_DRIVE,
+    DocumentSource.CONFLUENCE,
+    DocumentSource.SLACK,
+]
+
+
+def _word(index: int) -> str:
+    # Pronounceable made up words, distinct for every index
+    consonants = "bcdfghjklmnprstvz"
+    vowels = "aeiou"
+    word = ""
+    while True:
+        index, consonant = divmod(index, len(consonants))
+        index, vowel = divmod(index, len(vowels))
+        word += consonants[consonant] + vowels[vowel]
+        if index == 0:
+            return word
+
+
+class SyntheticCorpus:
+    def __init__(self, num_docs: int, seed: int = 0) -> None:
+        self.num_docs = num_docs
+        self.seed = seed
+        self.vocabulary = [_word(i) for i in range(_VOCABULARY_SIZE)]
+        topic_rng = random.Random(seed)
+        self.topics = [
+            topic_rng.sample(self.vocabulary, _TOPIC_WORDS) for _ in range(_NUM_TOPICS)
+        ]
+
+    def _sentence(self, rng: random.Random, topic: list[str]) -> str:
+        # About a third of the words are from the topic of the document
+        words = [
+            rng.choice(topic) if rng.random() < 0.3 else rng.choice(self.vocabulary)
+            for _ in range(rng.randint(8, 20))
+        ]
+        return " ".join(words).capitalize() + "."
+
+    def documents(self) -> list[Document]:
+        rng = random.Random(self.seed + 1)
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        documents: list[Document] = []
+        for doc_ind in range(self.num_docs):
+            topic = self.topics[doc_ind % _NUM_TOPICS]
+            sections = [
+                Section(
+                    text=" ".join(
+                        self._sentence(rng, topic) for _ in range(rng.randint(3, 30))
+                    ),
+                    link=f"https://example.com/doc/{doc_ind}#section-{section_ind}",
+                )
+                for section_ind in range(rng.randint(1, 6))
+            ]
+            documents.append(
+                Document(
+                    id=f"benchmark_doc_{doc_ind}",
+                    sections=sections,
+                    source=_SOURCES[doc_ind % len(_SOURCES)],
+                    semantic_identifier=" ".join(topic[:3]).title() + f" {doc_ind}",
+                    metadata={"team": topic[0], "tags": topic[1:3]},
+                    doc_updated_at=base_time
+                    + timedelta(hours=rng.randint(0, 24 * 365)),
+                )
+            )
+        return documents
+
+    def access(self, document_id: str) -> DocumentAccess:
+        doc_ind = int(document_id.rsplit("_", 1)[-1])
+        return DocumentAccess.build(
+            user_emails=[f"owner_{doc_ind % 100}@example.com"],
+            user_groups=[f"group_{doc_ind % _NUM_GROUPS}"],
+            external_user_emails=[],
+            external_user_group_ids=[f"external_group_{doc_ind % (_NUM_GROUPS * 4)}"],
+            is_public=doc_ind % 5 == 0,
+        )
+
+    def document_sets(self, document_id: str) -> set[str]:
+        doc_ind = int(document_id.rsplit("_", 1)[-1])
+        return {f"Document Set {doc_ind % _NUM_DOCUMENT_SETS}"}
+
+    def queries(self, num_queries: int) -> list[str]:
+        rng = random.Random(self.seed + 2)
+        return [
+            " ".join(rng.sample(self.topics[rng.randrange(_NUM_TOPICS)], 3))
+            for _ in range(num_queries)
+        ]
+
+    def user_acl(self, query_ind: int) -> list[str]:
+        """ACL of a user in a few groups, a public fraction of the corpus is always visible"""
+        access = DocumentAccess.build(
+            user_emails=[f"owner_{query_ind % 100}@example.com"],
+            user_groups=[f"group_{(query_ind + i) % _NUM_GROUPS}" for i in range(3)],
+            external_user_emails=[],
+            external_user_group_ids=[
+                f"external_group_{(query_ind + i) % (_NUM_GROUPS * 4)}"
+                for i in range(10)
+            ],
+            is_public=True,
+        )
+        return sorted(access.to_acl())
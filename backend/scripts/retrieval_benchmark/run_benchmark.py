@@ -0,0 +1,301 @@
+"""Offline benchmark of the indexing and search path on synthetic corpora.
+
+Runs each corpus size through chunking, embedding, indexing and the SearchPipeline and
+reports per stage throughput, p50/p95/p99 latency and (with --track-memory) the peak
+memory allocated. The embedding model and Vespa are replaced by deterministic in-process
+stand-ins (see stub_models.py) so no running services are needed and the same seed always
+does the same work. Only the tokenizer is needed, it must be available in the local
+Hugging Face cache (set HF_HUB_OFFLINE=1 to avoid any network access).
+
+Usage (from the backend directory):
+python -m scripts.retrieval_benchmark.run_benchmark --sizes 1000 10000 --queries 200 \
+    --output results.json --thresholds thresholds.json
+
+Thresholds are applied to every corpus size and look like:
+{"search": {"p95_ms": {"max": 50}}, "indexing": {"throughput": {"min": 500}}}
+The script exits with a non-zero code if any of them is breached.
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from typing import cast
+from unittest.mock import patch
+
+import numpy
+
+from onyx.configs.chat_configs import HYBRID_ALPHA
+from onyx.configs.chat_configs import NUM_RETURNED_HITS
+from onyx.configs.model_configs import DOCUMENT_ENCODER_MODEL
+from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import SearchQuery
+from onyx.context.search.models import SearchRequest
+from onyx.context.search.pipeline import SearchPipeline
+from onyx.indexing.chunker import Chunker
+from onyx.indexing.embedder import DefaultIndexingEmbedder
+from onyx.indexing.models import DocAwareChunk
+from onyx.indexing.models import DocMetadataAwareIndexChunk
+from onyx.indexing.models import IndexChunk
+from onyx.llm.interfaces import LLM
+from onyx.natural_language_processing.search_nlp_models import EmbeddingModel
+from onyx.utils.logger import setup_logger
+from scripts.retrieval_benchmark.corpus import SyntheticCorpus
+from scripts.retrieval_benchmark.stub_models import InMemoryDocumentIndex
+from scripts.retrieval_benchmark.stub_models import StubEmbeddingModel
+from shared_configs.enums import EmbedTextType
+
+logger = setup_logger()
+
+BENCHMARK_INDEX_NAME = "retrieval_benchmark"
+# Same as the number of documents per indexing batch in the real pipeline
+DOCS_PER_BATCH = 16
+
+
+class _StageRecorder:
+    """Times every call of one stage, optionally tracking the peak memory allocated"""
+
+    def __init__(self, track_memory: bool) -> None:
+        self.track_memory = track_memory
+        self.latencies: list[float] = []
+        self.items = 0
+        self.peak_bytes = 0
+
+    @contextmanager
+    def measure(self, items: int = 1) -> Iterator[None]:
+        if self.track_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+            self.items += items
+            if self.track_memory:
+                self.peak_bytes = max(
+                    self.peak_bytes, tracemalloc.get_traced_memory()[1]
+                )
+                tracemalloc.stop()
+
+    def summary(self) -> dict[str, float]:
+        total_seconds = sum(self.latencies)
+        latencies_ms = numpy.array(self.latencies) * 1000
+        summary = {
+            "calls": len(self.latencies),
+            "items": self.items,
+            "throughput": round(self.items / total_seconds, 2) if total_seconds else 0,
+            "p50_ms": round(float(numpy.percentile(latencies_ms, 50)), 3),
+            "p95_ms": round(float(numpy.percentile(latencies_ms, 95)), 3),
+            "p99_ms": round(float(numpy.percentile(latencies_ms, 99)), 3),
+        }
+        if self.track_memory:
+            summary["peak_memory_mb"] = round(self.peak_bytes / 2**20, 2)
+        return summary
+
+
+@contextmanager
+def _offline_search_dependencies(
+    document_index: InMemoryDocumentIndex,
+) -> Iterator[None]:
+    """The SearchPipeline looks up the search settings and document index in Postgres
+    and caches retrievals in Redis, none of which is part of what is measured here"""
+    search_settings = argparse.Namespace(
+        index_name=BENCHMARK_INDEX_NAME, multilingual_expansion=[]
+    )
+    with patch(
+        "onyx.context.search.pipeline.get_current_search_settings",
+        return_value=search_settings,
+    ), patch(
+        "onyx.context.search.pipeline.get_default_document_index",
+        return_value=document_index,
+    ), patch(
+        "onyx.context.search.pipeline.build_retrieval_cache_key", return_value=None
+    ), patch(
+        "onyx.context.search.retrieval.search_runner.get_multilingual_expansion",
+        return_value=[],
+    ):
+        yield
+
+
+def _batches(items: list, batch_size: int) -> Iterator[list]:
+    for ind in range(0, len(items), batch_size):
+        yield items[ind : ind + batch_size]
+
+
+def run_corpus(
+    corpus: SyntheticCorpus,
+    num_queries: int,
+    chunker: Chunker,
+    embedder: DefaultIndexingEmbedder,
+    track_memory: bool,
+) -> dict[str, Any]:
+    stages = {
+        stage: _StageRecorder(track_memory)
+        for stage in ["chunking", "embedding", "indexing", "search"]
+    }
+    document_index = InMemoryDocumentIndex(BENCHMARK_INDEX_NAME)
+    stub_model = cast(StubEmbeddingModel, embedder.embedding_model)
+
+    for document_batch in _batches(corpus.documents(), DOCS_PER_BATCH):
+        with stages["chunking"].measure(items=len(document_batch)):
+            chunks: list[DocAwareChunk] = chunker.chunk(document_batch)
+
+        with stages["embedding"].measure(items=len(chunks)):
+            index_chunks: list[IndexChunk] = embedder.embed_chunks(chunks)
+
+        with stages["indexing"].measure(items=len(index_chunks)):
+            document_index.index(
+                [
+                    DocMetadataAwareIndexChunk.from_index_chunk(
+                        index_chunk=chunk,
+                        access=corpus.access(chunk.source_document.id),
+                        document_sets=corpus.document_sets(chunk.source_document.id),
+                        boost=0,
+                        tenant_id=None,
+                    )
+                    for chunk in index_chunks
+                ]
+            )
+
+    # Per search stage times, from the timings the pipeline collects itself
+    search_stage_ms: dict[str, list[float]] = defaultdict(list)
+    with _offline_search_dependencies(document_index):
+        for query_ind, query in enumerate(corpus.queries(num_queries)):
+            search_query = SearchQuery(
+                query=query,
+                processed_keywords=query.split(),
+                search_type=SearchType.SEMANTIC,
+                evaluation_type=LLMEvaluationType.SKIP,
+                filters=IndexFilters(access_control_list=corpus.user_acl(query_ind)),
+                chunks_above=1,
+                chunks_below=1,
+                rerank_settings=None,
+                hybrid_alpha=HYBRID_ALPHA,
+                recency_bias_multiplier=1.0,
+                num_hits=NUM_RETURNED_HITS,
+                max_llm_filter_sections=0,
+                precomputed_query_embedding=stub_model.encode(
+                    [query], text_type=EmbedTextType.QUERY
+                )[0],
+            )
+            with stages["search"].measure():
+                pipeline = SearchPipeline(
+                    search_request=SearchRequest(query=query),
+                    user=None,
+                    # Not used without LLM evaluation
+                    llm=cast(LLM, None),
+                    fast_llm=cast(LLM, None),
+                    db_session=cast(Any, None),
+                    precomputed_search_query=search_query,
+                )
+                pipeline.final_context_sections
+            for stage, ms in pipeline.timings.as_milliseconds().items():
+                search_stage_ms[stage].append(ms)
+
+    return {
+        "num_docs": corpus.num_docs,
+        "stages": {stage: recorder.summary() for stage, recorder in stages.items()},
+        "search_stage_mean_ms": {
+            stage: round(float(numpy.mean(ms)), 3)
+            for stage, ms in search_stage_ms.items()
+        },
+    }
+
+
+def check_thresholds(
+    results: list[dict[str, Any]], thresholds: dict[str, dict[str, dict[str, float]]]
+) -> list[str]:
+    """Returns a description of every threshold breached, empty if there are none"""
+    breaches = []
+    for result in results:
+        for stage, metric_limits in thresholds.items():
+            stage_summary = result["stages"].get(stage)
+            if stage_summary is None:
+                raise ValueError(f"Threshold set for unknown stage '{stage}'")
+            for metric, limits in metric_limits.items():
+                value = stage_summary[metric]
+                if "max" in limits and value > limits["max"]:
+                    breaches.append(
+                        f"{result['num_docs']} docs, {stage} {metric}: "
+                        f"{value} > max {limits['max']}"
+                    )
+                if "min" in limits and value < limits["min"]:
+                    breaches.append(
+                        f"{result['num_docs']} docs, {stage} {metric}: "
+                        f"{value} < min {limits['min']}"
+                    )
+    return breaches
+
+
+def _log_results(results: list[dict[str, Any]]) -> None:
+    for result in results:
+        logger.notice(f"Corpus of {result['num_docs']} documents:")
+        for stage, summary in result["stages"].items():
+            logger.notice(
+                f"  {stage:<10} "
+                + " ".join(f"{metric}={value}" for metric, value in summary.items())
+            )
+        logger.notice(f"  search stages (mean ms): {result['search_stage_mean_ms']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000], help="Corpus sizes in docs"
+    )
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--track-memory",
+        action="store_true",
+        help="Record the peak memory of each stage, slows down all stages",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--thresholds", help="JSON file of regression thresholds")
+    args = parser.parse_args()
+
+    embedder = DefaultIndexingEmbedder(
+        model_name=DOCUMENT_ENCODER_MODEL,
+        normalize=True,
+        query_prefix=None,
+        passage_prefix=None,
+    )
+    chunker = Chunker(tokenizer=embedder.embedding_model.tokenizer)
+    embedder.embedding_model = cast(EmbeddingModel, StubEmbeddingModel())
+
+    results = [
+        run_corpus(
+            corpus=SyntheticCorpus(num_docs=size, seed=args.seed),
+            num_queries=args.queries,
+            chunker=chunker,
+            embedder=embedder,
+            track_memory=args.track_memory,
+        )
+        for size in args.sizes
+    ]
+    _log_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if not args.thresholds:
+        return 0
+
+    with open(args.thresholds) as f:
+        breaches = check_thresholds(results, json.load(f))
+    for breach in breaches:
+        logger.error(f"Threshold breached: {breach}")
+    return 1 if breaches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
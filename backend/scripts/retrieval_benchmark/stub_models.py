@@ -0,0 +1,273 @@
+"""Stand-ins for the model server and Vespa so the benchmark runs offline and is
+reproducible. They are deliberately simple (exact, brute force) so that the measured time
+is dominated by Onyx's own code around them and stays comparable between runs."""
+import random
+import re
+import zlib
+from typing import Any
+
+import numpy
+
+from onyx.configs.constants import INDEX_SEPARATOR
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunkUncleaned
+from onyx.document_index.interfaces import DocumentIndex
+from onyx.document_index.interfaces import DocumentInsertionRecord
+from onyx.document_index.interfaces import UpdateRequest
+from onyx.document_index.interfaces import VespaChunkRequest
+from onyx.document_index.interfaces import VespaDocumentFields
+from onyx.indexing.models import DocMetadataAwareIndexChunk
+from shared_configs.enums import EmbedTextType
+from shared_configs.model_server_models import Embedding
+
+_TOKEN_PAT = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_PAT.findall(text.lower())
+
+
+class StubEmbeddingModel:
+    """Hashed bag of words embeddings, deterministic across runs and processes. Has the
+    same encode signature as EmbeddingModel so it can replace it in the embedder."""
+
+    def __init__(self, dim: int = 384) -> None:
+        self.dim = dim
+
+    def _embed(self, text: str) -> Embedding:
+        vector = numpy.zeros(self.dim, dtype=numpy.float32)
+        for token in _tokens(text):
+            token_hash = zlib.crc32(token.encode())
+            vector[token_hash % self.dim] += 1 if token_hash & (1 << 31) else -1
+        norm = numpy.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def encode(
+        self, texts: list[str], text_type: EmbedTextType, **kwargs: Any
+    ) -> list[Embedding]:
+        if not texts or not all(texts):
+            raise ValueError(f"Empty or missing text for embedding: {texts}")
+        return [self._embed(text) for text in texts]
+
+
+class InMemoryDocumentIndex(DocumentIndex):
+    """Exact hybrid search over the indexed chunks: cosine similarity of the chunk
+    embedding blended with the fraction of query terms found in the chunk."""
+
+    def __init__(self, index_name: str, secondary_index_name: str | None = None):
+        super().__init__(index_name, secondary_index_name)
+        self._chunks: dict[tuple[str, int], DocMetadataAwareIndexChunk] = {}
+        # Built on the first search after indexing
+        self._keys: list[tuple[str, int]] = []
+        self._embeddings: numpy.ndarray | None = None
+        self._chunk_tokens: list[set[str]] = []
+
+    def ensure_indices_exist(
+        self,
+        index_embedding_dim: int,
+        secondary_index_embedding_dim: int | None,
+    ) -> None:
+        pass
+
+    @staticmethod
+    def register_multitenant_indices(
+        indices: list[str],
+        embedding_dims: list[int],
+    ) -> None:
+        pass
+
+    def index(
+        self,
+        chunks: list[DocMetadataAwareIndexChunk],
+        fresh_index: bool = False,
+    ) -> set[DocumentInsertionRecord]:
+        document_ids = {chunk.source_document.id for chunk in chunks}
+        existing_ids = {key[0] for key in self._chunks} & document_ids
+        self.delete(list(existing_ids))
+        for chunk in chunks:
+            self._chunks[(chunk.source_document.id, chunk.chunk_id)] = chunk
+        self._embeddings = None
+        return {
+            DocumentInsertionRecord(
+                document_id=document_id, already_existed=document_id in existing_ids
+            )
+            for document_id in document_ids
+        }
+
+    def delete_single(self, doc_id: str) -> int:
+        keys = [key for key in self._chunks if key[0] == doc_id]
+        for key in keys:
+            del self._chunks[key]
+        self._embeddings = None
+        return len(keys)
+
+    def delete(self, doc_ids: list[str]) -> None:
+        for doc_id in doc_ids:
+            self.delete_single(doc_id)
+
+    def update_single(self, doc_id: str, fields: VespaDocumentFields) -> int:
+        raise NotImplementedError("Updates are not benchmarked")
+
+    def update(self, update_requests: list[UpdateRequest]) -> None:
+        raise NotImplementedError("Updates are not benchmarked")
+
+    def _build_search_index(self) -> numpy.ndarray:
+        if self._embeddings is None:
+            self._keys = list(self._chunks)
+            self._embeddings = numpy.array(
+                [self._chunks[key].embeddings.full_embedding for key in self._keys],
+                dtype=numpy.float32,
+            )
+            self._chunk_tokens = [
+                set(_tokens(self._content(self._chunks[key]))) for key in self._keys
+            ]
+        return self._embeddings
+
+    @staticmethod
+    def _content(chunk: DocMetadataAwareIndexChunk) -> str:
+        # Same as what is stored in the Vespa content field
+        return f"{chunk.title_prefix}{chunk.content}{chunk.metadata_suffix_keyword}"
+
+    @staticmethod
+    def _matches(chunk: DocMetadataAwareIndexChunk, filters: IndexFilters) -> bool:
+        document = chunk.source_document
+        if filters.access_control_list is not None and not (
+            chunk.access.to_acl() & set(filters.access_control_list)
+        ):
+            return False
+        if filters.source_type and document.source not in filters.source_type:
+            return False
+        if filters.document_set and not (
+            chunk.document_sets & set(filters.document_set)
+        ):
+            return False
+        if filters.tags:
+            tags = set(document.get_metadata_str_attributes() or [])
+            if not any(
+                tag.tag_key + INDEX_SEPARATOR + tag.tag_value in tags
+                for tag in filters.tags
+            ):
+                return False
+        if filters.time_cutoff and (
+            document.doc_updated_at is None
+            or document.doc_updated_at < filters.time_cutoff
+        ):
+            return False
+        return True
+
+    def _to_inference_chunk(
+        self, chunk: DocMetadataAwareIndexChunk, score: float | None
+    ) -> InferenceChunkUncleaned:
+        document = chunk.source_document
+        return InferenceChunkUncleaned(
+            chunk_id=chunk.chunk_id,
+            blurb=chunk.blurb,
+            content=self._content(chunk),
+            source_links=chunk.source_links or {0: ""},
+            section_continuation=chunk.section_continuation,
+            document_id=document.id,
+            source_type=document.source,
+            title=document.get_title_for_document_index(),
+            semantic_identifier=document.semantic_identifier,
+            boost=chunk.boost,
+            recency_bias=1.0,
+            score=score,
+            hidden=False,
+            metadata=document.metadata,
+            match_highlights=[],
+            updated_at=document.doc_updated_at,
+            large_chunk_reference_ids=chunk.large_chunk_reference_ids,
+            llm_token_counts=chunk.llm_token_counts,
+            metadata_suffix=chunk.metadata_suffix_keyword,
+        )
+
+    def id_based_retrieval(
+        self,
+        chunk_requests: list[VespaChunkRequest],
+        filters: IndexFilters,
+        batch_retrieval: bool = False,
+    ) -> list[InferenceChunkUncleaned]:
+        requested = {request.document_id: request for request in chunk_requests}
+        results = []
+        for (document_id, chunk_id), chunk in sorted(self._chunks.items()):
+            request = requested.get(document_id)
+            if request is None or not self._matches(chunk, filters):
+                continue
+            if request.is_capped and not (
+                (request.min_chunk_ind or 0)
+                <= chunk_id
+                <= (request.max_chunk_ind or chunk_id)
+            ):
+                continue
+            results.append(self._to_inference_chunk(chunk, score=None))
+        return results
+
+    def hybrid_retrieval(
+        self,
+        query: str,
+        query_embedding: Embedding,
+        final_keywords: list[str] | None,
+        filters: IndexFilters,
+        hybrid_alpha: float,
+        time_decay_multiplier: float,
+        num_to_retrieve: int,
+        offset: int = 0,
+        title_content_ratio: float | None = None,
+    ) -> list[InferenceChunkUncleaned]:
+        embeddings = self._build_search_index()
+        if not self._keys:
+            return []
+
+        vector_scores = embeddings @ numpy.asarray(query_embedding, dtype=numpy.float32)
+        query_tokens = set(
+            _tokens(" ".join(final_keywords) if final_keywords else query)
+        )
+        keyword_scores = numpy.array(
+            [
+                len(query_tokens & chunk_tokens) / max(len(query_tokens), 1)
+                for chunk_tokens in self._chunk_tokens
+            ],
+            dtype=numpy.float32,
+        )
+        scores = hybrid_alpha * vector_scores + (1 - hybrid_alpha) * keyword_scores
+
+        results = []
+        for ind in numpy.argsort(-scores):
+            chunk = self._chunks[self._keys[ind]]
+            if not self._matches(chunk, filters):
+                continue
+            results.append(self._to_inference_chunk(chunk, score=float(scores[ind])))
+            if len(results) >= offset + num_to_retrieve:
+                break
+        return results[offset:]
+
+    def admin_retrieval(
+        self,
+        query: str,
+        filters: IndexFilters,
+        num_to_retrieve: int = 10,
+        offset: int = 0,
+    ) -> list[InferenceChunkUncleaned]:
+        return self.hybrid_retrieval(
+            query=query,
+            query_embedding=[0.0] * self._build_search_index().shape[-1],
+            final_keywords=None,
+            filters=filters,
+            hybrid_alpha=0.0,
+            time_decay_multiplier=1.0,
+            num_to_retrieve=num_to_retrieve,
+            offset=offset,
+        )
+
+    def random_retrieval(
+        self,
+        filters: IndexFilters,
+        num_to_retrieve: int = 10,
+    ) -> list[InferenceChunkUncleaned]:
+        matching = [
+            chunk for chunk in self._chunks.values() if self._matches(chunk, filters)
+        ]
+        return [
+            self._to_inference_chunk(chunk, score=None)
+            for chunk in random.sample(matching, min(num_to_retrieve, len(matching)))
+        ]
@@ -50,6 +50,20 @@ DISABLE_RERANK_FOR_STREAMING = (
 # model. If torch finds more threads on its own, this value is not used.
 MIN_THREADS_ML_MODELS = int(os.environ.get("MIN_THREADS_ML_MODELS") or 1)
 
+# Local models (by model name) to run with ONNX Runtime instead of PyTorch, only applies to
+# CPU model servers. Comma separated, add ":int8" to a model to also quantize its weights,
+# e.g. "nomic-ai/nomic-embed-text-v1:int8,mixedbread-ai/mxbai-rerank-xsmall-v1". The ONNX
+# model is checked against PyTorch on load and PyTorch is kept if the outputs differ
+ONNX_MODELS = {
+    model.strip().removesuffix(":int8"): model.strip().endswith(":int8")
+    for model in (os.environ.get("ONNX_MODELS") or "").split(",")
+    if model.strip()
+}
+# Exported (and quantized) ONNX models are stored here so they are only built once
+ONNX_MODEL_CACHE_DIR = os.environ.get("ONNX_MODEL_CACHE_DIR") or os.path.join(
+    os.path.expanduser("~"), ".cache", "onyx_onnx"
+)
+
 # Model server that has indexing only set will throw exception if used for reranking
 # or intent classification
 INDEXING_ONLY = os.environ.get("INDEXING_ONLY", "").lower() == "true"
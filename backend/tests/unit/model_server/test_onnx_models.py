@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+import torch
+from pytest_mock import MockerFixture
+from transformers import BertConfig  # type: ignore
+from transformers import BertForSequenceClassification
+from transformers import BertModel
+from transformers.modeling_outputs import BaseModelOutput  # type: ignore
+from transformers.modeling_outputs import SequenceClassifierOutput
+
+from model_server import onnx_models
+from model_server.onnx_models import OnnxModule
+from model_server.onnx_models import to_onnx_module
+
+_TINY_BERT_CONFIG = BertConfig(
+    vocab_size=100,
+    hidden_size=32,
+    num_hidden_layers=2,
+    num_attention_heads=2,
+    intermediate_size=64,
+    num_labels=1,
+)
+
+
+def _inputs(batch_size: int, sequence_length: int) -> dict[str, torch.Tensor]:
+    generator = torch.Generator().manual_seed(0)
+    return {
+        "input_ids": torch.randint(
+            0, 100, (batch_size, sequence_length), generator=generator
+        ),
+        "attention_mask": torch.ones(batch_size, sequence_length, dtype=torch.long),
+    }
+
+
+@pytest.fixture(autouse=True)
+def onnx_cache_dir(mocker: MockerFixture, tmp_path: Path) -> None:
+    mocker.patch.object(onnx_models, "ONNX_MODEL_CACHE_DIR", str(tmp_path))
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_onnx_matches_pytorch(mocker: MockerFixture, quantize: bool) -> None:
+    mocker.patch.object(onnx_models, "ONNX_MODELS", {"tiny-bert": quantize})
+    model = BertModel(_TINY_BERT_CONFIG).eval()
+
+    onnx_module = to_onnx_module(
+        model,
+        model_name="tiny-bert",
+        component="transformer",
+        sample_inputs=_inputs(batch_size=4, sequence_length=16),
+        wrap_output=lambda output: BaseModelOutput(last_hidden_state=output),
+    )
+    assert isinstance(onnx_module, OnnxModule)
+
+    # Batch size and sequence length are not fixed by the export
+    inputs = _inputs(batch_size=2, sequence_length=7)
+    with torch.no_grad():
+        expected = model(**inputs).last_hidden_state
+    actual = onnx_module(**inputs).last_hidden_state
+    assert actual.shape == expected.shape
+    assert torch.allclose(actual, expected, atol=0.1 if quantize else 1e-4)
+
+
+def test_onnx_cross_encoder(mocker: MockerFixture) -> None:
+    mocker.patch.object(onnx_models, "ONNX_MODELS", {"tiny-reranker": False})
+    model = BertForSequenceClassification(_TINY_BERT_CONFIG).eval()
+
+    onnx_module = to_onnx_module(
+        model,
+        model_name="tiny-reranker",
+        component="cross_encoder",
+        sample_inputs=_inputs(batch_size=4, sequence_length=16),
+        wrap_output=lambda output: SequenceClassifierOutput(logits=output),
+    )
+
+    inputs = _inputs(batch_size=3, sequence_length=10)
+    with torch.no_grad():
+        expected = model(**inputs, return_dict=True).logits
+    # Called the way CrossEncoder.predict calls the underlying model
+    actual = onnx_module(**inputs, return_dict=True).logits
+    assert torch.allclose(actual, expected, atol=1e-4)
+
+
+def test_pytorch_kept_when_not_selected(mocker: MockerFixture) -> None:
+    mocker.patch.object(onnx_models, "ONNX_MODELS", {})
+    model = BertModel(_TINY_BERT_CONFIG)
+
+    assert (
+        to_onnx_module(
+            model,
+            model_name="tiny-bert",
+            component="transformer",
+            sample_inputs=_inputs(batch_size=1, sequence_length=4),
+            wrap_output=lambda output: BaseModelOutput(last_hidden_state=output),
+        )
+        is model
+    )
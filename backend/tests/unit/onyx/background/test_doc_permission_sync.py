@@ -0,0 +1,177 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+from sqlalchemy.dialects import postgresql
+
+from ee.onyx.db.document import upsert_document_external_perms_batch
+from onyx.access.models import DocExternalAccess
+from onyx.access.models import DocumentAccess
+from onyx.access.models import ExternalAccess
+from onyx.access.utils import prefix_group_w_source
+from onyx.background.celery.tasks.doc_permission_syncing import tasks
+from onyx.configs.constants import DocumentSource
+from onyx.document_index.interfaces import UpdateRequest
+
+
+def _doc_external_access(
+    doc_id: str, emails: set[str], group_ids: set[str] | None = None
+) -> DocExternalAccess:
+    return DocExternalAccess(
+        external_access=ExternalAccess(
+            external_user_emails=emails,
+            external_user_group_ids=group_ids or set(),
+            is_public=False,
+        ),
+        doc_id=doc_id,
+    )
+
+
+def _existing_doc(
+    doc_id: str, emails: list[str], group_ids: list[str] | None = None
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=doc_id,
+        external_user_emails=emails,
+        external_user_group_ids=group_ids or [],
+        is_public=False,
+    )
+
+
+def test_upsert_document_external_perms_batch() -> None:
+    source = DocumentSource.GOOGLE_DRIVE
+    db_session = MagicMock()
+    db_session.execute.return_value.all.return_value = [
+        _existing_doc("changed", ["a@example.com"]),
+        _existing_doc(
+            "unchanged",
+            ["a@example.com"],
+            [prefix_group_w_source(ext_group_name="group", source=source)],
+        ),
+        _existing_doc("listed_twice", ["a@example.com"]),
+    ]
+
+    created_doc_ids, changed_doc_ids = upsert_document_external_perms_batch(
+        db_session=db_session,
+        doc_external_accesses=[
+            _doc_external_access("changed", {"b@example.com"}),
+            _doc_external_access("unchanged", {"a@example.com"}, {"group"}),
+            _doc_external_access("listed_twice", {"b@example.com"}),
+            _doc_external_access("new", {"c@example.com"}),
+            # the last permissions of a document win
+            _doc_external_access("listed_twice", {"a@example.com"}),
+        ],
+        source_type=source,
+    )
+
+    assert created_doc_ids == ["new"]
+    assert changed_doc_ids == ["changed"]
+
+    select_call, update_call, insert_call = db_session.execute.call_args_list
+    changed_doc_values = update_call.args[1]
+    assert [
+        (values["id"], values["external_user_emails"]) for values in changed_doc_values
+    ] == [("changed", ["b@example.com"])]
+
+    insert_params = insert_call.args[0].compile(dialect=postgresql.dialect()).params
+    assert insert_params["id_m0"] == "new"
+    assert insert_params["external_user_emails_m0"] == ["c@example.com"]
+    assert "id_m1" not in insert_params
+    db_session.commit.assert_called_once()
+
+
+def test_nothing_to_write_for_unchanged_docs() -> None:
+    db_session = MagicMock()
+    db_session.execute.return_value.all.return_value = [
+        _existing_doc("unchanged", ["a@example.com"])
+    ]
+
+    assert upsert_document_external_perms_batch(
+        db_session=db_session,
+        doc_external_accesses=[_doc_external_access("unchanged", {"a@example.com"})],
+        source_type=DocumentSource.GOOGLE_DRIVE,
+    ) == ([], [])
+    # only the select
+    db_session.execute.assert_called_once()
+
+
+def _access(emails: list[str | None]) -> DocumentAccess:
+    return DocumentAccess.build(
+        user_emails=emails,
+        user_groups=[],
+        external_user_emails=[],
+        external_user_group_ids=[],
+        is_public=False,
+    )
+
+
+def _mock_vespa_sync(mocker: MockerFixture) -> tuple[MagicMock, MagicMock]:
+    mocker.patch.object(tasks, "get_both_index_names", return_value=("primary", None))
+    document_index = mocker.patch.object(
+        tasks, "get_default_document_index"
+    ).return_value
+    mocker.patch.object(
+        tasks,
+        "get_documents_by_ids",
+        return_value=[
+            SimpleNamespace(id=doc_id, boost=0, hidden=False)
+            for doc_id in ["doc1", "doc2", "doc3", "doc4"]
+        ],
+    )
+    mocker.patch.object(
+        tasks,
+        "get_access_for_documents",
+        return_value={
+            "doc1": _access(["a@example.com"]),
+            "doc2": _access(["a@example.com"]),
+            "doc3": _access(["a@example.com"]),
+            "doc4": _access(["b@example.com"]),
+        },
+    )
+    mocker.patch.object(
+        tasks,
+        "fetch_document_sets_for_documents",
+        return_value=[
+            ("doc1", ["set"]),
+            ("doc2", ["set"]),
+            ("doc3", ["other set"]),
+            ("doc4", ["set"]),
+        ],
+    )
+    mocker.patch.object(tasks, "bump_index_generation")
+    mark_documents_as_synced = mocker.patch.object(tasks, "mark_documents_as_synced")
+    return document_index, mark_documents_as_synced
+
+
+def test_docs_with_the_same_fields_are_updated_together(
+    mocker: MockerFixture,
+) -> None:
+    document_index, mark_documents_as_synced = _mock_vespa_sync(mocker)
+
+    tasks._sync_documents_to_vespa(["doc1", "doc2", "doc3", "doc4"], None, MagicMock())
+
+    update_requests: list[UpdateRequest] = document_index.update.call_args.args[0]
+    assert sorted(
+        (update_request.document_ids, update_request.document_sets)
+        for update_request in update_requests
+    ) == [
+        (["doc1", "doc2"], {"set"}),
+        (["doc3"], {"other set"}),
+        (["doc4"], {"set"}),
+    ]
+    assert sorted(mark_documents_as_synced.call_args.args[0]) == [
+        "doc1",
+        "doc2",
+        "doc3",
+        "doc4",
+    ]
+
+
+def test_docs_are_not_marked_synced_when_vespa_fails(mocker: MockerFixture) -> None:
+    document_index, mark_documents_as_synced = _mock_vespa_sync(mocker)
+    document_index.update.side_effect = RuntimeError("vespa is down")
+
+    # left to the regular vespa sync rather than raised
+    tasks._sync_documents_to_vespa(["doc1", "doc2", "doc3", "doc4"], None, MagicMock())
+
+    mark_documents_as_synced.assert_not_called()
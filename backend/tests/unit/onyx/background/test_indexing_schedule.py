@@ -0,0 +1,59 @@
+import time
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.background.celery.tasks.indexing import tasks
+from onyx.db.models import SearchSettings
+from onyx.redis.redis_indexing_schedule import RedisIndexingSchedule
+from tests.unit.onyx.conftest import FakeRedis
+
+
+def test_only_due_and_changed_cc_pairs_are_checked(
+    mocker: MockerFixture, fake_redis: FakeRedis
+) -> None:
+    indexing_schedule = RedisIndexingSchedule(None, fake_redis)  # type: ignore
+    search_settings_list = [SearchSettings(id=1), SearchSettings(id=2)]
+    fetch_cc_pair_ids = mocker.patch.object(
+        tasks, "fetch_connector_credential_pair_ids", return_value=[10, 11]
+    )
+
+    # everything is checked on the first run
+    assert tasks._get_due_indexing_checks(
+        indexing_schedule, search_settings_list, MagicMock()
+    ) == [(10, 1), (10, 2), (11, 1), (11, 2)]
+
+    for cc_pair_id in [10, 11]:
+        for search_settings_id in [1, 2]:
+            indexing_schedule.set_next_check(
+                cc_pair_id, search_settings_id, time.time() + 60
+            )
+    indexing_schedule.set_next_check(11, 2, 0)
+
+    # afterwards only new, changed and due ones are
+    fetch_cc_pair_ids.return_value = [12]
+    indexing_schedule.mark_cc_pair_dirty(10)
+    assert sorted(
+        tasks._get_due_indexing_checks(
+            indexing_schedule, search_settings_list, MagicMock()
+        )
+    ) == [(10, 1), (10, 2), (11, 2), (12, 1), (12, 2)]
+    assert fetch_cc_pair_ids.call_args.kwargs["min_id"] == 11
+
+    # a new search settings rebuilds the schedule
+    fetch_cc_pair_ids.return_value = [10, 11, 12]
+    for cc_pair_id in [10, 11, 12]:
+        for search_settings_id in [1, 2]:
+            indexing_schedule.set_next_check(
+                cc_pair_id, search_settings_id, time.time() + 60
+            )
+    assert (
+        len(
+            tasks._get_due_indexing_checks(
+                indexing_schedule,
+                search_settings_list + [SearchSettings(id=3)],
+                MagicMock(),
+            )
+        )
+        == 9
+    )
@@ -0,0 +1,73 @@
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from onyx.background.indexing.job_client import WarmJob
+from onyx.background.indexing.job_client import WarmJobClient
+
+
+def _succeed(pid_file: str) -> None:
+    with open(pid_file, "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+
+def _fail() -> None:
+    raise ValueError("indexing went wrong")
+
+
+def _wait_until_done(job: WarmJob) -> None:
+    deadline = time.monotonic() + 60
+    while not job.done():
+        assert time.monotonic() < deadline
+        time.sleep(0.1)
+
+
+@pytest.fixture(autouse=True)
+def spawn_processes() -> Iterator[None]:
+    # same as the celery workers
+    start_method = multiprocessing.get_start_method()
+    multiprocessing.set_start_method("spawn", force=True)
+    yield
+    multiprocessing.set_start_method(start_method, force=True)
+
+
+def test_warm_workers_are_reused_then_recycled(tmp_path: str) -> None:
+    pid_file = os.path.join(tmp_path, "pids")
+    client = WarmJobClient(n_workers=1, max_jobs_per_worker=2)
+    client.start()
+
+    for _ in range(3):
+        job = client.submit(_succeed, pid_file)
+        assert job
+        _wait_until_done(job)
+        assert job.status == "finished"
+        job.release()
+
+    with open(pid_file) as f:
+        pids = f.read().split()
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+
+
+def test_warm_worker_reports_errors_and_cancellation(tmp_path: str) -> None:
+    client = WarmJobClient(n_workers=1, max_jobs_per_worker=10)
+
+    job = client.submit(_fail)
+    assert job
+    _wait_until_done(job)
+    assert job.status == "error"
+    assert "indexing went wrong" in job.exception()
+    job.release()
+
+    # the worker survives an exception in a job
+    failed_job_pid = job.process.pid
+    job = client.submit(time.sleep, 60)
+    assert job
+    assert job.process.pid == failed_job_pid
+    assert job.status == "running"
+    assert job.cancel()
+    job.process.join(timeout=10)
+    assert job.done()
@@ -0,0 +1,73 @@
+from typing import Any
+
+import pytest
+
+from onyx.background.celery.celery_utils import iterate_ids_from_runnable_connector
+from onyx.connectors.interfaces import GenerateDocumentsOutput
+from onyx.connectors.interfaces import GenerateSlimDocumentOutput
+from onyx.connectors.interfaces import LoadConnector
+from onyx.connectors.interfaces import SecondsSinceUnixEpoch
+from onyx.connectors.interfaces import SlimConnector
+from onyx.connectors.models import SlimDocument
+from onyx.redis.redis_connector_prune import RedisConnectorPrune
+from tests.unit.onyx.conftest import FakeRedis
+
+
+class _SlimLoadConnector(SlimConnector, LoadConnector):
+    def load_credentials(self, credentials: dict[str, Any]) -> dict[str, Any] | None:
+        return None
+
+    def load_from_state(self) -> GenerateDocumentsOutput:
+        raise AssertionError("Full documents should not be loaded when pruning")
+
+    def retrieve_all_slim_documents(
+        self,
+        start: SecondsSinceUnixEpoch | None = None,
+        end: SecondsSinceUnixEpoch | None = None,
+    ) -> GenerateSlimDocumentOutput:
+        yield [SlimDocument(id="doc_1"), SlimDocument(id="doc_2")]
+        yield [SlimDocument(id="doc_3")]
+
+
+def test_slim_connector_only_uses_slim_retrieval() -> None:
+    assert list(iterate_ids_from_runnable_connector(_SlimLoadConnector())) == [
+        ["doc_1", "doc_2"],
+        ["doc_3"],
+    ]
+
+
+def test_filter_missing_from_connector(fake_redis: FakeRedis) -> None:
+    redis_connector_prune = RedisConnectorPrune(None, 1, fake_redis)  # type: ignore
+    redis_connector_prune.start_connector_doc_ids()
+    for doc_id_batch in iterate_ids_from_runnable_connector(_SlimLoadConnector()):
+        redis_connector_prune.add_connector_doc_ids(doc_id_batch)
+
+    fake_redis.ttls.clear()
+    assert redis_connector_prune.filter_missing_from_connector(
+        ["doc_0", "doc_1", "doc_3", "doc_4"]
+    ) == ["doc_0", "doc_4"]
+    # kept from expiring while the indexed docs are compared
+    assert fake_redis.ttls == {
+        redis_connector_prune.connector_doc_ids_key: (
+            RedisConnectorPrune.CONNECTOR_DOC_IDS_TTL
+        )
+    }
+
+
+def test_source_with_no_docs_is_not_confused_with_a_missing_set(
+    fake_redis: FakeRedis,
+) -> None:
+    redis_connector_prune = RedisConnectorPrune(None, 1, fake_redis)  # type: ignore
+    redis_connector_prune.start_connector_doc_ids()
+    assert redis_connector_prune.filter_missing_from_connector(["doc_1"]) == ["doc_1"]
+
+    # expired, or cleared, before the diff finished
+    redis_connector_prune.connector_doc_ids_clear()
+    with pytest.raises(RuntimeError):
+        redis_connector_prune.filter_missing_from_connector(["doc_1"])
+
+    # never written
+    never_started = RedisConnectorPrune(None, 2, fake_redis)  # type: ignore
+    never_started.add_connector_doc_ids(["doc_1"])
+    with pytest.raises(RuntimeError):
+        never_started.filter_missing_from_connector(["doc_1", "doc_2"])
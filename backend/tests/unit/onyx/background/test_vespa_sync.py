@@ -0,0 +1,70 @@
+from typing import Any
+from unittest.mock import call
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.background.celery.tasks.vespa.tasks import get_fences_with_empty_tasksets
+from onyx.redis.redis_document_set import RedisDocumentSet
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+
+
+def test_only_fences_with_empty_tasksets_are_returned(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        RedisFenceRegistry,
+        "get_active_fences",
+        return_value=[b"documentset_fence_1", b"documentset_fence_2"],
+    )
+    r = MagicMock()
+    pipe = r.pipeline.return_value.__enter__.return_value
+    pipe.execute.return_value = [0, 3]
+
+    assert get_fences_with_empty_tasksets(
+        r, RedisDocumentSet.FENCE_PREFIX, RedisDocumentSet.TASKSET_PREFIX
+    ) == [b"documentset_fence_1"]
+    # all counts come from a single round trip
+    assert pipe.scard.call_args_list == [
+        call("documentset_taskset_1"),
+        call("documentset_taskset_2"),
+    ]
+    pipe.execute.assert_called_once()
+
+
+def test_no_fences(mocker: MockerFixture) -> None:
+    mocker.patch.object(RedisFenceRegistry, "get_active_fences", return_value=[])
+    r = MagicMock()
+
+    assert (
+        get_fences_with_empty_tasksets(
+            r, RedisDocumentSet.FENCE_PREFIX, RedisDocumentSet.TASKSET_PREFIX
+        )
+        == []
+    )
+    r.pipeline.assert_not_called()
+
+
+def test_task_ids_are_added_in_batches_before_sending() -> None:
+    batch_size = RedisDocumentSet.TASKSET_ADD_BATCH_SIZE
+    rds = RedisDocumentSet(None, 1)
+    db_session = MagicMock()
+    db_session.scalars.return_value.yield_per.return_value = [
+        MagicMock(id=f"doc_{ind}") for ind in range(batch_size + 1)
+    ]
+    redis_client = MagicMock()
+    added_task_ids: set[str] = set()
+    redis_client.sadd.side_effect = lambda key, *task_ids: added_task_ids.update(
+        task_ids
+    )
+
+    def send_task(*args: Any, task_id: str, **kwargs: Any) -> None:
+        # the taskset must contain the task before it can run
+        assert task_id in added_task_ids
+
+    celery_app = MagicMock()
+    celery_app.send_task.side_effect = send_task
+
+    assert rds.generate_tasks(
+        celery_app, db_session, redis_client, MagicMock(), None
+    ) == (batch_size + 1, batch_size + 1)
+    # one round trip per batch instead of one per task
+    assert redis_client.sadd.call_count == 2
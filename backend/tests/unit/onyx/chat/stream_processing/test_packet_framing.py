@@ -0,0 +1,59 @@
+import json
+
+from onyx.chat.models import CitationInfo
+from onyx.chat.models import OnyxAnswerPiece
+from onyx.chat.models import StreamStopInfo
+from onyx.chat.models import StreamStopReason
+from onyx.chat.stream_processing.packet_framing import frame_packets
+
+
+def _parse_frames(frames: list[str]) -> list[dict]:
+    return [json.loads(line) for frame in frames for line in frame.splitlines() if line]
+
+
+def test_answer_pieces_are_coalesced() -> None:
+    packets = [
+        OnyxAnswerPiece(answer_piece="The "),
+        OnyxAnswerPiece(answer_piece="answer "),
+        OnyxAnswerPiece(answer_piece="is [1]"),
+        CitationInfo(citation_num=1, document_id="doc1"),
+        OnyxAnswerPiece(answer_piece="."),
+        OnyxAnswerPiece(answer_piece=None),
+        StreamStopInfo(stop_reason=StreamStopReason.CANCELLED),
+    ]
+
+    frames = list(frame_packets(packets, max_delay_ms=60_000, max_frame_chars=1000))
+
+    # Each non answer packet closes the frame, ordering is kept
+    assert len(frames) == 3
+    assert _parse_frames(frames) == [
+        {"answer_piece": "The answer is [1]"},
+        {"citation_num": 1, "document_id": "doc1"},
+        {"answer_piece": "."},
+        {"answer_piece": None},
+        {"stop_reason": "CANCELLED"},
+    ]
+
+
+def test_frame_size_budget() -> None:
+    packets = [OnyxAnswerPiece(answer_piece="abcd") for _ in range(5)]
+
+    frames = list(frame_packets(packets, max_delay_ms=60_000, max_frame_chars=8))
+
+    assert _parse_frames(frames) == [
+        {"answer_piece": "abcdabcd"},
+        {"answer_piece": "abcdabcd"},
+        {"answer_piece": "abcd"},
+    ]
+
+
+def test_no_delay_sends_every_piece() -> None:
+    packets = [OnyxAnswerPiece(answer_piece=piece) for piece in ["a", "b", "c"]]
+
+    frames = list(frame_packets(packets, max_delay_ms=0, max_frame_chars=1000))
+
+    assert frames == [
+        '{"answer_piece":"a"}\n',
+        '{"answer_piece":"b"}\n',
+        '{"answer_piece":"c"}\n',
+    ]
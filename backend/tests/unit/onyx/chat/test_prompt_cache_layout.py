@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.chat.models import PromptConfig
+from onyx.chat.prompt_builder import build
+from onyx.chat.prompt_builder.build import AnswerPromptBuilder
+from onyx.chat.prompt_builder.build import default_build_system_message
+from onyx.chat.prompt_builder.build import default_build_user_message
+from onyx.configs.constants import MessageType
+from onyx.llm.models import PreviousMessage
+from onyx.llm.utils import PROMPT_CACHE_BREAKPOINT_KWARG
+
+
+def _previous_message(text: str, message_type: MessageType) -> PreviousMessage:
+    return PreviousMessage(
+        message=text,
+        token_count=5,
+        message_type=message_type,
+        files=[],
+        tool_call=None,
+    )
+
+
+def test_cache_layout_keeps_prefix_stable(
+    mocker: MockerFixture, prompt_config: PromptConfig, mock_llm: MagicMock
+) -> None:
+    mocker.patch.object(build, "ENABLE_PROMPT_CACHE_LAYOUT", True)
+    prompt_config = prompt_config.model_copy(update={"datetime_aware": True})
+
+    system_message = default_build_system_message(prompt_config)
+    assert system_message is not None
+    # Persona instructions are in the system prompt, the changing date is not
+    assert system_message.content == "System prompt\n\nTask prompt"
+
+    user_message = default_build_user_message("What is new?", prompt_config)
+    assert isinstance(user_message.content, str)
+    assert "Task prompt" not in user_message.content
+    assert "The current day and time is" in user_message.content
+
+    prompt_builder = AnswerPromptBuilder(
+        user_message=user_message,
+        message_history=[
+            _previous_message("Hi", MessageType.USER),
+            _previous_message("Hello!", MessageType.ASSISTANT),
+        ],
+        llm_config=mock_llm.config,
+        raw_user_text="What is new?",
+    )
+    prompt_builder.update_system_prompt(system_message)
+
+    breakpoints = [
+        bool(message.additional_kwargs.get(PROMPT_CACHE_BREAKPOINT_KWARG))
+        for message in prompt_builder.build()
+    ]
+    # System prompt and the end of the history, not the new user message
+    assert breakpoints == [True, False, True, False]
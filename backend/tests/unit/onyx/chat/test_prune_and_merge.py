@@ -1,9 +1,11 @@
 import pytest
 
 from onyx.chat.prune_and_merge import _merge_sections
+from onyx.chat.prune_and_merge import _precomputed_content_token_count
 from onyx.configs.constants import DocumentSource
 from onyx.context.search.models import InferenceChunk
 from onyx.context.search.models import InferenceSection
+from onyx.natural_language_processing.utils import BaseTokenizer
 
 
 # This large test accounts for all of the following:
@@ -228,3 +230,48 @@ def test_merge_minimal_sections(
     merged_sections = _merge_sections(sections)
     assert merged_sections[0].combined_content == expected_content
     assert merged_sections[0].center_chunk == expected_center_chunk
+
+
+class _WordTokenizer(BaseTokenizer):
+    def __init__(self) -> None:
+        self.encoded: list[str] = []
+
+    def encode(self, string: str) -> list[int]:
+        self.encoded.append(string)
+        return [0] * len(string.split())
+
+    def tokenize(self, string: str) -> list[str]:
+        return string.split()
+
+    def decode(self, tokens: list[int]) -> str:
+        raise NotImplementedError
+
+    @property
+    def family(self) -> str:
+        return "words"
+
+
+def test_precomputed_content_token_count() -> None:
+    tokenizer = _WordTokenizer()
+    chunks = [
+        create_inference_chunk("doc1", 0, "alpha beta", 1.0),
+        create_inference_chunk("doc1", 1, "gamma", 1.0),
+    ]
+    for chunk in chunks:
+        chunk.llm_token_counts = {"words": len(chunk.content.split()), "other": 100}
+    section = InferenceSection(
+        center_chunk=chunks[0],
+        chunks=chunks,
+        combined_content="alpha beta\ngamma",
+    )
+
+    assert _precomputed_content_token_count(section, tokenizer) == 4
+    assert tokenizer.encoded == []
+
+    # Trimmed content no longer lines up with the stored counts
+    trimmed_section = section.model_copy(update={"combined_content": "alpha"})
+    assert _precomputed_content_token_count(trimmed_section, tokenizer) is None
+
+    # Tokenizer mismatch
+    chunks[1].llm_token_counts = {"other": 100}
+    assert _precomputed_content_token_count(section, tokenizer) is None
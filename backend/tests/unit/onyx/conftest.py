@@ -0,0 +1,190 @@
+import fnmatch
+from typing import Any
+
+import pytest
+import redis
+
+
+def _key(key: str | bytes) -> str:
+    return key.decode("utf-8") if isinstance(key, bytes) else key
+
+
+def _encode(value: Any) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+class FakePipeline:
+    """Queues commands until execute(). After watch() commands run immediately until
+    multi(), and execute() raises WatchError if a watched key was written since."""
+
+    def __init__(self, r: "FakeRedis") -> None:
+        self.r = r
+        self.commands: list[tuple[str, tuple, dict]] = []
+        self.watched_versions: dict[str, int] | None = None
+        self.queueing = True
+
+    def __enter__(self) -> "FakePipeline":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def watch(self, *keys: str | bytes) -> None:
+        self.watched_versions = {
+            _key(key): self.r.versions.get(_key(key), 0) for key in keys
+        }
+        self.queueing = False
+
+    def multi(self) -> None:
+        self.queueing = True
+
+    def __getattr__(self, name: str) -> Any:
+        if not self.queueing:
+            return getattr(self.r, name)
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self) -> list[Any]:
+        if self.watched_versions and any(
+            self.r.versions.get(key, 0) != version
+            for key, version in self.watched_versions.items()
+        ):
+            raise redis.WatchError()
+        return [
+            getattr(self.r, name)(*args, **kwargs)
+            for name, args, kwargs in self.commands
+        ]
+
+
+class FakeRedis:
+    """In memory stand-in for the redis commands used by the code under test. Strings
+    are stored as bytes, sets as sets of bytes, hashes as dicts of bytes and sorted sets
+    as dicts of bytes to scores, like redis returns them."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, Any] = {}
+        # the expiry passed with the last write of each key
+        self.ttls: dict[str, int | None] = {}
+        # bumped on every write, for WATCH
+        self.versions: dict[str, int] = {}
+        self.scans = 0
+
+    def _written(self, key: str | bytes) -> None:
+        self.versions[_key(key)] = self.versions.get(_key(key), 0) + 1
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def exists(self, key: str | bytes) -> int:
+        return int(_key(key) in self.store)
+
+    def get(self, key: str | bytes) -> bytes | None:
+        return self.store.get(_key(key))
+
+    def getdel(self, key: str | bytes) -> bytes | None:
+        self._written(key)
+        return self.store.pop(_key(key), None)
+
+    def incrby(self, key: str | bytes, amount: int) -> int:
+        value = int(self.store.get(_key(key), b"0")) + amount
+        self.store[_key(key)] = _encode(value)
+        self._written(key)
+        return value
+
+    def delete(self, *keys: str | bytes) -> None:
+        for key in keys:
+            self.store.pop(_key(key), None)
+            self._written(key)
+
+    def expire(self, key: str | bytes, seconds: int) -> None:
+        if _key(key) in self.store:
+            self.ttls[_key(key)] = seconds
+
+    def sadd(self, key: str | bytes, *values: Any) -> None:
+        self.store.setdefault(_key(key), set()).update(
+            _encode(value) for value in values
+        )
+        self._written(key)
+
+    def srem(self, key: str | bytes, *values: Any) -> None:
+        for value in values:
+            self.store.get(_key(key), set()).discard(_encode(value))
+        self._written(key)
+
+    def smembers(self, key: str | bytes) -> set[bytes]:
+        return set(self.store.get(_key(key), set()))
+
+    def smismember(self, key: str | bytes, values: list[Any]) -> list[int]:
+        members = self.store.get(_key(key), set())
+        return [int(_encode(value) in members) for value in values]
+
+    def scard(self, key: str | bytes) -> int:
+        return len(self.store.get(_key(key), set()))
+
+    def spop(self, key: str | bytes) -> bytes | None:
+        members = self.store.get(_key(key))
+        if not members:
+            return None
+        self._written(key)
+        return members.pop()
+
+    def hset(
+        self,
+        key: str | bytes,
+        field: Any = None,
+        value: Any = None,
+        mapping: dict[str, Any] | None = None,
+    ) -> None:
+        fields = dict(mapping or {})
+        if field is not None:
+            fields[field] = value
+        self.store.setdefault(_key(key), {}).update(
+            {_encode(field): _encode(value) for field, value in fields.items()}
+        )
+        self._written(key)
+
+    def hgetall(self, key: str | bytes) -> dict[bytes, bytes]:
+        return dict(self.store.get(_key(key), {}))
+
+    def hmget(self, key: str | bytes, fields: list[Any]) -> list[bytes | None]:
+        values = self.store.get(_key(key), {})
+        return [values.get(_encode(field)) for field in fields]
+
+    def zadd(self, key: str | bytes, mapping: dict[Any, float]) -> None:
+        self.store.setdefault(_key(key), {}).update(
+            {_encode(member): score for member, score in mapping.items()}
+        )
+        self._written(key)
+
+    def zrem(self, key: str | bytes, member: Any) -> None:
+        self.store.get(_key(key), {}).pop(_encode(member), None)
+        self._written(key)
+
+    def zrangebyscore(self, key: str | bytes, min: str, max: float) -> list[bytes]:
+        scores = self.store.get(_key(key), {})
+        return [
+            member
+            for member in sorted(scores, key=scores.__getitem__)
+            if scores[member] <= max
+        ]
+
+    def scan_iter(self, match: str) -> list[bytes]:
+        self.scans += 1
+        return [
+            key.encode("utf-8") for key in self.store if fnmatch.fnmatch(key, match)
+        ]
+
+    # defined last so it doesn't shadow the builtin in the annotations above
+    def set(
+        self, key: str | bytes, value: Any, nx: bool = False, ex: int | None = None
+    ) -> bool:
+        if nx and _key(key) in self.store:
+            return False
+        self.store[_key(key)] = _encode(value)
+        self.ttls[_key(key)] = ex
+        self._written(key)
+        return True
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
@@ -0,0 +1,96 @@
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+
+from onyx.connectors.confluence.connector import ConfluenceConnector
+from onyx.connectors.confluence.onyx_confluence import OnyxConfluence
+from onyx.connectors.connector_runner import ConnectorRunner
+from onyx.connectors.interfaces import ConnectorCheckpoint
+
+_TIME_RANGE = (
+    datetime(2024, 1, 1, tzinfo=timezone.utc),
+    datetime(2024, 2, 1, tzinfo=timezone.utc),
+)
+
+
+def _page(page_id: str) -> dict[str, Any]:
+    return {
+        "id": page_id,
+        "type": "page",
+        "title": f"Page {page_id}",
+        "_links": {"webui": f"/spaces/TEST/pages/{page_id}"},
+        "body": {"storage": {"value": f"<p>page {page_id}</p>"}},
+        "space": {"name": "Test"},
+        "metadata": {"labels": {"results": []}},
+        "version": {"when": "2024-01-15T00:00:00.000Z"},
+    }
+
+
+def _build_connector(result_pages: list[list[dict[str, Any]]]) -> ConfluenceConnector:
+    """The page query serves result_pages one response at a time, comments and
+    attachments queries come back empty."""
+
+    def _get(url: str) -> dict[str, Any]:
+        if "type=page" in url:
+            index = 0
+        elif url.startswith("next/"):
+            index = int(url.removeprefix("next/"))
+        else:
+            return {"results": []}
+
+        response: dict[str, Any] = {"results": result_pages[index], "_links": {}}
+        if index + 1 < len(result_pages):
+            response["_links"]["next"] = f"next/{index + 1}"
+        return response
+
+    connector = ConfluenceConnector(
+        wiki_base="https://example.atlassian.net/wiki",
+        is_cloud=True,
+        batch_size=2,
+        labels_to_skip=[],
+    )
+    confluence_client = OnyxConfluence("https://example.atlassian.net/wiki")
+    confluence_client.get = _get  # type: ignore
+    connector._confluence_client = confluence_client
+    return connector
+
+
+def _run(
+    connector: ConfluenceConnector, checkpoint: ConnectorCheckpoint | None = None
+) -> tuple[list[str], list[ConnectorCheckpoint | None]]:
+    runner = ConnectorRunner(connector, time_range=_TIME_RANGE, checkpoint=checkpoint)
+    titles: list[str] = []
+    checkpoints: list[ConnectorCheckpoint | None] = []
+    for doc_batch in runner.run():
+        titles.extend(doc.semantic_identifier for doc in doc_batch)
+        checkpoints.append(runner.checkpoint)
+    return titles, checkpoints
+
+
+def test_resume_after_interruption() -> None:
+    result_pages = [
+        [_page("1"), _page("2"), _page("3")],
+        [_page("4"), _page("5")],
+    ]
+    all_titles, checkpoints = _run(_build_connector(result_pages))
+    assert all_titles == ["Page 1", "Page 2", "Page 3", "Page 4", "Page 5"]
+
+    # Interrupted after the first batch, in the middle of the first results
+    assert checkpoints[0] is not None
+    assert checkpoints[0]["done_page_ids"] == ["1", "2"]
+    resumed_titles, _ = _run(_build_connector(result_pages), checkpoints[0])
+    assert resumed_titles == ["Page 3", "Page 4", "Page 5"]
+
+
+def test_resume_when_done_page_dropped_out_of_the_results() -> None:
+    checkpoint = {
+        "results_url": "next/1",
+        "done_page_ids": ["3"],
+    }
+    # page 3 was modified after the window end, so the re-fetch no longer returns it
+    result_pages = [
+        [_page("1"), _page("2")],
+        [_page("4"), _page("5")],
+    ]
+    titles, _ = _run(_build_connector(result_pages), checkpoint)
+    assert titles == ["Page 4", "Page 5"]
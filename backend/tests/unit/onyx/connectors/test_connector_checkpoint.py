@@ -0,0 +1,86 @@
+from datetime import datetime
+from datetime import timezone
+from typing import Any
+
+from onyx.background.indexing.checkpointing import get_time_windows_to_resume
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.connector_runner import ConnectorRunner
+from onyx.connectors.interfaces import CheckpointConnector
+from onyx.connectors.interfaces import ConnectorCheckpoint
+from onyx.connectors.interfaces import GenerateCheckpointedDocumentsOutput
+from onyx.connectors.interfaces import SecondsSinceUnixEpoch
+from onyx.connectors.models import Document
+from onyx.connectors.models import IndexingCheckpoint
+from onyx.connectors.models import Section
+
+
+def _dt(day: int) -> datetime:
+    return datetime(2024, 1, day, tzinfo=timezone.utc)
+
+
+class _PagedConnector(CheckpointConnector):
+    def __init__(self, num_pages: int) -> None:
+        self.num_pages = num_pages
+
+    def load_credentials(self, credentials: dict[str, Any]) -> dict[str, Any] | None:
+        return None
+
+    def load_from_checkpoint(
+        self,
+        start: SecondsSinceUnixEpoch,
+        end: SecondsSinceUnixEpoch,
+        checkpoint: ConnectorCheckpoint | None,
+    ) -> GenerateCheckpointedDocumentsOutput:
+        for page in range(checkpoint["next_page"] if checkpoint else 0, self.num_pages):
+            yield [
+                Document(
+                    id=f"page_{page}",
+                    sections=[Section(text=f"page {page}", link=None)],
+                    source=DocumentSource.CONFLUENCE,
+                    semantic_identifier=f"page {page}",
+                    metadata={},
+                )
+            ], {"next_page": page + 1}
+
+
+def test_runner_resumes_from_checkpoint() -> None:
+    runner = ConnectorRunner(
+        _PagedConnector(num_pages=5),
+        time_range=(_dt(1), _dt(2)),
+        checkpoint={"next_page": 3},
+    )
+
+    doc_ids: list[str] = []
+    checkpoints: list[ConnectorCheckpoint | None] = []
+    for doc_batch in runner.run():
+        doc_ids.extend(doc.id for doc in doc_batch)
+        # The checkpoint is always the one to continue from after the yielded batch
+        checkpoints.append(runner.checkpoint)
+
+    assert doc_ids == ["page_3", "page_4"]
+    assert checkpoints == [{"next_page": 4}, {"next_page": 5}]
+
+
+def test_resume_keeps_checkpointed_window_end() -> None:
+    time_windows = [(_dt(1), _dt(5)), (_dt(5), _dt(10)), (_dt(10), _dt(20))]
+    checkpoint = IndexingCheckpoint(
+        window_start=_dt(5),
+        window_end=_dt(8),
+        connector_checkpoint={"next_page": 2},
+    )
+
+    # The rest of the planned window is indexed as a window of its own
+    assert get_time_windows_to_resume(time_windows, checkpoint) == [
+        (_dt(5), _dt(8)),
+        (_dt(8), _dt(10)),
+        (_dt(10), _dt(20)),
+    ]
+
+    # Survives the round trip through the JSON column
+    stored_checkpoint = IndexingCheckpoint.model_validate(
+        checkpoint.model_dump(mode="json")
+    )
+    assert stored_checkpoint == checkpoint
+
+    stale_checkpoint = checkpoint.model_copy(update={"window_start": _dt(2)})
+    assert get_time_windows_to_resume(time_windows, stale_checkpoint) is None
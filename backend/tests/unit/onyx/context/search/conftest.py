@@ -0,0 +1,51 @@
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunkUncleaned
+from onyx.context.search.models import SearchQuery
+
+
+def build_chunk(
+    document_id: str,
+    chunk_id: int,
+    score: float | None = None,
+    large_chunk_reference_ids: list[int] | None = None,
+) -> InferenceChunkUncleaned:
+    return InferenceChunkUncleaned(
+        chunk_id=chunk_id,
+        document_id=document_id,
+        semantic_identifier=document_id,
+        title=None,
+        blurb=f"{document_id} {chunk_id}",
+        content=f"{document_id} {chunk_id}",
+        source_links=None,
+        section_continuation=False,
+        source_type=DocumentSource.WEB,
+        boost=0,
+        recency_bias=1.0,
+        score=score,
+        hidden=False,
+        metadata={},
+        match_highlights=[],
+        updated_at=None,
+        large_chunk_reference_ids=large_chunk_reference_ids or [],
+        metadata_suffix=None,
+    )
+
+
+def build_search_query() -> SearchQuery:
+    return SearchQuery(
+        query="query",
+        processed_keywords=["query"],
+        search_type=SearchType.SEMANTIC,
+        evaluation_type=LLMEvaluationType.SKIP,
+        filters=IndexFilters(access_control_list=["PUBLIC"]),
+        chunks_above=1,
+        chunks_below=1,
+        rerank_settings=None,
+        hybrid_alpha=0.5,
+        recency_bias_multiplier=1.0,
+        max_llm_filter_sections=10,
+        precomputed_query_embedding=[0.1, 0.2],
+    )
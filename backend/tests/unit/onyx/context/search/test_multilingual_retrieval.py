@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunkUncleaned
+from onyx.context.search.models import SearchQuery
+from onyx.context.search.retrieval import search_runner
+from onyx.context.search.retrieval.search_runner import retrieve_chunks
+
+
+def _chunk(document_id: str, score: float) -> InferenceChunkUncleaned:
+    return InferenceChunkUncleaned(
+        chunk_id=0,
+        document_id=document_id,
+        semantic_identifier=document_id,
+        title=None,
+        blurb=document_id,
+        content=document_id,
+        source_links=None,
+        section_continuation=False,
+        source_type=DocumentSource.WEB,
+        boost=0,
+        recency_bias=1.0,
+        score=score,
+        hidden=False,
+        metadata={},
+        match_highlights=[],
+        updated_at=None,
+        large_chunk_reference_ids=[],
+        metadata_suffix=None,
+    )
+
+
+def test_rephrases_are_embedded_in_one_batch(mocker: MockerFixture) -> None:
+    mocker.patch.object(
+        search_runner, "get_multilingual_expansion", return_value=["French"]
+    )
+    mocker.patch.object(
+        search_runner,
+        "multilingual_query_expansion",
+        return_value=["bonjour le monde", "Hello world!"],
+    )
+    embed_queries = mocker.patch.object(
+        search_runner, "_embed_queries", return_value=[[0.2, 0.2]]
+    )
+    document_index = MagicMock()
+    document_index.hybrid_retrieval.side_effect = lambda query, **kwargs: [
+        _chunk(query, score=kwargs["query_embedding"][0])
+    ]
+
+    chunks = retrieve_chunks(
+        query=SearchQuery(
+            query="hello world",
+            processed_keywords=["hello", "world"],
+            search_type=SearchType.SEMANTIC,
+            evaluation_type=LLMEvaluationType.SKIP,
+            filters=IndexFilters(access_control_list=None),
+            chunks_above=0,
+            chunks_below=0,
+            rerank_settings=None,
+            hybrid_alpha=0.5,
+            recency_bias_multiplier=1.0,
+            max_llm_filter_sections=10,
+            precomputed_query_embedding=[0.1, 0.1],
+        ),
+        document_index=document_index,
+        db_session=MagicMock(),
+    )
+
+    # The near duplicate rephrase is dropped and the original query keeps its
+    # precomputed embedding, the remaining rephrase is embedded once
+    embed_queries.assert_called_once()
+    assert embed_queries.call_args.args[0] == ["bonjour le monde"]
+    assert document_index.hybrid_retrieval.call_count == 2
+    assert [(chunk.document_id, chunk.score) for chunk in chunks] == [
+        ("bonjour le monde", 0.2),
+        ("hello world", 0.1),
+    ]
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.models import RerankingDetails
+from onyx.context.search.models import SearchQuery
+from onyx.context.search.postprocessing import postprocessing
+from onyx.context.search.postprocessing import rerank_cache
+from onyx.context.search.postprocessing.postprocessing import semantic_reranking
+from tests.unit.onyx.conftest import FakeRedis
+
+
+def _chunk(document_id: str, content: str) -> InferenceChunk:
+    return InferenceChunk(
+        chunk_id=0,
+        document_id=document_id,
+        semantic_identifier=document_id,
+        title=None,
+        blurb=content,
+        content=content,
+        source_links=None,
+        section_continuation=False,
+        source_type=DocumentSource.WEB,
+        boost=0,
+        recency_bias=1.0,
+        score=0.5,
+        hidden=False,
+        metadata={},
+        match_highlights=[],
+        updated_at=None,
+    )
+
+
+def _search_query() -> SearchQuery:
+    return SearchQuery(
+        query="how do I reset my password",
+        processed_keywords=["reset", "password"],
+        search_type=SearchType.SEMANTIC,
+        evaluation_type=LLMEvaluationType.SKIP,
+        filters=IndexFilters(access_control_list=None),
+        chunks_above=0,
+        chunks_below=0,
+        rerank_settings=RerankingDetails(
+            rerank_model_name="mixedbread-ai/mxbai-rerank-xsmall-v1",
+            rerank_api_url=None,
+            rerank_provider_type=None,
+            num_rerank=10,
+        ),
+        hybrid_alpha=0.5,
+        recency_bias_multiplier=1.0,
+        max_llm_filter_sections=10,
+    )
+
+
+def test_only_unscored_passages_are_reranked(
+    mocker: MockerFixture, fake_redis: FakeRedis
+) -> None:
+    mocker.patch.object(rerank_cache, "get_redis_client", return_value=fake_redis)
+    mocker.patch.object(rerank_cache, "RERANK_SCORE_CACHE_TTL", 60)
+    model = MagicMock()
+    model.predict.side_effect = lambda query, passages: [
+        float(len(passage)) for passage in passages
+    ]
+    mocker.patch.object(postprocessing, "RerankingModel", return_value=model)
+
+    ranked_chunks, _ = semantic_reranking(
+        _search_query(), [_chunk("a", "aaaa"), _chunk("b", "bb")]
+    )
+    assert [chunk.document_id for chunk in ranked_chunks] == ["a", "b"]
+    assert model.predict.call_count == 1
+
+    # "a" is cached, "b" changed so it is scored again along with the new "c"
+    ranked_chunks, _ = semantic_reranking(
+        _search_query(),
+        [_chunk("a", "aaaa"), _chunk("b", "bbbbbb"), _chunk("c", "c")],
+    )
+    assert model.predict.call_args.kwargs["passages"] == ["b\nbbbbbb", "c\nc"]
+    assert [chunk.document_id for chunk in ranked_chunks] == ["b", "a", "c"]
+
+    model.predict.reset_mock()
+    semantic_reranking(_search_query(), [_chunk("a", "aaaa"), _chunk("c", "c")])
+    model.predict.assert_not_called()
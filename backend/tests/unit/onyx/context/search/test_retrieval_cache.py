@@ -0,0 +1,110 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from onyx.configs.constants import DocumentSource
+from onyx.context.search import retrieval_cache
+from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import InferenceChunk
+from onyx.context.search.models import InferenceSection
+from onyx.context.search.models import SearchQuery
+from onyx.context.search.retrieval_cache import build_retrieval_cache_key
+from onyx.context.search.retrieval_cache import bump_index_generation
+from onyx.context.search.retrieval_cache import CachedRetrieval
+from onyx.context.search.retrieval_cache import get_cached_retrieval
+from onyx.context.search.retrieval_cache import set_cached_retrieval
+from tests.unit.onyx.conftest import FakeRedis
+
+
+@pytest.fixture(autouse=True)
+def use_fake_redis(mocker: MockerFixture, fake_redis: FakeRedis) -> None:
+    mocker.patch.object(retrieval_cache, "get_redis_client", return_value=fake_redis)
+    mocker.patch.object(retrieval_cache, "RETRIEVAL_CACHE_TTL", 60)
+
+
+def _search_query(query: str, acl: list[str] | None) -> SearchQuery:
+    return SearchQuery(
+        query=query,
+        processed_keywords=query.split(),
+        search_type=SearchType.SEMANTIC,
+        evaluation_type=LLMEvaluationType.SKIP,
+        filters=IndexFilters(access_control_list=acl),
+        chunks_above=1,
+        chunks_below=1,
+        rerank_settings=None,
+        hybrid_alpha=0.5,
+        recency_bias_multiplier=1.0,
+        max_llm_filter_sections=10,
+    )
+
+
+def _cache_key(search_query: SearchQuery) -> str | None:
+    return build_retrieval_cache_key(
+        search_query=search_query,
+        index_name="danswer_chunk_nomic_ai_nomic_embed_text_v1",
+        multilingual_expansion=[],
+        persona_id=0,
+        tenant_id=None,
+    )
+
+
+def test_cache_key(fake_redis: FakeRedis) -> None:
+    key = _cache_key(
+        _search_query("What is the PTO policy?", ["user_email:a", "PUBLIC"])
+    )
+
+    assert key is not None
+    # Whitespace, casing and ACL ordering do not matter
+    assert key == _cache_key(
+        _search_query("what is  the PTO policy? ", ["PUBLIC", "user_email:a"])
+    )
+    # Users with different access never share results
+    assert key != _cache_key(_search_query("What is the PTO policy?", ["PUBLIC"]))
+    assert key != _cache_key(_search_query("What is the PTO policy?", None))
+
+    # Any write to the index invalidates everything cached before it
+    bump_index_generation(tenant_id=None)
+    assert key != _cache_key(
+        _search_query("What is the PTO policy?", ["user_email:a", "PUBLIC"])
+    )
+
+
+def test_cache_disabled(mocker: MockerFixture, fake_redis: FakeRedis) -> None:
+    mocker.patch.object(retrieval_cache, "RETRIEVAL_CACHE_TTL", 0)
+    assert _cache_key(_search_query("query", ["PUBLIC"])) is None
+
+
+def test_cache_roundtrip(fake_redis: FakeRedis) -> None:
+    chunk = InferenceChunk(
+        chunk_id=0,
+        document_id="doc1",
+        semantic_identifier="Doc 1",
+        title="Doc 1",
+        blurb="blurb",
+        content="content",
+        source_links={0: "https://example.com"},
+        section_continuation=False,
+        source_type=DocumentSource.WEB,
+        boost=0,
+        recency_bias=1.0,
+        score=0.5,
+        hidden=False,
+        metadata={"tag": ["a", "b"]},
+        match_highlights=[],
+        updated_at=None,
+    )
+    cached_retrieval = CachedRetrieval(
+        retrieved_chunks=[chunk],
+        retrieved_sections=[
+            InferenceSection(
+                center_chunk=chunk, chunks=[chunk], combined_content="content"
+            )
+        ],
+    )
+    key = _cache_key(_search_query("query", ["PUBLIC"]))
+    assert key is not None
+
+    assert get_cached_retrieval(key, tenant_id=None) is None
+    set_cached_retrieval(key, cached_retrieval, tenant_id=None)
+    assert get_cached_retrieval(key, tenant_id=None) == cached_retrieval
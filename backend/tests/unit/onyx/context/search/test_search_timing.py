@@ -0,0 +1,52 @@
+import time
+from unittest.mock import MagicMock
+
+from onyx.context.search.enums import SearchStage
+from onyx.context.search.retrieval.search_runner import doc_index_retrieval
+from onyx.context.search.timing import search_stage
+from onyx.context.search.timing import SearchTimings
+from onyx.utils.threadpool_concurrency import run_functions_tuples_in_parallel
+from tests.unit.onyx.context.search.conftest import build_chunk
+from tests.unit.onyx.context.search.conftest import build_search_query
+
+
+def test_stage_times_are_summed_across_threads() -> None:
+    timings = SearchTimings()
+    sleep = timings.timed(SearchStage.DOCUMENT_INDEX_QUERY, time.sleep)
+
+    run_functions_tuples_in_parallel([(sleep, (0.05,)), (sleep, (0.05,))])
+    with timings.stage(SearchStage.RERANK):
+        pass
+    # No collector, nothing to record
+    with search_stage(None, SearchStage.PRUNING):
+        pass
+
+    stage_ms = timings.as_milliseconds()
+    assert set(stage_ms) == {"document_index_query", "rerank"}
+    assert stage_ms["document_index_query"] >= 100
+    assert stage_ms["rerank"] < 50
+
+
+def test_retrieval_stages_are_recorded() -> None:
+    document_index = MagicMock()
+    document_index.hybrid_retrieval.return_value = [
+        build_chunk("a", 10, score=0.9, large_chunk_reference_ids=[2, 3]),
+    ]
+    document_index.id_based_retrieval.return_value = [
+        build_chunk("a", 2),
+        build_chunk("a", 3),
+    ]
+    timings = SearchTimings()
+
+    doc_index_retrieval(
+        query=build_search_query(),
+        document_index=document_index,
+        db_session=MagicMock(),
+        timings=timings,
+    )
+
+    # The query embedding was precomputed so there is no embedding stage
+    assert set(timings.as_milliseconds()) == {
+        "document_index_query",
+        "large_chunk_resolution",
+    }
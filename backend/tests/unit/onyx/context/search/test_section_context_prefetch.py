@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+from onyx.context.search.models import SectionContextPrefetch
+from onyx.context.search.retrieval.search_runner import doc_index_retrieval
+from onyx.document_index.interfaces import VespaChunkRequest
+from tests.unit.onyx.context.search.conftest import build_chunk
+from tests.unit.onyx.context.search.conftest import build_search_query
+
+
+def test_large_chunks_and_context_in_one_request() -> None:
+    document_index = MagicMock()
+    document_index.hybrid_retrieval.return_value = [
+        build_chunk("a", 10, score=0.9, large_chunk_reference_ids=[2, 3]),
+        build_chunk("b", 5, score=0.5),
+        build_chunk("b", 7, score=0.4),
+    ]
+    document_index.id_based_retrieval.return_value = [
+        build_chunk("a", chunk_id) for chunk_id in range(1, 5)
+    ] + [build_chunk("b", chunk_id) for chunk_id in range(4, 9)]
+    section_context = SectionContextPrefetch(chunks_above=1, chunks_below=1)
+
+    chunks = doc_index_retrieval(
+        query=build_search_query(),
+        document_index=document_index,
+        db_session=MagicMock(),
+        section_context=section_context,
+    )
+
+    document_index.id_based_retrieval.assert_called_once()
+    chunk_requests = document_index.id_based_retrieval.call_args.kwargs[
+        "chunk_requests"
+    ]
+    # Overlapping ranges are merged per document
+    assert sorted(chunk_requests, key=lambda request: request.document_id) == [
+        VespaChunkRequest(document_id="a", min_chunk_ind=1, max_chunk_ind=4),
+        VespaChunkRequest(document_id="b", min_chunk_ind=4, max_chunk_ind=8),
+    ]
+
+    # The referenced chunks get the score of the large chunk
+    assert [(chunk.document_id, chunk.chunk_id, chunk.score) for chunk in chunks] == [
+        ("a", 2, 0.9),
+        ("a", 3, 0.9),
+        ("b", 5, 0.5),
+        ("b", 7, 0.4),
+    ]
+    assert section_context.expanded_chunk_ids == {
+        ("a", 2),
+        ("a", 3),
+        ("b", 5),
+        ("b", 7),
+    }
+    assert {("a", 1), ("a", 4), ("b", 4), ("b", 6), ("b", 8)} <= set(
+        section_context.chunks
+    )
+
+
+def test_no_context_request_without_large_chunks_or_context() -> None:
+    document_index = MagicMock()
+    document_index.hybrid_retrieval.return_value = [build_chunk("b", 5, score=0.5)]
+
+    chunks = doc_index_retrieval(
+        query=build_search_query(),
+        document_index=document_index,
+        db_session=MagicMock(),
+        section_context=SectionContextPrefetch(chunks_above=0, chunks_below=0),
+    )
+
+    document_index.id_based_retrieval.assert_not_called()
+    assert [(chunk.document_id, chunk.chunk_id) for chunk in chunks] == [("b", 5)]
@@ -0,0 +1,127 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.configs.constants import MessageType
+from onyx.context.search import speculative_retrieval
+from onyx.context.search.enums import LLMEvaluationType
+from onyx.context.search.enums import SearchType
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import SearchQuery
+from onyx.context.search.speculative_retrieval import heuristic_followup_rewrite
+from onyx.context.search.speculative_retrieval import resolve_speculative_retrieval
+from onyx.context.search.speculative_retrieval import SpeculativeRetrievalResult
+from onyx.llm.models import PreviousMessage
+
+
+def _message(text: str, message_type: MessageType) -> PreviousMessage:
+    return PreviousMessage(
+        message=text,
+        token_count=0,
+        message_type=message_type,
+        files=[],
+        tool_call=None,
+    )
+
+
+def _speculative_result(
+    query: str, embedding: list[float]
+) -> SpeculativeRetrievalResult:
+    return SpeculativeRetrievalResult(
+        query=query,
+        query_embedding=embedding,
+        search_query=SearchQuery(
+            query=query,
+            processed_keywords=query.split(),
+            search_type=SearchType.SEMANTIC,
+            evaluation_type=LLMEvaluationType.SKIP,
+            filters=IndexFilters(access_control_list=None),
+            chunks_above=0,
+            chunks_below=0,
+            rerank_settings=None,
+            hybrid_alpha=0.5,
+            recency_bias_multiplier=1.0,
+            max_llm_filter_sections=10,
+            precomputed_query_embedding=embedding,
+        ),
+        retrieved_chunks=[],
+    )
+
+
+def _mock_embedding(mocker: MockerFixture, embedding: list[float]) -> MagicMock:
+    @contextmanager
+    def _fake_session(tenant_id: str | None) -> Iterator[MagicMock]:
+        yield MagicMock()
+
+    mocker.patch.object(speculative_retrieval, "get_session_with_tenant", _fake_session)
+    embedding_model = MagicMock()
+    embedding_model.encode.return_value = [embedding]
+    mocker.patch.object(
+        speculative_retrieval,
+        "_get_query_embedding_model",
+        return_value=embedding_model,
+    )
+    return embedding_model
+
+
+def test_heuristic_rewrite_uses_previous_user_message() -> None:
+    history = [
+        _message("How do I request vacation?", MessageType.USER),
+        _message("Submit it in the HR portal.", MessageType.ASSISTANT),
+    ]
+    assert (
+        heuristic_followup_rewrite("What about sick leave?", history)
+        == "How do I request vacation? What about sick leave?"
+    )
+    assert heuristic_followup_rewrite("What about sick leave?", []) is None
+
+
+def test_exact_match_reused_without_encoding(mocker: MockerFixture) -> None:
+    embedding_model = _mock_embedding(mocker, [1.0, 0.0])
+    results = [_speculative_result("vacation policy", [1.0, 0.0])]
+
+    matched, rephrased_embedding = resolve_speculative_retrieval(
+        rephrased_query="Vacation policy ", speculative_results=results, tenant_id=None
+    )
+
+    assert matched is not None
+    assert matched.search_query.query == "Vacation policy "
+    assert matched.search_query.precomputed_query_embedding is None
+    assert rephrased_embedding is None
+    embedding_model.encode.assert_not_called()
+
+
+def test_similar_query_reused(mocker: MockerFixture) -> None:
+    _mock_embedding(mocker, [0.99, 0.1])
+    results = [
+        _speculative_result("raw follow-up", [0.0, 1.0]),
+        _speculative_result("heuristic rewrite", [1.0, 0.0]),
+    ]
+
+    matched, _ = resolve_speculative_retrieval(
+        rephrased_query="rephrased",
+        speculative_results=results,
+        tenant_id=None,
+        similarity_threshold=0.95,
+    )
+
+    assert matched is not None
+    assert matched.query == "heuristic rewrite"
+
+
+def test_dissimilar_query_discarded(mocker: MockerFixture) -> None:
+    _mock_embedding(mocker, [0.5, 0.5])
+    results = [_speculative_result("raw follow-up", [1.0, 0.0])]
+
+    matched, rephrased_embedding = resolve_speculative_retrieval(
+        rephrased_query="rephrased",
+        speculative_results=results,
+        tenant_id=None,
+        similarity_threshold=0.95,
+    )
+
+    assert matched is None
+    # Handed back so the regular search does not need to embed the query again
+    assert rephrased_embedding == [0.5, 0.5]
@@ -0,0 +1,109 @@
+import os
+
+import numpy
+import pytest
+
+from onyx.configs.constants import EmbeddingQuantization
+from onyx.document_index.vespa.quantization import (
+    add_embedding_quantization_to_schema,
+)
+from onyx.document_index.vespa.quantization import quantize_embedding
+from onyx.document_index.vespa_constants import VESPA_DIM_REPLACEMENT_PAT
+
+_SCHEMA_FILE = os.path.join(
+    os.path.dirname(__file__),
+    "../../../../../onyx/document_index/vespa/app_config/schemas/danswer_chunk.sd",
+)
+
+
+def _schema(embedding_dim: int) -> str:
+    with open(_SCHEMA_FILE) as schema_f:
+        return schema_f.read().replace(VESPA_DIM_REPLACEMENT_PAT, str(embedding_dim))
+
+
+def test_quantize_embedding() -> None:
+    embedding = [0.5, -0.25, 0.0, 0.1, -1.0, 0.3, 0.2, -0.1, 0.9]
+
+    assert quantize_embedding(embedding, EmbeddingQuantization.INT8) == [
+        64,
+        -32,
+        0,
+        13,
+        -127,
+        38,
+        25,
+        -13,
+        114,
+    ]
+    # 0b10010110, 0b10000000 as signed bytes
+    assert quantize_embedding(embedding, EmbeddingQuantization.BINARY) == [-106, -128]
+
+
+def test_int8_quantization_keeps_cosine_similarity() -> None:
+    rng = numpy.random.default_rng(0)
+    a, b = rng.normal(size=(2, 768))
+
+    def _cosine(x: numpy.ndarray, y: numpy.ndarray) -> float:
+        return float(x @ y / (numpy.linalg.norm(x) * numpy.linalg.norm(y)))
+
+    quantized_a = numpy.array(
+        quantize_embedding(a.tolist(), EmbeddingQuantization.INT8), dtype=float
+    )
+    quantized_b = numpy.array(
+        quantize_embedding(b.tolist(), EmbeddingQuantization.INT8), dtype=float
+    )
+    assert abs(_cosine(a, b) - _cosine(quantized_a, quantized_b)) < 0.01
+
+
+def test_schema_without_quantization_is_unchanged() -> None:
+    schema = _schema(768)
+    assert (
+        add_embedding_quantization_to_schema(schema, 768, EmbeddingQuantization.NONE)
+        == schema
+    )
+
+
+@pytest.mark.parametrize(
+    "quantization,quantized_dim,distance_metric",
+    [
+        (EmbeddingQuantization.INT8, 768, "angular"),
+        (EmbeddingQuantization.BINARY, 96, "hamming"),
+    ],
+)
+def test_quantized_schema(
+    quantization: EmbeddingQuantization, quantized_dim: int, distance_metric: str
+) -> None:
+    schema = add_embedding_quantization_to_schema(_schema(768), 768, quantization)
+
+    assert schema.count("{") == schema.count("}")
+    # Only the quantized embeddings have an HNSW index, full precision ones are paged
+    for field in ["title_embedding", "embeddings"]:
+        field_definition = schema.split(f"field {field} type tensor<float>")[1]
+        field_definition = field_definition.split("\n        }\n")[0]
+        assert "| index" not in field_definition
+        assert "paged" in field_definition
+    assert (
+        f"field embeddings_quantized type tensor<int8>(t{{}},x[{quantized_dim}])"
+        in schema
+    )
+    assert (
+        f"field title_embedding_quantized type tensor<int8>(x[{quantized_dim}])"
+        in schema
+    )
+    assert f"distance-metric: {distance_metric}" in schema
+    assert (
+        f"query(query_embedding_quantized) tensor<int8>(x[{quantized_dim}])" in schema
+    )
+
+    # Quantized first phase, everything after it uses the full precision embeddings
+    assert "expression: closeness(field, embeddings_quantized)" in schema
+    assert "closeness(field, embeddings)" not in schema
+    assert "closeness(field, title_embedding)" not in schema
+    assert "expression: embeddings_similarity" in schema
+
+
+def test_binary_quantization_needs_whole_bytes() -> None:
+    with pytest.raises(ValueError):
+        add_embedding_quantization_to_schema(
+            _schema(100), 100, EmbeddingQuantization.BINARY
+        )
@@ -0,0 +1,52 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from pytest_mock import MockerFixture
+
+from onyx.document_index.vespa.shared_utils import utils
+from onyx.document_index.vespa.shared_utils.utils import (
+    close_shared_vespa_http_clients,
+)
+from onyx.document_index.vespa.shared_utils.utils import (
+    get_shared_vespa_http_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def close_clients() -> Iterator[None]:
+    close_shared_vespa_http_clients()
+    yield
+    close_shared_vespa_http_clients()
+
+
+def test_client_is_shared_across_threads() -> None:
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(
+            executor.map(lambda _: get_shared_vespa_http_client(), range(32))
+        )
+
+    assert all(client is clients[0] for client in clients)
+    assert not clients[0].is_closed
+    assert get_shared_vespa_http_client(no_timeout=True) is not clients[0]
+    assert get_shared_vespa_http_client(no_timeout=True).timeout == httpx.Timeout(None)
+    assert get_shared_vespa_http_client(http2=False) is not clients[0]
+
+
+def test_new_client_after_fork(mocker: MockerFixture) -> None:
+    parent_client = get_shared_vespa_http_client()
+
+    mocker.patch.object(utils.os, "getpid", return_value=-1)
+    child_client = get_shared_vespa_http_client()
+
+    assert child_client is not parent_client
+    assert get_shared_vespa_http_client() is child_client
+
+
+def test_closed_clients_are_recreated() -> None:
+    client = get_shared_vespa_http_client()
+    close_shared_vespa_http_clients()
+
+    assert client.is_closed
+    assert get_shared_vespa_http_client() is not client
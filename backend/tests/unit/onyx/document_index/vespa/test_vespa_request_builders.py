@@ -0,0 +1,70 @@
+from onyx.configs.constants import DocumentSource
+from onyx.context.search.models import IndexFilters
+from onyx.context.search.models import Tag
+from onyx.document_index.vespa.shared_utils.vespa_request_builders import (
+    build_vespa_filters,
+)
+
+
+def _filters(access_control_list: list[str]) -> IndexFilters:
+    return IndexFilters(
+        access_control_list=access_control_list,
+        source_type=[DocumentSource.WEB, DocumentSource.SLACK],
+        tags=[Tag(tag_key="team", tag_value="search")],
+        document_set=["docs"],
+    )
+
+
+def test_inline_filters() -> None:
+    filter_str = build_vespa_filters(
+        _filters(["PUBLIC", "group:eng"]), remove_trailing_and=True
+    )
+
+    assert filter_str == (
+        "!(hidden=true) and "
+        '(access_control_list contains "PUBLIC" or '
+        'access_control_list contains "group:eng") and '
+        '(source_type contains "web" or source_type contains "slack") and '
+        '(metadata_list contains "team===search") and '
+        '(document_sets contains "docs")'
+    )
+
+
+def test_filter_values_as_query_params() -> None:
+    access_control_list = ["PUBLIC"] + [f"group:{i}" for i in range(5000)]
+    filter_params: dict[str, str] = {}
+
+    filter_str = build_vespa_filters(
+        _filters(access_control_list + ['quote"d\\']),
+        remove_trailing_and=True,
+        filter_params=filter_params,
+    )
+
+    # The YQL does not grow with the number of values
+    assert filter_str == (
+        "!(hidden=true) and "
+        "(access_control_list in (@access_control_list_filter)) and "
+        "(source_type in (@source_type_filter)) and "
+        "(metadata_list in (@metadata_list_filter)) and "
+        "(document_sets in (@document_sets_filter))"
+    )
+    assert (
+        filter_params["access_control_list_filter"]
+        == ",".join(f'"{entry}"' for entry in access_control_list) + r',"quote\"d\\"'
+    )
+    assert filter_params["source_type_filter"] == '"web","slack"'
+    assert filter_params["metadata_list_filter"] == '"team===search"'
+    assert filter_params["document_sets_filter"] == '"docs"'
+
+
+def test_empty_filter_values_are_skipped() -> None:
+    filter_params: dict[str, str] = {}
+
+    filter_str = build_vespa_filters(
+        IndexFilters(access_control_list=None, document_set=["", ""]),
+        include_hidden=True,
+        filter_params=filter_params,
+    )
+
+    assert filter_str == ""
+    assert filter_params == {}
@@ -0,0 +1,93 @@
+from unittest.mock import MagicMock
+
+import httpx
+from pytest_mock import MockerFixture
+
+from onyx.access.models import DocumentAccess
+from onyx.document_index.interfaces import UpdateRequest
+from onyx.document_index.interfaces import VespaDocumentFields
+from onyx.document_index.vespa import index as vespa_index_module
+from onyx.document_index.vespa.index import VespaIndex
+
+
+def _mock_http_client(mocker: MockerFixture) -> MagicMock:
+    http_client = MagicMock()
+    http_client.put.return_value = httpx.Response(
+        200,
+        json={"documentCount": 1},
+        request=httpx.Request("PUT", "http://vespa"),
+    )
+    mocker.patch.object(
+        vespa_index_module,
+        "get_shared_vespa_http_client",
+        return_value=http_client,
+    )
+    return http_client
+
+
+def test_update_sends_one_selection_per_index_and_batch(
+    mocker: MockerFixture,
+) -> None:
+    http_client = _mock_http_client(mocker)
+    mocker.patch.object(vespa_index_module, "MAX_DOCUMENTS_PER_UPDATE_SELECTION", 2)
+
+    access = DocumentAccess.build(
+        user_emails=["a@example.com"],
+        user_groups=[],
+        external_user_emails=[],
+        external_user_group_ids=[],
+        is_public=False,
+    )
+    VespaIndex(
+        index_name="primary", secondary_index_name="secondary", multitenant=False
+    ).update(
+        [
+            UpdateRequest(
+                document_ids=["doc1", "doc'2", "doc3"], access=access, hidden=True
+            ),
+            UpdateRequest(document_ids=["doc4"], boost=2.0),
+        ]
+    )
+
+    calls = [
+        (call.args[0], call.kwargs["params"]["selection"], call.kwargs["json"])
+        for call in http_client.put.call_args_list
+    ]
+    access_update = {
+        "fields": {
+            "access_control_list": {"assign": {acl: 1 for acl in access.to_acl()}},
+            "hidden": {"assign": True},
+        }
+    }
+    boost_update = {"fields": {"boost": {"assign": 2.0}}}
+    assert [
+        (url.split("/")[-2], selection, body) for url, selection, body in calls
+    ] == [
+        (
+            "primary",
+            "primary.document_id=='doc1' or primary.document_id=='doc_2'",
+            access_update,
+        ),
+        ("primary", "primary.document_id=='doc3'", access_update),
+        (
+            "secondary",
+            "secondary.document_id=='doc1' or secondary.document_id=='doc_2'",
+            access_update,
+        ),
+        ("secondary", "secondary.document_id=='doc3'", access_update),
+        ("primary", "primary.document_id=='doc4'", boost_update),
+        ("secondary", "secondary.document_id=='doc4'", boost_update),
+    ]
+
+
+def test_update_single_uses_each_index_name(mocker: MockerFixture) -> None:
+    http_client = _mock_http_client(mocker)
+
+    VespaIndex(
+        index_name="primary", secondary_index_name="secondary", multitenant=False
+    ).update_single("doc1", VespaDocumentFields(boost=1.0))
+
+    assert [call.args[0].split("/")[-2] for call in http_client.put.call_args_list] == [
+        "primary",
+        "secondary",
+    ]
@@ -0,0 +1,127 @@
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import MagicMock
+
+from pytest_mock import MockerFixture
+
+from onyx.background.indexing import run_indexing
+from onyx.background.indexing.checkpointing import split_time_window
+from onyx.redis.redis_connector_index import IndexingShard
+from onyx.redis.redis_connector_index import IndexingShardResult
+from onyx.redis.redis_connector_index import RedisConnectorIndex
+from tests.unit.onyx.conftest import FakeRedis
+
+
+def _dt(day: int) -> datetime:
+    return datetime(2024, 1, day, tzinfo=timezone.utc)
+
+
+def test_split_time_window() -> None:
+    assert split_time_window(_dt(1), _dt(10), 3) == [
+        (_dt(1), _dt(4)),
+        (_dt(4), _dt(7)),
+        (_dt(7), _dt(10)),
+    ]
+
+
+def test_shards_are_claimed_once(fake_redis: FakeRedis) -> None:
+    redis_connector_index = RedisConnectorIndex(None, 1, 1, fake_redis)  # type: ignore
+    shards = [
+        IndexingShard(shard_id=ind, generation="window", start=start, end=end)
+        for ind, (start, end) in enumerate(split_time_window(_dt(1), _dt(10), 3))
+    ]
+    redis_connector_index.set_shards(shards, num_helpers=2)
+
+    first_shard = redis_connector_index.claim_shard()
+    second_shard = redis_connector_index.claim_shard()
+    assert first_shard and second_shard
+    assert first_shard.shard_id != second_shard.shard_id
+
+    # A shard with a result is never handed out again, even once its claim is gone
+    redis_connector_index.set_shard_result(
+        IndexingShardResult(shard_id=2, generation="window")
+    )
+    assert redis_connector_index.claim_shard() is None
+
+    redis_connector_index.shards_clear()
+    assert redis_connector_index.get_shards() == []
+    assert redis_connector_index.get_shard_results() == {}
+
+
+def test_sharded_window_waits_for_helpers(
+    mocker: MockerFixture, fake_redis: FakeRedis
+) -> None:
+    redis_connector_index = RedisConnectorIndex(None, 1, 1, fake_redis)  # type: ignore
+    mocker.patch.object(run_indexing, "INDEXING_POLL_SHARDS", 3)
+    mocker.patch.object(
+        run_indexing, "RedisConnector"
+    ).return_value.new_index.return_value = redis_connector_index
+    mocker.patch.object(run_indexing, "_check_indexing_can_continue")
+
+    # A helper claims the first shard before the indexing task gets to it
+    original_set_shards = redis_connector_index.set_shards
+
+    def set_shards_and_help(shards: list[IndexingShard], num_helpers: int) -> None:
+        original_set_shards(shards, num_helpers)
+        assert redis_connector_index.claim_shard() == shards[0]
+
+    mocker.patch.object(redis_connector_index, "set_shards", set_shards_and_help)
+    index_shard = mocker.patch.object(
+        run_indexing,
+        "_index_shard",
+        side_effect=lambda shard, **kwargs: IndexingShardResult(
+            shard_id=shard.shard_id, generation=shard.generation, document_count=10
+        ),
+    )
+    # The helper finishes while the indexing task waits
+    mocker.patch.object(
+        run_indexing.time,
+        "sleep",
+        side_effect=lambda _: redis_connector_index.set_shard_result(
+            IndexingShardResult(
+                shard_id=0,
+                generation=redis_connector_index.get_shards()[0].generation,
+                error="rate limited",
+            )
+        ),
+    )
+
+    shard_results = run_indexing._run_sharded_window(
+        db_session=MagicMock(),
+        index_attempt=MagicMock(),
+        search_settings=MagicMock(),
+        indexing_pipeline=MagicMock(),
+        window_start=_dt(1),
+        window_end=_dt(10),
+        tenant_id=None,
+        callback=None,
+    )
+
+    indexed_shard_ids = [
+        call.kwargs["shard"].shard_id for call in index_shard.call_args_list
+    ]
+    assert indexed_shard_ids == [1, 2]
+    assert sorted(
+        (result.shard_id, result.document_count, result.error)
+        for result in shard_results
+    ) == [(0, 0, "rate limited"), (1, 10, None), (2, 10, None)]
+    # Cleaned up for the next window
+    assert redis_connector_index.get_shards() == []
+
+
+def test_results_of_an_earlier_window_are_ignored(fake_redis: FakeRedis) -> None:
+    redis_connector_index = RedisConnectorIndex(None, 1, 1, fake_redis)  # type: ignore
+    shards = [
+        IndexingShard(shard_id=ind, generation="second", start=start, end=end)
+        for ind, (start, end) in enumerate(split_time_window(_dt(1), _dt(10), 2))
+    ]
+    redis_connector_index.set_shards(shards, num_helpers=1)
+
+    # A helper that lost its claim in the first window finishes after it was cleared
+    redis_connector_index.set_shard_result(
+        IndexingShardResult(shard_id=0, generation="first")
+    )
+
+    assert redis_connector_index.get_shard_results() == {}
+    assert redis_connector_index.claim_shard() == shards[0]
+    assert redis_connector_index.claim_shard() == shards[1]
@@ -0,0 +1,172 @@
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from pytest_mock import MockerFixture
+
+from onyx.background.indexing import run_indexing
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.models import BasicExpertInfo
+from onyx.connectors.models import Document
+from onyx.connectors.models import Section
+from onyx.context.search.models import InferenceChunk
+from onyx.document_index.interfaces import StoredChunkRetrievalCapable
+from onyx.indexing.chunker import Chunker
+from onyx.indexing.models import DocAwareChunk
+from onyx.indexing.reembedding import _build_document
+from onyx.indexing.reembedding import chunks_are_reusable
+from onyx.natural_language_processing.utils import get_tokenizer
+
+
+def _to_stored_chunk(chunk: DocAwareChunk) -> InferenceChunk:
+    """What the document index gives back for a chunk it indexed"""
+    document = chunk.source_document
+    return InferenceChunk(
+        chunk_id=chunk.chunk_id,
+        blurb=chunk.blurb,
+        content=chunk.content,
+        source_links=chunk.source_links,
+        section_continuation=chunk.section_continuation,
+        llm_token_counts=chunk.llm_token_counts,
+        document_id=document.id,
+        source_type=document.source,
+        semantic_identifier=document.semantic_identifier,
+        title=document.get_title_for_document_index(),
+        boost=0,
+        recency_bias=1.0,
+        score=None,
+        hidden=False,
+        metadata=document.metadata,
+        match_highlights=[],
+        updated_at=document.doc_updated_at,
+        primary_owners=["Jane Doe"],
+        large_chunk_reference_ids=chunk.large_chunk_reference_ids,
+    )
+
+
+def test_rebuild_chunks_matches_chunking() -> None:
+    document = Document(
+        id="test_doc",
+        source=DocumentSource.WEB,
+        semantic_identifier="Test Document",
+        metadata={"tags": ["tag1", "tag2"], "author": "Jane Doe"},
+        primary_owners=[BasicExpertInfo(first_name="Jane", last_name="Doe")],
+        sections=[
+            Section(text="This is a short section.", link="link1"),
+            Section(
+                text="This is a long section that should be split into chunks. " * 200,
+                link="link2",
+            ),
+            Section(text="Final short section.", link="link3"),
+        ],
+    )
+    chunker = Chunker(
+        tokenizer=get_tokenizer(model_name=None, provider_type=None),
+        enable_multipass=True,
+        enable_large_chunks=True,
+    )
+    chunks = chunker.chunk([document])
+    normal_chunks = [chunk for chunk in chunks if not chunk.large_chunk_reference_ids]
+    assert len(normal_chunks) > 4
+
+    stored_chunks = [_to_stored_chunk(chunk) for chunk in normal_chunks]
+    rebuilt_chunks = chunker.rebuild_chunks(
+        _build_document(stored_chunks[0]), list(reversed(stored_chunks))
+    )
+
+    fields = [
+        "chunk_id",
+        "blurb",
+        "content",
+        "source_links",
+        "section_continuation",
+        "title_prefix",
+        "metadata_suffix_semantic",
+        "metadata_suffix_keyword",
+        "mini_chunk_texts",
+        "large_chunk_reference_ids",
+        "llm_token_counts",
+    ]
+    assert [chunk.model_dump(include=set(fields)) for chunk in rebuilt_chunks] == [
+        chunk.model_dump(include=set(fields)) for chunk in chunks
+    ]
+    assert rebuilt_chunks[0].source_document.get_title_for_document_index() == (
+        document.get_title_for_document_index()
+    )
+
+
+def test_chunks_are_reusable_with_the_same_tokenizer() -> None:
+    tokenizer_families = {
+        "text-embedding-3-small": "cl100k_base",
+        "text-embedding-3-large": "cl100k_base",
+        "nomic-ai/nomic-embed-text-v1": "nomic-ai/nomic-embed-text-v1",
+    }
+
+    def _get_tokenizer(model_name: str, provider_type: str | None) -> MagicMock:
+        return MagicMock(family=tokenizer_families[model_name])
+
+    def _search_settings(model_name: str) -> MagicMock:
+        return MagicMock(model_name=model_name, provider_type=None)
+
+    with patch("onyx.indexing.reembedding.get_tokenizer", _get_tokenizer):
+        assert chunks_are_reusable(
+            _search_settings("text-embedding-3-small"),
+            _search_settings("text-embedding-3-large"),
+        )
+        assert not chunks_are_reusable(
+            _search_settings("text-embedding-3-small"),
+            _search_settings("nomic-ai/nomic-embed-text-v1"),
+        )
+
+
+def test_reembedding_counts_as_indexed_up_to_the_current_index(
+    mocker: MockerFixture,
+) -> None:
+    indexed_up_to = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    index_attempt = MagicMock()
+    index_attempt.connector_credential_pair.last_successful_index_time = indexed_up_to
+
+    mocker.patch.object(run_indexing, "get_current_search_settings")
+    mocker.patch.object(
+        run_indexing,
+        "get_default_document_index",
+        return_value=MagicMock(spec=StoredChunkRetrievalCapable),
+    )
+    mocker.patch.object(run_indexing, "DefaultIndexingEmbedder")
+    mocker.patch.object(run_indexing, "build_chunker")
+    mocker.patch.object(run_indexing, "_check_indexing_can_continue")
+    mocker.patch.object(run_indexing, "update_docs_indexed")
+    mocker.patch.object(
+        run_indexing,
+        "get_document_id_batches_for_connector_credential_pair",
+        return_value=[["doc1", "doc2"]],
+    )
+
+    # the current index keeps being updated from the source while the chunks are copied
+    def _reembed_doc_batch(**kwargs: object) -> tuple[int, int]:
+        index_attempt.connector_credential_pair.last_successful_index_time = datetime(
+            2024, 1, 2, tzinfo=timezone.utc
+        )
+        return 2, 4
+
+    mocker.patch.object(
+        run_indexing, "reembed_doc_batch", side_effect=_reembed_doc_batch
+    )
+    mark_attempt_succeeded_up_to = mocker.patch.object(
+        run_indexing, "mark_attempt_succeeded_up_to"
+    )
+
+    db_session = MagicMock()
+    run_indexing._run_reembedding(
+        db_session=db_session,
+        index_attempt=index_attempt,
+        search_settings=MagicMock(),
+        tenant_id=None,
+    )
+
+    # The next poll of the new index starts from where the copied chunks are up to
+    # date, so the changes made in the source in the meantime are not skipped
+    mark_attempt_succeeded_up_to.assert_called_once_with(
+        index_attempt, indexed_up_to, db_session
+    )
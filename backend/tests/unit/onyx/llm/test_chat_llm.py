@@ -5,11 +5,14 @@ import pytest
 from langchain_core.messages import AIMessage
 from langchain_core.messages import AIMessageChunk
 from langchain_core.messages import HumanMessage
+from langchain_core.messages import SystemMessage
 from litellm.types.utils import ChatCompletionDeltaToolCall
 from litellm.types.utils import Delta
 from litellm.types.utils import Function as LiteLLMFunction
+from prometheus_client import REGISTRY
 
 from onyx.llm.chat_llm import DefaultMultiLLM
+from onyx.llm.utils import mark_prompt_cache_breakpoint
 
 
 def _create_delta(
@@ -288,3 +291,105 @@ def test_multiple_tool_calls_streaming(default_multi_llm: DefaultMultiLLM) -> No
             timeout=30,
             parallel_tool_calls=False,
         )
+
+
+def test_prompt_cache_breakpoints() -> None:
+    llm = DefaultMultiLLM(
+        api_key="test_key",
+        timeout=30,
+        model_provider="anthropic",
+        model_name="claude-3-5-sonnet-20241022",
+    )
+    messages = [
+        mark_prompt_cache_breakpoint(SystemMessage(content="You are a helpful bot")),
+        HumanMessage(content="Hi"),
+    ]
+
+    with patch("onyx.llm.chat_llm.ENABLE_PROMPT_CACHE_LAYOUT", True), patch(
+        "onyx.llm.chat_llm.litellm.completion"
+    ) as mock_completion:
+        mock_completion.return_value = litellm.ModelResponse(
+            choices=[
+                litellm.Choices(
+                    finish_reason="stop",
+                    index=0,
+                    message=litellm.Message(content="Hello", role="assistant"),
+                )
+            ],
+            usage=litellm.Usage(
+                prompt_tokens=50,
+                completion_tokens=5,
+                total_tokens=55,
+                cache_read_input_tokens=40,
+            ),
+        )
+        llm.invoke(messages)
+
+    assert mock_completion.call_args.kwargs["messages"] == [
+        {
+            "role": "system",
+            "content": [
+                {
+                    "type": "text",
+                    "text": "You are a helpful bot",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        },
+        {"role": "user", "content": "Hi"},
+    ]
+    assert (
+        REGISTRY.get_sample_value(
+            "onyx_llm_prompt_tokens_total",
+            {
+                "model_provider": "anthropic",
+                "model_name": "claude-3-5-sonnet-20241022",
+                "token_type": "cache_read",
+            },
+        )
+        == 40
+    )
+
+
+@pytest.mark.parametrize(
+    "model_provider,api_base,custom_llm_provider,expect_stream_usage",
+    [
+        ("openai", None, None, True),
+        ("anthropic", None, None, True),
+        ("openai", "http://localhost:8000/v1", None, False),
+        ("bedrock", None, None, False),
+        ("openai", None, "openai_compatible", False),
+    ],
+)
+def test_stream_usage_only_requested_from_supporting_providers(
+    model_provider: str,
+    api_base: str | None,
+    custom_llm_provider: str | None,
+    expect_stream_usage: bool,
+) -> None:
+    llm = DefaultMultiLLM(
+        api_key="test_key",
+        timeout=30,
+        model_provider=model_provider,
+        model_name="some-model",
+        api_base=api_base,
+        custom_llm_provider=custom_llm_provider,
+    )
+
+    with patch("onyx.llm.chat_llm.ENABLE_PROMPT_CACHE_LAYOUT", True), patch(
+        "onyx.llm.chat_llm.litellm.completion"
+    ) as mock_completion:
+        mock_completion.return_value = [
+            litellm.ModelResponse(
+                choices=[
+                    litellm.Choices(
+                        delta=_create_delta(role="assistant", content="Hello"),
+                        finish_reason="stop",
+                        index=0,
+                    )
+                ],
+            )
+        ]
+        list(llm.stream([HumanMessage(content="Hi")]))
+
+    assert ("stream_options" in mock_completion.call_args.kwargs) == expect_stream_usage
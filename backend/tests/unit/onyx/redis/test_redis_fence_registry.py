@@ -0,0 +1,78 @@
+from typing import cast
+
+import redis
+from pytest_mock import MockerFixture
+
+from onyx.redis.redis_connector_delete import RedisConnectorDelete
+from onyx.redis.redis_connector_prune import RedisConnectorPrune
+from onyx.redis.redis_fence_registry import RedisFenceRegistry
+from tests.unit.onyx.conftest import FakePipeline
+from tests.unit.onyx.conftest import FakeRedis
+
+
+PRUNE_FENCE_PREFIX = RedisConnectorPrune.FENCE_PREFIX
+DELETE_FENCE_PREFIX = RedisConnectorDelete.FENCE_PREFIX
+
+
+def test_fences_are_found_without_scanning(fake_redis: FakeRedis) -> None:
+    r = cast(redis.Redis, fake_redis)
+    # set before the registry existed
+    fake_redis.set(f"{PRUNE_FENCE_PREFIX}_1", 0)
+    assert RedisFenceRegistry.get_active_fences(r, PRUNE_FENCE_PREFIX) == [
+        b"connectorpruning_fence_1"
+    ]
+    assert fake_redis.scans == 1
+
+    RedisFenceRegistry.set_fence(r, f"{PRUNE_FENCE_PREFIX}_2", 0)
+    RedisFenceRegistry.set_fence(r, f"{DELETE_FENCE_PREFIX}_1", "{}")
+    assert RedisFenceRegistry.get_active_fences(r, PRUNE_FENCE_PREFIX) == [
+        b"connectorpruning_fence_1",
+        b"connectorpruning_fence_2",
+    ]
+
+    RedisFenceRegistry.clear_fence(r, f"{PRUNE_FENCE_PREFIX}_1")
+    # a fence deleted without going through the registry is dropped from it
+    fake_redis.delete(f"{DELETE_FENCE_PREFIX}_1")
+    assert RedisFenceRegistry.get_active_fences(r, PRUNE_FENCE_PREFIX) == [
+        b"connectorpruning_fence_2"
+    ]
+    assert RedisFenceRegistry.get_active_fences(r, DELETE_FENCE_PREFIX) == []
+    assert fake_redis.smembers(RedisFenceRegistry.ACTIVE_FENCES_KEY) == {
+        b"connectorpruning_fence_2"
+    }
+    assert fake_redis.scans == 1
+
+
+def test_fence_set_again_is_not_unregistered(
+    mocker: MockerFixture, fake_redis: FakeRedis
+) -> None:
+    r = cast(redis.Redis, fake_redis)
+    fence_key = f"{PRUNE_FENCE_PREFIX}_1"
+    RedisFenceRegistry.set_fence(r, fence_key, 0)
+    # deleted without going through the registry, so it is found stale
+    fake_redis.delete(fence_key)
+
+    # set again between finding it missing and removing it from the registry
+    original_pipeline = fake_redis.pipeline
+
+    def pipeline_setting_the_fence(transaction: bool = True) -> FakePipeline:
+        pipe = original_pipeline(transaction)
+        original_multi = pipe.multi
+
+        def multi_after_fence_is_set() -> None:
+            RedisFenceRegistry.set_fence(r, fence_key, 0)
+            original_multi()
+
+        pipe.multi = multi_after_fence_is_set  # type: ignore[method-assign]
+        return pipe
+
+    mocker.patch.object(fake_redis, "pipeline", pipeline_setting_the_fence)
+    assert RedisFenceRegistry.get_active_fences(r, PRUNE_FENCE_PREFIX) == []
+    assert fake_redis.smembers(RedisFenceRegistry.ACTIVE_FENCES_KEY) == {
+        fence_key.encode("utf-8")
+    }
+
+    mocker.stopall()
+    assert RedisFenceRegistry.get_active_fences(r, PRUNE_FENCE_PREFIX) == [
+        fence_key.encode("utf-8")
+    ]
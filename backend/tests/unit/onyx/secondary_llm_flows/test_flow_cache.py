@@ -0,0 +1,145 @@
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.messages import AIMessage
+from pytest_mock import MockerFixture
+
+from onyx.configs.constants import DocumentSource
+from onyx.llm.interfaces import LLMConfig
+from onyx.secondary_llm_flows import flow_cache
+from onyx.secondary_llm_flows.flow_cache import build_flow_cache_key
+from onyx.secondary_llm_flows.flow_cache import invoke_llm_with_flow_cache
+from onyx.secondary_llm_flows.flow_cache import SecondaryLLMFlow
+from onyx.secondary_llm_flows.source_filter import extract_source_filter
+from onyx.utils.threadpool_concurrency import FunctionCall
+from onyx.utils.threadpool_concurrency import run_functions_in_parallel
+from tests.unit.onyx.conftest import FakeRedis
+
+
+def _make_llm(output: str, model_name: str = "gpt-4o-mini") -> Mock:
+    llm = Mock()
+    llm.config = LLMConfig(
+        model_provider="openai", model_name=model_name, temperature=0.0
+    )
+    llm.invoke = Mock(return_value=AIMessage(content=output))
+    return llm
+
+
+MESSAGES = [{"role": "user", "content": "What is the vacation policy?"}]
+
+
+@pytest.fixture(autouse=True)
+def use_fake_redis(mocker: MockerFixture, fake_redis: FakeRedis) -> None:
+    mocker.patch.object(flow_cache, "get_redis_client", return_value=fake_redis)
+
+
+def _enable_flows(mocker: MockerFixture, flows: list[str]) -> None:
+    mocker.patch.object(flow_cache, "SECONDARY_LLM_FLOW_CACHE_FLOWS", flows)
+
+
+def test_cache_disabled_always_calls_llm(
+    mocker: MockerFixture, fake_redis: FakeRedis
+) -> None:
+    _enable_flows(mocker, [])
+    llm = _make_llm("rephrased")
+
+    for _ in range(2):
+        assert (
+            invoke_llm_with_flow_cache(
+                flow=SecondaryLLMFlow.HISTORY_REPHRASE, llm=llm, messages=MESSAGES
+            )
+            == "rephrased"
+        )
+
+    assert llm.invoke.call_count == 2
+    assert fake_redis.store == {}
+
+
+def test_cache_hit_skips_llm(mocker: MockerFixture, fake_redis: FakeRedis) -> None:
+    _enable_flows(mocker, [SecondaryLLMFlow.HISTORY_REPHRASE.value])
+    mocker.patch.object(flow_cache, "SECONDARY_LLM_FLOW_CACHE_TTL", 123)
+    llm = _make_llm("rephrased")
+
+    outputs = [
+        invoke_llm_with_flow_cache(
+            flow=SecondaryLLMFlow.HISTORY_REPHRASE, llm=llm, messages=MESSAGES
+        )
+        for _ in range(3)
+    ]
+
+    assert outputs == ["rephrased"] * 3
+    assert llm.invoke.call_count == 1
+    assert list(fake_redis.ttls.values()) == [123]
+
+
+def test_cache_only_applies_to_enabled_flows(
+    mocker: MockerFixture, fake_redis: FakeRedis
+) -> None:
+    _enable_flows(mocker, [SecondaryLLMFlow.HISTORY_REPHRASE.value])
+    llm = _make_llm("output")
+
+    for _ in range(2):
+        invoke_llm_with_flow_cache(
+            flow=SecondaryLLMFlow.SOURCE_FILTER, llm=llm, messages=MESSAGES
+        )
+
+    assert llm.invoke.call_count == 2
+
+
+def test_cache_key_depends_on_flow_model_and_prompt() -> None:
+    base_llm = _make_llm("", model_name="gpt-4o-mini")
+    other_llm = _make_llm("", model_name="gpt-4o")
+    other_messages: list[dict[str, Any]] = [{"role": "user", "content": "Other"}]
+
+    base_key = build_flow_cache_key(
+        SecondaryLLMFlow.HISTORY_REPHRASE, base_llm, MESSAGES
+    )
+    assert base_key == build_flow_cache_key(
+        SecondaryLLMFlow.HISTORY_REPHRASE, base_llm, MESSAGES
+    )
+    assert base_key != build_flow_cache_key(
+        SecondaryLLMFlow.SOURCE_FILTER, base_llm, MESSAGES
+    )
+    assert base_key != build_flow_cache_key(
+        SecondaryLLMFlow.HISTORY_REPHRASE, other_llm, MESSAGES
+    )
+    assert base_key != build_flow_cache_key(
+        SecondaryLLMFlow.HISTORY_REPHRASE, base_llm, other_messages
+    )
+
+
+def test_redis_failure_falls_back_to_llm(mocker: MockerFixture) -> None:
+    _enable_flows(mocker, [SecondaryLLMFlow.HISTORY_REPHRASE.value])
+    broken_redis = Mock()
+    broken_redis.get.side_effect = ConnectionError("redis down")
+    broken_redis.set.side_effect = ConnectionError("redis down")
+    mocker.patch.object(flow_cache, "get_redis_client", return_value=broken_redis)
+    llm = _make_llm("rephrased")
+
+    assert (
+        invoke_llm_with_flow_cache(
+            flow=SecondaryLLMFlow.HISTORY_REPHRASE, llm=llm, messages=MESSAGES
+        )
+        == "rephrased"
+    )
+    assert llm.invoke.call_count == 1
+
+
+def test_worker_thread_uses_the_passed_tenant(mocker: MockerFixture) -> None:
+    _enable_flows(mocker, [SecondaryLLMFlow.SOURCE_FILTER.value])
+    get_redis_client = mocker.patch.object(flow_cache, "get_redis_client")
+    get_redis_client.return_value.get.return_value = None
+    mocker.patch(
+        "onyx.secondary_llm_flows.source_filter.fetch_unique_document_sources",
+        return_value=[DocumentSource.SLACK, DocumentSource.WEB],
+    )
+    llm = _make_llm('{"sources": ["slack"]}')
+
+    source_filter_call = FunctionCall(
+        extract_source_filter, (MESSAGES[0]["content"], llm, None, "tenant_1"), {}
+    )
+    results = run_functions_in_parallel([source_filter_call])
+
+    assert results[source_filter_call.result_id] == [DocumentSource.SLACK]
+    get_redis_client.assert_called_once_with(tenant_id="tenant_1")
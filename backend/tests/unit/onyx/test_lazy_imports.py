@@ -0,0 +1,78 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from onyx.configs.constants import DocumentSource
+from onyx.connectors.factory import identify_connector_class
+from onyx.connectors.models import InputType
+from onyx.connectors.registry import CONNECTOR_CLASS_MAP
+
+BACKEND_DIR = Path(__file__).parents[3]
+
+# packages that take a large share of the startup time and are only needed for
+# specific connectors, file types or LLM calls
+HEAVY_MODULES = [
+    "dropbox",
+    "docx",
+    "litellm",
+    "openpyxl",
+    "playwright",
+    "pptx",
+    "torch",
+    "transformers",
+    "unstructured",
+]
+
+
+def _loaded_modules_after_import(module: str) -> set[str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys; import {module}; print(','.join(sys.modules))",
+        ],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(result.stdout.strip().splitlines()[-1].split(","))
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "onyx.connectors.factory",
+        "onyx.file_processing.extract_file_text",
+        "onyx.llm.utils",
+    ],
+)
+def test_heavy_modules_are_not_imported(module: str) -> None:
+    loaded_modules = _loaded_modules_after_import(module)
+
+    assert [
+        heavy_module for heavy_module in HEAVY_MODULES if heavy_module in loaded_modules
+    ] == []
+    assert not any(
+        loaded_module.startswith("onyx.connectors.")
+        and loaded_module.endswith(".connector")
+        for loaded_module in loaded_modules
+    )
+
+
+def test_connector_registry_resolves_every_source() -> None:
+    for source, mapping in CONNECTOR_CLASS_MAP.items():
+        if isinstance(mapping, dict):
+            for input_type, input_type_mapping in mapping.items():
+                connector_class = identify_connector_class(source, input_type)
+                assert connector_class.__name__ == input_type_mapping.class_name
+        else:
+            connector_class = identify_connector_class(source)
+            assert connector_class.__name__ == mapping.class_name
+
+    assert (
+        identify_connector_class(DocumentSource.SLACK, InputType.POLL).__name__
+        == "SlackPollConnector"
+    )
@@ -1,9 +1,12 @@
 import os
+from unittest.mock import MagicMock
 
 import pytest
 import redis
+from pytest_mock import MockerFixture
 
 from onyx.redis.redis_pool import RedisPool
+from onyx.redis.redis_pool import TenantRedis
 from onyx.utils.logger import setup_logger
 
 logger = setup_logger()
@@ -37,3 +40,49 @@ def test_redis_ssl() -> None:
 
     r = redis.Redis(connection_pool=pool)
     assert r.ping()
+
+
+def test_tenant_pipeline_prefixes_keys() -> None:
+    # commands are only queued, so no server is needed
+    r = TenantRedis("tenant", connection_pool=RedisPool.create_pool())
+    with r.pipeline(transaction=False) as pipe:
+        pipe.get("fence")
+        pipe.scard("taskset")
+        pipe.mget(["a", "tenant:b"], "c")
+        pipe.delete("a", "b")
+        commands = [args for args, _ in pipe.command_stack]
+
+    assert commands == [
+        ("GET", "tenant:fence"),
+        ("SCARD", "tenant:taskset"),
+        ("MGET", "tenant:a", "tenant:b", "tenant:c"),
+        ("DEL", "tenant:a", "tenant:b"),
+    ]
+
+
+def test_tenant_redis_prefixes_every_key(mocker: MockerFixture) -> None:
+    r = TenantRedis("tenant", connection_pool=RedisPool.create_pool())
+    execute_command: MagicMock = mocker.patch.object(r, "execute_command")
+
+    r.exists("a", "b")
+    r.smembers("s")
+    r.hgetall("h")
+
+    assert [call.args for call in execute_command.call_args_list] == [
+        ("EXISTS", "tenant:a", "tenant:b"),
+        ("SMEMBERS", "tenant:s"),
+        ("HGETALL", "tenant:h"),
+    ]
+
+
+def test_tenant_redis_binds_prefixed_methods_once() -> None:
+    r = TenantRedis("tenant", connection_pool=RedisPool.create_pool())
+    # the same bound wrapper on every lookup, not a new one per command
+    assert r.get is r.get
+    assert r.delete is r.delete
+    assert r.scan_iter is r.scan_iter
+
+    pipe = r.pipeline(transaction=False)
+    assert pipe.get is pipe.get
+    # unwrapped attributes are left alone
+    assert "ping" not in vars(r)